@@ -0,0 +1,223 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""Benchmarks the Cadence memory planning algorithms on large graphs.
+
+Two kinds of graphs are planned:
+- The MultiLayerPerceptron test model repeated `--mlp-blocks` times, lowered
+  with the Cadence compiler. Its specs are planned with the constraints the
+  Cadence passes generate for the graph.
+- Synthetic chains of `--specs` operators, like the MLPs and convolution stacks
+  in the Cadence tests: every operator produces one tensor that is consumed by
+  one of the next few operators, and a fraction of tensors lives much longer
+  (e.g. skip connections). They reach sizes that take too long to export.
+
+The specs are planned into a small fast memory and a large slow one, as on a
+DSP. The script times each algorithm with the indexed MemoryPlanningState. Up
+to `--reference-max-specs` it also times the scanning state of the tests, which
+checks every placed spec for each candidate placement, and checks that both
+place all the specs in the same memories at the same offsets.
+
+    python -m executorch.backends.cadence.aot.benchmark_memory_planning \
+        --mlp-blocks 25 250 --specs 1000 20000
+"""
+
+import argparse
+import functools
+import gc
+import random
+import sys
+import time
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+import torch
+from executorch.backends.cadence.aot import compiler
+from executorch.backends.cadence.aot.memory_constraints import MemConstraints
+from executorch.backends.cadence.aot.memory_planning import (
+    GreedyWithHeuristic,
+    PositionBasedGreedyWithHierarchy,
+)
+from executorch.backends.cadence.aot.memory_planning_algo import (
+    MemoryPlanningAlgo,
+    MemoryPlanningState,
+)
+from executorch.backends.cadence.aot.tests.test_memory_passes import (
+    _ScanningMemoryPlanningState,
+)
+from executorch.backends.cadence.aot.utils import MemoryConfig
+from executorch.exir.memory_planning import (
+    collect_specs_from_nodes,
+    update_all_tensors_lifetime,
+)
+from executorch.exir.tensor import TensorSpec
+from executorch.exir.tests.models import MultiLayerPerceptron
+from torch.export import ExportGraphSignature
+
+_SIZES: tuple[int, ...] = (16, 64, 256, 1024, 4096, 16384)
+
+
+class _Graph(NamedTuple):
+    name: str
+    specs: list[TensorSpec]
+    # None for synthetic graphs, which are planned without constraints.
+    graph_module: Optional[torch.fx.GraphModule] = None
+    graph_signature: Optional[ExportGraphSignature] = None
+
+
+def _synthetic_graph(num_specs: int, long_lived_fraction: float, seed: int) -> _Graph:
+    rng = random.Random(seed)
+    specs = []
+    for step in range(num_specs):
+        spec = TensorSpec(dtype=torch.float32, shape=torch.Size([rng.choice(_SIZES)]))
+        if rng.random() < long_lived_fraction:
+            last_use = step + rng.randrange(num_specs // 10 + 1)
+        else:
+            last_use = step + rng.randrange(1, 8)
+        spec.lifetime = [step, min(last_use, num_specs - 1)]
+        specs.append(spec)
+    return _Graph("synthetic", specs)
+
+
+def _mlp_graph(num_blocks: int, dim: int, memory_config: MemoryConfig) -> _Graph:
+    model = torch.nn.Sequential(
+        *(MultiLayerPerceptron(dim, dim, dim, dim, dim) for _ in range(num_blocks))
+    )
+    program = compiler.export_to_executorch_gen_etrecord(
+        model, (torch.ones(8, dim),), memory_config=memory_config
+    ).exported_program()
+    graph_module, graph_signature = program.graph_module, program.graph_signature
+    update_all_tensors_lifetime(graph_module, graph_signature)
+    specs = list(
+        collect_specs_from_nodes(
+            graph_module.graph.nodes, graph_signature, do_assertion=False
+        )
+    )
+    return _Graph("mlp", specs, graph_module, graph_signature)
+
+
+def _constraints(algo: MemoryPlanningAlgo, graph: _Graph) -> MemConstraints:
+    if graph.graph_module is None:
+        return MemConstraints()
+    _, constraints = algo.populate_constraints(graph.graph_module)
+    return constraints
+
+
+def _plan(
+    algo: MemoryPlanningAlgo,
+    state: MemoryPlanningState,
+    graph: _Graph,
+    constraints: MemConstraints,
+) -> list[tuple[Optional[int], Optional[int]]]:
+    for spec in graph.specs:
+        spec.mem_id = None
+        spec.mem_offset = None
+    algo.plan_with_constraints(
+        graph.specs,
+        # pyre-ignore[6]: Synthetic graphs have no graph module or signature.
+        graph.graph_module,
+        graph.graph_signature,
+        state,
+        constraints,
+    )
+    return [(spec.mem_id, spec.mem_offset) for spec in graph.specs]
+
+
+def _time(fn: Callable[[], Any]) -> tuple[float, Any]:
+    # Like timeit, exclude garbage collections, which are dominated by the size
+    # of the heap rather than by the planner.
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return time.perf_counter() - start, result
+    finally:
+        gc.enable()
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--specs",
+        type=int,
+        nargs="*",
+        default=[1000, 5000, 20000, 100000],
+        help="Number of tensor specs per synthetic graph.",
+    )
+    parser.add_argument(
+        "--mlp-blocks",
+        type=int,
+        nargs="*",
+        default=[25, 250],
+        help="Number of MultiLayerPerceptron blocks per exported model.",
+    )
+    parser.add_argument("--mlp-dim", type=int, default=32)
+    parser.add_argument("--long-lived-fraction", type=float, default=0.01)
+    parser.add_argument(
+        "--reference-max-specs",
+        type=int,
+        default=5000,
+        help="Largest graph to also run the scanning state on.",
+    )
+    parser.add_argument(
+        "--fast-memory-size",
+        type=int,
+        default=256 * 1024,
+        help="Size of the first memory in bytes; the second one is unbounded.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    memory_config = MemoryConfig(
+        memory_sizes=[args.fast_memory_size, 1 << 40], memory_alignments=[16, 64]
+    )
+    graphs = [
+        _mlp_graph(num_blocks, args.mlp_dim, memory_config)
+        for num_blocks in args.mlp_blocks
+    ] + [
+        _synthetic_graph(num_specs, args.long_lived_fraction, args.seed)
+        for num_specs in args.specs
+    ]
+    print(
+        f"{'algo':>34} {'graph':>10} {'specs':>8} {'indexed s':>10} "
+        f"{'reference s':>12} {'same plan':>10}"
+    )
+    for algo_cls in (PositionBasedGreedyWithHierarchy, GreedyWithHeuristic):
+        algo = algo_cls(memory_config)
+        for graph in graphs:
+            indexed_s, placement = _time(
+                functools.partial(
+                    _plan,
+                    algo,
+                    MemoryPlanningState(memory_config),
+                    graph,
+                    _constraints(algo, graph),
+                )
+            )
+            reference_s = same_plan = "-"
+            if len(graph.specs) <= args.reference_max_specs:
+                seconds, reference = _time(
+                    functools.partial(
+                        _plan,
+                        algo,
+                        _ScanningMemoryPlanningState(memory_config),
+                        graph,
+                        _constraints(algo, graph),
+                    )
+                )
+                reference_s = f"{seconds:.3f}"
+                same_plan = str(placement == reference)
+            print(
+                f"{algo_cls.__name__:>34} {graph.name:>10} {len(graph.specs):>8} "
+                f"{indexed_s:>10.3f} {reference_s:>12} {same_plan:>10}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -25,7 +25,7 @@ from executorch.backends.cadence.aot.utils import (
 )
 
 from executorch.exir import ExecutorchProgramManager
-from executorch.exir.memory_planning import collect_specs_from_nodes, Verifier
+from executorch.exir.memory_planning import collect_specs_from_nodes
 from executorch.exir.pass_base import PassBase
 from executorch.exir.pass_manager import PassManager
 from executorch.exir.passes import MemoryPlanningPass
@@ -122,10 +122,7 @@ class GreedyWithHeuristic(MemoryPlanningAlgo):
                 # Skip placement for blocked memory id.
                 continue
             prev_offset, smallest_gap = 0, float("inf")
-            for allocated_spec in state.allocated_buffers[spec.mem_id]:
-                if not Verifier.lifetime_overlap(spec, allocated_spec):
-                    continue
-
+            for allocated_spec in state.get_lifetime_overlapping_specs(spec):
                 if (
                     gap := allocated_spec.mem_offset - prev_offset
                 ) >= spec.allocated_memory and gap < smallest_gap:
@@ -155,7 +152,7 @@ class GreedyWithHeuristic(MemoryPlanningAlgo):
             state.place_spec(spec)
             # A data structure used for maintaining the tensor order
             # by offset, named ordered_allocated_ids in the paper
-            state.allocated_buffers[spec.mem_id].sort(key=lambda spec: spec.mem_offset)
+            state.sort_by_offset(spec.mem_id)
             break
 
     def plan(
@@ -25,6 +25,88 @@ def get_aligned_offset(pre_aligned_offset: int, alignment: int) -> int:
     return int(math.ceil(pre_aligned_offset / alignment) * alignment)
 
 
+# Lifetimes are indices of graph nodes, so they are below 2**_MAX_LIFETIME_BITS.
+_MAX_LIFETIME_BITS: int = 40
+
+# A node of _LifetimeIndex, as (level, index) for the time steps
+# [index << level, (index + 1) << level).
+_IndexNode = tuple[int, int]
+
+
+class _LifetimeIndex:
+    """
+    Segment tree over time steps, answering which of the specs added to it
+    are alive at some step of a given lifetime.
+
+    A spec is stored in the O(log(steps)) nodes that its lifetime covers, and
+    in the `overlapping` lists of those nodes and of their ancestors. A query
+    then only reads the `overlapping` lists of the nodes that the queried
+    lifetime covers, and the `covering` lists of their ancestors.
+    """
+
+    def __init__(self) -> None:
+        # Specs whose lifetime covers the node.
+        self._covering: dict[_IndexNode, list[TensorSpec]] = {}
+        # Specs whose lifetime covers the node or a node in its subtree.
+        self._overlapping: dict[_IndexNode, list[TensorSpec]] = {}
+
+    @staticmethod
+    def _cover(start: int, end: int) -> list[_IndexNode]:
+        """The nodes partitioning the steps [start, end]."""
+        nodes = []
+        lo, hi, level = start, end + 1, 0
+        while lo < hi:
+            if lo & 1:
+                nodes.append((level, lo))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                nodes.append((level, hi))
+            lo >>= 1
+            hi >>= 1
+            level += 1
+        return nodes
+
+    @staticmethod
+    def _lifetime(spec: TensorSpec) -> tuple[int, int]:
+        start, end = spec.lifetime
+        assert (
+            start is not None and end is not None
+        ), f"{spec} should have valid start and end"
+        assert end < (1 << _MAX_LIFETIME_BITS), f"{spec} has too long a lifetime"
+        return start, end
+
+    def add(self, spec: TensorSpec) -> None:
+        for node in self._cover(*self._lifetime(spec)):
+            self._covering.setdefault(node, []).append(spec)
+            level, index = node
+            while level <= _MAX_LIFETIME_BITS:
+                specs = self._overlapping.setdefault((level, index), [])
+                if specs and specs[-1] is spec:
+                    # Added through another node; so are all the ancestors.
+                    break
+                specs.append(spec)
+                level += 1
+                index >>= 1
+
+    def query(self, spec: TensorSpec) -> list[TensorSpec]:
+        """Returns the specs whose lifetime overlaps that of `spec`."""
+        found: dict[int, TensorSpec] = {}
+        visited: set[_IndexNode] = set()
+        for level, index in self._cover(*self._lifetime(spec)):
+            for other in self._overlapping.get((level, index), ()):
+                found[id(other)] = other
+            level += 1
+            index >>= 1
+            while level <= _MAX_LIFETIME_BITS and (level, index) not in visited:
+                visited.add((level, index))
+                for other in self._covering.get((level, index), ()):
+                    found[id(other)] = other
+                level += 1
+                index >>= 1
+        return list(found.values())
+
+
 class MemoryPlanningState:
     def __init__(self, memory_config: MemoryConfig) -> None:
         self.num_memories: int = len(memory_config.memory_sizes) + 1
@@ -32,17 +114,39 @@ class MemoryPlanningState:
         assert alignment is not None
         assert len(alignment) == self.num_memories - 1
         self.alignment: list[int] = [1] + alignment
-        # TODO: Maybe keep this sorted with heapq?
+        # Specs placed in each memory, in the order they were placed, or by
+        # offset since the last sort_by_offset().
         self.allocated_buffers: list[list[TensorSpec]] = [
             [] for _ in range(self.num_memories)
         ]
         self.bufsizes: list[int] = [0] * self.num_memories
+        # Lifetimes of allocated_buffers, so that finding overlapping specs
+        # doesn't scan every placed spec.
+        self._lifetime_index: list[_LifetimeIndex] = [
+            _LifetimeIndex() for _ in range(self.num_memories)
+        ]
+        # Position of each placed spec in the order of placement, per memory.
+        self._placement_order: list[dict[TensorSpec, int]] = [
+            {} for _ in range(self.num_memories)
+        ]
+        # Number of specs sorted by the last sort_by_offset(), per memory.
+        self._num_sorted: list[int] = [0] * self.num_memories
+        # Result of the last get_lifetime_overlapping_specs(), valid until
+        # the next update, as ((spec, mem_id, lifetime, num_updates), specs).
+        self._num_updates: int = 0
+        self._overlapping_cache: Optional[
+            tuple[tuple[TensorSpec, int, tuple[int, int], int], list[TensorSpec]]
+        ] = None
 
     def place_spec(self, spec: TensorSpec) -> None:
         """Place the spec at the given memory and offset."""
         logging.debug(f"Placing spec {spec}: {spec.mem_id=}, {spec.mem_offset=}")
         assert self.get_overlapping_spec(spec) is None
         self.allocated_buffers[spec.mem_id].append(spec)
+        self._lifetime_index[spec.mem_id].add(spec)
+        placement_order = self._placement_order[spec.mem_id]
+        placement_order[spec] = len(placement_order)
+        self._num_updates += 1
         self.bufsizes[spec.mem_id] = max(
             self.bufsizes[spec.mem_id],
             get_aligned_offset(
@@ -50,18 +154,48 @@ class MemoryPlanningState:
             ),
         )
 
+    def sort_by_offset(self, mem_id: int) -> None:
+        """Stable sort the specs placed in the memory by offset."""
+        self.allocated_buffers[mem_id].sort(key=lambda spec: spec.mem_offset)
+        self._num_sorted[mem_id] = len(self.allocated_buffers[mem_id])
+        self._num_updates += 1
+
+    def get_lifetime_overlapping_specs(self, spec: TensorSpec) -> list[TensorSpec]:
+        """
+        Get the specs placed in spec.mem_id whose lifetime overlaps with that
+        of the given spec, in the order of allocated_buffers.
+        """
+        mem_id = spec.mem_id
+        key = (spec, mem_id, tuple(spec.lifetime), self._num_updates)
+        cache = self._overlapping_cache
+        if cache is not None and cache[0][0] is spec and cache[0][1:] == key[1:]:
+            return cache[1]
+
+        placement_order = self._placement_order[mem_id]
+        num_sorted = self._num_sorted[mem_id]
+
+        # The specs sorted by the last sort_by_offset() come first, by offset
+        # and then by placement, followed by those placed since, by placement.
+        def list_position(other: TensorSpec) -> tuple[int, int, int]:
+            order = placement_order[other]
+            if order < num_sorted:
+                return (0, other.mem_offset, order)
+            return (1, 0, order)
+
+        specs = sorted(self._lifetime_index[mem_id].query(spec), key=list_position)
+        self._overlapping_cache = (key, specs)
+        return specs
+
     def get_overlapping_spec(self, spec: TensorSpec) -> Optional[TensorSpec]:
         """Get the overlapping spec for the given spec."""
-        for allocated_spec in self.allocated_buffers[spec.mem_id]:
-            if Verifier.lifetime_overlap(
-                spec, allocated_spec
-            ) and Verifier.storage_overlap(spec, allocated_spec):
+        for allocated_spec in self.get_lifetime_overlapping_specs(spec):
+            if Verifier.storage_overlap(spec, allocated_spec):
                 return allocated_spec
         return None
 
     def is_placed(self, spec: TensorSpec) -> bool:
         """Check if the spec is placed."""
-        return spec.mem_id is not None and spec in self.allocated_buffers[spec.mem_id]
+        return spec.mem_id is not None and spec in self._placement_order[spec.mem_id]
 
     def __str__(self) -> str:
         allocated_buffers_str = ""
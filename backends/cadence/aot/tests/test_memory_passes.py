@@ -8,6 +8,7 @@
 
 import logging
 import math
+import random
 import unittest
 from typing import cast, List, Optional, Sequence
 
@@ -21,6 +22,7 @@ from executorch.backends.cadence.aot.memory_constraints import (
 from executorch.backends.cadence.aot.memory_planning import (
     CadenceMemoryPlanning,
     find_peak_memory_usage,
+    GreedyWithHeuristic,
     PositionBasedGreedyWithHierarchy,
 )
 from executorch.backends.cadence.aot.memory_planning_algo import (
@@ -44,9 +46,11 @@ from executorch.exir.dialects._ops import ops as exir_ops
 from executorch.exir.memory_planning import (
     collect_specs_from_nodes,
     update_all_tensors_lifetime,
+    Verifier,
 )
 from executorch.exir.pass_base import PassBase, PassResult
 from executorch.exir.passes.spec_prop_pass import SpecPropPass
+from executorch.exir.tensor import TensorSpec
 from executorch.exir.tests.models import MultiLayerPerceptron
 from parameterized import parameterized
 from torch.fx import GraphModule
@@ -1365,3 +1369,105 @@ class TestMixedPlacementConstraints(TestConstraintsBase):
             placement_constraints.add_relative_placement_constraint(
                 x, x_slice, x_offset, update_lifetime=False
             )
+
+
+class _ScanningMemoryPlanningState(MemoryPlanningState):
+    """MemoryPlanningState that scans all the placed specs instead of indexing them."""
+
+    def get_lifetime_overlapping_specs(self, spec: TensorSpec) -> list[TensorSpec]:
+        return [
+            allocated_spec
+            for allocated_spec in self.allocated_buffers[spec.mem_id]
+            if Verifier.lifetime_overlap(spec, allocated_spec)
+        ]
+
+
+class TestMemoryPlanningState(unittest.TestCase):
+    def _random_specs(self, rng: random.Random, num_specs: int) -> list[TensorSpec]:
+        specs = []
+        max_lifetime = rng.choice([1, 4, num_specs])
+        for _ in range(num_specs):
+            spec = TensorSpec(
+                dtype=torch.float32, shape=torch.Size([rng.choice([0, 1, 3, 8, 64])])
+            )
+            start = rng.randrange(num_specs)
+            spec.lifetime = [start, start + rng.randrange(max_lifetime)]
+            specs.append(spec)
+        return specs
+
+    def _plan(
+        self,
+        algo: MemoryPlanningAlgo,
+        state: MemoryPlanningState,
+        specs: list[TensorSpec],
+        pinned_offsets: list[int],
+    ) -> list[tuple[Optional[int], Optional[int]]]:
+        for spec in specs:
+            spec.mem_id = None
+            spec.mem_offset = None
+        # Pinned specs are placed in the given order, not by offset.
+        for spec, offset in zip(specs, pinned_offsets):
+            spec.mem_id = 1
+            spec.mem_offset = offset
+            state.place_spec(spec)
+        algo.plan(
+            specs[len(pinned_offsets) :],
+            # pyre-ignore[6]
+            None,
+            # pyre-ignore[6]
+            None,
+            state,
+            MemConstraints(),
+        )
+        return [(spec.mem_id, spec.mem_offset) for spec in specs]
+
+    def test_plans_match_scanning_state(self) -> None:
+        rng = random.Random(0)
+        memory_config = MemoryConfig([2048, 1 << 20], memory_alignments=[16, 8])
+        for algo_cls in (PositionBasedGreedyWithHierarchy, GreedyWithHeuristic):
+            for num_specs in (1, 10, 100, 300):
+                specs = self._random_specs(rng, num_specs)
+                pinned_offsets = [1024, 0] if num_specs > 2 else []
+                algo = algo_cls(memory_config)
+                indexed = self._plan(
+                    algo, MemoryPlanningState(memory_config), specs, pinned_offsets
+                )
+                scanning = self._plan(
+                    algo,
+                    _ScanningMemoryPlanningState(memory_config),
+                    specs,
+                    pinned_offsets,
+                )
+                self.assertEqual(indexed, scanning, msg=f"{algo_cls=} {num_specs=}")
+
+    def test_get_overlapping_spec(self) -> None:
+        memory_config = MemoryConfig([1024])
+        state = MemoryPlanningState(memory_config)
+        placed = []
+        for lifetime, offset in (([0, 3], 0), ([2, 5], 64), ([6, 9], 0)):
+            spec = TensorSpec(dtype=torch.float32, shape=torch.Size([16]))
+            spec.lifetime = lifetime
+            spec.mem_id = 1
+            spec.mem_offset = offset
+            state.place_spec(spec)
+            placed.append(spec)
+
+        spec = TensorSpec(dtype=torch.float32, shape=torch.Size([32]))
+        spec.lifetime = [3, 6]
+        spec.mem_id = 1
+        spec.mem_offset = 0
+        self.assertEqual(state.get_lifetime_overlapping_specs(spec), placed)
+        self.assertIs(state.get_overlapping_spec(spec), placed[0])
+        spec.mem_offset = 128
+        self.assertIsNone(state.get_overlapping_spec(spec))
+        spec.lifetime = [10, 12]
+        self.assertEqual(state.get_lifetime_overlapping_specs(spec), [])
+        self.assertFalse(state.is_placed(spec))
+        self.assertTrue(state.is_placed(placed[1]))
+
+        state.sort_by_offset(1)
+        spec.lifetime = [0, 9]
+        self.assertEqual(
+            state.get_lifetime_overlapping_specs(spec),
+            [placed[0], placed[2], placed[1]],
+        )
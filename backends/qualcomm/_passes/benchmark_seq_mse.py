@@ -0,0 +1,183 @@
+# Copyright (c) Qualcomm Innovation Center, Inc.
+# All rights reserved
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Benchmarks the candidate search of SeqMseModule over the whole calibration
+batch against only its first calibration_samples samples, on representative
+convolution and linear layers. Linear layers are lowered as 1x1 convolutions
+by the QNN passes, so they are benchmarked as such. Also reports whether both
+searches pick the same scale.
+
+    python -m executorch.backends.qualcomm._passes.benchmark_seq_mse \
+        --candidates 50 --calibration-samples 1 2 4
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+import torch
+from executorch.backends.qualcomm._passes.seq_mse import SeqMseModule
+from executorch.backends.qualcomm.quantizer.observers.per_block_param_observer import (
+    PerBlockParamObserver,
+)
+from executorch.backends.qualcomm.quantizer.observers.per_channel_param_observer import (
+    PerChannelParamObserver,
+)
+
+
+class Layer(NamedTuple):
+    name: str
+    # (batch, in_channels, height, width) of the input
+    input_shape: Tuple[int, int, int, int]
+    out_channels: int
+    kernel_size: int
+    padding: int
+    groups: int
+
+
+LAYERS: List[Layer] = [
+    Layer("conv3x3", (8, 64, 32, 32), 64, 3, 1, 1),
+    Layer("conv3x3_groups4", (8, 64, 32, 32), 64, 3, 1, 4),
+    Layer("depthwise3x3", (8, 64, 32, 32), 64, 3, 1, 64),
+    # A linear layer over 8 samples of 16 tokens, as lowered to a 1x1
+    # convolution
+    Layer("linear", (8, 1024, 1, 16), 1024, 1, 0, 1),
+]
+
+
+def per_channel_observer() -> torch.nn.Module:
+    return PerChannelParamObserver(
+        dtype=torch.int8,
+        qscheme=torch.per_channel_symmetric,
+        quant_min=-128,
+        quant_max=127,
+    )
+
+
+def per_block_observer(weight: torch.Tensor) -> torch.nn.Module:
+    block_size = (1, min(weight.shape[1], 32), 1, 1)
+    return PerBlockParamObserver(
+        dtype=torch.int8,
+        block_size=torch.Size(block_size),
+        quant_min=-8,
+        quant_max=7,
+    )
+
+
+def make_seq_mse_module(
+    layer: Layer,
+    observer_fn: Callable[[torch.Tensor], torch.nn.Module],
+    num_candidates: int,
+    calibration_samples: Optional[int],
+) -> Tuple[SeqMseModule, torch.Tensor, torch.Tensor]:
+    """Returns a SeqMseModule for `layer`, its input and its float output."""
+    torch.manual_seed(0)
+    in_channels = layer.input_shape[1]
+    weight = torch.randn(
+        layer.out_channels,
+        in_channels // layer.groups,
+        layer.kernel_size,
+        layer.kernel_size,
+    )
+    bias = torch.randn(layer.out_channels)
+    nominal_input = torch.randn(layer.input_shape)
+    nominal_output = torch.nn.functional.conv2d(
+        nominal_input, weight, bias, padding=layer.padding, groups=layer.groups
+    )
+
+    graph = torch.fx.Graph()
+    node = graph.call_function(
+        torch.ops.aten.conv2d.default,
+        (
+            graph.placeholder("input"),
+            graph.placeholder("weight"),
+            graph.placeholder("bias"),
+            [1, 1],
+            [layer.padding, layer.padding],
+            [1, 1],
+            layer.groups,
+        ),
+    )
+    observer = observer_fn(weight)
+    observer(weight)
+    module = SeqMseModule(
+        nominal_weight=weight,
+        nominal_bias=bias,
+        operator=node,
+        observer=observer,
+        num_candidates=num_candidates,
+        calibration_samples=calibration_samples,
+    )
+    return module, nominal_input, nominal_output
+
+
+def time_search(
+    layer: Layer,
+    observer_fn: Callable[[torch.Tensor], torch.nn.Module],
+    num_candidates: int,
+    calibration_samples: Optional[int],
+    repeats: int,
+) -> Tuple[float, float]:
+    """Returns the median time of a search in seconds, and the best step."""
+    module, nominal_input, nominal_output = make_seq_mse_module(
+        layer, observer_fn, num_candidates, calibration_samples
+    )
+    times = []
+    step = 0.0
+    with torch.no_grad():
+        for _ in range(repeats):
+            start = time.perf_counter()
+            step = module._find_best_candidate(nominal_input, nominal_output)
+            times.append(time.perf_counter() - start)
+    return statistics.median(times), step
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--calibration-samples", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+    if args.threads is not None:
+        torch.set_num_threads(args.threads)
+
+    observers = {
+        "per_channel": lambda weight: per_channel_observer(),
+        "per_block": per_block_observer,
+    }
+    print(
+        f"{'layer':<18}{'observer':<13}{'all samples (ms)':>18}"
+        f"{'samples':>9}{'subsampled (ms)':>17}{'speedup':>9}{'same scale':>12}"
+    )
+    for layer in LAYERS:
+        for observer_name, observer_fn in observers.items():
+            if observer_name == "per_block" and layer.groups != 1:
+                # Blocks span input channels, which grouped convolutions split.
+                continue
+            full_s, full_step = time_search(
+                layer, observer_fn, args.candidates, None, args.repeats
+            )
+            for calibration_samples in args.calibration_samples:
+                subsampled_s, subsampled_step = time_search(
+                    layer,
+                    observer_fn,
+                    args.candidates,
+                    calibration_samples,
+                    args.repeats,
+                )
+                print(
+                    f"{layer.name:<18}{observer_name:<13}"
+                    f"{full_s * 1e3:>18.1f}{calibration_samples:>9}"
+                    f"{subsampled_s * 1e3:>17.1f}{full_s / subsampled_s:>8.2f}x"
+                    f"{str(full_step == subsampled_step):>12}"
+                )
+
+
+if __name__ == "__main__":
+    main()
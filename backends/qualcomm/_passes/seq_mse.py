@@ -30,6 +30,9 @@ class SeqMseModule(torch.nn.Module):
             parameter observer (specific for weight)
         num_candidates: int
             grids to search minimal mse loss
+        calibration_samples: int
+            only use the first samples of the calibration batch to compute
+            the loss, all of them if None
     """
 
     def __init__(
@@ -39,11 +42,13 @@ class SeqMseModule(torch.nn.Module):
         operator,
         observer,
         num_candidates,
+        calibration_samples=None,
     ):
         super().__init__()
         self.nominal_weight = nominal_weight
         self.nominal_bias = nominal_bias
         self.observer = observer
+        self.calibration_samples = calibration_samples
         self.coarse_steps = torch.linspace(
             1 / num_candidates, 1, steps=num_candidates
         ).tolist()
@@ -107,6 +112,9 @@ class SeqMseModule(torch.nn.Module):
     def _find_best_candidate(self, nominal_input, nominal_output):
         scale, zero_point = self.observer.calculate_qparams()
         zero_point = zero_point.to(torch.int32)
+        if self.calibration_samples is not None:
+            nominal_input = nominal_input[: self.calibration_samples]
+            nominal_output = nominal_output[: self.calibration_samples]
 
         def _eval_step(step):
             self.operator.weight.data = self._fake_quant(scale * step, zero_point)
@@ -147,9 +155,10 @@ class InsertSeqMse(ExportPass):
 
     seq_mse_ops = {torch.ops.aten.conv2d.default}
 
-    def __init__(self, num_candidates=50):
+    def __init__(self, num_candidates=50, calibration_samples=None):
         super(InsertSeqMse, self).__init__()
         self.num_candidates = num_candidates
+        self.calibration_samples = calibration_samples
 
     def _insert_seq_mse(
         self, graph_module: torch.fx.GraphModule
@@ -176,6 +185,7 @@ class InsertSeqMse(ExportPass):
                         operator=node,
                         observer=observer,
                         num_candidates=self.num_candidates,
+                        calibration_samples=self.calibration_samples,
                     )
                     module_name = f"seq_mse_{count}"
                     count += 1
@@ -229,8 +239,10 @@ class RemoveSeqMse(ExportPass):
 
 
 @contextmanager
-def SeqMSE(prepared_gm, num_candidates):
-    prepared_gm = InsertSeqMse(num_candidates)(prepared_gm).graph_module
+def SeqMSE(prepared_gm, num_candidates, calibration_samples=None):
+    prepared_gm = InsertSeqMse(num_candidates, calibration_samples)(
+        prepared_gm
+    ).graph_module
     try:
         yield
     finally:
@@ -12,26 +12,13 @@ import tempfile
 
 import executorch.backends.qualcomm.serialization as serialization_package
 from executorch.backends.qualcomm.serialization.qc_schema import QnnExecuTorchOptions
-from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
-from executorch.exir._serialize._flatbuffer import _flatc_compile, _flatc_decompile
+from executorch.exir._serialize._dataclass import _json_to_dataclass
+from executorch.exir._serialize._flatbuffer import _flatc_decompile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_with_schema
 
 
 def _convert_to_flatbuffer(obj, schema: str):
-    obj_json = json.dumps(obj, cls=_DataclassEncoder)
-    with tempfile.TemporaryDirectory() as d:
-        schema_path = os.path.join(d, f"{schema}.fbs")
-        with open(schema_path, "wb") as schema_file:
-            schema_file.write(
-                _resources.read_binary(serialization_package, f"{schema}.fbs")
-            )
-        json_path = os.path.join(d, f"{schema}.json")
-        with open(json_path, "wb") as json_file:
-            json_file.write(obj_json.encode("ascii"))
-
-        _flatc_compile(d, schema_path, json_path)
-        output_path = os.path.join(d, f"{schema}.bin")
-        with open(output_path, "rb") as output_file:
-            return output_file.read()
+    return _serialize_with_schema(obj, serialization_package, [f"{schema}.fbs"])
 
 
 def _convert_to_object(flatbuffers: bytes, obj_type, schema: str):
@@ -10,6 +10,13 @@ from executorch.backends.qualcomm._passes import (
     InsertReshapeForReduceOps,
     RemoveRedundancy,
 )
+from executorch.backends.qualcomm._passes.seq_mse import SeqMseModule
+from executorch.backends.qualcomm.quantizer.observers.per_block_param_observer import (
+    PerBlockParamObserver,
+)
+from executorch.backends.qualcomm.quantizer.observers.per_channel_param_observer import (
+    PerChannelParamObserver,
+)
 from executorch.backends.qualcomm.quantizer.quantizer import QnnQuantizer, QuantDtype
 from executorch.backends.qualcomm.serialization.qc_schema import QcomChipset
 from executorch.backends.qualcomm.tests.models import TopKandIndex
@@ -294,6 +301,62 @@ class TestPasses(unittest.TestCase):
             f"Following nodes did not find a match in the graph: {name_handle_map.keys()}",
         )
 
+    def test_seq_mse_calibration_samples(self):
+        """With calibration_samples, the candidate search only computes the
+        loss over the first samples of the calibration batch."""
+
+        def make_observer(per_block):
+            if per_block:
+                return PerBlockParamObserver(
+                    dtype=torch.int8,
+                    block_size=torch.Size((1, 16, 1, 1)),
+                    quant_min=-8,
+                    quant_max=7,
+                )
+            return PerChannelParamObserver(
+                dtype=torch.int8,
+                qscheme=torch.per_channel_symmetric,
+                quant_min=-128,
+                quant_max=127,
+            )
+
+        for per_block in (False, True):
+            with self.subTest(per_block=per_block):
+                torch.manual_seed(0)
+                weight = torch.randn(8, 32, 3, 3)
+                bias = torch.randn(8)
+                nominal_input = torch.randn(4, 32, 6, 6)
+                # Only the first samples are representative, so using all of
+                # them would pick another scale.
+                nominal_input[2:] *= 100
+                nominal_output = torch.nn.functional.conv2d(
+                    nominal_input, weight, bias, padding=1
+                )
+                graph = torch.fx.Graph()
+                node = graph.call_function(
+                    torch.ops.aten.conv2d.default,
+                    (
+                        graph.placeholder("input"),
+                        graph.placeholder("weight"),
+                        graph.placeholder("bias"),
+                        [1, 1],
+                        [1, 1],
+                    ),
+                )
+                observer = make_observer(per_block)
+                observer(weight)
+                module = SeqMseModule(
+                    weight, bias, node, observer, 20, calibration_samples=2
+                )
+                reference = SeqMseModule(weight, bias, node, observer, 20)
+                with torch.no_grad():
+                    self.assertEqual(
+                        module._find_best_candidate(nominal_input, nominal_output),
+                        reference._find_best_candidate(
+                            nominal_input[:2], nominal_output[:2]
+                        ),
+                    )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6510,6 +6510,39 @@ class TestQNNQuantizedUtils(TestQNN):
                 converted = convert_pt2e(prepared)
                 self.lower_module_and_test_output(converted, sample_input)
 
+    def test_qnn_backend_seq_mse_calibration_samples(self):
+        from executorch.backends.qualcomm._passes.seq_mse import SeqMSE
+
+        o_ch, i_ch, kernel, padding = 32, 64, (3, 3), 1
+        module = Conv2dSingle(  # noqa: F405
+            in_channel=i_ch,
+            out_channel=o_ch,
+            kernel_size=kernel,
+            padding=padding,
+        )
+        sample_input = (torch.randn(4, i_ch, 8, 8),)
+        # per-channel / per-block
+        quantizers = [
+            make_quantizer(
+                backend=get_backend_type(self.backend), soc_model=self.model
+            ),
+            make_quantizer(
+                backend=get_backend_type(self.backend),
+                soc_model=self.model,
+                quant_dtype=QuantDtype.use_16a4w_block,
+            ),
+        ]
+        quantizers[-1].set_block_size_map({"conv2d": (1, 32, 1, 1)})
+
+        for i, quantizer in enumerate(quantizers):
+            with self.subTest(i=i):
+                ep = torch.export.export(module, sample_input).module()
+                prepared = prepare_pt2e(ep, quantizer)
+                with SeqMSE(prepared, 100, calibration_samples=2):
+                    prepared(*sample_input)
+                converted = convert_pt2e(prepared)
+                self.lower_module_and_test_output(converted, sample_input)
+
 
 class TestExampleLLMScript(TestQNN):
 
@@ -0,0 +1,54 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+
+from executorch.backends.qualcomm.serialization.qc_schema import (
+    HtpArch,
+    HtpInfo,
+    QcomChipset,
+    QnnExecuTorchBackendOptions,
+    QnnExecuTorchBackendType,
+    QnnExecuTorchHtpBackendOptions,
+    QnnExecuTorchHtpPerformanceMode,
+    QnnExecuTorchOptions,
+    SocInfo,
+)
+from executorch.backends.qualcomm.serialization.qc_schema_serialize import (
+    flatbuffer_to_option,
+    option_to_flatbuffer,
+)
+from executorch.exir._serialize.test.utils import flatc_serialize
+
+
+class TestQcSchemaSerialize(unittest.TestCase):
+    def _make_options(self) -> QnnExecuTorchOptions:
+        return QnnExecuTorchOptions(
+            soc_info=SocInfo(QcomChipset.SM8650, HtpInfo(HtpArch.V75, 8)),
+            backend_options=QnnExecuTorchBackendOptions(
+                backend_type=QnnExecuTorchBackendType.kHtpBackend,
+                htp_options=QnnExecuTorchHtpBackendOptions(
+                    performance_mode=QnnExecuTorchHtpPerformanceMode.kHtpBurst,
+                    use_fold_relu=False,
+                ),
+            ),
+            library_path="libQnnHtp.so",
+            shared_buffer=True,
+        )
+
+    def test_option_matches_flatc(self) -> None:
+        options = self._make_options()
+        self.assertEqual(
+            option_to_flatbuffer(options),
+            flatc_serialize(
+                options,
+                "executorch.backends.qualcomm.serialization",
+                ["qc_compiler_spec.fbs"],
+            ),
+        )
+
+    def test_option_round_trip(self) -> None:
+        options = self._make_options()
+        self.assertEqual(flatbuffer_to_option(option_to_flatbuffer(options)), options)
@@ -23,26 +23,13 @@ from executorch.backends.vulkan.serialization.vulkan_graph_schema import (
     VkBytes,
     VkGraph,
 )
-from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
-from executorch.exir._serialize._flatbuffer import _flatc_compile, _flatc_decompile
+from executorch.exir._serialize._dataclass import _json_to_dataclass
+from executorch.exir._serialize._flatbuffer import _flatc_decompile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_with_schema
 
 
 def convert_to_flatbuffer(vk_graph: VkGraph) -> bytes:
-    vk_graph_json = json.dumps(vk_graph, cls=_DataclassEncoder)
-
-    with tempfile.TemporaryDirectory() as d:
-        schema_path = os.path.join(d, "schema.fbs")
-        with open(schema_path, "wb") as schema_file:
-            schema_file.write(
-                _resources.read_binary(serialization_package, "schema.fbs")
-            )
-        json_path = os.path.join(d, "schema.json")
-        with open(json_path, "wb") as json_file:
-            json_file.write(vk_graph_json.encode("ascii"))
-        _flatc_compile(d, schema_path, json_path)
-        output_path = os.path.join(d, "schema.bin")
-        with open(output_path, "rb") as output_file:
-            return output_file.read()
+    return _serialize_with_schema(vk_graph, serialization_package, ["schema.fbs"])
 
 
 def flatbuffer_to_vk_graph(flatbuffers: bytes) -> VkGraph:
@@ -0,0 +1,457 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import contextvars
+import ctypes
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+import torch
+
+from executorch.backends.xnnpack.operators.quant_params import QuantParams
+from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
+    ConstantDataOffset,
+)
+from executorch.backends.xnnpack.serialization.xnnpack_graph_serialize import (
+    CONSTANT_TENSOR_ALIGNMENT,
+)
+from executorch.backends.xnnpack.utils.utils import check_or_raise
+from executorch.exir._serialize._cord import FileRange
+from executorch.exir._serialize._named_data_store import NamedDataStore
+
+# Bump when the transformations applied to constants change, to invalidate
+# entries written by older versions.
+_CACHE_FORMAT_VERSION: int = 3
+
+_DIGEST_SIZE: int = hashlib.sha256().digest_size
+
+# Header of a cache entry: its key, the SHA-256 of its data and the size of
+# its data.
+_HEADER_FORMAT: str = f"<{_DIGEST_SIZE}s{_DIGEST_SIZE}sQ"
+_HEADER_SIZE: int = struct.calcsize(_HEADER_FORMAT)
+
+# Processed constant data: either a tensor in memory, or a range of a file in
+# the on-disk cache.
+PackedData = Union[torch.Tensor, FileRange]
+
+
+@dataclass(frozen=True)
+class WeightPackingOptions:
+    """
+    How XnnpackBackend.preprocess processes constant data, see ConstantPacker.
+
+    These options only affect how long lowering takes, never its output, so
+    they are not compile specs, which are serialized into the program.
+    """
+
+    # Number of threads that quantize, pack and hash constants while the
+    # delegated graph is being serialized.
+    max_workers: int = 1
+    # Directory of an on-disk cache of processed constants, keyed by the source
+    # constants and their transformations.
+    cache_dir: Optional[str] = None
+
+
+_weight_packing_options: contextvars.ContextVar[WeightPackingOptions] = (
+    contextvars.ContextVar(
+        "xnnpack_weight_packing_options", default=WeightPackingOptions()
+    )
+)
+
+
+@contextmanager
+def weight_packing_options(
+    max_workers: int = 1, cache_dir: Optional[str] = None
+) -> Iterator[WeightPackingOptions]:
+    """
+    Sets how XNNPACK processes constant data when lowering in this context, e.g.
+
+        with weight_packing_options(max_workers=8, cache_dir="/tmp/xnnpack"):
+            to_edge_transform_and_lower(ep, partitioner=[XnnpackPartitioner()])
+    """
+    options = WeightPackingOptions(max_workers=max_workers, cache_dir=cache_dir)
+    token = _weight_packing_options.set(options)
+    try:
+        yield options
+    finally:
+        _weight_packing_options.reset(token)
+
+
+def get_weight_packing_options() -> WeightPackingOptions:
+    """Returns the options set by the innermost `weight_packing_options()`."""
+    return _weight_packing_options.get()
+
+
+def tensor_bytes(tensor: torch.Tensor) -> ctypes.Array:
+    """
+    Returns the data of a dense `tensor` as a ctypes array, without copying it.
+
+    Only the bytes of `tensor` are covered, not the rest of its storage, which
+    may hold other views, e.g. the other chunks of a fused weight.
+    """
+    check_or_raise(
+        tensor.is_contiguous()
+        or (
+            tensor.dim() == 4
+            and tensor.is_contiguous(memory_format=torch.channels_last)
+        ),
+        "Constant data must be contiguous or channels last",
+    )
+    array_type = ctypes.c_char * (tensor.numel() * tensor.element_size())
+    if tensor.numel() == 0:
+        return array_type()
+    return ctypes.cast(tensor.data_ptr(), ctypes.POINTER(array_type)).contents
+
+
+def _tensor_view(tensor: torch.Tensor) -> memoryview:
+    """Returns the data of a dense `tensor` as a read-only view that keeps it alive."""
+    tensor = tensor.detach()
+    if not tensor.is_contiguous():
+        # Channels last, see tensor_bytes.
+        tensor = tensor.permute(0, 2, 3, 1)
+    # Reinterpret as bytes, since numpy does not support e.g. bfloat16.
+    return memoryview(tensor.reshape(-1).view(torch.uint8).numpy()).toreadonly()
+
+
+@dataclass(frozen=True)
+class ConstantTransform:
+    """
+    The transformations that NodeVisitor.get_serialized_buffer_index applies to
+    a constant before it is serialized
+    """
+
+    convert_to_nhwc: bool
+    swap_in_out_for_weights: bool
+    quant_params: Optional[QuantParams]
+    force_fp32: bool
+    groups: int
+
+    def apply(
+        self,
+        const_val: torch.Tensor,
+        convert_to_qc4w: Callable[[torch.Tensor], torch.Tensor],
+    ) -> torch.Tensor:
+        quant_params = self.quant_params
+        # Quantize buffer if static data is indeed quantized
+        if quant_params is not None and not quant_params.is_dynamic:
+            const_val = quant_params.quantize_tensor(const_val).contiguous()
+        elif const_val.dtype != torch.float16 or self.force_fp32:
+            # ensure that the const is fp32
+            const_val = const_val.to(dtype=torch.float32).contiguous()
+
+        if self.swap_in_out_for_weights:
+            # Permute and reshape the tensor from (inc, oc/groups, height, width) to (oc, inc/groups, height, width)
+            # which should be used for depthwise/transpose convolution weights for XNNPACK
+            groups = self.groups
+            shape = const_val.shape
+            const_val = const_val.reshape(
+                (groups, const_val.shape[0] // groups) + tuple(const_val.shape[1:])
+            )
+            const_val = const_val.permute((0, 2, 1) + tuple(range(3, const_val.dim())))
+            const_val = const_val.reshape(
+                (shape[1] * groups, shape[0] // groups) + tuple(shape[2:])
+            ).contiguous()
+
+        if self.convert_to_nhwc:
+            const_val = const_val.to(memory_format=torch.channels_last)
+
+        if quant_params is not None and quant_params.is_qc4w:
+            const_val = convert_to_qc4w(const_val)
+
+        return const_val
+
+    def update_hash(self, sha: "hashlib._Hash") -> None:
+        """Adds everything that determines the output of `apply` but the input data."""
+        sha.update(
+            repr(
+                (
+                    _CACHE_FORMAT_VERSION,
+                    self.convert_to_nhwc,
+                    self.swap_in_out_for_weights,
+                    self.force_fp32,
+                    self.groups,
+                )
+            ).encode()
+        )
+        quant_params = self.quant_params
+        if quant_params is None:
+            return
+        sha.update(
+            repr(
+                (
+                    quant_params.per_channel,
+                    quant_params.per_channel_group,
+                    quant_params.group_size,
+                    quant_params.axis,
+                    str(quant_params.dtype),
+                    quant_params.qmin,
+                    quant_params.qmax,
+                    quant_params.is_dynamic,
+                    quant_params.is_qc4w,
+                )
+            ).encode()
+        )
+        for qparam in (quant_params.scale, quant_params.zp):
+            if isinstance(qparam, torch.Tensor):
+                qparam = qparam.detach().cpu().contiguous()
+                sha.update(repr((str(qparam.dtype), tuple(qparam.shape))).encode())
+                sha.update(tensor_bytes(qparam))
+            else:
+                sha.update(repr(qparam).encode())
+
+
+class ConstantWeightCache:
+    """
+    Content-addressed on-disk cache of processed constants
+
+    Entries are keyed by the SHA-256 of the source tensor (its own bytes, not
+    its whole storage) and of the transformation applied to it. Each entry is
+    a file holding its key, the SHA-256 and the size of the processed data,
+    followed by the data itself, so that a hit needs no transformation. On a
+    hit, only the header is read: the key and size it records are checked
+    against the requested key and the size of the file, and the recorded
+    digest is used as the named key. Entries are written atomically, so a
+    file is either complete or absent. Hits are returned as FileRanges, which
+    are read when the program is written out.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(source: torch.Tensor, transform: ConstantTransform) -> str:
+        sha = hashlib.sha256()
+        sha.update(
+            repr(
+                (
+                    str(source.dtype),
+                    tuple(source.shape),
+                    tuple(source.stride()),
+                )
+            ).encode()
+        )
+        transform.update_hash(sha)
+        sha.update(tensor_bytes(source.contiguous()))
+        return sha.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key: str) -> Optional[Tuple[str, FileRange]]:
+        """Returns the named key and the data of the entry `key`, if cached."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_HEADER_SIZE)
+                size = os.fstat(f.fileno()).st_size - _HEADER_SIZE
+        except FileNotFoundError:
+            return None
+        if len(header) != _HEADER_SIZE or size <= 0:
+            logging.warning(f"Ignoring truncated XNNPACK weight cache entry {path}")
+            return None
+        entry_key, digest, entry_size = struct.unpack(_HEADER_FORMAT, header)
+        if entry_key != bytes.fromhex(key) or entry_size != size:
+            logging.warning(f"Ignoring corrupt XNNPACK weight cache entry {path}")
+            return None
+        return digest.hex(), FileRange(path, _HEADER_SIZE, size)
+
+    def put(self, key: str, digest: bytes, data: torch.Tensor) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file and rename it, so that concurrent exports
+        # never observe a partially written entry.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                data_bytes = tensor_bytes(data)
+                f.write(
+                    struct.pack(
+                        _HEADER_FORMAT, bytes.fromhex(key), digest, len(data_bytes)
+                    )
+                )
+                f.write(data_bytes)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+@dataclass
+class _PendingConstant:
+    name: str
+    # None for data added with add_named_data, whose offset is already known.
+    constant_data: Optional[ConstantDataOffset]
+    external_tag: Optional[str]
+    result: "Future[Tuple[str, int, PackedData]]"
+
+
+class ConstantPacker:
+    """
+    Transforms, hashes and stores the constant data of an XNNGraph
+
+    With max_workers > 1, constants are processed in a thread pool while the
+    graph is being serialized, and are added to the NamedDataStore by
+    `flush()`. The heavy parts (quantizing, permuting, packing and hashing)
+    release the GIL. By default, each constant is processed when it is
+    submitted.
+
+    Either way, the data of `submit()` and `add_named_data()` is added to the
+    NamedDataStore in the order of the calls, i.e. the order of the graph, so
+    that the program doesn't depend on the number of workers.
+
+    If cache_dir is given, processed constants are looked up in and added to
+    a ConstantWeightCache in that directory.
+    """
+
+    def __init__(
+        self,
+        named_data_store: NamedDataStore,
+        max_workers: int = 1,
+        cache_dir: Optional[str] = None,
+    ) -> None:
+        self._named_data_store = named_data_store
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="xnnpack_constants"
+            )
+            if max_workers > 1
+            else None
+        )
+        self._cache: Optional[ConstantWeightCache] = (
+            ConstantWeightCache(cache_dir) if cache_dir is not None else None
+        )
+        self._pending: List[_PendingConstant] = []
+
+    def _pack(
+        self,
+        name: str,
+        source: torch.Tensor,
+        transform: ConstantTransform,
+        convert_to_qc4w: Callable[[torch.Tensor], torch.Tensor],
+    ) -> Tuple[str, int, PackedData]:
+        """Returns the named key, size and data of the processed `source`."""
+        cache_key = None
+        if self._cache is not None:
+            cache_key = ConstantWeightCache.key(source, transform)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                named_key, data = cached
+                return named_key, data.size, data
+
+        const_val = transform.apply(source, convert_to_qc4w)
+        data = tensor_bytes(const_val)
+        size = len(data)
+        check_or_raise(
+            size > 0,
+            f"Serializing constant data node {name} but tensor value has no bytes",
+        )
+        digest = hashlib.sha256(data).digest()
+
+        if self._cache is not None and cache_key is not None:
+            self._cache.put(cache_key, digest, const_val)
+        return digest.hex(), size, const_val
+
+    def submit(
+        self,
+        name: str,
+        source: torch.Tensor,
+        transform: ConstantTransform,
+        constant_data: ConstantDataOffset,
+        convert_to_qc4w: Callable[[torch.Tensor], torch.Tensor],
+        external_tag: Optional[str] = None,
+    ) -> None:
+        """
+        Processes the constant `source` and fills in the named key and size of
+        `constant_data` for it, immediately or by the next `flush()`
+        """
+        if self._executor is None:
+            self._add(
+                name,
+                constant_data,
+                external_tag,
+                self._pack(name, source, transform, convert_to_qc4w),
+            )
+            return
+        self._pending.append(
+            _PendingConstant(
+                name,
+                constant_data,
+                external_tag,
+                self._executor.submit(
+                    self._pack, name, source, transform, convert_to_qc4w
+                ),
+            )
+        )
+
+    def add_named_data(
+        self,
+        named_key: str,
+        data: torch.Tensor,
+        external_tag: Optional[str] = None,
+    ) -> None:
+        """
+        Adds data that needs no processing to the NamedDataStore, after the
+        constants submitted before it
+        """
+        packed = (named_key, len(tensor_bytes(data)), data)
+        if self._executor is None:
+            self._add(named_key, None, external_tag, packed)
+            return
+        result: "Future[Tuple[str, int, PackedData]]" = Future()
+        result.set_result(packed)
+        self._pending.append(_PendingConstant(named_key, None, external_tag, result))
+
+    def _add(
+        self,
+        name: str,
+        constant_data: Optional[ConstantDataOffset],
+        external_tag: Optional[str],
+        packed: Tuple[str, int, PackedData],
+    ) -> None:
+        named_key, size, data = packed
+        if constant_data is not None:
+            constant_data.named_key = named_key
+            constant_data.size = size
+        if external_tag is not None:
+            logging.info(
+                f"Adding constant data with name {name}, key {named_key} and external_tag {external_tag} to named_data_store"
+            )
+        # Only the bytes of the tensor are added, not its whole storage, see
+        # tensor_bytes. The store copies them, unless it references data.
+        self._named_data_store.add_named_data(
+            named_key,
+            _tensor_view(data) if isinstance(data, torch.Tensor) else data,
+            alignment=CONSTANT_TENSOR_ALIGNMENT,
+            external_tag=external_tag,
+        )
+
+    def flush(self) -> None:
+        """Waits for all submitted constants and adds them to the NamedDataStore."""
+        pending, self._pending = self._pending, []
+        try:
+            for constant in pending:
+                self._add(
+                    constant.name,
+                    constant.constant_data,
+                    constant.external_tag,
+                    constant.result.result(),
+                )
+        finally:
+            for constant in pending:
+                constant.result.cancel()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -4,9 +4,7 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-import ctypes
 import hashlib
-import logging
 
 from typing import cast, Dict, List, Optional, Tuple
 
@@ -17,6 +15,11 @@ from executorch.backends.xnnpack._passes.channels_last_tagged_reshape_pass impor
     ChannelsLastTaggedReshapePass,
 )
 
+from executorch.backends.xnnpack.operators.constant_packer import (
+    ConstantPacker,
+    ConstantTransform,
+    tensor_bytes,
+)
 from executorch.backends.xnnpack.operators.quant_params import QuantParams
 
 from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
@@ -51,10 +54,6 @@ XNN_TYPE_MAP = {
     torch.float32: XNNDatatype.xnn_datatype_fp32,
 }
 
-from executorch.backends.xnnpack.serialization.xnnpack_graph_serialize import (
-    CONSTANT_TENSOR_ALIGNMENT,
-)
-
 
 class InputTypeToIndex:
     """
@@ -91,10 +90,12 @@ class NodeVisitor:
         exported_program: ExportedProgram,
         external_ids: Dict,
         named_data_store: NamedDataStore,
+        constant_packer: Optional[ConstantPacker] = None,
     ) -> None:
         self._external_ids = external_ids or {}
         self._exported_program = exported_program or None
         self._named_data_store = named_data_store
+        self._constant_packer = constant_packer or ConstantPacker(named_data_store)
 
     @property
     def external_ids(self) -> Dict:
@@ -285,25 +286,18 @@ class NodeVisitor:
             if quant_params.per_channel_group:
                 scale = scale.to(torch.bfloat16)
 
-            num_bytes = scale.untyped_storage().nbytes()
-            scale_array = ctypes.cast(
-                scale.untyped_storage().data_ptr(),
-                ctypes.POINTER(ctypes.c_char * num_bytes),
-            ).contents
-            scale_name = hashlib.sha256(bytes(scale_array)).hexdigest()
+            scale = scale.contiguous()
+            scale_array = tensor_bytes(scale)
+            num_bytes = len(scale_array)
+            scale_name = hashlib.sha256(scale_array).hexdigest()
             scale_name = "scale_" + scale_name
             xnn_graph.constant_data.append(
                 ConstantDataOffset(
                     offset=UINT64_MAX, size=num_bytes, named_key=scale_name
                 )
             )
-            if external_tag is not None:
-                logging.info(
-                    f"Adding constant data with name, key {scale_name} and external_tag {external_tag} to named_data_store"
-                )
-            self._named_data_store.add_named_data(
-                scale_name, bytes(scale_array), CONSTANT_TENSOR_ALIGNMENT, external_tag
-            )
+            # Added in graph order with the constants of the packer.
+            self._constant_packer.add_named_data(scale_name, scale, external_tag)
 
             if quant_params.per_channel_group:
                 return PerChannelGroupQuant(
@@ -588,62 +582,26 @@ class NodeVisitor:
         assert const_val is not None and isinstance(const_val, torch.Tensor)
         const_val = const_val.contiguous()
 
-        # Quantize buffer if static data is indeed quantized
-        if quant_params is not None and not quant_params.is_dynamic:
-            const_val = quant_params.quantize_tensor(const_val).contiguous()
-        elif const_val.dtype != torch.float16 or force_fp32:
-            # ensure that the const is fp32
-            const_val = const_val.to(dtype=torch.float32).contiguous()
-
-        if swap_in_out_for_weights:
-            # Permute and reshape the tensor from (inc, oc/groups, height, width) to (oc, inc/groups, height, width)
-            # which should be used for depthwise/transpose convolution weights for XNNPACK
-            shape = const_val.shape
-            const_val = const_val.reshape(
-                (groups, const_val.shape[0] // groups) + tuple(const_val.shape[1:])
-            )
-            const_val = const_val.permute((0, 2, 1) + tuple(range(3, const_val.dim())))
-            const_val = const_val.reshape(
-                (shape[1] * groups, shape[0] // groups) + tuple(shape[2:])
-            ).contiguous()
-
-        if convert_to_nhwc:
-            const_val = const_val.to(memory_format=torch.channels_last)
-
-        if quant_params is not None and quant_params.is_qc4w:
-            const_val = self.convert_to_qc4w(const_val)
-
-        size = const_val.untyped_storage().nbytes()
-        array_type = ctypes.c_char * size
-        array = ctypes.cast(
-            const_val.untyped_storage().data_ptr(),
-            ctypes.POINTER(array_type),
-        ).contents
-
-        check_or_raise(
-            size > 0,
-            f"Serializing constant data node {tensor} but tensor value has no bytes",
-        )
-        sha256_hash = hashlib.sha256(bytes(array))
-        named_key = sha256_hash.hexdigest()
-
-        size = const_val.untyped_storage().nbytes()
-        xnn_graph.constant_data.append(
-            ConstantDataOffset(offset=UINT64_MAX, size=size, named_key=named_key)
-        )
+        # The size and named key are filled in by the constant packer.
+        constant_data = ConstantDataOffset(offset=UINT64_MAX, size=0)
+        xnn_graph.constant_data.append(constant_data)
 
         custom_meta = tensor.meta.get("custom", None)
         external_tag = (
             custom_meta.get("delegate_constant_tag", None) if custom_meta else None
         )
-        if external_tag is not None:
-            logging.info(
-                f"Adding constant data with name {tensor.name}, key {named_key} and external_tag {external_tag} to named_data_store"
-            )
-        self._named_data_store.add_named_data(
-            named_key,
-            bytes(array),
-            alignment=CONSTANT_TENSOR_ALIGNMENT,
+        self._constant_packer.submit(
+            tensor.name,
+            const_val,
+            ConstantTransform(
+                convert_to_nhwc=convert_to_nhwc,
+                swap_in_out_for_weights=swap_in_out_for_weights,
+                quant_params=quant_params,
+                force_fp32=force_fp32,
+                groups=groups,
+            ),
+            constant_data,
+            self.convert_to_qc4w,
             external_tag=external_tag,
         )
 
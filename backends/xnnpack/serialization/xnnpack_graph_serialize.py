@@ -5,18 +5,15 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-import importlib.resources as _resources
 import json
 import logging
-import os
-import tempfile
 from dataclasses import dataclass, fields, is_dataclass
 from typing import ClassVar, Literal, Optional
 
 import executorch.backends.xnnpack.serialization as serialization_package
 from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import XNNGraph
 from executorch.exir._serialize._dataclass import _DataclassEncoder
-from executorch.exir._serialize._flatbuffer import _flatc_compile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_with_schema
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.WARNING)
@@ -303,32 +300,17 @@ _delegate_instance_id = 0
 def convert_to_flatbuffer(xnnpack_graph: XNNGraph) -> bytes:
     global _delegate_instance_id
     sanity_check_xnngraph_dataclass(xnnpack_graph)
-    xnnpack_graph_json = json.dumps(xnnpack_graph, cls=_DataclassEncoder)
 
     # Log the XNNGraph if debugging
     if logger.getEffectiveLevel() == logging.DEBUG:
+        xnnpack_graph_json = json.dumps(xnnpack_graph, cls=_DataclassEncoder)
         filename: str = f"./xnnpack_delegate_graph_{_delegate_instance_id}.json"
         logger.debug(f"Writing XNNGraph to {filename}")
         pretty_print_xnngraph(xnnpack_graph_json, filename)
 
     _delegate_instance_id += 1
 
-    with tempfile.TemporaryDirectory() as d:
-        schema_path = os.path.join(d, "schema.fbs")
-        with open(schema_path, "wb") as schema_file:
-            schema_file.write(
-                _resources.files(serialization_package)
-                .joinpath("schema.fbs")
-                .read_bytes()
-            )
-        json_path = os.path.join(d, "schema.json")
-        with open(json_path, "wb") as json_file:
-            json_file.write(xnnpack_graph_json.encode("ascii"))
-
-        _flatc_compile(d, schema_path, json_path)
-        output_path = os.path.join(d, "schema.bin")
-        with open(output_path, "rb") as output_file:
-            return output_file.read()
+    return _serialize_with_schema(xnnpack_graph, serialization_package, ["schema.fbs"])
 
 
 def serialize_xnnpack_binary(
@@ -0,0 +1,258 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import hashlib
+import os
+import tempfile
+import unittest
+from typing import List
+
+import torch
+
+from executorch.backends.xnnpack.operators.constant_packer import (
+    ConstantPacker,
+    ConstantTransform,
+    ConstantWeightCache,
+    get_weight_packing_options,
+    weight_packing_options,
+)
+from executorch.backends.xnnpack.operators.node_visitor import NodeVisitor
+from executorch.backends.xnnpack.partition.xnnpack_partitioner import XnnpackPartitioner
+from executorch.backends.xnnpack.quantizer.xnnpack_quantizer import (
+    get_symmetric_quantization_config,
+    XNNPACKQuantizer,
+)
+from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
+    ConstantDataOffset,
+)
+from executorch.backends.xnnpack.utils.xnnpack_constants import UINT64_MAX
+from executorch.exir import to_edge_transform_and_lower
+from executorch.exir._serialize._cord import FileRange
+from executorch.exir._serialize._named_data_store import NamedDataStore
+from torch.export import export
+from torchao.quantization.pt2e.quantize_pt2e import convert_pt2e, prepare_pt2e
+
+
+def _transform(convert_to_nhwc: bool = False) -> ConstantTransform:
+    return ConstantTransform(
+        convert_to_nhwc=convert_to_nhwc,
+        swap_in_out_for_weights=False,
+        quant_params=None,
+        force_fp32=False,
+        groups=1,
+    )
+
+
+class ConvLinear(torch.nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.convs = torch.nn.Sequential(
+            *(torch.nn.Conv2d(8, 8, 3, padding=1) for _ in range(4))
+        )
+        self.linear = torch.nn.Linear(8 * 6 * 6, 16)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.linear(self.convs(x).flatten(1))
+
+
+class TestConstantPacker(unittest.TestCase):
+    def setUp(self) -> None:
+        torch.manual_seed(0)
+        self.weights = [torch.randn(8, 4, 3, 3) for _ in range(6)]
+
+    def _pack(
+        self,
+        store: NamedDataStore,
+        max_workers: int = 1,
+        cache_dir=None,
+        convert_to_nhwc: bool = True,
+    ) -> List[ConstantDataOffset]:
+        packer = ConstantPacker(store, max_workers=max_workers, cache_dir=cache_dir)
+        constant_data = []
+        try:
+            for i, weight in enumerate(self.weights):
+                offset = ConstantDataOffset(offset=UINT64_MAX, size=0)
+                packer.submit(
+                    f"w{i}",
+                    weight,
+                    _transform(convert_to_nhwc),
+                    offset,
+                    NodeVisitor.convert_to_qc4w,
+                )
+                constant_data.append(offset)
+            packer.flush()
+        finally:
+            packer.shutdown()
+        return constant_data
+
+    def test_named_key_is_hash_of_packed_data(self) -> None:
+        store = NamedDataStore()
+        constant_data = self._pack(store)
+        for weight, offset in zip(self.weights, constant_data):
+            packed = weight.to(memory_format=torch.channels_last)
+            data = (
+                torch.empty(0, dtype=torch.uint8)
+                .set_(packed.untyped_storage())
+                .numpy()
+                .tobytes()
+            )
+            self.assertEqual(offset.size, len(data))
+            self.assertEqual(offset.named_key, hashlib.sha256(data).hexdigest())
+            entry = store.pte_data[offset.named_key]
+            self.assertEqual(bytes(store.buffers[entry.buffer_index]), data)
+
+    def test_threaded_matches_serial(self) -> None:
+        serial_store = NamedDataStore()
+        serial = self._pack(serial_store)
+        threaded_store = NamedDataStore()
+        threaded = self._pack(threaded_store, max_workers=4)
+
+        self.assertEqual(serial, threaded)
+        self.assertEqual(serial_store.pte_data, threaded_store.pte_data)
+        self.assertEqual(
+            [bytes(b) for b in serial_store.buffers],
+            [bytes(b) for b in threaded_store.buffers],
+        )
+
+    def test_cache_hit_skips_processing(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first_store = NamedDataStore()
+            first = self._pack(first_store, cache_dir=cache_dir)
+
+            second_store = NamedDataStore()
+            second = self._pack(second_store, max_workers=2, cache_dir=cache_dir)
+
+            self.assertEqual(first, second)
+            for buffer in second_store.buffers:
+                self.assertIsInstance(buffer, FileRange)
+            self.assertEqual(
+                [bytes(b) for b in first_store.buffers],
+                [bytes(b) for b in second_store.buffers],
+            )
+
+    def test_cache_key_depends_on_transform_and_data(self) -> None:
+        weight = self.weights[0]
+        key = ConstantWeightCache.key(weight, _transform())
+        self.assertEqual(key, ConstantWeightCache.key(weight.clone(), _transform()))
+        self.assertNotEqual(
+            key, ConstantWeightCache.key(weight, _transform(convert_to_nhwc=True))
+        )
+        self.assertNotEqual(key, ConstantWeightCache.key(weight + 1, _transform()))
+
+    def test_same_shape_views_of_one_storage(self) -> None:
+        # E.g. the query and key chunks of a fused QKV weight.
+        fused = torch.randn(16, 4, 3, 3)
+        views = list(fused.chunk(2))
+        self.assertNotEqual(
+            ConstantWeightCache.key(views[0], _transform()),
+            ConstantWeightCache.key(views[1], _transform()),
+        )
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for _ in range(2):
+                store = NamedDataStore()
+                packer = ConstantPacker(store, cache_dir=cache_dir)
+                constant_data = []
+                for i, view in enumerate(views):
+                    offset = ConstantDataOffset(offset=UINT64_MAX, size=0)
+                    packer.submit(
+                        f"w{i}",
+                        view,
+                        _transform(),
+                        offset,
+                        NodeVisitor.convert_to_qc4w,
+                    )
+                    constant_data.append(offset)
+                packer.flush()
+                packer.shutdown()
+
+                for view, offset in zip(views, constant_data):
+                    data = view.contiguous().numpy().tobytes()
+                    self.assertEqual(offset.size, len(data))
+                    self.assertEqual(offset.named_key, hashlib.sha256(data).hexdigest())
+                    entry = store.pte_data[offset.named_key]
+                    self.assertEqual(bytes(store.buffers[entry.buffer_index]), data)
+
+    def test_cache_key_does_not_depend_on_storage_offset(self) -> None:
+        weight = self.weights[0]
+        views = torch.cat([weight, weight]).chunk(2)
+        self.assertEqual(
+            ConstantWeightCache.key(views[0], _transform()),
+            ConstantWeightCache.key(views[1], _transform()),
+        )
+        self.assertEqual(
+            ConstantWeightCache.key(views[1], _transform()),
+            ConstantWeightCache.key(weight, _transform()),
+        )
+
+    def test_mismatched_cache_entry_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ConstantWeightCache(cache_dir)
+            key = ConstantWeightCache.key(self.weights[0], _transform())
+            other_key = ConstantWeightCache.key(self.weights[1], _transform())
+            data = self.weights[0]
+            digest = hashlib.sha256(data.numpy().tobytes()).digest()
+            cache.put(key, digest, data)
+            self.assertIsNotNone(cache.get(key))
+
+            # An entry written for another key, e.g. copied by hand.
+            os.makedirs(os.path.dirname(cache._path(other_key)), exist_ok=True)
+            os.replace(cache._path(key), cache._path(other_key))
+            self.assertIsNone(cache.get(other_key))
+
+            # An entry whose data does not match the size in its header.
+            cache.put(key, digest, data)
+            with open(cache._path(key), "ab") as f:
+                f.write(b"\x00")
+            self.assertIsNone(cache.get(key))
+
+    def test_truncated_cache_entry_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = ConstantWeightCache(cache_dir)
+            key = ConstantWeightCache.key(self.weights[0], _transform())
+            path = os.path.join(cache_dir, key[:2], key)
+            os.makedirs(os.path.dirname(path))
+            with open(path, "wb") as f:
+                f.write(b"\x00" * 4)
+            self.assertIsNone(cache.get(key))
+
+    def test_options_are_scoped(self) -> None:
+        self.assertEqual(get_weight_packing_options().max_workers, 1)
+        with weight_packing_options(max_workers=4, cache_dir="cache"):
+            options = get_weight_packing_options()
+            self.assertEqual((options.max_workers, options.cache_dir), (4, "cache"))
+        self.assertIsNone(get_weight_packing_options().cache_dir)
+
+    def test_program_does_not_depend_on_options(self) -> None:
+        torch.manual_seed(0)
+        inputs = (torch.randn(1, 8, 6, 6),)
+        model = export(ConvLinear().eval(), inputs).module()
+        quantizer = XNNPACKQuantizer().set_global(
+            get_symmetric_quantization_config(is_per_channel=True)
+        )
+        model = prepare_pt2e(model, quantizer)
+        model(*inputs)
+        model = convert_pt2e(model)
+
+        def lower() -> bytes:
+            return (
+                to_edge_transform_and_lower(
+                    export(model, inputs), partitioner=[XnnpackPartitioner()]
+                )
+                .to_executorch()
+                .buffer
+            )
+
+        expected = lower()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for max_workers, options_cache_dir in (
+                (4, None),
+                (1, cache_dir),
+                # Cache hits
+                (3, cache_dir),
+                (1, os.path.join(cache_dir, "other")),
+            ):
+                with weight_packing_options(max_workers, options_cache_dir):
+                    self.assertEqual(lower(), expected)
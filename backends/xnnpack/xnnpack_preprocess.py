@@ -12,6 +12,10 @@ import torch
 
 from executorch.backends.xnnpack._passes import XNNPACKPassManager
 from executorch.backends.xnnpack._passes.convert_to_linear import ConvertToLinearPass
+from executorch.backends.xnnpack.operators.constant_packer import (
+    ConstantPacker,
+    get_weight_packing_options,
+)
 from executorch.backends.xnnpack.operators.node_visitor import get_node_visitors
 
 from executorch.backends.xnnpack.serialization.xnnpack_graph_schema import (
@@ -161,30 +165,46 @@ class XnnpackBackend(BackendDetails):
         )
 
         constant_data_bytes = bytearray()
-        node_visitors = get_node_visitors(ep, node_to_external_map, named_data_store)
-
-        for node in graph_module.graph.nodes:
-            if node.op == "call_function":
-                logger.info(f"Visiting: {node}, {node.target.__name__}")
-                if node.target.__name__ in node_visitors:
-                    node_visitors[node.target.__name__].define_node(
-                        node,
-                        xnnpack_graph,
-                        vals_to_ids,
-                        node.meta.get("debug_handle", DEFAULT_DEBUG_HANDLE),
-                    )
+        # Set with weight_packing_options() rather than compile specs, since
+        # they don't change the output.
+        weight_packing_options = get_weight_packing_options()
+        constant_packer = ConstantPacker(
+            named_data_store,
+            max_workers=weight_packing_options.max_workers,
+            cache_dir=weight_packing_options.cache_dir,
+        )
+        try:
+            node_visitors = get_node_visitors(
+                ep, node_to_external_map, named_data_store, constant_packer
+            )
+
+            for node in graph_module.graph.nodes:
+                if node.op == "call_function":
+                    logger.info(f"Visiting: {node}, {node.target.__name__}")
+                    if node.target.__name__ in node_visitors:
+                        node_visitors[node.target.__name__].define_node(
+                            node,
+                            xnnpack_graph,
+                            vals_to_ids,
+                            node.meta.get("debug_handle", DEFAULT_DEBUG_HANDLE),
+                        )
+                    else:
+                        raise RuntimeError(
+                            f"For {node}, {node.op}:{node.target.__name__} is not supported in XNNPACK Delegate"
+                        )
+                elif node.op in [
+                    "get_attr",
+                    "placeholder",
+                    "output",
+                ]:
+                    continue
                 else:
-                    raise RuntimeError(
-                        f"For {node}, {node.op}:{node.target.__name__} is not supported in XNNPACK Delegate"
-                    )
-            elif node.op in [
-                "get_attr",
-                "placeholder",
-                "output",
-            ]:
-                continue
-            else:
-                raise RuntimeError(f"{node.op} is not supported in XNNPACK")
+                    raise RuntimeError(f"{node.op} is not supported in XNNPACK")
+            # Wait for the constant data, which completes xnnpack_graph.constant_data.
+            constant_packer.flush()
+        finally:
+            constant_packer.shutdown()
+
         return PreprocessResult(
             processed_bytes=serialize_xnnpack_binary(
                 xnnpack_graph, constant_data_bytes
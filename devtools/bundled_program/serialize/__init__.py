@@ -20,6 +20,7 @@ import executorch.devtools.bundled_program.serialize as serialization_package
 from executorch.devtools.bundled_program.core import BundledProgram
 from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
 from executorch.exir._serialize._flatbuffer import _flatc_compile, _flatc_decompile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_with_schema
 
 # The prefix of schema files used for bundled program
 BUNDLED_PROGRAM_SCHEMA_NAME = "bundled_program_schema"
@@ -94,8 +95,10 @@ def serialize_from_bundled_program_to_flatbuffer(
 
     bundled_program_in_schema = bundled_program.serialize_to_schema()
 
-    return convert_to_flatbuffer(
-        serialize_from_bundled_program_to_json(bundled_program_in_schema)
+    return _serialize_with_schema(
+        bundled_program_in_schema,
+        serialization_package,
+        [f"{BUNDLED_PROGRAM_SCHEMA_NAME}.fbs", f"{SCALAR_TYPE_SCHEMA_NAME}.fbs"],
     )
 
 
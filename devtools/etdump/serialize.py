@@ -11,11 +11,17 @@ import importlib.resources as _resources
 import json
 import os
 import tempfile
+from typing import Union
 
 import executorch.devtools.etdump as etdump_package
 from executorch.devtools.etdump.schema_flatcc import ETDumpFlatCC
-from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
-from executorch.exir._serialize._flatbuffer import _flatc_compile, _flatc_decompile
+from executorch.exir._serialize._dataclass import _json_to_dataclass
+from executorch.exir._serialize._flatbuffer import _flatc_decompile
+from executorch.exir._serialize._flatbuffer_builder import (
+    _load_schema,
+    _serialize_with_schema,
+)
+from executorch.exir._serialize._flatbuffer_reader import _FlatbufferTable, _root_table
 
 # The prefix of schema files used for etdump
 ETDUMP_FLATCC_SCHEMA_NAME = "etdump_schema_flatcc"
@@ -28,10 +34,6 @@ def _write_schema(d: str, schema_name: str) -> None:
         schema_file.write(_resources.read_binary(etdump_package, f"{schema_name}.fbs"))
 
 
-def _serialize_from_etdump_to_json(etdump: ETDumpFlatCC) -> str:
-    return json.dumps(etdump, cls=_DataclassEncoder, indent=4)
-
-
 """
 ETDump FlatCC Schema Implementations
 """
@@ -43,23 +45,6 @@ def _deserialize_from_json_to_etdump_flatcc(etdump_json: bytes) -> ETDumpFlatCC:
     return _json_to_dataclass(etdump_json, ETDumpFlatCC)
 
 
-def _convert_to_flatcc(etdump_json: str) -> bytes:
-    with tempfile.TemporaryDirectory() as d:
-        # load given and common schema
-        _write_schema(d, ETDUMP_FLATCC_SCHEMA_NAME)
-        _write_schema(d, SCALAR_TYPE_SCHEMA_NAME)
-
-        schema_path = os.path.join(d, "{}.fbs".format(ETDUMP_FLATCC_SCHEMA_NAME))
-        json_path = os.path.join(d, "{}.json".format(ETDUMP_FLATCC_SCHEMA_NAME))
-        with open(json_path, "wb") as json_file:
-            json_file.write(etdump_json.encode("ascii"))
-
-        _flatc_compile(d, schema_path, json_path)
-        output_path = os.path.join(d, "{}.etdp".format(ETDUMP_FLATCC_SCHEMA_NAME))
-        with open(output_path, "rb") as output_file:
-            return output_file.read()
-
-
 def _convert_from_flatcc(etdump_flatbuffer: bytes, size_prefixed: bool = True) -> bytes:
     with tempfile.TemporaryDirectory() as d:
         _write_schema(d, ETDUMP_FLATCC_SCHEMA_NAME)
@@ -80,16 +65,24 @@ def _convert_from_flatcc(etdump_flatbuffer: bytes, size_prefixed: bool = True) -
 
 def serialize_to_etdump_flatcc(
     etdump: ETDumpFlatCC,
+    size_prefixed: bool = False,
 ) -> bytes:
     """
     Given an ETdump python object this function will return a serialized object
     that can then be written to a file using the FlatCC schema.
     Args:
         etdump: ETDump python object that the user wants to serialize.
+        size_prefixed: Whether to prefix the blob with its size, like the
+            ETDumps written by the runtime.
     Returns:
         Serialized etdump binary blob using the FlatCC schema
     """
-    return _convert_to_flatcc(_serialize_from_etdump_to_json(etdump))
+    return _serialize_with_schema(
+        etdump,
+        etdump_package,
+        [f"{ETDUMP_FLATCC_SCHEMA_NAME}.fbs", f"{SCALAR_TYPE_SCHEMA_NAME}.fbs"],
+        size_prefixed=size_prefixed,
+    )
 
 
 def deserialize_from_etdump_flatcc(
@@ -106,3 +99,25 @@ def deserialize_from_etdump_flatcc(
     return _deserialize_from_json_to_etdump_flatcc(
         _convert_from_flatcc(data, size_prefixed)
     )
+
+
+def deserialize_from_etdump_flatcc_lazy(
+    data: Union[bytes, bytearray, memoryview], size_prefixed: bool = True
+) -> _FlatbufferTable:
+    """
+    Given an etdump binary blob (constructed using the FlatCC schema) this function
+    returns a lazy, read-only view of it, without running flatc. Fields are read
+    from `data` when they are accessed, with the names of the FlatCC schema, so
+    e.g. runs can be decoded one at a time from an mmap of a large ETDump.
+    Args:
+        data: Serialized etdump binary blob.
+        size_prefixed: Whether the blob is prefixed with its size.
+    Returns:
+        View of the root ETDump table, see `_FlatbufferTable`.
+    """
+    schema = _load_schema(
+        etdump_package,
+        (f"{ETDUMP_FLATCC_SCHEMA_NAME}.fbs", f"{SCALAR_TYPE_SCHEMA_NAME}.fbs"),
+    )
+    view = memoryview(data).cast("B")
+    return _root_table(view[4:] if size_prefixed else view, schema)
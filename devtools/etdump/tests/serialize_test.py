@@ -16,6 +16,7 @@ import executorch.devtools.etdump.schema_flatcc as flatcc
 
 from executorch.devtools.etdump.serialize import (
     deserialize_from_etdump_flatcc,
+    deserialize_from_etdump_flatcc_lazy,
     serialize_to_etdump_flatcc,
 )
 from executorch.exir._serialize._dataclass import _DataclassEncoder
@@ -140,3 +141,21 @@ class TestSerializeFlatCC(unittest.TestCase):
                 )
             ),
         )
+
+    def test_deserialize_lazy(self) -> None:
+        program = get_sample_etdump_flatcc()
+
+        for size_prefixed in (False, True):
+            etdump = deserialize_from_etdump_flatcc_lazy(
+                serialize_to_etdump_flatcc(program, size_prefixed=size_prefixed),
+                size_prefixed=size_prefixed,
+            )
+            self.assertEqual(etdump.version, program.version)
+            self.assertEqual(len(etdump.run_data), len(program.run_data))
+            self.assertEqual(
+                etdump.run_data[0]
+                .events[0]
+                .profile_event.to_dataclass(flatcc.ProfileEvent),
+                program.run_data[0].events[0].profile_event,
+            )
+            self.assertEqual(etdump.to_dataclass(flatcc.ETDumpFlatCC), program)
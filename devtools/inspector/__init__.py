@@ -6,6 +6,10 @@
 
 # pyre-unsafe
 
+from executorch.devtools.inspector._etdump_aggregate import (
+    compare_etdump_aggregates,
+    ETDumpAggregate,
+)
 from executorch.devtools.inspector._inspector import (
     Event,
     EventBlock,
@@ -15,10 +19,12 @@ from executorch.devtools.inspector._inspector import (
 from executorch.devtools.inspector._inspector_utils import compare_results, TimeScale
 
 __all__ = [
+    "ETDumpAggregate",
     "Event",
     "EventBlock",
     "Inspector",
     "PerfData",
+    "compare_etdump_aggregates",
     "compare_results",
     "TimeScale",
 ]
@@ -0,0 +1,375 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-unsafe
+
+"""Aggregates the profiling data of many ETDumps of the same program.
+
+ETDumps collected from many devices and runs of one build are loaded in worker
+processes, and the timings of each Event are merged across them. Two such
+aggregates, e.g. of two builds, are compared with
+`compare_etdump_aggregates()`.
+"""
+
+import glob
+import logging
+import math
+import multiprocessing
+import os
+import warnings
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from executorch.devtools.etrecord import ETRecord, parse_etrecord
+from executorch.devtools.inspector._inspector import (
+    Event,
+    EventBlock,
+    EXTRA_PERF_STATS,
+    Inspector,
+    PERF_STATS,
+    PerfData,
+)
+from executorch.devtools.inspector._inspector_utils import TimeScale
+
+# An Event across ETDumps, as (event block name, event name, instruction id,
+# delegate debug identifier).
+_EventKey = Tuple[str, str, Optional[int], Optional[Union[int, str]]]
+
+# Statistics that compare_etdump_aggregates() can compare, i.e. timings.
+_COMPARABLE_STATS: Tuple[str, ...] = tuple(
+    stat for stat in (*PERF_STATS, *EXTRA_PERF_STATS) if stat != "num_outliers"
+)
+
+# Set in each worker process by _init_worker().
+_worker_options: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class _EventTimings:
+    key: _EventKey
+    op_types: List[str]
+    debug_handles: Optional[Union[int, Sequence[int]]]
+    is_delegated_op: Optional[bool]
+    delegate_backend_name: Optional[str]
+    raw: np.ndarray
+
+
+def _load_timings(etdump_path: str, options: Dict[str, Any]) -> List[_EventTimings]:
+    """Returns the timings of the profiled Events of one ETDump."""
+    with warnings.catch_warnings():
+        # Debug data isn't aggregated.
+        warnings.filterwarnings("ignore", message="Output Buffer not found")
+        inspector = Inspector(etdump_path=etdump_path, streaming=True, **options)
+    timings = []
+    for event_block in inspector.event_blocks:
+        for event in event_block.events:
+            if event.perf_data is None:
+                continue
+            timings.append(
+                _EventTimings(
+                    key=(
+                        event_block.name,
+                        event.name,
+                        event._instruction_id,
+                        event.delegate_debug_identifier,
+                    ),
+                    op_types=event.op_types,
+                    debug_handles=event.debug_handles,
+                    is_delegated_op=event.is_delegated_op,
+                    delegate_backend_name=event.delegate_backend_name,
+                    raw=np.asarray(event.perf_data.raw),
+                )
+            )
+    return timings
+
+
+def _init_worker(options: Dict[str, Any]) -> None:
+    global _worker_options
+    _worker_options = options
+
+
+def _load_timings_in_worker(etdump_path: str) -> List[_EventTimings]:
+    assert _worker_options is not None
+    return _load_timings(etdump_path, _worker_options)
+
+
+def _map_etdumps(
+    etdump_paths: Sequence[str], options: Dict[str, Any], max_workers: int
+) -> List[List[_EventTimings]]:
+    """Loads the timings of `etdump_paths`, in up to `max_workers` processes."""
+    if max_workers > 1 and len(etdump_paths) > 1:
+        if "fork" in multiprocessing.get_all_start_methods():
+            # Forked workers inherit the options, e.g. the parsed ETRecord and
+            # time scale converters that can't be pickled.
+            with ProcessPoolExecutor(
+                max_workers=min(max_workers, len(etdump_paths)),
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(options,),
+            ) as pool:
+                return list(pool.map(_load_timings_in_worker, etdump_paths))
+        logging.warning(
+            "Loading ETDumps sequentially: worker processes require the 'fork' "
+            "start method, which is unavailable on this platform."
+        )
+    return [_load_timings(etdump_path, options) for etdump_path in etdump_paths]
+
+
+@dataclass
+class ETDumpAggregate:
+    """
+    The profiling data of many ETDumps of the same program, e.g. from many
+    devices and runs of one build.
+
+    Args:
+        event_blocks: One EventBlock per event block name of the ETDumps, with one
+            Event per profiled operator or delegate block. The perf_data of each
+            Event holds its timings from all the ETDumps, in the order of
+            `etdump_paths`. Events are identified across ETDumps by their name,
+            instruction id and delegate debug identifier.
+        etdump_paths: The aggregated ETDumps.
+    """
+
+    event_blocks: List[EventBlock]
+    etdump_paths: List[str]
+
+    @classmethod
+    def from_directory(
+        cls,
+        etdump_dir: str,
+        pattern: str = "*.etdp",
+        **kwargs: Any,
+    ) -> "ETDumpAggregate":
+        """
+        Aggregates the ETDumps in `etdump_dir` whose name matches `pattern`, see
+        `from_paths()` for the other arguments.
+        """
+        etdump_paths = sorted(glob.glob(os.path.join(etdump_dir, pattern)))
+        if not etdump_paths:
+            raise ValueError(f"No ETDump matching {pattern!r} in {etdump_dir}")
+        return cls.from_paths(etdump_paths, **kwargs)
+
+    @classmethod
+    def from_paths(
+        cls,
+        etdump_paths: Sequence[str],
+        etrecord: Optional[Union[ETRecord, str]] = None,
+        source_time_scale: TimeScale = TimeScale.NS,
+        target_time_scale: TimeScale = TimeScale.MS,
+        delegate_time_scale_converter: Optional[
+            Callable[[Union[int, str], Union[int, float]], Union[int, float]]
+        ] = None,
+        max_workers: Optional[int] = None,
+    ) -> "ETDumpAggregate":
+        """
+        Aggregates the ETDumps at `etdump_paths`.
+
+        Args:
+            etdump_paths: Paths to ETDumps of the program of `etrecord`.
+            etrecord: Optional ETRecord object or path to the ETRecord file.
+            source_time_scale, target_time_scale, delegate_time_scale_converter:
+                As for Inspector.
+            max_workers: Number of worker processes that load the ETDumps. Defaults
+                to the number of CPUs; 1 loads them in this process.
+        """
+        if isinstance(etrecord, str):
+            # Parse it once rather than in every Inspector.
+            etrecord = parse_etrecord(etrecord_path=etrecord)
+        options = {
+            "etrecord": etrecord,
+            "source_time_scale": source_time_scale,
+            "target_time_scale": target_time_scale,
+            "delegate_time_scale_converter": delegate_time_scale_converter,
+        }
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        first_timings: Dict[_EventKey, _EventTimings] = {}
+        raws: Dict[_EventKey, List[np.ndarray]] = defaultdict(list)
+        for etdump_timings in _map_etdumps(etdump_paths, options, max_workers):
+            for timings in etdump_timings:
+                first_timings.setdefault(timings.key, timings)
+                raws[timings.key].append(timings.raw)
+
+        events: Dict[str, List[Event]] = defaultdict(list)
+        for key, timings in first_timings.items():
+            block_name, name, instruction_id, delegate_debug_identifier = key
+            events[block_name].append(
+                Event(
+                    name=name,
+                    perf_data=PerfData(np.concatenate(raws[key])),
+                    op_types=timings.op_types,
+                    delegate_debug_identifier=delegate_debug_identifier,
+                    debug_handles=timings.debug_handles,
+                    is_delegated_op=timings.is_delegated_op,
+                    delegate_backend_name=timings.delegate_backend_name,
+                    _instruction_id=instruction_id,
+                )
+            )
+        event_blocks = [
+            EventBlock(
+                name=block_name,
+                events=block_events,
+                source_time_scale=source_time_scale,
+                target_time_scale=target_time_scale,
+            )
+            for block_name, block_events in events.items()
+        ]
+        return cls(event_blocks=event_blocks, etdump_paths=list(etdump_paths))
+
+    def to_dataframe(
+        self,
+        include_units: bool = True,
+        extra_stats: Sequence[str] = (),
+    ) -> pd.DataFrame:
+        """
+        Returns a pandas DataFrame of the aggregated Events, with each row
+        representing an Event, like Inspector.to_dataframe().
+        """
+        return pd.concat(
+            [
+                event_block.to_dataframe(
+                    include_units=include_units, extra_stats=extra_stats
+                )
+                for event_block in self.event_blocks
+            ],
+            ignore_index=True,
+        )
+
+    def _events_by_key(self) -> Dict[_EventKey, Event]:
+        return {
+            (
+                event_block.name,
+                event.name,
+                event._instruction_id,
+                event.delegate_debug_identifier,
+            ): event
+            for event_block in self.event_blocks
+            for event in event_block.events
+        }
+
+
+def _mann_whitney_u_p_value(x: np.ndarray, y: np.ndarray) -> float:
+    """
+    Returns the two-sided p-value of the Mann-Whitney U test that `x` and `y`
+    come from the same distribution, with the normal approximation corrected
+    for ties and continuity.
+    """
+    n1, n2 = len(x), len(y)
+    n = n1 + n2
+    values = np.concatenate([x, y])
+    order = np.argsort(values, kind="stable")
+    _, first, counts = np.unique(values[order], return_index=True, return_counts=True)
+    # Tied values get the average of their 1-based ranks.
+    ranks = np.empty(n)
+    ranks[order] = np.repeat(first + (counts + 1) / 2, counts)
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    ties = (counts**3 - counts).sum()
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = max(abs(u - n1 * n2 / 2) - 0.5, 0) / math.sqrt(variance)
+    return min(math.erfc(z / math.sqrt(2)), 1.0)
+
+
+def _relative_change(baseline: float, candidate: float) -> float:
+    if baseline == 0:
+        return 0.0 if candidate == 0 else math.inf
+    return candidate / baseline - 1
+
+
+def compare_etdump_aggregates(
+    baseline: ETDumpAggregate,
+    candidate: ETDumpAggregate,
+    threshold: float = 0.05,
+    alpha: float = 0.05,
+    stats: Sequence[str] = ("p50", "p90"),
+) -> pd.DataFrame:
+    """
+    Compares the timings of each operator and delegate block between two
+    aggregates, e.g. of two builds of the same model.
+
+    An Event is flagged as regressed (or improved) when its timings differ
+    significantly, i.e. the two-sided Mann-Whitney U test rejects that they have
+    the same distribution at level `alpha`, and one of `stats` grew (or shrank)
+    by more than `threshold`, relative to the baseline. The test is not corrected
+    for comparing many Events.
+
+    Args:
+        baseline: The aggregate to compare against.
+        candidate: The aggregate to compare.
+        threshold: Relative change of a statistic that is flagged, e.g. 0.05 for 5%.
+        alpha: Significance level of the test.
+        stats: Statistics to compare, e.g. "p50" and "p90", see PERF_STATS and
+            EXTRA_PERF_STATS.
+
+    Returns:
+        A pandas DataFrame with a row per Event of either aggregate, with the
+        event_block_name, event_name, delegate_debug_identifier, is_delegated_op
+        and delegate_backend_name of the Event; the number of timings in each
+        aggregate; for each statistic, its baseline and candidate value and their
+        relative change; the p_value of the test; and whether the Event
+        regressed or improved. Events in only one aggregate have NaN statistics
+        and are not flagged.
+    """
+    for stat in stats:
+        if stat not in _COMPARABLE_STATS:
+            raise ValueError(
+                f"Unknown statistic {stat!r}, expected one of {_COMPARABLE_STATS}"
+            )
+    baseline_events = baseline._events_by_key()
+    candidate_events = candidate._events_by_key()
+    for events in (baseline_events, candidate_events):
+        PerfData._compute_batched(
+            [event.perf_data for event in events.values() if event.perf_data], stats
+        )
+
+    rows = []
+    for key in {**baseline_events, **candidate_events}:
+        block_name, name, _, delegate_debug_identifier = key
+        base = baseline_events.get(key)
+        cand = candidate_events.get(key)
+        in_both = base is not None and cand is not None
+        event = base if base is not None else cand
+        assert event is not None
+        row: Dict[str, Any] = {
+            "event_block_name": block_name,
+            "event_name": name,
+            "delegate_debug_identifier": delegate_debug_identifier,
+            "is_delegated_op": event.is_delegated_op,
+            "delegate_backend_name": event.delegate_backend_name,
+            "baseline_runs": len(base.perf_data.raw) if base is not None else 0,
+            "candidate_runs": len(cand.perf_data.raw) if cand is not None else 0,
+        }
+        changes = []
+        for stat in stats:
+            base_value = getattr(base.perf_data, stat) if base is not None else math.nan
+            cand_value = getattr(cand.perf_data, stat) if cand is not None else math.nan
+            change = _relative_change(base_value, cand_value) if in_both else math.nan
+            row[f"baseline_{stat}"] = base_value
+            row[f"candidate_{stat}"] = cand_value
+            row[f"{stat}_change"] = change
+            changes.append(change)
+        p_value = math.nan
+        if in_both:
+            p_value = _mann_whitney_u_p_value(
+                np.asarray(base.perf_data.raw, dtype=np.float64),
+                np.asarray(cand.perf_data.raw, dtype=np.float64),
+            )
+        significant = p_value < alpha
+        row["p_value"] = p_value
+        row["regressed"] = significant and any(c > threshold for c in changes)
+        row["improved"] = (
+            significant
+            and not row["regressed"]
+            and any(c < -threshold for c in changes)
+        )
+        rows.append(row)
+    return pd.DataFrame(rows)
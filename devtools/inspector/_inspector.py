@@ -6,6 +6,7 @@
 
 # pyre-unsafe
 
+import contextlib
 import dataclasses
 import logging
 import sys
@@ -20,6 +21,7 @@ from typing import (
     IO,
     List,
     Mapping,
+    NamedTuple,
     Optional,
     Sequence,
     Tuple,
@@ -54,11 +56,14 @@ from executorch.devtools.inspector._inspector_utils import (
     find_populated_event,
     FORWARD,
     gen_etdump_object,
+    gen_etdump_view,
     gen_graphs_from_etrecord,
     get_aot_debug_handle_to_op_name_mapping,
     inflate_runtime_output,
     is_debug_output,
     is_inference_output_equal,
+    LazyProgramOutput,
+    map_debug_buffer,
     map_runtime_aot_intermediate_outputs,
     merge_runtime_overlapping_debug_handles,
     ProgramOutput,
@@ -68,7 +73,10 @@ from executorch.devtools.inspector._inspector_utils import (
     verify_debug_data_equivalence,
 )
 from executorch.devtools.inspector._intermediate_output_capturer import (
+    DiskBackedIntermediateOutputs,
     IntermediateOutputCapturer,
+    summarize_output,
+    TensorSummary,
 )
 from executorch.devtools.inspector.numerical_comparator import (
     L1Comparator,
@@ -77,6 +85,7 @@ from executorch.devtools.inspector.numerical_comparator import (
     SNRComparator,
 )
 from executorch.exir import ExportedProgram
+from executorch.exir._serialize._flatbuffer_reader import _FlatbufferTable
 
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -277,34 +286,198 @@ DelegateMetadata = TypedDict(
 )
 
 
+# Statistics of the timings of an Event, in the order of the columns of
+# EventBlock.to_dataframe().
+PERF_STATS: Tuple[str, ...] = ("p10", "p50", "p90", "avg", "min", "max")
+# Statistics that can be added to EventBlock.to_dataframe() with `extra_stats`.
+EXTRA_PERF_STATS: Tuple[str, ...] = ("p99", "stddev", "trimmed_mean", "num_outliers")
+
+_PERCENTILES: Dict[str, float] = {"p10": 10, "p50": 50, "p90": 90, "p99": 99}
+# Proportion of the timings cut from each end for the trimmed mean.
+_TRIM_PROPORTION = 0.1
+# Timings further than this many interquartile ranges beyond the quartiles
+# count as outliers (Tukey's fences).
+_OUTLIER_IQR_SCALE = 1.5
+
+
+def _compute_perf_stats(
+    timings: np.ndarray, stats: Sequence[str]
+) -> Dict[str, np.ndarray]:
+    """
+    Computes `stats` of each row of the 2D array `timings`, vectorized over the
+    rows: e.g. all the percentiles are computed with one np.percentile call.
+    """
+    result: Dict[str, np.ndarray] = {}
+    quantiles = {stat: _PERCENTILES[stat] for stat in stats if stat in _PERCENTILES}
+    if "num_outliers" in stats:
+        quantiles.update({"_q1": 25, "_q3": 75})
+    if quantiles:
+        values = np.percentile(timings, list(quantiles.values()), axis=1)
+        result.update(zip(quantiles, values))
+    for stat in stats:
+        if stat in result:
+            continue
+        if stat == "avg":
+            result[stat] = np.mean(timings, axis=1)
+        elif stat == "min":
+            result[stat] = np.min(timings, axis=1)
+        elif stat == "max":
+            result[stat] = np.max(timings, axis=1)
+        elif stat == "stddev":
+            result[stat] = np.std(timings, axis=1)
+        elif stat == "trimmed_mean":
+            n = timings.shape[1]
+            cut = int(_TRIM_PROPORTION * n)
+            result[stat] = np.mean(np.sort(timings, axis=1)[:, cut : n - cut], axis=1)
+        elif stat == "num_outliers":
+            iqr = result["_q3"] - result["_q1"]
+            low = result["_q1"] - _OUTLIER_IQR_SCALE * iqr
+            high = result["_q3"] + _OUTLIER_IQR_SCALE * iqr
+            result[stat] = np.count_nonzero(
+                (timings < low[:, None]) | (timings > high[:, None]), axis=1
+            )
+        else:
+            raise ValueError(f"Unknown statistic {stat!r}")
+    result.pop("_q1", None)
+    result.pop("_q3", None)
+    return result
+
+
 @dataclass
 class PerfData:
-    def __init__(self, raw: List[float]):
-        self.raw: List[float] = raw
+    """
+    Timings of the runs of an Event, and statistics over them. The statistics are
+    computed on first access and cached, so `raw` must not be modified in place
+    (assigning a new `raw` is fine). EventBlock.to_dataframe() computes the
+    statistics of all its Events in batches, see `_compute_batched()`.
+    """
+
+    def __init__(self, raw: Union[List[float], np.ndarray]):
+        self.raw = raw
+
+    @property
+    def raw(self) -> Union[List[float], np.ndarray]:
+        return self._raw
+
+    @raw.setter
+    def raw(self, raw: Union[List[float], np.ndarray]) -> None:
+        self._raw = raw
+        self._stats: Dict[str, Any] = {}
+
+    def _stat(self, name: str) -> Any:
+        if name not in self._stats:
+            timings = np.asarray(self._raw).reshape(1, -1)
+            self._stats[name] = _compute_perf_stats(timings, (name,))[name][0]
+        return self._stats[name]
+
+    @staticmethod
+    def _compute_batched(
+        perf_datas: Sequence["PerfData"], stats: Sequence[str]
+    ) -> None:
+        """
+        Computes and caches `stats` of all of `perf_datas`, stacking the timings
+        of those with the same number and type of timings into one array.
+        """
+        groups: Dict[Tuple[Tuple[int, ...], np.dtype], List[int]] = defaultdict(list)
+        timings = []
+        for i, perf_data in enumerate(perf_datas):
+            raw = np.asarray(perf_data.raw)
+            timings.append(raw)
+            if raw.ndim == 1 and raw.size > 0:
+                groups[(raw.shape, raw.dtype)].append(i)
+        for indices in groups.values():
+            missing = [
+                stat
+                for stat in stats
+                if any(stat not in perf_datas[i]._stats for i in indices)
+            ]
+            if not missing:
+                continue
+            values = _compute_perf_stats(
+                np.stack([timings[i] for i in indices]), missing
+            )
+            for stat, column in values.items():
+                for i, value in zip(indices, column):
+                    perf_datas[i]._stats[stat] = value
 
     @property
     def p10(self) -> float:
-        return np.percentile(self.raw, 10)
+        return self._stat("p10")
 
     @property
     def p50(self) -> float:
-        return np.percentile(self.raw, 50)
+        return self._stat("p50")
 
     @property
     def p90(self) -> float:
-        return np.percentile(self.raw, 90)
+        return self._stat("p90")
+
+    @property
+    def p99(self) -> float:
+        return self._stat("p99")
 
     @property
     def avg(self) -> float:
-        return np.mean(self.raw)
+        return self._stat("avg")
 
     @property
     def min(self) -> float:
-        return min(self.raw)
+        return self._stat("min")
 
     @property
     def max(self) -> float:
-        return max(self.raw)
+        return self._stat("max")
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation of the timings."""
+        return self._stat("stddev")
+
+    @property
+    def trimmed_mean(self) -> float:
+        """Mean of the timings without the lowest and highest 10%."""
+        return self._stat("trimmed_mean")
+
+    @property
+    def num_outliers(self) -> int:
+        """Number of timings more than 1.5 IQR below p25 or above p75."""
+        return int(self._stat("num_outliers"))
+
+
+def _row_types(row: Dict[str, Any]) -> Tuple[type, ...]:
+    # Values wrapped in a list are a cell of their own; the type of the wrapped
+    # value determines the dtype of the column.
+    return tuple(
+        (list, type(value[0])) if isinstance(value, list) else type(value)
+        for value in row.values()
+    )
+
+
+def _rows_to_dataframe(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Returns pd.concat([pd.DataFrame(row) for row in rows], ignore_index=True) for
+    rows of Event.asdict(), without building a DataFrame per row. Rows whose
+    values have the same types are built into one DataFrame, and these are then
+    concatenated, so that the column dtypes follow the rules of pd.concat.
+    """
+    groups: Dict[Tuple[type, ...], List[int]] = defaultdict(list)
+    for i, row in enumerate(rows):
+        groups[_row_types(row)].append(i)
+    frames = []
+    order: List[int] = []
+    for indices in groups.values():
+        columns = {}
+        for column, value in rows[indices[0]].items():
+            if isinstance(value, list):
+                columns[column] = [rows[i][column][0] for i in indices]
+            else:
+                columns[column] = [rows[i][column] for i in indices]
+        frames.append(pd.DataFrame(columns))
+        order.extend(indices)
+    df = pd.concat(frames, ignore_index=True)
+    if len(frames) > 1:
+        df = df.iloc[np.argsort(order, kind="stable")].reset_index(drop=True)
+    return df
 
 
 @dataclass
@@ -314,7 +487,7 @@ class Event:
 
     Args:
         name: Name of the profiling `Event`, empty if no profiling event.
-        perf_data: Performance data associated with the event retrived from the runtime (available attributes: p10, p50, p90, avg, min and max).
+        perf_data: Performance data associated with the event retrived from the runtime (available attributes: p10, p50, p90, p99, avg, min, max, stddev, trimmed_mean and num_outliers).
         op_type: List of op types corresponding to the event.
         delegate_debug_identifier: Supplemental identifier used in combination with instruction id.
         debug_handles: Debug handles in the model graph to which this event is correlated.
@@ -329,7 +502,8 @@ class Event:
             Available parsed (if parser provided) as Event.delegate_debug_metadatas
             Available as Event.raw_delegate_debug_metadatas
 
-        debug_data: A list containing intermediate data collected.
+        debug_data: A list containing intermediate data collected. Events generated from an ETDump hold a
+            LazyProgramOutput, which inflates each value from the debug buffer when it is first accessed.
 
         _instruction_id: Instruction Identifier for Symbolication
         _delegate_metadata_parser: Optional Parser for _delegate_debug_metadatas
@@ -347,14 +521,16 @@ class Event:
     delegate_backend_name: Optional[str] = None
     _delegate_debug_metadatas: List[str] = dataclasses.field(default_factory=list)
 
-    debug_data: ProgramOutput = dataclasses.field(default_factory=list)
+    debug_data: Union[ProgramOutput, LazyProgramOutput] = dataclasses.field(
+        default_factory=list
+    )
     _instruction_id: Optional[int] = None
 
     _delegate_metadata_parser: Optional[Callable[[List[str]], Dict[str, Any]]] = None
     _delegate_time_scale_converter: Optional[
         Callable[[Union[int, str], Union[int, float]], Union[int, float]]
     ] = None
-    _start_time: Optional[List[Union[int, float]]] = None
+    _start_time: Optional[Union[List[Union[int, float]], np.ndarray]] = None
 
     @cached_property
     def delegate_debug_metadatas(self) -> Union[List[str], Dict[str, Any]]:
@@ -374,32 +550,32 @@ class Event:
         return self._delegate_debug_metadatas
 
     @property
-    def start_time(self) -> Optional[List[Union[int, float]]]:
+    def start_time(self) -> Optional[Union[List[Union[int, float]], np.ndarray]]:
         """
         Returns the start time of the event.
         """
         return self._start_time
 
-    def to_dataframe(self, _units="") -> pd.DataFrame:
+    def to_dataframe(self, _units="", extra_stats: Sequence[str] = ()) -> pd.DataFrame:
         """
         Convert the Event into a pandas DataFrame
 
         Args:
-            None
+            extra_stats: Statistics from EXTRA_PERF_STATS to add after "max"
 
         Returns:
             A pandas DataFrame with the Event data
         """
-        event_dict = self.asdict(_units=_units)
+        event_dict = self.asdict(_units=_units, extra_stats=extra_stats)
         return pd.DataFrame(event_dict)
 
     # Override the default implementation of dataclass.asdict to handle null perf data
-    def asdict(self, _units="") -> dict:
+    def asdict(self, _units="", extra_stats: Sequence[str] = ()) -> dict:
         """
         Convert the Event into a dict
 
         Args:
-            None
+            extra_stats: Statistics from EXTRA_PERF_STATS to add after "max"
 
         Returns:
             A dict with the Event data
@@ -408,15 +584,16 @@ class Event:
         def truncated_list(long_list: List[str]) -> str:
             return f"['{long_list[0]}', '{long_list[1]}' ... '{long_list[-1]}'] ({len(long_list)} total)"
 
+        stats = {}
+        for stat in (*PERF_STATS, *extra_stats):
+            # Counts have no unit.
+            column = stat if stat == "num_outliers" else stat + _units
+            stats[column] = getattr(self.perf_data, stat) if self.perf_data else None
+
         return {
             "event_name": self.name,
             "raw": [self.perf_data.raw if self.perf_data else None],
-            "p10" + _units: self.perf_data.p10 if self.perf_data else None,
-            "p50" + _units: self.perf_data.p50 if self.perf_data else None,
-            "p90" + _units: self.perf_data.p90 if self.perf_data else None,
-            "avg" + _units: self.perf_data.avg if self.perf_data else None,
-            "min" + _units: self.perf_data.min if self.perf_data else None,
-            "max" + _units: self.perf_data.max if self.perf_data else None,
+            **stats,
             "op_types": [
                 (
                     self.op_types
@@ -499,6 +676,121 @@ class Event:
             elapsed_time = end_time - start_time
         return elapsed_time
 
+    @staticmethod
+    def _calculate_elapsed_times(
+        start_times: np.ndarray, end_times: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized `_calculate_elapsed_time()` over arrays of start and end times
+        """
+        max_uint32 = 2**32 - 1
+        wrapped = start_times > end_times
+        if not wrapped.any():
+            return end_times - start_times
+        invalid = np.flatnonzero(
+            wrapped & ((start_times > max_uint32) | (end_times > max_uint32))
+        )
+        if len(invalid) > 0:
+            start_time = start_times[invalid[0]]
+            end_time = end_times[invalid[0]]
+            raise ValueError(
+                f"Expected start_time ({start_time}) and end_time ({end_time}) to be less than {max_uint32} for cases where there is wrap-around of time values."
+            )
+        return np.where(
+            wrapped, (max_uint32 - start_times) + end_times, end_times - start_times
+        )
+
+    @staticmethod
+    def _convert_time_scales(
+        convert_time_scale: Callable[
+            [Union[int, str], Union[int, float]], Union[int, float]
+        ],
+        name: Union[int, str],
+        times: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Applies a delegate time scale converter to an array of times, calling it
+        once per time if it doesn't support arrays
+        """
+        try:
+            converted = convert_time_scale(name, times)
+        except Exception:
+            # Converters are only required to support scalars
+            converted = None
+        if not isinstance(converted, np.ndarray) or converted.shape != times.shape:
+            converted = np.array(
+                [convert_time_scale(name, time) for time in times.tolist()]
+            )
+        return converted
+
+    @staticmethod
+    def _gen_from_columns(
+        signature: EventSignature,
+        start_times: Optional[np.ndarray],
+        end_times: Optional[np.ndarray],
+        delegate_debug_metadatas: Optional[List[Union[bytes, str]]],
+        debug_values: Optional[List[flatcc.Value]],
+        scale_factor: float = 1.0,
+        output_buffer: Optional[bytes] = None,
+        delegate_metadata_parser: Optional[
+            Callable[[List[str]], Dict[str, Any]]
+        ] = None,
+        delegate_time_scale_converter: Optional[
+            Callable[[Union[int, str], Union[int, float]], Union[int, float]]
+        ] = None,
+    ) -> "Event":
+        """
+        Like `_gen_from_inference_events()`, for the instances of an event stored
+        in a `_RunGroupColumns`: the start and end times of its profile events
+        (one per run), their delegate debug metadata if any is populated, and the
+        debug entries of its first instance.
+
+        perf_data.raw and start_time are NumPy arrays.
+        """
+        ret_event: Event = Event(
+            name="",
+            _instruction_id=signature.instruction_id,
+            _delegate_metadata_parser=delegate_metadata_parser,
+            _delegate_time_scale_converter=delegate_time_scale_converter,
+        )
+
+        Event._populate_event_signature_fields(
+            ret_event, signature.profile_event_signature
+        )
+        if start_times is not None and end_times is not None and len(start_times) > 0:
+            if (
+                ret_event.is_delegated_op
+                and (convert_time_scale := ret_event._delegate_time_scale_converter)
+                is not None
+            ):
+                data = Event._calculate_elapsed_times(
+                    Event._convert_time_scales(
+                        convert_time_scale, ret_event.name, start_times
+                    ),
+                    Event._convert_time_scales(
+                        convert_time_scale, ret_event.name, end_times
+                    ),
+                )
+            else:
+                data = Event._calculate_elapsed_times(start_times, end_times).astype(
+                    np.float64
+                )
+                # Scale factor should only be applied to non-delegated ops
+                if not ret_event.is_delegated_op:
+                    data /= scale_factor
+            ret_event.perf_data = PerfData(data)
+            ret_event._start_time = start_times
+        if delegate_debug_metadatas is not None:
+            ret_event._delegate_debug_metadatas = delegate_debug_metadatas
+
+        Event._populate_event_signature_fields(
+            ret_event, signature.debug_event_signature
+        )
+        if debug_values is not None:
+            ret_event.debug_data = LazyProgramOutput(debug_values, output_buffer)
+
+        return ret_event
+
     @staticmethod
     def _populate_event_signature_fields(
         ret_event: "Event",
@@ -658,10 +950,7 @@ class Event:
                     intermediate data present in this ETDump and indicates potential issues
                     with the model/runtime."""
 
-        ret_event.debug_data = [
-            inflate_runtime_output(debug_value, output_buffer)
-            for debug_value in debug_data
-        ]
+        ret_event.debug_data = LazyProgramOutput(debug_data, output_buffer)
 
     def _associate_with_op_graph_nodes(
         self,
@@ -700,6 +989,96 @@ class Event:
                         self.op_types += [node.op]
 
 
+def _signature_fields(
+    name: Optional[str],
+    instruction_id: int,
+    delegate_id: int,
+    delegate_id_str: Optional[str],
+) -> Tuple[str, Optional[int], Optional[int], Optional[str]]:
+    """
+    Returns the fields of the ProfileEventSignature or DebugEventSignature of
+    an event, see `ProfileEventSignature._gen_from_event()`
+    """
+    return (
+        name or "",
+        instruction_id if instruction_id != -1 else None,
+        delegate_id if delegate_id != -1 else None,
+        delegate_id_str if delegate_id_str != "" else None,
+    )
+
+
+class _DecodedProfileEvent(NamedTuple):
+    """The fields of a ProfileEvent that the Inspector uses"""
+
+    signature_fields: Tuple[str, Optional[int], Optional[int], Optional[str]]
+    start_time: int
+    end_time: int
+    delegate_debug_metadata: Optional[memoryview]
+
+
+class _RunGroupColumns:
+    """
+    Columnar store of the runs of an ETDump that share a RunSignature.
+
+    The start and end times of the profile events are stored in arrays with a
+    row per profiled EventSignature and a column per run, so the timings of an
+    event are contiguous. Delegate debug metadata is only stored for the events
+    that have any. Debug entries are kept for the first run only, since the
+    other runs are verified to match it.
+    """
+
+    def __init__(
+        self, signatures: Sequence[EventSignature], profiled: Sequence[bool]
+    ) -> None:
+        self.signatures: Sequence[EventSignature] = signatures
+        # Row of each signature in the timing arrays, None if it isn't profiled
+        self.rows: List[Optional[int]] = []
+        num_rows = 0
+        for is_profiled in profiled:
+            self.rows.append(num_rows if is_profiled else None)
+            num_rows += int(is_profiled)
+        self.num_runs = 0
+        self._start_times: np.ndarray = np.empty((num_rows, 1), dtype=np.uint64)
+        self._end_times: np.ndarray = np.empty((num_rows, 1), dtype=np.uint64)
+        self.delegate_debug_metadatas: Dict[int, List[Union[bytes, str]]] = {}
+        self.debug_values: Dict[int, List[flatcc.Value]] = {}
+        self.run_output: ProgramOutput = []
+
+    @property
+    def start_times(self) -> np.ndarray:
+        return self._start_times[:, : self.num_runs]
+
+    @property
+    def end_times(self) -> np.ndarray:
+        return self._end_times[:, : self.num_runs]
+
+    def append_run(
+        self,
+        start_times: List[int],
+        end_times: List[int],
+        delegate_debug_metadatas: List[Union[bytes, str]],
+    ) -> None:
+        """
+        Appends the times and metadata of the profile events of a run, in the
+        order of the rows
+        """
+        if self.num_runs == self._start_times.shape[1]:
+            # Grow geometrically, so appending runs is amortized constant time
+            capacity = 2 * self.num_runs
+            for name in ("_start_times", "_end_times"):
+                grown = np.empty((len(start_times), capacity), dtype=np.uint64)
+                grown[:, : self.num_runs] = getattr(self, name)
+                setattr(self, name, grown)
+        self._start_times[:, self.num_runs] = start_times
+        self._end_times[:, self.num_runs] = end_times
+        for row, metadata in enumerate(delegate_debug_metadatas):
+            if (metadatas := self.delegate_debug_metadatas.get(row)) is not None:
+                metadatas.append(metadata)
+            elif metadata:
+                self.delegate_debug_metadatas[row] = [""] * self.num_runs + [metadata]
+        self.num_runs += 1
+
+
 @dataclass
 class EventBlock:
     r"""
@@ -724,7 +1103,10 @@ class EventBlock:
     reference_output: Optional[ProgramOutput] = None
 
     def to_dataframe(
-        self, include_units: bool = False, include_delegate_debug_data: bool = False
+        self,
+        include_units: bool = False,
+        include_delegate_debug_data: bool = False,
+        extra_stats: Sequence[str] = (),
     ) -> pd.DataFrame:
         """
         Converts the EventBlock into a DataFrame with each row being an event instance
@@ -735,14 +1117,25 @@ class EventBlock:
         Args:
             include_units: Whether headers should include units (default false)
             include_delegate_debug_data: Whether to show the delegate debug data
+            extra_stats: Statistics from EXTRA_PERF_STATS to add as columns after "max"
+                (default none)
 
         Returns:
             A pandas DataFrame containing the data of each Event instance in this EventBlock.
         """
+        for stat in extra_stats:
+            if stat not in EXTRA_PERF_STATS:
+                raise ValueError(
+                    f"Unknown statistic {stat!r}, expected one of {EXTRA_PERF_STATS}"
+                )
 
         units = " (" + self.target_time_scale.value + ")" if include_units else ""
 
-        df = pd.concat([e.to_dataframe(units) for e in self.events], ignore_index=True)
+        PerfData._compute_batched(
+            [e.perf_data for e in self.events if e.perf_data is not None],
+            (*PERF_STATS, *extra_stats),
+        )
+        df = _rows_to_dataframe([e.asdict(units, extra_stats) for e in self.events])
         df.insert(
             0,
             "event_block_name",
@@ -901,6 +1294,270 @@ class EventBlock:
 
         return event_blocks
 
+    @staticmethod
+    def _gen_from_etdump_streaming(
+        etdump: _FlatbufferTable,
+        source_time_scale: TimeScale = TimeScale.NS,
+        target_time_scale: TimeScale = TimeScale.MS,
+        output_buffer: Optional[bytes] = None,
+        delegate_metadata_parser: Optional[
+            Callable[[List[str]], Dict[str, Any]]
+        ] = None,
+        delegate_time_scale_converter: Optional[
+            Callable[[Union[int, str], Union[int, float]], Union[int, float]]
+        ] = None,
+    ) -> List["EventBlock"]:
+        """
+        Like `_gen_from_etdump()`, for a lazy view of an ETDump (see
+        `gen_etdump_view()`), decoding one run at a time.
+
+        The runs are grouped by RunSignature in the same way, but the profile
+        events of each group are appended to a `_RunGroupColumns` instead of
+        being kept as objects, and the Events are generated from those columns.
+        """
+
+        # EventSignatures are interned, and runs are grouped on their indices
+        signature_ids: Dict[Tuple[Any, ...], int] = {}
+        signatures: List[EventSignature] = []
+        run_groups: Dict[Tuple[Any, ...], _RunGroupColumns] = {}
+
+        for run in etdump.run_data or []:
+            if (run_events := run.events) is None:
+                continue
+
+            events, run_outputs = EventBlock._decode_run_events(
+                run_events, signature_ids, signatures
+            )
+
+            run_key = (run.name, run.bundled_input_index, tuple(events.keys()))
+            if (run_group := run_groups.get(run_key)) is None:
+                run_group = _RunGroupColumns(
+                    [signatures[index] for index in events.keys()],
+                    [profile_event is not None for profile_event, _ in events.values()],
+                )
+                run_groups[run_key] = run_group
+
+            # Append the profile events, and populate (or verify) the debug entries
+            start_times = []
+            end_times = []
+            delegate_debug_metadatas = []
+            for column, (profile_event, debug_events) in enumerate(events.values()):
+                if profile_event is not None:
+                    start_times.append(profile_event.start_time)
+                    end_times.append(profile_event.end_time)
+                    metadata = profile_event.delegate_debug_metadata
+                    delegate_debug_metadatas.append(bytes(metadata) if metadata else "")
+                if debug_events is None:
+                    continue
+                if (debug_values := run_group.debug_values.get(column)) is None:
+                    run_group.debug_values[column] = [
+                        debug_event.debug_entry.to_dataclass(flatcc.Value)
+                        for debug_event in debug_events
+                    ]
+                    continue
+                for debug_event, value in zip(debug_events, debug_values):
+                    v1 = inflate_runtime_output(
+                        debug_event.debug_entry.to_dataclass(flatcc.Value),
+                        output_buffer,
+                    )
+                    v2 = inflate_runtime_output(value, output_buffer)
+                    assert is_inference_output_equal(
+                        v1, v2
+                    ), """Corresponding debug events in multiple iterations of the model
+                    must have the same debug entry values. This is not the case for the
+                    intermediate data present in this ETDump and indicates potential issues
+                    with the model/runtime."""
+            run_group.append_run(start_times, end_times, delegate_debug_metadatas)
+
+            # Populate (or Verify if already populated) Run Outputs
+            run_outputs = [
+                inflate_runtime_output(
+                    debug_entry.to_dataclass(flatcc.Value), output_buffer
+                )
+                for debug_entry in run_outputs
+            ]
+            if len(existing_run_outputs := run_group.run_output) == 0:
+                existing_run_outputs.extend(run_outputs)
+            else:
+                verify_debug_data_equivalence(existing_run_outputs, run_outputs)
+
+        # Construct the EventBlocks
+        event_blocks = []
+        scale_factor = calculate_time_scale_factor(source_time_scale, target_time_scale)
+        for (name, bundled_input_index, _), run_group in run_groups.items():
+            start_times = run_group.start_times
+            end_times = run_group.end_times
+            events: List[Event] = []
+            for column, signature in enumerate(run_group.signatures):
+                row = run_group.rows[column]
+                events.append(
+                    Event._gen_from_columns(
+                        signature,
+                        start_times[row] if row is not None else None,
+                        end_times[row] if row is not None else None,
+                        run_group.delegate_debug_metadatas.get(row),
+                        run_group.debug_values.get(column),
+                        scale_factor,
+                        output_buffer,
+                        delegate_metadata_parser,
+                        delegate_time_scale_converter,
+                    )
+                )
+            event_blocks.append(
+                EventBlock(
+                    name=name,
+                    events=events,
+                    source_time_scale=source_time_scale,
+                    target_time_scale=target_time_scale,
+                    bundled_input_index=bundled_input_index,
+                    run_output=run_group.run_output,
+                )
+            )
+
+        return event_blocks
+
+    @staticmethod
+    def _decode_run_events(
+        run_events: Sequence[_FlatbufferTable],
+        signature_ids: Dict[Tuple[Any, ...], int],
+        signatures: List[EventSignature],
+    ) -> Tuple[
+        Dict[int, Tuple[Optional[_DecodedProfileEvent], Optional[List[Any]]]],
+        List[_FlatbufferTable],
+    ]:
+        """
+        Given the lazily decoded events of a run, collate them like
+        `InstructionEvent.gen_from_events()` and
+        `EventSignature.gen_from_instruction_event()`.
+
+        Returns a map from the index of each EventSignature of the run (in
+        `signatures`, interned through `signature_ids`) to its profile event (or
+        None) and debug events (or None), and the debug entries of the run
+        outputs.
+        """
+        instruction_events, run_outputs = EventBlock._collate_run_events(run_events)
+
+        events: Dict[
+            int, Tuple[Optional[_DecodedProfileEvent], Optional[List[Any]]]
+        ] = {}
+        for (instruction_id, *_), (
+            profile_events,
+            debug_events,
+        ) in instruction_events.items():
+            if profile_events is None and debug_events is None:
+                # Currently corresponds to run output
+                continue
+            debug_fields = (
+                _signature_fields(
+                    debug_events[0].name,
+                    debug_events[0].instruction_id,
+                    debug_events[0].delegate_debug_id_int,
+                    debug_events[0].delegate_debug_id_str,
+                )
+                if debug_events is not None
+                else None
+            )
+            for profile_event in profile_events or [None]:
+                profile_fields = (
+                    profile_event.signature_fields
+                    if profile_event is not None
+                    else None
+                )
+                key = (instruction_id, profile_fields, debug_fields)
+                if (index := signature_ids.get(key)) is None:
+                    index = len(signatures)
+                    signature_ids[key] = index
+                    signatures.append(
+                        EventSignature(
+                            instruction_id=instruction_id,
+                            profile_event_signature=(
+                                ProfileEventSignature(*profile_fields)
+                                if profile_fields is not None
+                                else None
+                            ),
+                            debug_event_signature=(
+                                DebugEventSignature(*debug_fields)
+                                if debug_fields is not None
+                                else None
+                            ),
+                        )
+                    )
+                events[index] = (profile_event, debug_events)
+        return events, run_outputs
+
+    @staticmethod
+    def _collate_run_events(
+        run_events: Sequence[_FlatbufferTable],
+    ) -> Tuple[Dict[Tuple[Any, ...], List[Any]], List[_FlatbufferTable]]:
+        """
+        Given the lazily decoded events of a run, collate the profile events
+        (decoded, each field is read once) and debug events by instruction like
+        `InstructionEvent.gen_from_events()`, and collect the debug entries of
+        the run outputs.
+        """
+        instruction_events: Dict[Tuple[Any, ...], List[Any]] = {}
+        run_outputs = []
+        for event in run_events:
+            # See find_populated_event() and _collect_run_outputs()
+            profile_event = event.profile_event
+            debug_event = event.debug_event
+            is_run_output = False
+            if debug_event is not None:
+                if (debug_entry := debug_event.debug_entry) is None:
+                    raise RuntimeError(
+                        "Debug entry inside debug event should not be empty!"
+                    )
+                if (output := debug_entry.output) is not None and output.bool_val:
+                    run_outputs.append(debug_entry)
+                    is_run_output = True
+
+            if profile_event is not None:
+                instruction_id = profile_event.instruction_id
+                delegate_id = profile_event.delegate_debug_id_int
+                delegate_id_str = profile_event.delegate_debug_id_str
+                instruction_event = instruction_events.setdefault(
+                    (
+                        instruction_id,
+                        profile_event.chain_index,
+                        delegate_id,
+                        delegate_id_str,
+                    ),
+                    [None, None],
+                )
+                if instruction_event[0] is None:
+                    instruction_event[0] = []
+                instruction_event[0].append(
+                    _DecodedProfileEvent(
+                        _signature_fields(
+                            profile_event.name,
+                            instruction_id,
+                            delegate_id,
+                            delegate_id_str,
+                        ),
+                        profile_event.start_time,
+                        profile_event.end_time,
+                        profile_event.delegate_debug_metadata,
+                    )
+                )
+                continue
+
+            if debug_event is None:
+                raise ValueError("Unable to find populated event")
+            instruction_event = instruction_events.setdefault(
+                (
+                    debug_event.instruction_id,
+                    debug_event.chain_index,
+                    debug_event.delegate_debug_id_int,
+                    debug_event.delegate_debug_id_str,
+                ),
+                [None, None],
+            )
+            if not is_run_output:
+                if instruction_event[1] is None:
+                    instruction_event[1] = []
+                instruction_event[1].append(debug_event)
+        return instruction_events, run_outputs
+
     @staticmethod
     def _collect_run_outputs(
         events: List[flatcc.Event], output_buffer: Optional[bytes] = None
@@ -1025,6 +1682,7 @@ class Inspector:
             Callable[[Union[int, str], Union[int, float]], Union[int, float]]
         ] = None,
         enable_module_hierarchy: bool = False,
+        streaming: bool = False,
     ) -> None:
         r"""
         Initialize an `Inspector` instance with the underlying `EventBlock`\ s populated with data from the provided ETDump path or binary,
@@ -1037,9 +1695,13 @@ class Inspector:
             source_time_scale: The time scale of the performance data retrieved from the runtime. The default time hook implentation in the runtime returns NS.
             target_time_scale: The target time scale to which the users want their performance data converted to. Defaults to MS.
             debug_buffer_path: Debug buffer file path that contains the debug data referenced by ETDump for intermediate and program outputs.
+                The file is memory mapped, and the tensors of the debug data are views of it.
             delegate_metadata_parser: Optional function to parse delegate metadata from an Profiling Event. Expected signature of the function is (delegate_metadata_list: List[bytes]) -> Union[List[str], Dict[str, Any]].
             delegate_time_scale_converter: Optional function to convert the time scale of delegate profiling data. If not given, use the conversion ratio of target_time_scale/source_time_scale.
             enable_module_hierarchy: Enable submodules in the operator graph. Defaults to False.
+            streaming: Decode the ETDump one run at a time into a columnar store of the profiling data, instead of
+                into objects for every event of every run, which bounds memory for ETDumps of many runs.
+                perf_data.raw and start_time of the Events are then NumPy arrays. Defaults to False.
 
         Returns:
             None
@@ -1077,10 +1739,14 @@ class Inspector:
             )
 
         # Create EventBlocks from ETDump
-        etdump = gen_etdump_object(etdump_path=etdump_path, etdump_data=etdump_data)
+        if streaming:
+            etdump = gen_etdump_view(etdump_path=etdump_path, etdump_data=etdump_data)
+            gen_event_blocks = EventBlock._gen_from_etdump_streaming
+        else:
+            etdump = gen_etdump_object(etdump_path=etdump_path, etdump_data=etdump_data)
+            gen_event_blocks = EventBlock._gen_from_etdump
         if debug_buffer_path is not None:
-            with open(debug_buffer_path, "rb") as f:
-                output_buffer = f.read()
+            output_buffer = map_debug_buffer(debug_buffer_path)
         else:
             output_buffer = None
             warnings.warn(
@@ -1088,7 +1754,7 @@ class Inspector:
                 stacklevel=1,
             )
 
-        self.event_blocks = EventBlock._gen_from_etdump(
+        self.event_blocks = gen_event_blocks(
             etdump=etdump,
             source_time_scale=self._source_time_scale,
             target_time_scale=self._target_time_scale,
@@ -1259,20 +1925,25 @@ class Inspector:
     def _get_aot_intermediate_outputs_and_op_names(
         self,
         reference_graph_module: torch.fx.GraphModule,
-    ) -> Tuple[Dict[DebugHandle, Any], Dict[DebugHandle, List[str]]]:
+        storage_dir: Optional[str] = None,
+        summarize: Optional[TensorSummary] = None,
+    ) -> Tuple[Mapping[DebugHandle, Any], Dict[DebugHandle, List[str]]]:
         """
         Capture intermediate outputs and operator name mappings from the given graph module.
 
         Args:
             reference_graph_module: The resolved reference graph module to use.
+            storage_dir, summarize: See IntermediateOutputCapturer.
 
         Returns:
-            Tuple of (intermediate_outputs, debug_handle_to_op_names) dictionaries.
+            Tuple of (intermediate_outputs, debug_handle_to_op_names) mappings.
         """
         aot_debug_handle_to_op_name = get_aot_debug_handle_to_op_name_mapping(
             reference_graph_module
         )
-        capturer = IntermediateOutputCapturer(reference_graph_module)
+        capturer = IntermediateOutputCapturer(
+            reference_graph_module, storage_dir=storage_dir, summarize=summarize
+        )
         aot_intermediate_outputs = capturer.run_and_capture(
             self._etrecord._representative_inputs
         )
@@ -1377,11 +2048,14 @@ class Inspector:
         self,
         include_units: bool = True,
         include_delegate_debug_data: bool = False,
+        extra_stats: Sequence[str] = (),
     ) -> pd.DataFrame:
         """
         Args:
             include_units: Whether headers should include units (default true)
             include_delegate_debug_data: Whether to include delegate debug metadata (default false)
+            extra_stats: Statistics from EXTRA_PERF_STATS (p99, stddev, trimmed_mean and
+                num_outliers) to add as columns (default none)
 
         Returns:
             Returns a pandas DataFrame of the Events in each EventBlock in the inspector, with each row representing an Event.
@@ -1391,6 +2065,7 @@ class Inspector:
             event_block.to_dataframe(
                 include_units=include_units,
                 include_delegate_debug_data=include_delegate_debug_data,
+                extra_stats=extra_stats,
             )
             for event_block in self.event_blocks
         ]
@@ -1530,11 +2205,48 @@ class Inspector:
             else self._etrecord.graph_map.get(graph)
         )
 
+    def _get_comparator(
+        self,
+        distance: Union[str, NumericalComparatorBase],
+        chunk_size: Optional[int],
+        max_workers: Optional[int],
+    ) -> NumericalComparatorBase:
+        """Returns the comparator for calculate_numeric_gap()."""
+        if isinstance(distance, NumericalComparatorBase):
+            comparator = distance
+            # Inject inspector if not already set
+            if comparator.inspector is None:
+                comparator.inspector = self
+            if chunk_size is not None:
+                comparator.chunk_size = chunk_size
+            if max_workers is not None:
+                comparator.max_workers = max_workers
+        else:
+            metric = distance.strip().upper()
+            if metric == "MSE":
+                comparator_cls = MSEComparator
+            elif metric == "L1":
+                comparator_cls = L1Comparator
+            elif metric == "SNR":
+                comparator_cls = SNRComparator
+            else:
+                raise ValueError(f"Unsupported distance metric {distance!r}")
+            comparator = comparator_cls(
+                inspector=self,
+                chunk_size=chunk_size,
+                max_workers=max_workers if max_workers is not None else 1,
+            )
+        return comparator
+
     def calculate_numeric_gap(
         self,
         distance: Union[str, NumericalComparatorBase],
         disable_debug_handle_valdiation: bool = False,
         reference_graph: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        intermediate_output_dir: Optional[str] = None,
+        intermediate_output_summary: Optional[TensorSummary] = None,
     ):
         """
         Compares logged intermediate outputs from the exported graph (in ETRecord)
@@ -1568,6 +2280,18 @@ class Inspector:
                 If None (default), automatically selects the best available graph:
                 - Uses "exported_program" if available and debug handle backpropagation succeeds.
                 - Falls back to "edge_dialect_exported_program" otherwise.
+            chunk_size: If set, compare intermediate outputs in chunks of this many elements, which bounds the
+                memory used for large tensors. Supported by the built-in comparators, and by custom ones that
+                implement chunk_sums() and reduce_sums(). Overrides the setting of a comparator instance.
+            max_workers: Number of threads that compare the intermediate outputs of different operators
+                concurrently. Defaults to 1, or to the setting of a comparator instance.
+            intermediate_output_dir: If set, the intermediate outputs of the reference graph are written to a
+                temporary file in this directory as they are captured, and read back through a memory map, so that
+                models whose intermediate outputs don't fit in memory can be compared. The file is closed once they
+                are compared, and deleted once the returned DataFrame is garbage collected.
+            intermediate_output_summary: Optional function that reduces each intermediate tensor, e.g.
+                stats_summary or sample_summary(n) from _intermediate_output_capturer. It is applied to both the
+                AOT and the runtime outputs, and the summaries are compared instead of the full tensors.
 
         Returns:
             pd.DataFrame: A DataFrame listing corresponding operator intermediate outputs from both stages and their computed numerical gaps.
@@ -1580,8 +2304,15 @@ class Inspector:
         )
 
         # Get intermediate outputs and op names from the resolved graph
+        capture_kwargs: Dict[str, Any] = {}
+        if intermediate_output_dir is not None:
+            capture_kwargs["storage_dir"] = intermediate_output_dir
+        if intermediate_output_summary is not None:
+            capture_kwargs["summarize"] = intermediate_output_summary
         aot_intermediate_outputs, aot_debug_handle_to_op_names = (
-            self._get_aot_intermediate_outputs_and_op_names(reference_graph_module)
+            self._get_aot_intermediate_outputs_and_op_names(
+                reference_graph_module, **capture_kwargs
+            )
         )
         if len(aot_intermediate_outputs) == 0 or len(aot_debug_handle_to_op_names) == 0:
             raise ValueError(
@@ -1598,52 +2329,47 @@ class Inspector:
         runtime_intermediate_outputs, runtime_debug_handle_to_op_names = (
             self._get_runtime_intermediate_outputs_and_op_names()
         )
-        mapping = map_runtime_aot_intermediate_outputs(
-            aot_intermediate_outputs, runtime_intermediate_outputs
-        )
+        if intermediate_output_summary is not None:
+            runtime_intermediate_outputs = {
+                debug_handle: (
+                    summarize_output(output, intermediate_output_summary),
+                    num_outputs,
+                )
+                for debug_handle, (
+                    output,
+                    num_outputs,
+                ) in runtime_intermediate_outputs.items()
+            }
+        # Closes the file of disk-backed outputs once they are compared. It is
+        # deleted once no tensor in the DataFrame maps it anymore.
+        with (
+            aot_intermediate_outputs
+            if isinstance(aot_intermediate_outputs, DiskBackedIntermediateOutputs)
+            else contextlib.nullcontext()
+        ):
+            mapping = map_runtime_aot_intermediate_outputs(
+                aot_intermediate_outputs, runtime_intermediate_outputs
+            )
 
-        # Get or create comparator
-        if isinstance(distance, NumericalComparatorBase):
-            comparator = distance
-            # Inject inspector if not already set
-            if comparator.inspector is None:
-                comparator.inspector = self
-        else:
-            metric = distance.strip().upper()
-            if metric == "MSE":
-                comparator = MSEComparator(inspector=self)
-            elif metric == "L1":
-                comparator = L1Comparator(inspector=self)
-            elif metric == "SNR":
-                comparator = SNRComparator(inspector=self)
-            else:
-                raise ValueError(f"Unsupported distance metric {distance!r}")
+            comparator = self._get_comparator(distance, chunk_size, max_workers)
 
-        # Delegate to comparator's compare method (includes preprocessing)
-        df = comparator.compare(
-            mapping,
-            aot_debug_handle_to_op_names,
-            runtime_debug_handle_to_op_names,
-        )
+            # Delegate to comparator's compare method (includes preprocessing)
+            df = comparator.compare(
+                mapping,
+                aot_debug_handle_to_op_names,
+                runtime_debug_handle_to_op_names,
+            )
+
+        # Add stacktraces column by looking up each row's aot_ops, in an index of
+        # the stack traces of all debug handles. The first debug handle with an
+        # op provides its stack trace.
+        op_name_to_stack_trace: Dict[str, Optional[str]] = {}
+        for stack_traces_dict in aot_debug_handle_to_stack_traces.values():
+            for op_name, stack_trace in stack_traces_dict.items():
+                op_name_to_stack_trace.setdefault(op_name, stack_trace)
 
-        # Add stacktraces column by looking up each row's debug handle
-        # We need to map from aot_ops back to debug handles to get stack traces
         def get_stacktraces_for_row(aot_ops: List[str]) -> Dict[str, Optional[str]]:
-            """Find stack traces for the given aot_ops by looking up in all debug handles."""
-            result: Dict[str, Optional[str]] = {}
-            for op_name in aot_ops:
-                # Search through debug handle mappings to find the stack trace for this op
-                for (
-                    _,
-                    stack_traces_dict,
-                ) in aot_debug_handle_to_stack_traces.items():
-                    if op_name in stack_traces_dict:
-                        result[op_name] = stack_traces_dict[op_name]
-                        break
-                else:
-                    # Op not found in any debug handle's stack traces
-                    result[op_name] = None
-            return result
+            return {op_name: op_name_to_stack_trace.get(op_name) for op_name in aot_ops}
 
         if len(df) > 0:
             df["stacktraces"] = df["aot_ops"].apply(get_stacktraces_for_row)
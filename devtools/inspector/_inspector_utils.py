@@ -7,7 +7,10 @@
 # pyre-unsafe
 
 import math
+import mmap
+import os
 import sys
+from collections import defaultdict
 from collections.abc import Sequence
 from dataclasses import dataclass
 from enum import Enum
@@ -32,9 +35,13 @@ from executorch.devtools.etdump.schema_flatcc import (
     ValueType,
 )
 
-from executorch.devtools.etdump.serialize import deserialize_from_etdump_flatcc
+from executorch.devtools.etdump.serialize import (
+    deserialize_from_etdump_flatcc,
+    deserialize_from_etdump_flatcc_lazy,
+)
 from executorch.devtools.etrecord import ETRecord
 
+from executorch.exir._serialize._flatbuffer_reader import _FlatbufferTable
 from executorch.exir.debug_handle_utils import (
     DEBUG_HANDLE_KEY,
     FROM_NODE_KEY,
@@ -206,9 +213,19 @@ def _parse_tensor_value(
     if tensor.offset is None:
         raise ValueError("Tensor offset cannot be None")
 
+    if tensor.offset % dtype_size != 0:
+        # Misaligned data can't be viewed in place
+        return torch.frombuffer(
+            bytearray(output_buffer[tensor.offset : tensor.offset + tensor_bytes_size]),
+            dtype=torch_dtype,
+        ).view(tensor.sizes)
+
+    # View the data in place rather than slicing (and copying) the buffer
     return torch.frombuffer(
-        output_buffer[tensor.offset : tensor.offset + tensor_bytes_size],
+        output_buffer,
         dtype=torch_dtype,
+        count=math.prod(tensor.sizes),
+        offset=tensor.offset,
     ).view(tensor.sizes)
 
 
@@ -245,6 +262,58 @@ def inflate_runtime_output(
         ]
 
 
+class LazyProgramOutput(Sequence):
+    """
+    A ProgramOutput whose values are inflated from ETDump Value objects (see
+    `inflate_runtime_output()`) when they are first accessed, so no tensor is
+    made for intermediate outputs that are never looked at.
+    """
+
+    def __init__(self, values: List[Value], output_buffer: Optional[bytes]) -> None:
+        self._values = values
+        self._output_buffer = output_buffer
+        self._outputs: Dict[int, InferenceOutput] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._values)))]
+        if index < 0:
+            index += len(self._values)
+        if not 0 <= index < len(self._values):
+            raise IndexError("LazyProgramOutput index out of range")
+        if index not in self._outputs:
+            self._outputs[index] = inflate_runtime_output(
+                self._values[index], self._output_buffer
+            )
+        return self._outputs[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def map_debug_buffer(debug_buffer_path: str) -> Union[bytes, mmap.mmap]:
+    """
+    Memory maps the debug buffer at `debug_buffer_path`, so the tensors inflated
+    from it are views of the file that are paged in on access.
+
+    The mapping is copy-on-write: the tensors are writable, without modifying
+    the file.
+    """
+    with open(debug_buffer_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be memory mapped
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+
 def find_populated_event(event: flatcc.Event) -> Union[ProfileEvent, DebugEvent]:
     """
     Given a ETDump Event object, find the populated event
@@ -372,6 +441,26 @@ def gen_etdump_object(
     return deserialize_from_etdump_flatcc(etdump_data)
 
 
+def gen_etdump_view(
+    etdump_path: Optional[str] = None, etdump_data: Optional[bytes] = None
+) -> _FlatbufferTable:
+    """
+    Like `gen_etdump_object()`, but returns a lazy view of the ETDump that is
+    decoded when it is accessed. A file at `etdump_path` is memory mapped
+    rather than read.
+    """
+    if etdump_data is None and etdump_path is not None:
+        with open(etdump_path, "rb") as buff:
+            etdump_data = mmap.mmap(buff.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if etdump_data is None:
+        raise ValueError(
+            "Unable to get ETDump data. One and only one of etdump_path and etdump_data must be specified."
+        )
+
+    return deserialize_from_etdump_flatcc_lazy(etdump_data)
+
+
 def display_or_print_df(df: pd.DataFrame, file: IO[str] = sys.stdout):
     try:
         from IPython import get_ipython
@@ -1068,6 +1157,40 @@ def find_op_names(
     return result
 
 
+class OpNameIndex:
+    """
+    Finds the operator names of debug handles like find_op_names(), for a fixed
+    `debug_handle_to_op_names`. Only the debug handles that share an id with the
+    target are checked, rather than all of them.
+    """
+
+    def __init__(self, debug_handle_to_op_names: Dict[DebugHandle, List[str]]):
+        self._entries: List[Tuple[DebugHandle, List[str]]] = list(
+            debug_handle_to_op_names.items()
+        )
+        self._entries_by_id: Dict[int, List[int]] = defaultdict(list)
+        # Empty debug handles are a subset of any target.
+        self._empty_entries: List[int] = []
+        for i, (debug_handle, _) in enumerate(self._entries):
+            if not debug_handle:
+                self._empty_entries.append(i)
+            for debug_id in set(debug_handle):
+                self._entries_by_id[debug_id].append(i)
+
+    def find_op_names(self, target_debug_handle: DebugHandle) -> List[str]:
+        dh_set = set(target_debug_handle)
+        candidates = set(self._empty_entries)
+        for debug_id in dh_set:
+            candidates.update(self._entries_by_id.get(debug_id, ()))
+        result = []
+        # In the order of debug_handle_to_op_names, like find_op_names().
+        for i in sorted(candidates):
+            debug_handle, op_names = self._entries[i]
+            if dh_set.issuperset(debug_handle):
+                result.extend(op_names)
+        return result
+
+
 def get_ancestor_node_identifiers(node: Node) -> List[str]:
     """Get the identifier of the ancestor node of the given node, with the graph id the ancestor node lives in.
 
@@ -7,13 +7,178 @@
 # pyre-unsafe
 
 
-from typing import Any, Dict
+import mmap
+import tempfile
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 import torch
 from executorch.devtools.inspector._inspector_utils import DebugHandle, NodeFilter
 from torch.fx import GraphModule
 from torch.fx.interpreter import Interpreter
 
+# Reduces a captured tensor to a smaller one, see stats_summary() and
+# sample_summary().
+TensorSummary = Callable[[torch.Tensor], torch.Tensor]
+
+# Tensors are stored at offsets aligned to this many bytes, for any dtype.
+_ALIGNMENT = 64
+
+
+def stats_summary(tensor: torch.Tensor) -> torch.Tensor:
+    """Summarizes `tensor` as its float64 mean, std, min, max and mean absolute value."""
+    values = tensor.detach().reshape(-1).double()
+    if values.numel() == 0:
+        return values
+    return torch.stack(
+        [
+            values.mean(),
+            values.std(correction=0),
+            values.min(),
+            values.max(),
+            values.abs().mean(),
+        ]
+    )
+
+
+def sample_summary(num_samples: int) -> TensorSummary:
+    """
+    Returns a summary that keeps `num_samples` elements of a tensor, evenly spaced
+    over its flattened elements. Tensors of the same shape are sampled at the same
+    positions, so samples of AOT and runtime outputs can be compared.
+    """
+
+    def summarize(tensor: torch.Tensor) -> torch.Tensor:
+        values = tensor.detach().reshape(-1)
+        if values.numel() <= num_samples:
+            return values.clone()
+        indices = torch.linspace(0, values.numel() - 1, num_samples).long()
+        return values[indices]
+
+    return summarize
+
+
+def _map_tensors(output: Any, fn: Callable[[torch.Tensor], Any]) -> Any:
+    """
+    Applies `fn` to each tensor of an intermediate output. The outputs of
+    multi-output ops, possibly nested, become lists with one entry per output.
+    Any sequence is mapped, e.g. the LazyProgramOutput of a runtime output.
+    """
+    if isinstance(output, torch.Tensor):
+        return fn(output)
+    if isinstance(output, Sequence) and not isinstance(output, (str, bytes)):
+        return [_map_tensors(o, fn) for o in output]
+    return output
+
+
+def summarize_output(output: Any, summarize: TensorSummary) -> Any:
+    """
+    Applies `summarize` to the tensors of an intermediate output. Each output
+    of a multi-output op is summarized on its own, so the summaries have the
+    same structure as the outputs captured in memory.
+    """
+    return _map_tensors(output, summarize)
+
+
+@dataclass(frozen=True)
+class _StoredTensor:
+    offset: int
+    dtype: torch.dtype
+    shape: Tuple[int, ...]
+
+
+class DiskBackedIntermediateOutputs(Mapping[DebugHandle, Any]):
+    """
+    Intermediate outputs keyed by debug handle, whose tensors are written to an
+    anonymous temporary file as they are added. Tensors are read back as views of
+    a copy-on-write memory map of the file, so only the pages that are accessed
+    are brought into memory, and they can be dropped again under memory pressure.
+
+    Tensors that can't be stored as raw bytes, e.g. quantized or sparse ones, are
+    kept in memory.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        Args:
+            directory: Directory of the temporary file, e.g. on a disk with enough
+                space for all the intermediate outputs. Defaults to the system's
+                temporary directory.
+        """
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._size = 0
+        self._entries: Dict[DebugHandle, Any] = {}
+        self._buffer: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+
+    def _write_tensor(self, tensor: torch.Tensor) -> Any:
+        if tensor.is_quantized or tensor.layout != torch.strided:
+            return tensor.detach().clone()
+        data = tensor.detach().cpu().contiguous().reshape(-1)
+        if data.numel() == 0:
+            return _StoredTensor(0, tensor.dtype, tuple(tensor.shape))
+        offset = -self._size % _ALIGNMENT + self._size
+        self._file.seek(offset)
+        self._file.write(memoryview(data.view(torch.uint8).numpy()))
+        self._size = offset + data.numel() * data.element_size()
+        return _StoredTensor(offset, tensor.dtype, tuple(tensor.shape))
+
+    def add(self, debug_handle: DebugHandle, output: Any) -> None:
+        """
+        Stores `output`, a tensor, a possibly nested list or tuple of tensors, or
+        another value.
+        """
+        self._entries[debug_handle] = _map_tensors(output, self._write_tensor)
+
+    def _read_tensor(self, stored: _StoredTensor) -> torch.Tensor:
+        numel = 1
+        for size in stored.shape:
+            numel *= size
+        if numel == 0:
+            return torch.empty(stored.shape, dtype=stored.dtype)
+        if self._buffer is None or self._mapped_size < self._size:
+            self._file.flush()
+            # Tensors already read keep the previous mapping alive.
+            self._buffer = mmap.mmap(
+                self._file.fileno(), self._size, access=mmap.ACCESS_COPY
+            )
+            self._mapped_size = self._size
+        return torch.frombuffer(
+            self._buffer, dtype=stored.dtype, count=numel, offset=stored.offset
+        ).view(stored.shape)
+
+    def _read_entry(self, entry: Any) -> Any:
+        if isinstance(entry, _StoredTensor):
+            return self._read_tensor(entry)
+        if isinstance(entry, list):
+            return [self._read_entry(e) for e in entry]
+        return entry
+
+    def __getitem__(self, debug_handle: DebugHandle) -> Any:
+        return self._read_entry(self._entries[debug_handle])
+
+    def __iter__(self) -> Iterator[DebugHandle]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the file holding the tensors."""
+        return self._size
+
+    def close(self) -> None:
+        """Closes the file, which is deleted once no tensor maps it anymore."""
+        self._file.close()
+
+    def __enter__(self) -> "DiskBackedIntermediateOutputs":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
 
 class IntermediateOutputCapturer(Interpreter):
     """
@@ -21,17 +186,46 @@ class IntermediateOutputCapturer(Interpreter):
     Attributes:
         module (GraphModule): The graph module to capture outputs from.
         node_filters (List[NodeFilter]): A list of filters to apply to the nodes.
+        storage_dir (Optional[str]): If set, captured tensors are written to a
+            file in this directory instead of being kept in memory, see
+            DiskBackedIntermediateOutputs.
+        summarize (Optional[TensorSummary]): If set, each captured tensor is
+            replaced with its summary, e.g. stats_summary or sample_summary(n).
     """
 
-    def __init__(self, module: GraphModule):
+    def __init__(
+        self,
+        module: GraphModule,
+        storage_dir: Optional[str] = None,
+        summarize: Optional[TensorSummary] = None,
+    ):
         super().__init__(module)
         self.node_filters = [
             NodeFilter("debug_handle", "call_function", exclude_ops=["getitem"])
         ]
+        self.storage_dir = storage_dir
+        self.summarize = summarize
+
+    def _copy_output(self, result: Any) -> Any:
+        if self.summarize is not None:
+            return summarize_output(result, self.summarize)
+        # Tensors stored on disk are copied when they are written.
+        if self.storage_dir is not None:
+            return result
+        # Handle tensor results by detaching and cloning
+        return _map_tensors(result, lambda r: r.detach().clone())
 
     # Runs the graph module and captures the intermediate outputs.
-    def run_and_capture(self, *args, **kwargs) -> Dict[DebugHandle, Any]:
-        captured_outputs = {}
+    def run_and_capture(self, *args, **kwargs) -> Mapping[DebugHandle, Any]:
+        """
+        Returns the captured outputs by debug handle: a dict, or a
+        DiskBackedIntermediateOutputs if `storage_dir` is set.
+        """
+        captured_outputs: Any = (
+            {}
+            if self.storage_dir is None
+            else DiskBackedIntermediateOutputs(self.storage_dir)
+        )
 
         def capture_run_node(n: torch.fx.Node) -> Any:
             result = super(IntermediateOutputCapturer, self).run_node(n)
@@ -43,16 +237,11 @@ class IntermediateOutputCapturer(Interpreter):
                     if isinstance(debug_handle, int)
                     else tuple(debug_handle)
                 )
-                # Handle tensor results by detaching and cloning
-                if isinstance(result, torch.Tensor):
-                    captured_outputs[key] = result.detach().clone()
-                elif isinstance(result, (tuple, list)):
-                    captured_outputs[key] = [
-                        r.detach().clone() if isinstance(r, torch.Tensor) else r
-                        for r in result
-                    ]
+                output = self._copy_output(result)
+                if isinstance(captured_outputs, DiskBackedIntermediateOutputs):
+                    captured_outputs.add(key, output)
                 else:
-                    captured_outputs[key] = result
+                    captured_outputs[key] = output
             return result
 
         original_run_node = self.run_node
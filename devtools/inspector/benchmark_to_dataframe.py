@@ -0,0 +1,165 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmarks Inspector.to_dataframe() on synthetic ETDumps.
+
+Each ETDump has `--runs` runs of one method that profile the same `--events`
+operators, with random timings. The script times loading the ETDump into an
+Inspector, and `Inspector.to_dataframe()`, which computes the statistics of
+all the events of a block in batches. Up to `--reference-max-events` it also
+times the previous conversion, which builds and concatenates a DataFrame per
+event and computes its statistics separately, and checks that both return the
+same DataFrame.
+
+    python -m executorch.devtools.inspector.benchmark_to_dataframe --events 1000 10000
+"""
+
+import argparse
+import functools
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Callable, List, Sequence, Tuple
+
+import executorch.devtools.etdump.schema_flatcc as flatcc
+import pandas as pd
+from executorch.devtools.etdump.serialize import serialize_to_etdump_flatcc
+from executorch.devtools.inspector import Inspector
+
+
+def _synthetic_etdump(num_runs: int, num_events: int, seed: int) -> bytes:
+    rng = random.Random(seed)
+    durations = [rng.randrange(100, 10000) for _ in range(num_events)]
+    run_data = []
+    for _ in range(num_runs):
+        events = []
+        time_ns = 0
+        for instruction_id, duration in enumerate(durations):
+            end_time = time_ns + duration + rng.randrange(duration // 10 + 1)
+            events.append(
+                flatcc.Event(
+                    profile_event=flatcc.ProfileEvent(
+                        name=f"op_{instruction_id % 50}",
+                        chain_index=0,
+                        instruction_id=instruction_id,
+                        delegate_debug_id_int=-1,
+                        delegate_debug_id_str="",
+                        delegate_debug_metadata=None,
+                        start_time=time_ns,
+                        end_time=end_time,
+                    ),
+                    allocation_event=None,
+                    debug_event=None,
+                )
+            )
+            time_ns = end_time
+        run_data.append(
+            flatcc.RunData(
+                name="forward",
+                bundled_input_index=-1,
+                allocators=[],
+                events=events,
+            )
+        )
+    return serialize_to_etdump_flatcc(
+        flatcc.ETDumpFlatCC(version=0, run_data=run_data), size_prefixed=True
+    )
+
+
+def _reference_dataframe(
+    inspector: Inspector, extra_stats: Sequence[str]
+) -> pd.DataFrame:
+    """Converts `inspector` like to_dataframe() did before batching."""
+    frames = []
+    for event_block in inspector.event_blocks:
+        events = event_block.events
+        units = " (" + event_block.target_time_scale.value + ")"
+        for event in events:
+            if event.perf_data is not None:
+                # Drop the statistics cached by previous conversions.
+                event.perf_data.raw = event.perf_data.raw
+        df = pd.concat(
+            [event.to_dataframe(units, extra_stats) for event in events],
+            ignore_index=True,
+        )
+        df.insert(0, "event_block_name", event_block.name, allow_duplicates=True)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _time(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    # Like timeit, exclude garbage collections, which are dominated by the size
+    # of the heap rather than by the conversion.
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return time.perf_counter() - start, result
+    finally:
+        gc.enable()
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--events",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000],
+        help="Number of profiled operators per run.",
+    )
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--extra-stats",
+        nargs="*",
+        default=["p99", "stddev", "trimmed_mean", "num_outliers"],
+        help="Statistics to add to the DataFrame, see EXTRA_PERF_STATS.",
+    )
+    parser.add_argument(
+        "--reference-max-events",
+        type=int,
+        default=10000,
+        help="Largest ETDump to also run the previous conversion on.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    extra_stats: List[str] = args.extra_stats
+
+    print(
+        f"{'events':>8} {'runs':>5} {'load s':>8} {'to_dataframe s':>15} "
+        f"{'reference s':>12} {'same df':>8}"
+    )
+    for num_events in args.events:
+        etdump = _synthetic_etdump(args.runs, num_events, args.seed)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            etdump_path = os.path.join(tmpdir, "etdump.etdp")
+            with open(etdump_path, "wb") as f:
+                f.write(etdump)
+            load_s, inspector = _time(
+                functools.partial(Inspector, etdump_path=etdump_path, streaming=True)
+            )
+            to_dataframe_s, df = _time(
+                functools.partial(inspector.to_dataframe, extra_stats=extra_stats)
+            )
+            reference_s = same_df = "-"
+            if num_events <= args.reference_max_events:
+                seconds, reference = _time(
+                    functools.partial(_reference_dataframe, inspector, extra_stats)
+                )
+                reference_s = f"{seconds:.3f}"
+                same_df = str(df.equals(reference))
+        print(
+            f"{num_events:>8} {args.runs:>5} {load_s:>8.3f} {to_dataframe_s:>15.3f} "
+            f"{reference_s:>12} {same_df:>8}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -4,7 +4,7 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, List, Optional, TYPE_CHECKING
 
 import torch
 from executorch.devtools.inspector._inspector_utils import convert_to_float_tensor
@@ -19,8 +19,13 @@ if TYPE_CHECKING:
 class L1Comparator(NumericalComparatorBase):
     """L1 (sum of absolute differences) comparator for numerical discrepancy detection."""
 
-    def __init__(self, inspector: Optional["Inspector"] = None) -> None:
-        super().__init__(inspector)
+    def __init__(
+        self,
+        inspector: Optional["Inspector"] = None,
+        chunk_size: Optional[int] = None,
+        max_workers: int = 1,
+    ) -> None:
+        super().__init__(inspector, chunk_size, max_workers)
 
     def element_compare(self, a: Any, b: Any) -> float:
         """Sum up all these element-wise absolute differences between two tensors."""
@@ -33,3 +38,9 @@ class L1Comparator(NumericalComparatorBase):
         except Exception as e:
             raise ValueError(f"Error computing L1 difference between tensors: {str(e)}")
         return res
+
+    def chunk_sums(self, a: torch.Tensor, b: torch.Tensor) -> List[torch.Tensor]:
+        return [torch.abs(a - b).sum()]
+
+    def reduce_sums(self, sums: List[float], numel: int) -> float:
+        return sums[0]
@@ -6,11 +6,16 @@
 
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 import pandas as pd
+import torch
 
-from executorch.devtools.inspector._inspector_utils import DebugHandle
+from executorch.devtools.inspector._inspector_utils import (
+    convert_to_float_tensor,
+    DebugHandle,
+)
 
 if TYPE_CHECKING:
     from executorch.devtools.inspector._inspector import Inspector
@@ -33,20 +38,42 @@ class NumericalComparatorBase(ABC):
     orchestrates the full comparison pipeline: preprocess -> element-wise compare
     -> aggregate results into a DataFrame.
 
+    Comparators whose metric is computed from sums over the elements, like the
+    built-in ones, can implement `chunk_sums` and `reduce_sums` to compare large
+    tensors in chunks of `chunk_size` elements, which bounds the memory of the
+    float64 temporaries. Chunks are only used when both are defined by the
+    class that defines `element_compare`, so that a subclass overriding only
+    `element_compare` is always compared with it.
+
     Attributes:
         _inspector: Optional reference to the Inspector instance, which provides
             access to the reference graph and other metadata needed for preprocessing.
+        chunk_size: If set, compare tensors of the same shape in chunks of this
+            many elements, when the comparator implements `chunk_sums`.
+        max_workers: Number of threads that compare the outputs of different
+            operators concurrently.
     """
 
-    def __init__(self, inspector: Optional["Inspector"] = None) -> None:
+    def __init__(
+        self,
+        inspector: Optional["Inspector"] = None,
+        chunk_size: Optional[int] = None,
+        max_workers: int = 1,
+    ) -> None:
         """Initialize the comparator.
 
         Args:
             inspector: Optional Inspector instance that provides access to the
                 reference graph and other metadata. Can be set later via the
                 `inspector` property.
+            chunk_size: Optional number of elements to compare at a time.
+            max_workers: Number of threads that compare outputs concurrently.
         """
         self._inspector: Optional["Inspector"] = inspector
+        if chunk_size is not None and chunk_size <= 0:
+            raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+        self.chunk_size: Optional[int] = chunk_size
+        self.max_workers: int = max_workers
 
     @property
     def inspector(self) -> Optional["Inspector"]:
@@ -109,6 +136,79 @@ class NumericalComparatorBase(ABC):
         """
         pass
 
+    def chunk_sums(self, a: torch.Tensor, b: torch.Tensor) -> Optional[List[Any]]:
+        """Return sums over the elements of a chunk of two outputs.
+
+        Override this method, together with `reduce_sums`, to support comparing
+        large tensors in chunks. The sums of all the chunks are added up and
+        passed to `reduce_sums`.
+
+        Args:
+            a: A chunk of the first output, flattened and converted like
+                convert_to_float_tensor().
+            b: The same chunk of the second output.
+
+        Returns:
+            A list of scalar sums (e.g. 0-dim tensors), or None if the comparator
+            doesn't support chunks, which is the default.
+        """
+        return None
+
+    def reduce_sums(self, sums: List[float], numel: int) -> Optional[float]:
+        """Return the metric from the sums of `chunk_sums` over all the chunks.
+
+        Args:
+            sums: The sums returned by `chunk_sums`, added up over all chunks.
+            numel: The number of elements of each output.
+
+        Returns:
+            The metric, or None to compare the outputs with `element_compare`
+            instead, which is the default.
+        """
+        return None
+
+    def _chunk_sums_match_element_compare(self) -> bool:
+        """Whether `chunk_sums` and `reduce_sums` are defined by the class that
+        defines `element_compare`, and so compute the same metric.
+        """
+
+        def owner(name: str) -> type:
+            return next(cls for cls in type(self).__mro__ if name in vars(cls))
+
+        return owner("element_compare") is owner("chunk_sums") is owner("reduce_sums")
+
+    def _chunked_element_compare(self, a: Any, b: Any) -> float:
+        """Compare two outputs like `element_compare`, in chunks if possible."""
+        chunk_size = self.chunk_size
+        if (
+            chunk_size is None
+            or not self._chunk_sums_match_element_compare()
+            or not isinstance(a, torch.Tensor)
+            or not isinstance(b, torch.Tensor)
+            or a.shape != b.shape
+            or a.numel() <= chunk_size
+        ):
+            return self.element_compare(a, b)
+        flat_a = a.detach().reshape(-1)
+        flat_b = b.detach().reshape(-1)
+        sums: Optional[List[Any]] = None
+        for start in range(0, flat_a.numel(), chunk_size):
+            chunk_sums = self.chunk_sums(
+                convert_to_float_tensor(flat_a[start : start + chunk_size]),
+                convert_to_float_tensor(flat_b[start : start + chunk_size]),
+            )
+            if chunk_sums is None:
+                return self.element_compare(a, b)
+            if sums is None:
+                sums = chunk_sums
+            else:
+                sums = [total + part for total, part in zip(sums, chunk_sums)]
+        assert sums is not None
+        result = self.reduce_sums([float(total) for total in sums], flat_a.numel())
+        if result is None:
+            return self.element_compare(a, b)
+        return result
+
     @staticmethod
     def _validate_preprocessing_output(
         processed_mapping: IntermediateOutputMapping,
@@ -184,9 +284,9 @@ class NumericalComparatorBase(ABC):
                     f"Sequences 'a' ({a}) and 'b' ({b}) must have the same length "
                     f"for comparison. len(a): {len(a)} len(b): {len(b)}."
                 )
-            return [self.element_compare(x, y) for x, y in zip(a, b)]
+            return [self._chunked_element_compare(x, y) for x, y in zip(a, b)]
         elif not is_a_sequence and not is_b_sequence:
-            return [self.element_compare(a, b)]
+            return [self._chunked_element_compare(a, b)]
         else:
             raise ValueError(
                 f"Both inputs 'a' ({a}) and 'b' ({b}) must be sequences "
@@ -219,7 +319,7 @@ class NumericalComparatorBase(ABC):
                 - runtime_intermediate_output: Runtime intermediate output tensor
                 - gap: List of numerical gap values
         """
-        from executorch.devtools.inspector._inspector_utils import find_op_names
+        from executorch.devtools.inspector._inspector_utils import OpNameIndex
 
         # Step 1: Apply preprocessing
         processed_mapping = self.preprocessing(mapping)
@@ -227,8 +327,8 @@ class NumericalComparatorBase(ABC):
         # Validate the preprocessed mapping format
         self._validate_preprocessing_output(processed_mapping)
 
-        # Step 2: Element-wise comparison and aggregation
-        rows = []
+        # Step 2: Element-wise comparison
+        pairs = []
         for (aot_debug_handle, aot_intermediate_output), (
             runtime_debug_handle,
             runtime_intermediate_output,
@@ -244,21 +344,43 @@ class NumericalComparatorBase(ABC):
                 and len(aot_intermediate_output) > 1
             ):
                 continue
-            rows.append(
-                {
-                    "aot_ops": find_op_names(
-                        aot_debug_handle, aot_debug_handle_to_op_names
-                    ),
-                    "aot_intermediate_output": aot_intermediate_output,
-                    "runtime_ops": find_op_names(
-                        runtime_debug_handle, runtime_debug_handle_to_op_names
-                    ),
-                    "runtime_intermediate_output": runtime_intermediate_output,
-                    "gap": self._compare_intermediate_outputs(
-                        aot_intermediate_output, runtime_intermediate_output
-                    ),
-                }
+            pairs.append(
+                (
+                    aot_debug_handle,
+                    aot_intermediate_output,
+                    runtime_debug_handle,
+                    runtime_intermediate_output,
+                )
             )
 
-        # Step 3: Build and return DataFrame
+        def compare_pair(
+            pair: Tuple[DebugHandle, Any, DebugHandle, Any]
+        ) -> List[float]:
+            return self._compare_intermediate_outputs(pair[1], pair[3])
+
+        if self.max_workers > 1 and len(pairs) > 1:
+            # torch releases the GIL in the comparisons of large tensors.
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                gaps = list(pool.map(compare_pair, pairs))
+        else:
+            gaps = [compare_pair(pair) for pair in pairs]
+
+        # Step 3: Aggregate results into a DataFrame
+        aot_op_names = OpNameIndex(aot_debug_handle_to_op_names)
+        runtime_op_names = OpNameIndex(runtime_debug_handle_to_op_names)
+        rows = [
+            {
+                "aot_ops": aot_op_names.find_op_names(aot_debug_handle),
+                "aot_intermediate_output": aot_intermediate_output,
+                "runtime_ops": runtime_op_names.find_op_names(runtime_debug_handle),
+                "runtime_intermediate_output": runtime_intermediate_output,
+                "gap": gap,
+            }
+            for (
+                aot_debug_handle,
+                aot_intermediate_output,
+                runtime_debug_handle,
+                runtime_intermediate_output,
+            ), gap in zip(pairs, gaps)
+        ]
         return pd.DataFrame(rows)
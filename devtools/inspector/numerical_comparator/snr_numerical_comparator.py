@@ -5,7 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, List, Optional, TYPE_CHECKING
 
 import torch
 from executorch.devtools.inspector._inspector_utils import convert_to_float_tensor
@@ -20,8 +20,13 @@ if TYPE_CHECKING:
 class SNRComparator(NumericalComparatorBase):
     """Signal-to-Noise Ratio comparator for numerical discrepancy detection."""
 
-    def __init__(self, inspector: Optional["Inspector"] = None) -> None:
-        super().__init__(inspector)
+    def __init__(
+        self,
+        inspector: Optional["Inspector"] = None,
+        chunk_size: Optional[int] = None,
+        max_workers: int = 1,
+    ) -> None:
+        super().__init__(inspector, chunk_size, max_workers)
 
     def element_compare(self, a: Any, b: Any) -> float:
         """
@@ -45,3 +50,11 @@ class SNRComparator(NumericalComparatorBase):
         # Calculate SNR
         snr = 10 * torch.log10(original_power / error_power)
         return snr.item()
+
+    def chunk_sums(self, a: torch.Tensor, b: torch.Tensor) -> List[torch.Tensor]:
+        return [torch.square(a).sum(), torch.square(a - b).sum()]
+
+    def reduce_sums(self, sums: List[float], numel: int) -> float:
+        original_power = torch.tensor(sums[0] / numel, dtype=torch.float64)
+        error_power = sums[1] / numel
+        return (10 * torch.log10(original_power / error_power)).item()
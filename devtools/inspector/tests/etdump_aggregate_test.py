@@ -0,0 +1,155 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import os
+import tempfile
+import unittest
+from typing import List
+
+import executorch.devtools.etdump.schema_flatcc as flatcc
+import numpy as np
+from executorch.devtools.etdump.serialize import serialize_to_etdump_flatcc
+from executorch.devtools.inspector import compare_etdump_aggregates, ETDumpAggregate
+from executorch.devtools.inspector._etdump_aggregate import _mann_whitney_u_p_value
+
+
+def _write_etdump(path: str, durations: List[List[int]]) -> None:
+    """Writes an ETDump with a run per element of `durations`, of ops op_0, ..."""
+    run_data = []
+    for run_durations in durations:
+        events = []
+        time = 0
+        for instruction_id, duration in enumerate(run_durations):
+            events.append(
+                flatcc.Event(
+                    profile_event=flatcc.ProfileEvent(
+                        name=f"op_{instruction_id}",
+                        chain_index=0,
+                        instruction_id=instruction_id,
+                        delegate_debug_id_int=-1,
+                        delegate_debug_id_str="",
+                        delegate_debug_metadata=None,
+                        start_time=time,
+                        end_time=time + duration,
+                    ),
+                    allocation_event=None,
+                    debug_event=None,
+                )
+            )
+            time += duration
+        run_data.append(
+            flatcc.RunData(
+                name="forward", bundled_input_index=-1, allocators=[], events=events
+            )
+        )
+    with open(path, "wb") as f:
+        f.write(
+            serialize_to_etdump_flatcc(
+                flatcc.ETDumpFlatCC(version=0, run_data=run_data), size_prefixed=True
+            )
+        )
+
+
+class TestETDumpAggregate(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _write_build(self, name: str, op_1_duration: int) -> str:
+        """Writes 3 ETDumps of 4 runs of op_0, taking ~1000ns, and op_1."""
+        build_dir = os.path.join(self.tmpdir.name, name)
+        os.makedirs(build_dir)
+        for device in range(3):
+            durations = [
+                [
+                    int(self.rng.integers(1000, 1100)),
+                    int(self.rng.integers(op_1_duration, op_1_duration + 100)),
+                ]
+                for _ in range(4)
+            ]
+            _write_etdump(os.path.join(build_dir, f"device_{device}.etdp"), durations)
+        return build_dir
+
+    def test_from_directory(self) -> None:
+        durations = [[[10, 20], [11, 21]], [[12, 22]], [[13, 23], [14, 24]]]
+        for i, etdump_durations in enumerate(durations):
+            _write_etdump(os.path.join(self.tmpdir.name, f"{i}.etdp"), etdump_durations)
+        # Not an ETDump
+        with open(os.path.join(self.tmpdir.name, "notes.txt"), "w") as f:
+            f.write("notes")
+
+        for max_workers in (1, 2):
+            aggregate = ETDumpAggregate.from_directory(
+                self.tmpdir.name, max_workers=max_workers
+            )
+            self.assertEqual(len(aggregate.etdump_paths), 3)
+            self.assertEqual(len(aggregate.event_blocks), 1)
+            events = aggregate.event_blocks[0].events
+            self.assertEqual([event.name for event in events], ["op_0", "op_1"])
+            for op, event in enumerate(events):
+                assert event.perf_data is not None
+                # Converted from ns to ms, in the order of the ETDumps and runs.
+                np.testing.assert_allclose(
+                    event.perf_data.raw,
+                    [run[op] / 1e6 for runs in durations for run in runs],
+                )
+
+            df = aggregate.to_dataframe()
+            self.assertEqual(list(df["event_name"]), ["op_0", "op_1"])
+            self.assertAlmostEqual(df["max (ms)"][1], 24 / 1e6)
+
+        with self.assertRaises(ValueError):
+            ETDumpAggregate.from_directory(self.tmpdir.name, pattern="*.bin")
+
+    def test_compare_etdump_aggregates(self) -> None:
+        baseline = ETDumpAggregate.from_directory(
+            self._write_build("baseline", 2000), max_workers=2
+        )
+        # op_1 takes 10% longer.
+        candidate = ETDumpAggregate.from_directory(
+            self._write_build("candidate", 2200), max_workers=2
+        )
+
+        report = compare_etdump_aggregates(baseline, candidate, threshold=0.05)
+        self.assertEqual(list(report["event_name"]), ["op_0", "op_1"])
+        self.assertEqual(list(report["baseline_runs"]), [12, 12])
+        self.assertEqual(list(report["regressed"]), [False, True])
+        self.assertEqual(list(report["improved"]), [False, False])
+        self.assertGreater(report["p_value"][0], 0.05)
+        self.assertLess(report["p_value"][1], 0.05)
+        self.assertAlmostEqual(report["p50_change"][1], 0.1, delta=0.05)
+
+        report = compare_etdump_aggregates(candidate, baseline, threshold=0.05)
+        self.assertEqual(list(report["improved"]), [False, True])
+
+        # A larger threshold isn't reached.
+        report = compare_etdump_aggregates(baseline, candidate, threshold=0.2)
+        self.assertFalse(report["regressed"].any())
+
+        with self.assertRaises(ValueError):
+            compare_etdump_aggregates(baseline, candidate, stats=("num_outliers",))
+
+    def test_mann_whitney_u_p_value(self) -> None:
+        self.assertAlmostEqual(
+            _mann_whitney_u_p_value(np.array([1.0, 2, 3]), np.array([4.0, 5, 6])),
+            0.0808556,
+            places=6,
+        )
+        # With ties
+        self.assertAlmostEqual(
+            _mann_whitney_u_p_value(
+                np.array([1.0, 2, 2, 3]), np.array([2.0, 3, 3, 4, 5])
+            ),
+            0.0993422,
+            places=6,
+        )
+        self.assertEqual(
+            _mann_whitney_u_p_value(np.array([1.0, 1]), np.array([1.0, 1])), 1.0
+        )
@@ -5,11 +5,18 @@
 # LICENSE file in the root directory of this source tree.
 
 # pyre-strict
+import statistics
 import unittest
 from typing import List, Optional, Tuple, Union
 
 import executorch.devtools.etdump.schema_flatcc as flatcc
+import numpy as np
+import pandas as pd
 from executorch.devtools.etdump.schema_flatcc import ETDumpFlatCC, ProfileEvent
+from executorch.devtools.etdump.serialize import (
+    deserialize_from_etdump_flatcc_lazy,
+    serialize_to_etdump_flatcc,
+)
 from executorch.devtools.inspector import Event, EventBlock, PerfData
 from executorch.devtools.inspector._inspector import (
     DelegateMetadata,
@@ -337,6 +344,116 @@ class TestEventBlock(unittest.TestCase):
 
         return ETDumpFlatCC(version=0, run_data=[run_data_1])
 
+    @staticmethod
+    def _get_sample_etdump_flatcc_many_runs() -> flatcc.ETDumpFlatCC:
+        """
+        Helper for getting a sample ETDumpFlatCC object with 8 runs of 2 bundled
+        inputs, with operator and delegated events, some of which wrap around or
+        have delegate debug metadata, and a run output
+        """
+        run_data = []
+        for run in range(8):
+            profile_events = [
+                TestEventBlock._gen_sample_profile_event(
+                    name="Method::execute", instruction_id=-1, time=(0, 10000)
+                )
+            ]
+            for instruction_id in range(3):
+                # The timer wraps around in the middle of the first instruction
+                start_time = 2**32 - 5 if instruction_id == 0 else 100 * run
+                profile_events.append(
+                    TestEventBlock._gen_sample_profile_event(
+                        name=f"op_{instruction_id}",
+                        instruction_id=instruction_id,
+                        time=(start_time, (start_time + 10 + run) % (2**32 - 1)),
+                        # pyre-ignore[6]: Metadata is serialized as bytes
+                        delegate_debug_metadata=(
+                            f"metadata_{run}".encode()
+                            if instruction_id == 1 and run >= 2
+                            else None
+                        ),
+                    )
+                )
+                profile_events.append(
+                    TestEventBlock._gen_sample_profile_event(
+                        name="DELEGATE_EVENT",
+                        instruction_id=instruction_id,
+                        time=(1000 * run, 1000 * run + 20 + 3 * run),
+                        delegate_debug_id=instruction_id,
+                        # pyre-ignore[6]: Metadata is serialized as bytes
+                        delegate_debug_metadata=b"delegate_metadata",
+                    )
+                )
+            run_output = TestEventBlock._gen_sample_debug_event(instruction_id=3)
+            # pyre-ignore[16]: Tensor values aren't inflated without a buffer
+            run_output.debug_entry.val = flatcc.ValueType.INT.value
+            run_output.debug_entry.output = flatcc.Bool(True)
+            events = [
+                flatcc.Event(
+                    allocation_event=None,
+                    debug_event=None,
+                    profile_event=profile_event,
+                )
+                for profile_event in profile_events
+            ]
+            events.append(
+                flatcc.Event(
+                    allocation_event=None,
+                    debug_event=run_output,
+                    profile_event=None,
+                )
+            )
+            run_data.append(
+                flatcc.RunData(
+                    name="forward",
+                    bundled_input_index=run % 2,
+                    allocators=[],
+                    events=events,
+                )
+            )
+        return ETDumpFlatCC(version=0, run_data=run_data)
+
+    def _assert_event_blocks_equal(
+        self, blocks: List[EventBlock], expected_blocks: List[EventBlock]
+    ) -> None:
+        """
+        Asserts that EventBlocks generated from the same ETDump are equal,
+        comparing perf_data and start_time by value
+        """
+        self.assertEqual(len(blocks), len(expected_blocks))
+        for block, expected_block in zip(blocks, expected_blocks):
+            self.assertEqual(block.name, expected_block.name)
+            self.assertEqual(
+                block.bundled_input_index, expected_block.bundled_input_index
+            )
+            self.assertEqual(block.run_output, expected_block.run_output)
+            self.assertEqual(len(block.events), len(expected_block.events))
+            for event, expected_event in zip(block.events, expected_block.events):
+                self.assertEqual(event.name, expected_event.name)
+                self.assertEqual(
+                    event.delegate_debug_identifier,
+                    expected_event.delegate_debug_identifier,
+                )
+                self.assertEqual(event.is_delegated_op, expected_event.is_delegated_op)
+                self.assertEqual(event._instruction_id, expected_event._instruction_id)
+                self.assertEqual(
+                    event.raw_delegate_debug_metadatas,
+                    expected_event.raw_delegate_debug_metadatas,
+                )
+                self.assertEqual(len(event.debug_data), len(expected_event.debug_data))
+                if expected_event.perf_data is None:
+                    self.assertIsNone(event.perf_data)
+                    continue
+                self.assertEqual(
+                    list(event.perf_data.raw), expected_event.perf_data.raw
+                )
+                self.assertEqual(list(event.start_time), expected_event.start_time)
+                for stat in ("p10", "p50", "p90", "avg", "min", "max"):
+                    self.assertEqual(
+                        getattr(event.perf_data, stat),
+                        getattr(expected_event.perf_data, stat),
+                    )
+
     # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Tests ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
     def test_gen_from_etdump(self) -> None:
@@ -432,6 +549,49 @@ class TestEventBlock(unittest.TestCase):
         # Non delegated event uses event_name as event name
         self.assertEqual(event_blocks[0].events[1].name, event_name)
 
+    def test_gen_from_etdump_streaming(self) -> None:
+        """
+        Test that EventBlocks generated from a serialized ETDump one run at a
+        time are equal to the ones generated from the deserialized ETDump
+        """
+        etdumps = [
+            TestEventBlock._get_sample_etdump_flatcc(),
+            TestEventBlock._get_sample_etdump_flatcc_profiling_and_debugging(),
+            TestEventBlock._get_sample_etdump_flatcc_debug_events_only(
+                event_name="test_debug_event_only", delegate_debug_id="debug_id"
+            ),
+            TestEventBlock._get_sample_etdump_flatcc_many_runs(),
+        ]
+        converters = [
+            None,
+            # Supports arrays of times
+            lambda event_name, input_time: input_time / 1000,
+            # Only supports scalar times
+            lambda event_name, input_time: int(input_time) // 2,
+        ]
+        for etdump in etdumps:
+            data = serialize_to_etdump_flatcc(etdump, size_prefixed=True)
+            for converter in converters:
+                expected_blocks = EventBlock._gen_from_etdump(
+                    etdump, delegate_time_scale_converter=converter
+                )
+                blocks = EventBlock._gen_from_etdump_streaming(
+                    deserialize_from_etdump_flatcc_lazy(data),
+                    delegate_time_scale_converter=converter,
+                )
+                self._assert_event_blocks_equal(blocks, expected_blocks)
+
+    def test_gen_from_etdump_streaming_inconsistent_debug_data(self) -> None:
+        etdump: ETDumpFlatCC = (
+            TestEventBlock._get_sample_etdump_flatcc_inconsistent_debug_data()
+        )
+        with self.assertRaises(AssertionError):
+            EventBlock._gen_from_etdump_streaming(
+                deserialize_from_etdump_flatcc_lazy(
+                    serialize_to_etdump_flatcc(etdump), size_prefixed=False
+                )
+            )
+
     def test_inspector_event_generation(self) -> None:
         """
         Test Inspector.Event derivation from various ProfileEvent cases
@@ -655,3 +815,81 @@ class TestEventBlock(unittest.TestCase):
                 self.assertEqual(
                     event.debug_handles, handle_map[str(event._instruction_id)]
                 )
+
+    def test_perf_data_extra_stats(self) -> None:
+        raw = [float(i) for i in range(1, 21)] + [1000.0]
+        perf_data = PerfData(raw)
+
+        self.assertEqual(perf_data.p99, np.percentile(raw, 99))
+        self.assertAlmostEqual(perf_data.stddev, statistics.pstdev(raw))
+        # 10% of 21 timings: the lowest and the highest are cut.
+        self.assertAlmostEqual(perf_data.trimmed_mean, statistics.mean(raw[1:-1]))
+        self.assertEqual(perf_data.num_outliers, 1)
+
+        # Statistics are recomputed for new timings.
+        perf_data.raw = [1.0, 2.0]
+        self.assertEqual(perf_data.max, 2.0)
+        self.assertEqual(perf_data.num_outliers, 0)
+
+    def test_to_dataframe_batched_stats(self) -> None:
+        """
+        Test that to_dataframe() returns the same DataFrame as concatenating the
+        DataFrames of each Event, for Events with different types of values.
+        """
+        rng = np.random.default_rng(0)
+        events = []
+        for i in range(30):
+            kind = i % 5
+            perf_data = None
+            if kind == 0:
+                perf_data = PerfData(list(rng.random(10)))
+            elif kind == 1:
+                perf_data = PerfData(rng.random(10))
+            elif kind == 2:
+                perf_data = PerfData(list(rng.integers(0, 100, 10)))
+            elif kind == 3:
+                perf_data = PerfData(rng.random(3))
+            events.append(
+                Event(
+                    name=f"op_{i % 7}",
+                    perf_data=perf_data,
+                    op_types=["op_type"] * (i % 7),
+                    delegate_debug_identifier=[None, i, f"id_{i}"][i % 3],
+                    is_delegated_op=None if kind == 4 else kind == 1,
+                    delegate_backend_name="backend" if kind == 1 else None,
+                )
+            )
+        event_block = EventBlock(name="block", events=events)
+        extra_stats = ("p99", "stddev", "trimmed_mean", "num_outliers")
+
+        df = event_block.to_dataframe(include_units=True, extra_stats=extra_stats)
+
+        for event in events:
+            if event.perf_data is not None:
+                # Drop the cached statistics.
+                event.perf_data.raw = event.perf_data.raw
+        expected = pd.concat(
+            [event.to_dataframe(" (ms)", extra_stats) for event in events],
+            ignore_index=True,
+        )
+        pd.testing.assert_frame_equal(
+            df.drop(columns="event_block_name"), expected, check_exact=True
+        )
+        self.assertEqual(
+            list(df.columns[3:13]),
+            [
+                "p10 (ms)",
+                "p50 (ms)",
+                "p90 (ms)",
+                "avg (ms)",
+                "min (ms)",
+                "max (ms)",
+                "p99 (ms)",
+                "stddev (ms)",
+                "trimmed_mean (ms)",
+                "num_outliers",
+            ],
+        )
+
+        with self.assertRaises(ValueError):
+            event_block.to_dataframe(extra_stats=("p95",))
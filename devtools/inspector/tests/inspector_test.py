@@ -29,6 +29,7 @@ from executorch.backends.xnnpack.partition.xnnpack_partitioner import XnnpackPar
 from executorch.devtools import generate_etrecord, parse_etrecord
 from executorch.devtools.debug_format.et_schema import OperatorNode
 from executorch.devtools.etdump.schema_flatcc import ProfileEvent
+from executorch.devtools.etdump.serialize import serialize_to_etdump_flatcc
 from executorch.devtools.etrecord.tests.etrecord_test import TestETRecord
 
 from executorch.devtools.inspector import (
@@ -46,6 +47,8 @@ from executorch.devtools.inspector._inspector import (
     ProfileEventSignature,
     TimeScale,
 )
+from executorch.devtools.inspector._inspector_utils import LazyProgramOutput
+from executorch.devtools.inspector._intermediate_output_capturer import stats_summary
 from executorch.devtools.inspector.tests.inspector_test_utils import (
     check_if_debug_handle_to_op_names_match,
     check_if_intermediate_outputs_match,
@@ -162,6 +165,58 @@ class TestInspector(unittest.TestCase):
                 Callable,
             )
 
+    def test_inspector_streaming(self):
+        etdump = flatcc.ETDumpFlatCC(
+            version=0,
+            run_data=[
+                flatcc.RunData(
+                    name="forward",
+                    bundled_input_index=-1,
+                    allocators=[],
+                    events=[
+                        flatcc.Event(
+                            profile_event=ProfileEvent(
+                                name=f"op_{instruction_id}",
+                                chain_index=0,
+                                instruction_id=instruction_id,
+                                delegate_debug_id_int=-1,
+                                delegate_debug_id_str="",
+                                delegate_debug_metadata=None,
+                                start_time=100 * instruction_id,
+                                end_time=100 * instruction_id + run + 10,
+                            ),
+                            allocation_event=None,
+                            debug_event=None,
+                        )
+                        for instruction_id in range(5)
+                    ],
+                )
+                for run in range(10)
+            ],
+        )
+        with patch.object(_inspector, "gen_etdump_object", return_value=etdump):
+            expected_df = Inspector(etdump_path=ETDUMP_PATH).to_dataframe()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            etdump_path = os.path.join(tmp_dir, "etdump.etdp")
+            with open(etdump_path, "wb") as f:
+                f.write(serialize_to_etdump_flatcc(etdump, size_prefixed=True))
+            df = Inspector(etdump_path=etdump_path, streaming=True).to_dataframe()
+
+        self.assertEqual(list(df.columns), list(expected_df.columns))
+        self.assertEqual(list(df["event_name"]), list(expected_df["event_name"]))
+        for column in (
+            "p10 (ms)",
+            "p50 (ms)",
+            "p90 (ms)",
+            "avg (ms)",
+            "min (ms)",
+            "max (ms)",
+        ):
+            self.assertEqual(list(df[column]), list(expected_df[column]))
+        for raw, expected_raw in zip(df["raw"], expected_df["raw"]):
+            self.assertEqual(list(raw), expected_raw)
+
     def test_inspector_print_data_tabular(self):
         # Create a context manager to patch functions called by Inspector.__init__
         with patch.object(
@@ -768,6 +823,83 @@ class TestInspector(unittest.TestCase):
                 # gap should equal 3.0
                 self.assertEqual(row["gap"][0], 3.0)
 
+    def test_calculate_numeric_gap_with_summary(self):
+        with patch.object(
+            _inspector, "parse_etrecord", return_value=None
+        ), patch.object(
+            _inspector, "gen_etdump_object", return_value=None
+        ), patch.object(
+            EventBlock, "_gen_from_etdump"
+        ), patch.object(
+            _inspector, "gen_graphs_from_etrecord"
+        ):
+            inspector_instance = Inspector(
+                etdump_path=ETDUMP_PATH,
+                etrecord=ETRECORD_PATH,
+            )
+
+            aot_output = torch.tensor([1.0, 2.0, 3.0])
+            runtime_output = torch.tensor([2.0, 1.0, 5.0])
+            capture_kwargs = {}
+
+            def get_aot_intermediate_outputs_and_op_names(
+                reference_graph_module, **kwargs
+            ):
+                capture_kwargs.update(kwargs)
+                # The capturer summarizes the AOT outputs.
+                return {(0,): kwargs["summarize"](aot_output)}, {(0,): "op_0"}
+
+            inspector_instance._resolve_reference_graph = (
+                lambda ref_graph=None, disable_validation=False: (
+                    MagicMock(),
+                    "exported_program",
+                )
+            )
+            inspector_instance._get_aot_intermediate_outputs_and_op_names = (
+                get_aot_intermediate_outputs_and_op_names
+            )
+            # Runtime outputs inflated from an ETDump are LazyProgramOutputs.
+            runtime_value = flatcc.Value(
+                val=flatcc.ValueType.TENSOR.value,
+                tensor=flatcc.Tensor(
+                    scalar_type=flatcc.ScalarType.FLOAT,
+                    sizes=[3],
+                    strides=[1],
+                    offset=0,
+                ),
+                tensor_list=None,
+                int_value=None,
+                float_value=None,
+                double_value=None,
+                bool_value=None,
+                output=None,
+            )
+            runtime_intermediate_output = LazyProgramOutput(
+                [runtime_value], runtime_output.numpy().tobytes()
+            )
+            inspector_instance._get_runtime_intermediate_outputs_and_op_names = (
+                lambda: ({(0,): (runtime_intermediate_output, 1)}, {(0,): "op_0"})
+            )
+            inspector_instance._get_aot_debug_handle_to_stack_traces = (
+                lambda reference_graph_module, resolved_graph_name: {}
+            )
+
+            with tempfile.TemporaryDirectory() as tmp:
+                df = inspector_instance.calculate_numeric_gap(
+                    distance="L1",
+                    intermediate_output_dir=tmp,
+                    intermediate_output_summary=stats_summary,
+                )
+            self.assertEqual(
+                capture_kwargs, {"storage_dir": tmp, "summarize": stats_summary}
+            )
+            self.assertEqual(len(df), 1)
+            self.assertEqual(df["runtime_intermediate_output"][0].shape, (5,))
+            expected_gap = torch.abs(
+                stats_summary(aot_output) - stats_summary(runtime_output)
+            ).sum()
+            self.assertAlmostEqual(df["gap"][0][0], expected_gap.item())
+
     def test_calculate_numeric_gap_with_stacktraces(self):
         """Test calculate_numeric_gap includes stacktraces column when stack traces are available."""
         # Create a context manager to patch functions called by Inspector.__init__
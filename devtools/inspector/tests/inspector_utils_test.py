@@ -6,9 +6,11 @@
 
 # pyre-unsafe
 
+import os
 import tempfile
 import unittest
 from typing import Dict, Tuple
+from unittest.mock import patch
 
 import executorch.exir.tests.models as models
 
@@ -37,10 +39,14 @@ from executorch.devtools.inspector._inspector_utils import (
     find_populated_event,
     gen_graphs_from_etrecord,
     get_aot_debug_handle_to_op_name_mapping,
+    inflate_runtime_output,
     is_inference_output_equal,
+    LazyProgramOutput,
+    map_debug_buffer,
     map_runtime_aot_intermediate_outputs,
     merge_runtime_overlapping_debug_handles,
     NodeFilter,
+    OpNameIndex,
     propagate_back_debug_handle,
     TimeScale,
 )
@@ -190,6 +196,79 @@ class TestInspectorUtils(unittest.TestCase):
             )
         )
 
+    @staticmethod
+    def _gen_tensor_value(sizes, offset: int) -> flatcc.Value:
+        return flatcc.Value(
+            val=flatcc.ValueType.TENSOR.value,
+            tensor=flatcc.Tensor(
+                scalar_type=flatcc.ScalarType.FLOAT,
+                sizes=sizes,
+                strides=[1],
+                offset=offset,
+            ),
+            tensor_list=None,
+            int_value=None,
+            float_value=None,
+            double_value=None,
+            bool_value=None,
+            output=None,
+        )
+
+    def test_inflate_runtime_output_from_mapped_debug_buffer(self):
+        data = torch.arange(16, dtype=torch.float)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            debug_buffer_path = os.path.join(tmp_dir, "debug_buffer.bin")
+            with open(debug_buffer_path, "wb") as f:
+                f.write(data.numpy().tobytes())
+            output_buffer = map_debug_buffer(debug_buffer_path)
+
+            tensor = inflate_runtime_output(
+                self._gen_tensor_value([2, 3], offset=8), output_buffer
+            )
+            self.assertTrue(torch.equal(tensor, data[2:8].view(2, 3)))
+            # The tensor is a view of the mapping, not a copy
+            tensor[0, 0] = -1.0
+            self.assertEqual(
+                inflate_runtime_output(
+                    self._gen_tensor_value([1], offset=8), output_buffer
+                ).item(),
+                -1.0,
+            )
+            # ... which is copy-on-write
+            with open(debug_buffer_path, "rb") as f:
+                self.assertEqual(f.read(), data.numpy().tobytes())
+
+            # Misaligned tensors are copied
+            self.assertEqual(
+                inflate_runtime_output(
+                    self._gen_tensor_value([1], offset=2), output_buffer
+                ).shape,
+                torch.Size([1]),
+            )
+
+    def test_lazy_program_output(self):
+        output_buffer = torch.arange(4, dtype=torch.float).numpy().tobytes()
+        values = [self._gen_tensor_value([2], offset=0)] * 2 + [
+            self._gen_tensor_value([1], offset=12)
+        ]
+        with patch(
+            "executorch.devtools.inspector._inspector_utils.inflate_runtime_output",
+            wraps=inflate_runtime_output,
+        ) as mock_inflate:
+            debug_data = LazyProgramOutput(values, output_buffer)
+            self.assertEqual(len(debug_data), 3)
+            mock_inflate.assert_not_called()
+
+            self.assertTrue(torch.equal(debug_data[-1], torch.tensor([3.0])))
+            self.assertIs(debug_data[2], debug_data[-1])
+            self.assertEqual(mock_inflate.call_count, 1)
+
+            self.assertEqual(len(list(debug_data)), 3)
+            self.assertEqual(mock_inflate.call_count, 3)
+            with self.assertRaises(IndexError):
+                debug_data[3]
+        self.assertEqual(LazyProgramOutput([], None), [])
+
     def test_calculate_time_scale_factor_second_based(self):
         self.assertEqual(
             calculate_time_scale_factor(TimeScale.NS, TimeScale.MS), 1000000
@@ -605,6 +684,21 @@ class TestInspectorUtils(unittest.TestCase):
             ["op1", "op2", "op3", "op4", "op5", "op6", "op7"],
         )
 
+    def test_op_name_index(self):
+        debug_handle_to_op_names = {
+            (5,): ["op5"],
+            (1, 2): ["op1"],
+            (): ["op0"],
+            (3,): ["op2", "op3"],
+            (2, 3, 4): ["op4"],
+        }
+        index = OpNameIndex(debug_handle_to_op_names)
+        for debug_handle in [(), (1,), (1, 2), (2, 3, 4, 5), (1, 2, 3, 4, 5), (6,)]:
+            self.assertEqual(
+                index.find_op_names(debug_handle),
+                find_op_names(debug_handle, debug_handle_to_op_names),
+            )
+
     def test_equip_debug_handle_to_export_program_success(self):
         """Test that propagate_back_debug_handle returns True and properly equips debug handles."""
         # Create a test model
@@ -6,6 +6,7 @@
 
 # pyre-unsafe
 
+import tempfile
 import unittest
 from typing import Dict, Tuple, Union
 
@@ -16,7 +17,10 @@ from executorch.devtools.inspector._inspector_utils import (
     propagate_back_debug_handle,
 )
 from executorch.devtools.inspector._intermediate_output_capturer import (
+    DiskBackedIntermediateOutputs,
     IntermediateOutputCapturer,
+    sample_summary,
+    stats_summary,
 )
 from executorch.devtools.inspector.tests.inspector_test_utils import (
     check_if_intermediate_outputs_match,
@@ -99,3 +103,108 @@ class TestIntermediateOutputCapturer(unittest.TestCase):
                     edge_program_manager.exported_program(),
                     model.get_edge_dialect_expected_intermediate_outputs(),
                 )
+
+    def test_disk_backed_capture(self):
+        for model_name, model_cls in model_registry.items():
+            with self.subTest(model=model_name), tempfile.TemporaryDirectory() as tmp:
+                model = model_cls()
+                input_tensor = model.get_input()
+                module = (
+                    to_edge(export(model, (input_tensor,))).exported_program().module()
+                )
+                expected = IntermediateOutputCapturer(module).run_and_capture(
+                    input_tensor
+                )
+                captured = IntermediateOutputCapturer(
+                    module, storage_dir=tmp
+                ).run_and_capture(input_tensor)
+
+                self.assertIsInstance(captured, DiskBackedIntermediateOutputs)
+                self.assertGreater(captured.nbytes, 0)
+                self.assertEqual(list(captured.keys()), list(expected.keys()))
+                self.assertTrue(check_if_intermediate_outputs_match(captured, expected))
+
+                summarized = IntermediateOutputCapturer(
+                    module, storage_dir=tmp, summarize=stats_summary
+                ).run_and_capture(input_tensor)
+                for key, output in expected.items():
+                    if isinstance(output, torch.Tensor):
+                        self.assertTrue(
+                            torch.equal(summarized[key], stats_summary(output))
+                        )
+
+    def test_summarized_multi_output_capture(self):
+        class TopK(torch.nn.Module):
+            def forward(self, x):
+                values, indices = torch.topk(x, 3)
+                return values * 2, indices
+
+        x = torch.randn(4, 8)
+        module = to_edge(export(TopK(), (x,))).exported_program().module()
+        expected = IntermediateOutputCapturer(module).run_and_capture(x)
+        multi_output_keys = [
+            key for key, output in expected.items() if isinstance(output, list)
+        ]
+        self.assertEqual(len(multi_output_keys), 1)
+        with tempfile.TemporaryDirectory() as tmp:
+            for storage_dir in (None, tmp):
+                summarized = IntermediateOutputCapturer(
+                    module, storage_dir=storage_dir, summarize=stats_summary
+                ).run_and_capture(x)
+                for key in multi_output_keys:
+                    # One summary per output, like the outputs in memory.
+                    self.assertEqual(len(summarized[key]), len(expected[key]))
+                    for summary, output in zip(summarized[key], expected[key]):
+                        self.assertTrue(torch.equal(summary, stats_summary(output)))
+
+    def test_disk_backed_intermediate_outputs(self):
+        outputs = {
+            (1,): torch.randn(3, 4),
+            (2,): torch.arange(10, dtype=torch.int64)[::2],
+            (3,): [torch.tensor(True), 5, torch.randn(2).bfloat16()],
+            (4, 5): torch.empty(0, 3),
+            (6,): 1.5,
+            (7,): [[torch.randn(2), torch.randn(3)], torch.randn(1)],
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            with DiskBackedIntermediateOutputs(tmp) as store:
+                store.add((1,), outputs[(1,)])
+                first = store[(1,)]
+                for key in [(2,), (3,), (4, 5), (6,), (7,)]:
+                    store.add(key, outputs[key])
+                self.assertEqual(len(store), 6)
+                for key, expected in outputs.items():
+                    actual = store[key]
+                    if isinstance(expected, torch.Tensor):
+                        self.assertEqual(actual.dtype, expected.dtype)
+                        self.assertTrue(torch.equal(actual, expected))
+                    elif key == (7,):
+                        self.assertTrue(torch.equal(actual[0][0], expected[0][0]))
+                        self.assertTrue(torch.equal(actual[0][1], expected[0][1]))
+                        self.assertTrue(torch.equal(actual[1], expected[1]))
+                    elif isinstance(expected, list):
+                        self.assertTrue(torch.equal(actual[0], expected[0]))
+                        self.assertEqual(actual[1], expected[1])
+                        self.assertTrue(torch.equal(actual[2], expected[2]))
+                    else:
+                        self.assertEqual(actual, expected)
+                # Tensors read before more were added stay valid.
+                self.assertTrue(torch.equal(first, outputs[(1,)]))
+            # Tensors read before the store is closed stay valid too.
+            self.assertTrue(torch.equal(first, outputs[(1,)]))
+
+    def test_summaries(self):
+        tensor = torch.tensor([[1.0, -2.0], [3.0, -4.0]])
+        self.assertTrue(
+            torch.allclose(
+                stats_summary(tensor),
+                torch.tensor([-0.5, 2.6925824, -4.0, 3.0, 2.5], dtype=torch.float64),
+            )
+        )
+        self.assertTrue(
+            torch.equal(
+                sample_summary(3)(torch.arange(9).reshape(3, 3)),
+                torch.tensor([0, 4, 8]),
+            )
+        )
+        self.assertTrue(torch.equal(sample_summary(5)(tensor), tensor.reshape(-1)))
@@ -47,3 +47,13 @@ class TestL1Comparator(unittest.TestCase):
         expected = 14.0
         result = self.l1_comparator.element_compare(a, b)
         self.assertAlmostEqual(result, expected)
+
+    def test_chunked(self):
+        a = torch.randn(10, 101)
+        b = a + 0.1 * torch.randn(10, 101)
+        a[3, 5] = float("nan")
+        expected = self.l1_comparator.element_compare(a, b)
+        chunked_comparator = L1Comparator(chunk_size=64)
+        self.assertAlmostEqual(
+            chunked_comparator._chunked_element_compare(a, b), expected
+        )
@@ -8,7 +8,10 @@ import unittest
 
 import torch
 
-from executorch.devtools.inspector.numerical_comparator import MSEComparator
+from executorch.devtools.inspector.numerical_comparator import (
+    MSEComparator,
+    NumericalComparatorBase,
+)
 
 
 class TestMSEComparator(unittest.TestCase):
@@ -47,3 +50,66 @@ class TestMSEComparator(unittest.TestCase):
         expected = (9.0 + 49.0 + 9.0 + 36.0) / 4.0
         result = self.mse_comparator.element_compare(a, b)
         self.assertAlmostEqual(result, expected)
+
+    def test_chunked(self):
+        a = torch.randn(10, 101)
+        b = a + 0.1 * torch.randn(10, 101)
+        a[3, 5] = float("nan")
+        expected = self.mse_comparator.element_compare(a, b)
+        chunked_comparator = MSEComparator(chunk_size=64)
+        self.assertAlmostEqual(
+            chunked_comparator._chunked_element_compare(a, b), expected
+        )
+
+    def test_chunked_without_reduce_sums(self):
+        # A comparator that only implements chunk_sums falls back to comparing
+        # whole tensors.
+        class ChunkSumsOnlyComparator(MSEComparator):
+            reduce_sums = NumericalComparatorBase.reduce_sums
+
+        a = torch.randn(10, 101)
+        b = a + 0.1 * torch.randn(10, 101)
+        expected = self.mse_comparator.element_compare(a, b)
+        self.assertAlmostEqual(
+            ChunkSumsOnlyComparator(chunk_size=64)._chunked_element_compare(a, b),
+            expected,
+        )
+
+    def test_chunked_with_overridden_element_compare(self):
+        # A subclass that only overrides element_compare inherits chunk_sums,
+        # which compute the MSE, but must be compared with its own metric.
+        class MaxErrorComparator(MSEComparator):
+            def element_compare(self, a, b) -> float:
+                return float((a - b).abs().max())
+
+        a = torch.randn(10, 101)
+        b = a + 0.1 * torch.randn(10, 101)
+        comparator = MaxErrorComparator(chunk_size=64)
+        self.assertAlmostEqual(
+            comparator._chunked_element_compare(a, b),
+            comparator.element_compare(a, b),
+        )
+
+    def test_compare_chunked_with_threads(self):
+        mapping = {
+            ((i,), torch.randn(8, 50)): ((i, i + 100), torch.randn(8, 50))
+            for i in range(6)
+        }
+        aot_debug_handle_to_op_names = {(i,): [f"aot_{i}"] for i in range(6)}
+        runtime_debug_handle_to_op_names = {
+            (i, i + 100): [f"runtime_{i}"] for i in range(6)
+        }
+        expected = self.mse_comparator.compare(
+            mapping, aot_debug_handle_to_op_names, runtime_debug_handle_to_op_names
+        )
+        df = MSEComparator(chunk_size=100, max_workers=3).compare(
+            mapping, aot_debug_handle_to_op_names, runtime_debug_handle_to_op_names
+        )
+        self.assertEqual(list(df["aot_ops"]), list(expected["aot_ops"]))
+        self.assertEqual(list(df["runtime_ops"]), list(expected["runtime_ops"]))
+        for gap, expected_gap in zip(df["gap"], expected["gap"]):
+            self.assertAlmostEqual(gap[0], expected_gap[0])
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            MSEComparator(chunk_size=0)
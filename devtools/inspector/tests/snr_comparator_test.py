@@ -50,3 +50,13 @@ class TestSNRComparator(unittest.TestCase):
         expected = 10 * math.log10(37.25 / 17.0)
         result = self.snr_comparator.element_compare(a, b)
         self.assertAlmostEqual(result, expected)
+
+    def test_chunked(self):
+        a = torch.randn(10, 101)
+        b = a + 0.1 * torch.randn(10, 101)
+        a[3, 5] = float("nan")
+        expected = self.snr_comparator.element_compare(a, b)
+        chunked_comparator = SNRComparator(chunk_size=64)
+        self.assertAlmostEqual(
+            chunked_comparator._chunked_element_compare(a, b), expected
+        )
@@ -12,9 +12,9 @@ import argparse
 import struct
 from collections import Counter
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from executorch.exir._serialize._program import deserialize_pte_binary
+from executorch.exir._serialize._program import LazyPTEFile
 from executorch.exir.scalar_type import ScalarType
 from executorch.exir.schema import (
     Bool,
@@ -227,20 +227,14 @@ def _build_tensor_to_operators(
     return mapping
 
 
-def _get_tensor_bytes(
-    tensor: Tensor,
-    constant_buffer: list,
-    mutable_data: Optional[list],
-) -> Optional[bytes]:
-    if tensor.data_buffer_idx > 0 and tensor.data_buffer_idx < len(constant_buffer):
-        return constant_buffer[tensor.data_buffer_idx].storage
+def _get_tensor_bytes(tensor: Tensor, pte: LazyPTEFile) -> Optional[memoryview]:
+    if tensor.data_buffer_idx > 0:
+        return pte.constant_data(tensor.data_buffer_idx)
     if (
         tensor.extra_tensor_info
         and tensor.extra_tensor_info.mutable_data_segments_idx > 0
-        and mutable_data is not None
-        and tensor.extra_tensor_info.mutable_data_segments_idx < len(mutable_data)
     ):
-        return mutable_data[tensor.extra_tensor_info.mutable_data_segments_idx].storage
+        return pte.mutable_data(tensor.extra_tensor_info.mutable_data_segments_idx)
     return None
 
 
@@ -255,8 +249,8 @@ def _unravel_index(flat_idx: int, sizes: List[int]) -> Tuple[int, ...]:
 
 
 def _compute_tensor_stats(
-    bytes_a: bytes,
-    bytes_b: bytes,
+    bytes_a: Union[bytes, memoryview],
+    bytes_b: Union[bytes, memoryview],
     scalar_type: ScalarType,
     sizes: List[int],
     max_samples: int = 10,
@@ -478,26 +472,37 @@ def _format_size(num_bytes: int) -> str:
 
 
 def diff_pte(
-    data_a: bytes,
-    data_b: bytes,
+    data_a: Union[bytes, memoryview],
+    data_b: Union[bytes, memoryview],
     path_a: str = "A",
     path_b: str = "B",
     max_samples: int = 10,
 ) -> PTEDiffResult:
+    """Diffs two PTE files given as bytes-like objects (e.g. mmaps).
+
+    The files are read lazily: only execution plan metadata is decoded, and
+    tensor data is compared in place.
+    """
     result = PTEDiffResult(
         path_a=path_a,
         path_b=path_b,
         size_a=len(data_a),
         size_b=len(data_b),
-        bitwise_equal=data_a == data_b,
+        bitwise_equal=memoryview(data_a) == memoryview(data_b),
     )
 
     if result.bitwise_equal:
         return result
 
     try:
-        pte_a = deserialize_pte_binary(data_a)
-        pte_b = deserialize_pte_binary(data_b)
+        pte_a = LazyPTEFile(data_a)
+        pte_b = LazyPTEFile(data_b)
+        plans_a = [
+            plan.to_dataclass(ExecutionPlan) for plan in pte_a.program.execution_plan
+        ]
+        plans_b = [
+            plan.to_dataclass(ExecutionPlan) for plan in pte_b.program.execution_plan
+        ]
     except Exception as e:
         result.error = f"Deserialization failed: {e}"
         return result
@@ -509,28 +514,19 @@ def diff_pte(
         result.version_a = prog_a.version
         result.version_b = prog_b.version
 
-    num_plans = min(len(prog_a.execution_plan), len(prog_b.execution_plan))
+    num_plans = min(len(plans_a), len(plans_b))
 
     for i in range(num_plans):
-        plan_a = prog_a.execution_plan[i]
-        plan_b = prog_b.execution_plan[i]
         plan_diff = _diff_execution_plan(
-            i,
-            plan_a,
-            plan_b,
-            prog_a,
-            prog_b,
-            pte_a.mutable_data,
-            pte_b.mutable_data,
-            max_samples,
+            i, plans_a[i], plans_b[i], pte_a, pte_b, max_samples
         )
         if plan_diff.has_differences():
             result.plan_diffs.append(plan_diff)
 
-    for i in range(num_plans, len(prog_a.execution_plan)):
-        result.extra_plans_in_a.append(prog_a.execution_plan[i].name)
-    for i in range(num_plans, len(prog_b.execution_plan)):
-        result.extra_plans_in_b.append(prog_b.execution_plan[i].name)
+    for i in range(num_plans, len(plans_a)):
+        result.extra_plans_in_a.append(plans_a[i].name)
+    for i in range(num_plans, len(plans_b)):
+        result.extra_plans_in_b.append(plans_b[i].name)
 
     # Compare named data
     named_a = {nd.key: nd.segment_index for nd in (prog_a.named_data or [])}
@@ -551,10 +547,8 @@ def _diff_tensors(
     tensor_b: Tensor,
     op_map_a: Dict[int, List[OperatorUsage]],
     op_map_b: Dict[int, List[OperatorUsage]],
-    constant_buffer_a: list,
-    constant_buffer_b: list,
-    mutable_data_a: Optional[list],
-    mutable_data_b: Optional[list],
+    pte_a: LazyPTEFile,
+    pte_b: LazyPTEFile,
     max_samples: int,
 ) -> Optional[TensorDataDiff]:
     """Compare two tensors at the same evalue index. Returns None if identical."""
@@ -563,8 +557,8 @@ def _diff_tensors(
 
     metadata_diffs = _diff_tensor_metadata(tensor_a, tensor_b)
 
-    bytes_a = _get_tensor_bytes(tensor_a, constant_buffer_a, mutable_data_a)
-    bytes_b = _get_tensor_bytes(tensor_b, constant_buffer_b, mutable_data_b)
+    bytes_a = _get_tensor_bytes(tensor_a, pte_a)
+    bytes_b = _get_tensor_bytes(tensor_b, pte_b)
 
     has_data = bytes_a is not None or bytes_b is not None
     data_matches = bytes_a is not None and bytes_b is not None and bytes_a == bytes_b
@@ -599,10 +593,8 @@ def _diff_execution_plan(  # noqa: C901
     plan_index: int,
     plan_a: ExecutionPlan,
     plan_b: ExecutionPlan,
-    prog_a,
-    prog_b,
-    mutable_data_a: Optional[list],
-    mutable_data_b: Optional[list],
+    pte_a: LazyPTEFile,
+    pte_b: LazyPTEFile,
     max_samples: int,
 ) -> ExecutionPlanDiff:
     diff = ExecutionPlanDiff(plan_index=plan_index)
@@ -674,10 +666,8 @@ def _diff_execution_plan(  # noqa: C901
                 ev_b.val,
                 op_map_a,
                 op_map_b,
-                prog_a.constant_buffer,
-                prog_b.constant_buffer,
-                mutable_data_a,
-                mutable_data_b,
+                pte_a,
+                pte_b,
                 max_samples,
             )
             if td is not None:
@@ -880,13 +870,13 @@ def _main() -> None:
     )
     args = parser.parse_args()
 
-    with open(args.file_a, "rb") as f:
-        data_a = f.read()
-    with open(args.file_b, "rb") as f:
-        data_b = f.read()
-
+    # mmap the files so that only the parts that are compared are read.
     result = diff_pte(
-        data_a, data_b, args.file_a, args.file_b, max_samples=args.max_samples
+        LazyPTEFile.open(args.file_a).data,
+        LazyPTEFile.open(args.file_b).data,
+        args.file_a,
+        args.file_b,
+        max_samples=args.max_samples,
     )
     print(format_diff_result(result, verbose=args.verbose))
 
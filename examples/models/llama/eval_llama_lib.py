@@ -7,7 +7,7 @@
 
 import argparse
 
-from typing import Optional, Union
+from typing import Iterable, List, Optional, Tuple, Union
 
 import torch
 
@@ -25,6 +25,12 @@ from torch.nn import CrossEntropyLoss
 from tqdm import tqdm
 
 from .evaluate.eager_eval import EagerEvalWrapper
+from .evaluate.pte_eval import (
+    generate_greedy,
+    prefetch,
+    PrefixCachingScorer,
+    PTEForward,
+)
 
 from .export_llama_lib import (
     _prepare_for_llama_export,
@@ -90,6 +96,11 @@ class ETPybindEvalWrapper(EagerEvalWrapper):
     """
     A wrapper class for ExecuTorch py-binded integration with the
     lm-evaluation-harness library.
+
+    Loglikelihood requests are tokenized by a worker thread while the program
+    runs, and scored by a PrefixCachingScorer, which reorders them to reuse the
+    KV cache of the prefixes they share and feeds each one in as few calls as
+    the program allows. The program doesn't need to return full logits.
     """
 
     def __init__(
@@ -97,6 +108,7 @@ class ETPybindEvalWrapper(EagerEvalWrapper):
         model: str,
         tokenizer: Union[SentencePieceTokenizer, Tiktoken],
         max_seq_length: Optional[int] = None,
+        window_size: int = 256,
     ):
         super().__init__(None, tokenizer, max_seq_length)  # pyre-ignore
         self._model = model  # Expects model to be path to a .pte file
@@ -113,31 +125,104 @@ class ETPybindEvalWrapper(EagerEvalWrapper):
         from executorch.kernels import quantized  # noqa
 
         self._et_model = _load_for_executorch(self._model)
-        self._use_kv_cache = self._et_model.run_method("use_kv_cache")[0]  # pyre-ignore
+        self._forward = PTEForward(self._et_model, max_seq_length)
+        self._use_kv_cache = self._forward.use_kv_cache
+        if max_seq_length is None and self._forward.max_context_len is not None:
+            self._max_seq_length = self._forward.max_context_len
+        self._scorer = PrefixCachingScorer(
+            self._forward, self.max_length, self._use_kv_cache, window_size
+        )
 
     def _model_call(self, inps):
-        # Given inps (tokens), return the logits from a single forward call
-        # inps: Tensor of shape (1, max_seq_len - 1)
-        # logits: Tensor of shape (1, max_seq_len - 1, vocab_size)
-        result = []
-        if self._use_kv_cache:
-            pos_tensor = torch.tensor([0], dtype=torch.int64, device=self.device)
-            result = self._et_model.forward(
-                (inps[:, : self._max_seq_length], pos_tensor)
-            )
+        # Given inps (tokens), return the logits of all of them
+        # inps: Tensor of shape (1, N)
+        # logits: Tensor of shape (1, N, vocab_size)
+        return self._forward(inps[0, : self._max_seq_length].tolist()).unsqueeze(0)
+
+    def _encode_request(self, args: Tuple[str, str]):
+        context, continuation = args
+        if context == "":
+            # Like lm-eval, the prefix token is the context of empty ones.
+            context_enc = [self.prefix_token_id]
+            continuation_enc = self.tok_encode(continuation)
         else:
-            result = self._et_model.forward((inps,))
-        if result[0].dim() != 3:
-            raise ValueError(
-                f"Dim of logits must be 3 for evaluation. Got {result[0].dim()} here. Add --generate_full_logits in export_llama to generate a pte file with full logits."
+            context_enc, continuation_enc = self._encode_pair(context, continuation)
+        return (context, continuation), context_enc, continuation_enc
+
+    def _score_requests(
+        self, requests: Iterable, num_requests: Optional[int], disable_tqdm: bool
+    ) -> List[Tuple[float, bool]]:
+        cache_keys = []
+
+        def token_pairs():
+            for cache_key, context_enc, continuation_enc in tqdm(
+                requests,
+                total=num_requests,
+                disable=disable_tqdm,
+                desc="Running loglikelihood requests",
+            ):
+                cache_keys.append(cache_key)
+                yield context_enc, continuation_enc
+
+        results = self._scorer.score(token_pairs())
+        for cache_key, result in zip(cache_keys, results):
+            if cache_key is not None:
+                self.cache_hook.add_partial("loglikelihood", cache_key, result)
+        return results
+
+    def loglikelihood(self, requests, disable_tqdm: bool = False):
+        # The program runs without the GIL, so the worker thread tokenizes the
+        # next requests in the meantime.
+        encoded = prefetch(map(self._encode_request, [req.args for req in requests]))
+        return self._score_requests(encoded, len(requests), disable_tqdm)
+
+    def _loglikelihood_tokens(self, requests, disable_tqdm=False, override_bs=None):
+        return self._score_requests(requests, len(requests), disable_tqdm)
+
+    def loglikelihood_rolling(self, requests, disable_tqdm: bool = False):
+        # Like lm-eval, but the windows of all the requests are scored together.
+        from lm_eval.utils import get_rolling_token_windows, make_disjoint_window
+
+        strings = [req.args[0] for req in requests]
+        num_windows = []
+
+        def windows():
+            for string in strings:
+                rolling_windows = [
+                    (None,) + make_disjoint_window(window)
+                    for window in get_rolling_token_windows(
+                        token_list=self.tok_encode(string),
+                        prefix_token=self.prefix_token_id,
+                        max_seq_len=self.max_length,
+                        context_len=1,
+                    )
+                ]
+                num_windows.append(len(rolling_windows))
+                yield from rolling_windows
+
+        results = self._score_requests(prefetch(windows()), None, disable_tqdm)
+        loglikelihoods = []
+        start = 0
+        for string, count in zip(strings, num_windows):
+            loglikelihood = sum(
+                log_prob for log_prob, _ in results[start : start + count]
+            )
+            start += count
+            loglikelihoods.append(loglikelihood)
+            self.cache_hook.add_partial(
+                "loglikelihood_rolling", (string,), loglikelihood
             )
-        return result[0]
+        return loglikelihoods
 
 
-class ETRunnerEvalWrapper(EagerEvalWrapper):
+class ETRunnerEvalWrapper(ETPybindEvalWrapper):
     """
     A wrapper class for ExecuTorch Runtime integration with the
     lm-evaluation-harness library.
+
+    Loglikelihood requests are scored like ETPybindEvalWrapper does. Generation
+    requests are greedily decoded with the same loaded program, instead of a
+    second copy of it in a runner. `tokenizer_bin` is kept for compatibility.
     """
 
     def __init__(
@@ -147,18 +232,35 @@ class ETRunnerEvalWrapper(EagerEvalWrapper):
         tokenizer_bin: str,
         max_seq_length: Optional[int] = None,
     ):
-        super().__init__(None, tokenizer, max_seq_length)  # pyre-ignore
-        self._model = model
+        super().__init__(model, tokenizer, max_seq_length)
         self._tokenizer_bin = tokenizer_bin
 
-    def _model_call(self, inps):
-        # Given inps (tokens), return the logits from a single
-        # forward call
-
-        # Example:
-        # inps: Tensor of shape (1, N)
-        # logits: Tensor of shape (1, N, vocab_size)
-        pass
+    def _model_generate(self, context, max_length, stop=None, **generation_kwargs):
+        # Given context (tokens) of shape (1, N), return the tokens of shape
+        # (1, M), M <= max_length, of the context followed by greedily generated
+        # ones, until the EOT token or one of the stop sequences.
+        max_length = min(max_length, self.max_length)
+        max_new_tokens = max_length - context.shape[1]
+        if max_new_tokens <= 0:
+            return context
+
+        def is_stopped(generated: List[int]) -> bool:
+            if generated[-1] == self.eot_token_id:
+                return True
+            return bool(stop) and any(s in self.tok_decode(generated) for s in stop)
+
+        generated = generate_greedy(
+            self._forward,
+            self._use_kv_cache,
+            context[0].tolist(),
+            max_new_tokens,
+            is_stopped,
+        )
+        # Generation overwrote the KV cache of the last scored request.
+        self._scorer.reset_cache()
+        return torch.cat(
+            [context, torch.tensor([generated], dtype=context.dtype)], dim=1
+        )
 
 
 def gen_eval_wrapper(
@@ -0,0 +1,310 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# Scoring of lm-eval loglikelihood requests with an ExecuTorch program, see
+# ETPybindEvalWrapper in eval_llama_lib.py. Nothing here depends on lm-eval.
+
+# pyre-unsafe
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import torch
+
+# Returns the logits, of shape [len(tokens), vocab_size], of `tokens` fed to the
+# model from position `start_pos`, see PTEForward.
+Forward = Callable[[Sequence[int], int], torch.Tensor]
+
+_DONE = object()
+
+
+def _put(pending: "queue.Queue[Any]", stopped: threading.Event, item: Any) -> bool:
+    while not stopped.is_set():
+        try:
+            pending.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _produce(
+    items: Iterable[Any], pending: "queue.Queue[Any]", stopped: threading.Event
+) -> None:
+    try:
+        for item in items:
+            if not _put(pending, stopped, (item, None)):
+                return
+    except Exception as e:
+        _put(pending, stopped, (_DONE, e))
+        return
+    _put(pending, stopped, (_DONE, None))
+
+
+def prefetch(items: Iterable[Any], max_pending: int = 64) -> Iterator[Any]:
+    """
+    Yields the items of `items`, which are produced by a worker thread up to
+    `max_pending` items ahead of the consumer, e.g. to tokenize requests while the
+    model runs. Exceptions of the worker are raised by the consumer.
+    """
+    pending: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+    stopped = threading.Event()
+    worker = threading.Thread(
+        target=_produce, args=(items, pending, stopped), name="prefetch", daemon=True
+    )
+    worker.start()
+    try:
+        while True:
+            item, error = pending.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        # Unblocks the worker if the consumer stops early.
+        stopped.set()
+
+
+def _metadata(et_model, method_names: Sequence[str], name: str, default: Any) -> Any:
+    if name not in method_names:
+        return default
+    return et_model.run_method(name)[0]
+
+
+class PTEForward:
+    """
+    Runs the forward method of a program exported by export_llama, through
+    pybindings, on any number of tokens, see Forward.
+
+    With a KV cache, tokens are fed in chunks of up to the number of tokens the
+    program accepts per call: max_seq_len - 1 with dynamic shapes, else 1. If the
+    program only returns the logits of the last token, which is detected from the
+    first call, the tokens are fed one at a time instead. Without a KV cache, the
+    tokens are fed at once, as a sequence starting at position 0.
+    """
+
+    def __init__(self, et_model, max_seq_len: Optional[int] = None) -> None:
+        """
+        Args:
+            et_model: Module loaded by _load_for_executorch().
+            max_seq_len: Maximum sequence length, if the program doesn't have a
+                get_max_seq_len method.
+        """
+        self._et_model = et_model
+        method_names = et_model.method_names()
+        self.use_kv_cache = bool(
+            _metadata(et_model, method_names, "use_kv_cache", False)
+        )
+        enable_dynamic_shape = bool(
+            _metadata(et_model, method_names, "enable_dynamic_shape", True)
+        )
+        self.max_seq_len: Optional[int] = _metadata(
+            et_model, method_names, "get_max_seq_len", max_seq_len
+        )
+        # Number of positions of the KV cache.
+        self.max_context_len: Optional[int] = _metadata(
+            et_model, method_names, "get_max_context_len", self.max_seq_len
+        )
+        if not self.use_kv_cache or not enable_dynamic_shape:
+            self._chunk_size = 1
+        elif self.max_seq_len is None:
+            raise ValueError(
+                "The program has no get_max_seq_len method, max_seq_len must be set"
+            )
+        else:
+            self._chunk_size = max(self.max_seq_len - 1, 1)
+        # Whether the program returns the logits of all the tokens, unknown
+        # until the first call.
+        self._full_logits: Optional[bool] = None
+        self.num_calls = 0
+
+    def _call(self, tokens: Sequence[int], start_pos: int) -> torch.Tensor:
+        inputs: Tuple[torch.Tensor, ...] = (torch.tensor([tokens], dtype=torch.int64),)
+        if self.use_kv_cache:
+            inputs += (torch.tensor([start_pos], dtype=torch.int64),)
+        self.num_calls += 1
+        # Without the GIL, so that prefetch() can prepare the next requests.
+        logits = self._et_model.forward(inputs, release_gil=True)[0]
+        if self._full_logits is None:
+            self._full_logits = logits.dim() == 3
+        # [1, num_tokens, vocab_size] or [1, vocab_size]
+        return logits[0] if self._full_logits else logits
+
+    def _forward_no_kv_cache(self, tokens: Sequence[int]) -> torch.Tensor:
+        logits = self._call(tokens, 0)
+        if self._full_logits:
+            return logits
+        # The logits of each token need a call on the tokens up to it.
+        return torch.cat(
+            [self._call(tokens[:i], 0) for i in range(1, len(tokens))] + [logits]
+        )
+
+    def __call__(self, tokens: Sequence[int], start_pos: int = 0) -> torch.Tensor:
+        if not self.use_kv_cache:
+            if start_pos != 0:
+                raise ValueError("Without a KV cache, tokens start at position 0")
+            return self._forward_no_kv_cache(tokens)
+
+        logits = []
+        start = 0
+        while start < len(tokens):
+            chunk_size = self._chunk_size if self._full_logits is not False else 1
+            chunk = tokens[start : start + chunk_size]
+            chunk_logits = self._call(chunk, start_pos + start)
+            if not self._full_logits and len(chunk) > 1:
+                # Only the logits of the last token, feed the chunk again one
+                # token at a time, which overwrites the same cache positions.
+                continue
+            logits.append(chunk_logits)
+            start += len(chunk)
+        return torch.cat(logits)
+
+
+def generate_greedy(
+    forward: Forward,
+    use_kv_cache: bool,
+    context: Sequence[int],
+    max_new_tokens: int,
+    stop: Optional[Callable[[List[int]], bool]] = None,
+) -> List[int]:
+    """
+    Returns up to `max_new_tokens` tokens greedily generated by `forward` after
+    `context`, stopping early once `stop` returns True on the tokens generated
+    so far. With a KV cache, each generated token is fed on its own.
+    """
+    if max_new_tokens <= 0:
+        return []
+    tokens = list(context)
+    generated: List[int] = []
+    with torch.no_grad():
+        logits = forward(tokens, 0)
+        while True:
+            generated.append(int(torch.argmax(logits[-1]).item()))
+            if len(generated) == max_new_tokens or (stop and stop(generated)):
+                return generated
+            if use_kv_cache:
+                logits = forward(generated[-1:], len(tokens) + len(generated) - 1)
+            else:
+                logits = forward(tokens + generated, 0)
+
+
+@dataclass
+class ScorerStats:
+    num_requests: int = 0
+    # Tokens whose logits were needed, and tokens fed to the model, fewer when
+    # prefixes of previous requests are reused.
+    num_tokens: int = 0
+    num_fed_tokens: int = 0
+
+
+class PrefixCachingScorer:
+    """
+    Scores lm-eval loglikelihood requests, i.e. the log probability of a
+    continuation given a context, and whether it is the greedy one, with
+    `forward`.
+
+    Requests are scored in windows of `window_size` requests, in the
+    lexicographic order of their tokens, so that requests sharing a prefix, like
+    the choices of a multiple choice question, are scored one after the other.
+    With a KV cache, the tokens of the prefix shared with the previous request
+    are then not fed to the model again: the cache already holds them, and
+    attention ignores the entries of later positions, which are overwritten.
+    """
+
+    def __init__(
+        self,
+        forward: Forward,
+        max_length: int,
+        use_kv_cache: bool,
+        window_size: int = 256,
+    ) -> None:
+        """
+        Args:
+            forward: See Forward.
+            max_length: Maximum number of tokens fed to the model per request.
+                Longer requests are truncated from the left, like lm-eval does.
+            use_kv_cache: Whether `forward` keeps a KV cache between calls.
+            window_size: Number of requests reordered together, which bounds the
+                number of requests read ahead of the ones scored.
+        """
+        if window_size <= 0:
+            raise ValueError(f"window_size must be positive, got {window_size}")
+        self._forward = forward
+        self._max_length = max_length
+        self._use_kv_cache = use_kv_cache
+        self._window_size = window_size
+        # Tokens in the KV cache.
+        self._cached: List[int] = []
+        self.stats = ScorerStats()
+
+    def reset_cache(self) -> None:
+        """Forgets the tokens in the KV cache, after `forward` is used elsewhere."""
+        self._cached = []
+
+    def _logits(self, tokens: List[int], first: int) -> torch.Tensor:
+        """Returns the logits of tokens[first:], reusing the cached prefix."""
+        start = 0
+        if self._use_kv_cache:
+            shared = 0
+            for cached, token in zip(self._cached, tokens):
+                if cached != token:
+                    break
+                shared += 1
+            start = min(shared, first)
+            self._cached = tokens
+        self.stats.num_tokens += len(tokens)
+        self.stats.num_fed_tokens += len(tokens) - start
+        return self._forward(tokens[start:], start)[first - start :]
+
+    def _score(
+        self, context: Sequence[int], continuation: Sequence[int]
+    ) -> Tuple[float, bool]:
+        # Like lm-eval, the last continuation token is only a target.
+        tokens = (list(context) + list(continuation))[-(self._max_length + 1) :]
+        num_targets = min(len(continuation), len(tokens) - 1)
+        targets = torch.tensor(tokens[-num_targets:])
+        logits = self._logits(tokens[:-1], len(tokens) - 1 - num_targets)
+        log_probs = torch.log_softmax(logits.float(), dim=-1)
+        log_prob = log_probs.gather(1, targets.unsqueeze(1)).sum().item()
+        is_greedy = bool((log_probs.argmax(dim=-1) == targets).all())
+        self.stats.num_requests += 1
+        return log_prob, is_greedy
+
+    def _score_window(
+        self,
+        window: List[Tuple[Sequence[int], Sequence[int]]],
+        results: List[Tuple[float, bool]],
+    ) -> None:
+        order = sorted(
+            range(len(window)), key=lambda i: list(window[i][0]) + list(window[i][1])
+        )
+        scored: List[Any] = [None] * len(window)
+        for i in order:
+            scored[i] = self._score(*window[i])
+        results.extend(scored)
+
+    def score(
+        self, requests: Iterable[Tuple[Sequence[int], Sequence[int]]]
+    ) -> List[Tuple[float, bool]]:
+        """
+        Returns the (log probability, is greedy) of each (context tokens,
+        continuation tokens) of `requests`, in the same order. `requests` is read
+        one window at a time, so it can be produced while earlier windows are
+        scored, see prefetch().
+        """
+        results: List[Tuple[float, bool]] = []
+        window: List[Tuple[Sequence[int], Sequence[int]]] = []
+        with torch.no_grad():
+            for request in requests:
+                window.append(request)
+                if len(window) == self._window_size:
+                    self._score_window(window, results)
+                    window = []
+            if window:
+                self._score_window(window, results)
+        return results
@@ -303,6 +303,28 @@ def build_args_parser() -> argparse.ArgumentParser:
         default="Once upon a time",
         help="Calibration prompts from users",
     )
+    parser.add_argument(
+        "--calibration_mode",
+        type=str,
+        default=None,
+        choices=["decode", "prefill"],
+        help="Calibrate by decoding one token at a time and running lm_eval (decode, "
+        "the default), or by prefilling whole calibration samples (prefill). With "
+        "prefill, --calibration_data can be a text file of samples separated by "
+        "blank lines.",
+    )
+    parser.add_argument(
+        "--calibration_max_tokens",
+        type=int,
+        default=None,
+        help="Maximum number of tokens to prefill for calibration",
+    )
+    parser.add_argument(
+        "--calibration_cache_dir",
+        type=str,
+        default=None,
+        help="Directory to cache the tokenized calibration samples in",
+    )
     parser.add_argument(
         "-t",
         "--tokenizer_path",
@@ -1602,6 +1624,9 @@ def _load_llama_model(llm_config: LlmConfig) -> "LLMEdgeManager":
         calibration_limit=llm_config.quantization.calibration_limit,
         calibration_seq_length=llm_config.quantization.calibration_seq_length,
         calibration_data=llm_config.quantization.calibration_data,
+        calibration_mode=llm_config.quantization.calibration_mode.value,
+        calibration_max_tokens=llm_config.quantization.calibration_max_tokens,
+        calibration_cache_dir=llm_config.quantization.calibration_cache_dir,
         tokenizer_path=llm_config.base.tokenizer_path,
         save_exported_program=llm_config.export.export_only,
         verbose=llm_config.debug.verbose,
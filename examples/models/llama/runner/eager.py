@@ -13,7 +13,10 @@ from executorch.examples.models.llama.export_llama_lib import (
     _prepare_for_llama_export,
     build_args_parser as _build_args_parser,
 )
-from executorch.examples.models.llama.runner.generation import LlamaRunner
+from executorch.examples.models.llama.runner.generation import (
+    add_speculative_decoding_args,
+    LlamaRunner,
+)
 from executorch.extension.llm.export.builder import LLMEdgeManager
 
 from executorch.extension.llm.export.config.llm_config import LlmConfig
@@ -89,6 +92,8 @@ def build_args_parser() -> argparse.ArgumentParser:
         help="Path to an accompanying tokenizer_config.json, which provides metadata for the main tokenizer.json",
     )
 
+    add_speculative_decoding_args(parser)
+
     return parser
 
 
@@ -114,6 +119,15 @@ def execute_runner(runner_class: Type[LlamaRunner]) -> None:
             tokenizer_config_path=tokenizer_config_path,
             use_attention_sink=use_attention_sink,
         )
+        if args.draft_pte is not None:
+            # Imported here as it loads the pybindings.
+            from executorch.examples.models.llama.runner.native import (
+                load_draft_forward,
+            )
+
+            runner.enable_speculative_decoding(
+                load_draft_forward(args.draft_pte), args.num_draft_tokens
+            )
 
         generated_tokens = (
             runner.chat_completion(
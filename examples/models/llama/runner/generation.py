@@ -4,9 +4,11 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import argparse
 import time
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
 
 import torch
 
@@ -46,6 +48,81 @@ def next_token(logits: torch.Tensor, temperature: float, top_p: float) -> int:
     return torch.argmax(logits, dim=-1).item()
 
 
+def token_probs(logits: torch.Tensor, temperature: float, top_p: float) -> torch.Tensor:
+    """
+    Returns the distribution that next_token() samples from, of shape
+    [vocab_size], given the logits of a token. It is one-hot on the argmax if
+    temperature is 0.
+    """
+    logits = logits.reshape(-1).float()
+    if temperature <= 0:
+        probs = torch.zeros_like(logits)
+        probs[torch.argmax(logits)] = 1.0
+        return probs
+    probs = torch.softmax(logits / temperature, dim=-1)
+    # Like sample_top_p(), in vocab order.
+    probs_sort, probs_idx = torch.sort(probs, descending=True)
+    mask = torch.cumsum(probs_sort, dim=-1) - probs_sort > top_p
+    probs_sort[mask] = 0.0
+    filtered = torch.zeros_like(probs).scatter_(0, probs_idx, probs_sort)
+    return filtered / filtered.sum()
+
+
+# Takes the tokens [1, num_tokens] to feed from the position input_pos [1],
+# and returns the logits of the last token [1, vocab_size], or of all the tokens
+# [1, num_tokens, vocab_size], like LlamaRunner.forward().
+DecoderForward = Callable[[torch.Tensor, Optional[torch.Tensor]], torch.Tensor]
+
+
+def last_token_logits(logits: torch.Tensor) -> torch.Tensor:
+    """Returns the logits [1, vocab_size] of the last token of `logits`."""
+    return logits[:, -1] if logits.dim() == 3 else logits
+
+
+def add_speculative_decoding_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--draft_pte",
+        type=str,
+        default=None,
+        help="Path to the pte file of a smaller draft model, with the same tokenizer, to decode speculatively. "
+        "Both models need a KV cache and dynamic shapes, and the main one --generate_full_logits.",
+    )
+    parser.add_argument(
+        "--num_draft_tokens",
+        type=int,
+        default=4,
+        help="Number of tokens the draft model proposes per forward call of the main model.",
+    )
+
+
+@dataclass
+class GenerationStats:
+    """Statistics of the last LlamaRunner.generate() call."""
+
+    num_prompt_tokens: int = 0
+    prefill_time: float = 0.0
+    # Tokens generated after the first one, which comes from the prefill, and
+    # the time it took.
+    num_decoded_tokens: int = 0
+    decode_time: float = 0.0
+    # Decode calls of the target model.
+    num_forwards: int = 0
+    # Tokens proposed by the draft model and accepted by the target model, with
+    # speculative decoding.
+    num_draft_tokens: int = 0
+    num_accepted_tokens: int = 0
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.num_decoded_tokens / self.decode_time if self.decode_time else 0.0
+
+    @property
+    def accept_rate(self) -> float:
+        if not self.num_draft_tokens:
+            return 0.0
+        return self.num_accepted_tokens / self.num_draft_tokens
+
+
 class LlamaRunner(ABC):
     def __init__(
         self,
@@ -79,6 +156,33 @@ class LlamaRunner(ABC):
             print(
                 "Warning - given vocab_size in params is unequal to tokenizer vocab size."
             )
+        self.draft_forward: Optional[DecoderForward] = None
+        self.num_draft_tokens = 0
+        self.stats = GenerationStats()
+
+    def enable_speculative_decoding(
+        self, draft_forward: DecoderForward, num_draft_tokens: int = 4
+    ) -> None:
+        """
+        Makes generate() decode speculatively: `draft_forward`, a smaller model
+        with the same tokenizer, proposes `num_draft_tokens` tokens at a time,
+        which this model verifies with a single forward call. The generated
+        tokens follow the same distribution as without a draft model, and are
+        the same ones when sampling greedily, up to numerical differences.
+
+        Both models need a KV cache and to accept several tokens per call, and
+        this one needs to return the logits of all the tokens, e.g. exported
+        with --generate_full_logits. Models with recurrent state, e.g. DeltaNet
+        layers, aren't supported, as rejected tokens can't be rolled back.
+        """
+        if not self.use_kv_cache:
+            raise ValueError("Speculative decoding requires a KV cache")
+        if num_draft_tokens <= 0:
+            raise ValueError(
+                f"num_draft_tokens must be positive, got {num_draft_tokens}"
+            )
+        self.draft_forward = draft_forward
+        self.num_draft_tokens = num_draft_tokens
 
     @abstractmethod
     def forward(
@@ -88,6 +192,23 @@ class LlamaRunner(ABC):
     ) -> torch.Tensor:
         pass
 
+    def _is_stop_token(self, token: int) -> bool:
+        return token == self.tokenizer.eos_id or (
+            hasattr(self.tokenizer, "stop_tokens")
+            and token in self.tokenizer.stop_tokens
+        )
+
+    def _print_stats(self) -> None:
+        print(f"Prefill time: {self.stats.prefill_time}")
+        print(f"Generation tok/s: {self.stats.tokens_per_second}")
+        if self.stats.num_draft_tokens:
+            print(
+                f"Draft tokens accepted: {self.stats.num_accepted_tokens}/"
+                f"{self.stats.num_draft_tokens} ({self.stats.accept_rate:.1%}), "
+                f"{self.stats.num_decoded_tokens / self.stats.num_forwards:.2f} "
+                "tokens per forward"
+            )
+
     def generate(  # noqa: C901
         self,
         prompt_tokens: List[int],
@@ -97,6 +218,12 @@ class LlamaRunner(ABC):
         echo: bool = False,
         pos_base: int = 0,
     ) -> List[int]:
+        if self.draft_forward is not None:
+            return self._speculative_generate(
+                prompt_tokens, max_seq_len, temperature, top_p, echo, pos_base
+            )
+        self.stats = GenerationStats(num_prompt_tokens=len(prompt_tokens))
+
         # Prefill
         prefill_start = time.time()
         logits = self.forward(
@@ -107,46 +234,181 @@ class LlamaRunner(ABC):
                 else None
             ),
         )
-        prefill_time = time.time() - prefill_start
+        self.stats.prefill_time = time.time() - prefill_start
 
-        current_token = next_token(logits, temperature, top_p)
+        current_token = next_token(last_token_logits(logits), temperature, top_p)
         print(f"{self.tokenizer.decode_token(current_token)}", end="", flush=True)
         tokens = prompt_tokens + [current_token]
 
+        # Updated in place for each token rather than allocated again.
+        token_tensor = torch.empty((1, 1), dtype=torch.long, device=self.device)
+        pos_tensor = torch.empty((1,), dtype=torch.long, device=self.device)
         generate_start = time.time()
         while len(tokens) < max_seq_len:
             if self.use_kv_cache:
-                logits = self.forward(
-                    tokens=torch.tensor(
-                        [[current_token]], dtype=torch.long, device=self.device
-                    ),
-                    input_pos=torch.tensor(
-                        [pos_base + len(tokens) - 1],
-                        dtype=torch.long,
-                        device=self.device,
-                    ),
-                )
+                token_tensor.fill_(current_token)
+                pos_tensor.fill_(pos_base + len(tokens) - 1)
+                logits = self.forward(tokens=token_tensor, input_pos=pos_tensor)
             else:
                 logits = self.forward(
                     tokens=torch.tensor([tokens], dtype=torch.long, device=self.device),
                 )
+            self.stats.num_forwards += 1
 
             # If the logits aren't already clipped to only contain the last logit, clip them.
-            current_token = next_token(logits, temperature, top_p)
+            current_token = next_token(last_token_logits(logits), temperature, top_p)
             tokens.append(current_token)
+            self.stats.num_decoded_tokens += 1
 
-            if current_token == self.tokenizer.eos_id or (
-                hasattr(self.tokenizer, "stop_tokens")
-                and current_token in self.tokenizer.stop_tokens
-            ):
+            if self._is_stop_token(current_token):
                 break
 
             print(f"{self.tokenizer.decode_token(current_token)}", end="", flush=True)
         print("\n")
 
-        generate_time = time.time() - generate_start
-        print(f"Prefill time: {prefill_time}")
-        print(f"Generation tok/s: {len(tokens) / generate_time}")
+        self.stats.decode_time = time.time() - generate_start
+        self._print_stats()
+
+        return tokens if echo else tokens[len(prompt_tokens) :]
+
+    def _propose(
+        self,
+        tokens: List[int],
+        draft_len: int,
+        num_draft_tokens: int,
+        pos_base: int,
+        temperature: float,
+        top_p: float,
+    ) -> Tuple[List[int], List[torch.Tensor]]:
+        """
+        Returns `num_draft_tokens` tokens sampled from the draft model after
+        `tokens`, of which it already has the KV cache of the first `draft_len`,
+        and their draft distributions.
+        """
+        draft_forward = self.draft_forward
+        assert draft_forward is not None
+        proposals = []
+        draft_probs = []
+        feed = tokens[draft_len:]
+        pos = pos_base + draft_len
+        for _ in range(num_draft_tokens):
+            logits = draft_forward(
+                torch.tensor([feed], dtype=torch.long, device=self.device),
+                torch.tensor([pos], dtype=torch.long, device=self.device),
+            )
+            pos += len(feed)
+            probs = token_probs(last_token_logits(logits), temperature, top_p)
+            token = int(torch.multinomial(probs, num_samples=1).item())
+            proposals.append(token)
+            draft_probs.append(probs)
+            feed = [token]
+        return proposals, draft_probs
+
+    def _verify(
+        self,
+        logits: torch.Tensor,
+        proposals: List[int],
+        draft_probs: List[torch.Tensor],
+        temperature: float,
+        top_p: float,
+    ) -> List[int]:
+        """
+        Returns the accepted prefix of `proposals`, followed by a token sampled
+        from the target model, given its logits after the last token and each
+        proposal, by speculative sampling: a proposal is accepted with
+        probability min(1, p / q), where p and q are its target and draft
+        probabilities, and else replaced with a sample of max(p - q, 0).
+        """
+        accepted = []
+        for i, token in enumerate(proposals):
+            probs = token_probs(logits[i], temperature, top_p)
+            q = draft_probs[i][token]
+            if probs[token] >= q or torch.rand(()).item() * q < probs[token]:
+                accepted.append(token)
+                continue
+            residual = torch.clamp(probs - draft_probs[i], min=0.0)
+            if residual.sum() <= 0:
+                residual = probs
+            accepted.append(int(torch.multinomial(residual, num_samples=1).item()))
+            return accepted
+        probs = token_probs(logits[len(proposals)], temperature, top_p)
+        accepted.append(int(torch.multinomial(probs, num_samples=1).item()))
+        return accepted
+
+    def _speculative_generate(
+        self,
+        prompt_tokens: List[int],
+        max_seq_len: int,
+        temperature: float,
+        top_p: float,
+        echo: bool,
+        pos_base: int,
+    ) -> List[int]:
+        """
+        Like generate(), with the draft model of enable_speculative_decoding().
+        Tokens rejected by the target model stay in the KV caches of both
+        models, but are overwritten before attention reaches their positions.
+        """
+        draft_forward = self.draft_forward
+        assert draft_forward is not None
+        self.stats = GenerationStats(num_prompt_tokens=len(prompt_tokens))
+
+        prefill_start = time.time()
+        prompt = torch.tensor([prompt_tokens], dtype=torch.long, device=self.device)
+        start_pos = torch.tensor([pos_base], dtype=torch.long, device=self.device)
+        logits = self.forward(tokens=prompt, input_pos=start_pos)
+        draft_forward(prompt, start_pos)
+        self.stats.prefill_time = time.time() - prefill_start
+
+        current_token = next_token(last_token_logits(logits), temperature, top_p)
+        print(f"{self.tokenizer.decode_token(current_token)}", end="", flush=True)
+        tokens = prompt_tokens + [current_token]
+        # Number of tokens in the KV cache of the draft model.
+        draft_len = len(prompt_tokens)
+
+        generate_start = time.time()
+        done = False
+        while not done and len(tokens) < max_seq_len:
+            # Leave room for the token sampled from the target model.
+            num_draft_tokens = min(self.num_draft_tokens, max_seq_len - len(tokens) - 1)
+            proposals, draft_probs = self._propose(
+                tokens, draft_len, num_draft_tokens, pos_base, temperature, top_p
+            )
+            logits = self.forward(
+                tokens=torch.tensor(
+                    [tokens[-1:] + proposals], dtype=torch.long, device=self.device
+                ),
+                input_pos=torch.tensor(
+                    [pos_base + len(tokens) - 1], dtype=torch.long, device=self.device
+                ),
+            )
+            if logits.dim() != 3:
+                raise ValueError(
+                    "Speculative decoding needs the logits of all the tokens, "
+                    "export the model with --generate_full_logits"
+                )
+            new_tokens = self._verify(
+                logits[0], proposals, draft_probs, temperature, top_p
+            )
+            num_accepted = len(new_tokens) - 1
+            if num_draft_tokens > 0:
+                # The draft model was fed all the proposals but the last one.
+                draft_len = len(tokens) + min(num_accepted, num_draft_tokens - 1)
+            self.stats.num_forwards += 1
+            self.stats.num_draft_tokens += num_draft_tokens
+            self.stats.num_accepted_tokens += num_accepted
+
+            for token in new_tokens:
+                tokens.append(token)
+                self.stats.num_decoded_tokens += 1
+                if self._is_stop_token(token):
+                    done = True
+                    break
+                print(f"{self.tokenizer.decode_token(token)}", end="", flush=True)
+        print("\n")
+
+        self.stats.decode_time = time.time() - generate_start
+        self._print_stats()
 
         return tokens if echo else tokens[len(prompt_tokens) :]
 
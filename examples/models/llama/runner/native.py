@@ -5,6 +5,7 @@
 # LICENSE file in the root directory of this source tree.
 
 import argparse
+import functools
 import json
 from typing import Optional
 
@@ -20,13 +21,35 @@ from executorch.extension.pybindings.portable_lib import _load_for_executorch
 # Load custom ops and quantized ops.
 from executorch.extension.pybindings import portable_lib  # noqa # usort: skip
 
-from executorch.examples.models.llama.runner.generation import LlamaRunner
+from executorch.examples.models.llama.runner.generation import (
+    add_speculative_decoding_args,
+    DecoderForward,
+    LlamaRunner,
+)
 
 # Note: import this after portable_lib
 from executorch.extension.llm.custom_ops import custom_ops  # noqa # usort: skip
 from executorch.kernels import quantized  # noqa
 
 
+def _pte_forward(
+    model, tokens: torch.Tensor, input_pos: Optional[torch.Tensor] = None
+) -> torch.Tensor:
+    return (
+        model.forward((tokens, input_pos))
+        if input_pos is not None
+        else model.forward((tokens,))
+    )[0]
+
+
+def load_draft_forward(pte_path: str) -> DecoderForward:
+    """
+    Loads a pte file to use as the draft model of
+    LlamaRunner.enable_speculative_decoding().
+    """
+    return functools.partial(_pte_forward, _load_for_executorch(pte_path))
+
+
 class NativeLlamaRunner(LlamaRunner):
     """
     Runs llama via ExecuTorch with provided pte file.
@@ -50,11 +73,7 @@ class NativeLlamaRunner(LlamaRunner):
         tokens: torch.Tensor,
         input_pos: Optional[torch.Tensor] = None,
     ) -> torch.Tensor:
-        return (
-            self.model.forward((tokens, input_pos))
-            if input_pos is not None
-            else self.model.forward((tokens,))
-        )[0]
+        return _pte_forward(self.model, tokens, input_pos)
 
 
 def validate_args(args) -> None:
@@ -126,6 +145,8 @@ def build_args_parser() -> argparse.ArgumentParser:
         help="Maximum length of the generated response sequence.",
     )
 
+    add_speculative_decoding_args(parser)
+
     return parser
 
 
@@ -134,6 +155,10 @@ def main() -> None:
     args = parser.parse_args()
     validate_args(args)
     runner = NativeLlamaRunner(args)
+    if args.draft_pte is not None:
+        runner.enable_speculative_decoding(
+            load_draft_forward(args.draft_pte), args.num_draft_tokens
+        )
     generated_tokens = runner.text_completion(
         prompt=args.prompt,
         temperature=args.temperature,
@@ -0,0 +1,208 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+from typing import Any, List, Sequence, Tuple
+
+import torch
+from executorch.examples.models.llama.evaluate.pte_eval import (
+    generate_greedy,
+    prefetch,
+    PrefixCachingScorer,
+    PTEForward,
+)
+from executorch.examples.models.llama.llama_transformer import construct_transformer
+from executorch.examples.models.llama.model_args import ModelArgs
+
+
+class _FakeProgram:
+    """Runs an eager model like a program loaded by _load_for_executorch()."""
+
+    def __init__(self, model: torch.nn.Module, args: ModelArgs) -> None:
+        self._model = model
+        self._args = args
+        self.num_tokens: List[int] = []
+
+    def method_names(self) -> List[str]:
+        return ["forward", "use_kv_cache", "enable_dynamic_shape", "get_max_seq_len"]
+
+    def run_method(self, name: str) -> List[Any]:
+        return {
+            "use_kv_cache": [self._args.use_kv_cache],
+            "enable_dynamic_shape": [self._args.enable_dynamic_shape],
+            "get_max_seq_len": [self._args.max_seq_len],
+        }[name]
+
+    def forward(
+        self, inputs: Tuple[torch.Tensor, ...], release_gil: bool = False
+    ) -> List[torch.Tensor]:
+        tokens = inputs[0]
+        self.num_tokens.append(tokens.shape[1])
+        if self._args.use_kv_cache:
+            return [self._model(tokens, {"input_pos": inputs[1]})]
+        return [self._model(tokens)]
+
+
+def _reference_score(
+    model: torch.nn.Module, context: Sequence[int], continuation: Sequence[int]
+) -> Tuple[float, bool]:
+    tokens = list(context) + list(continuation)
+    logits = model(torch.tensor([tokens[:-1]]))[0, -len(continuation) :]
+    log_probs = torch.log_softmax(logits, dim=-1)
+    targets = torch.tensor(continuation)
+    return (
+        log_probs.gather(1, targets.unsqueeze(1)).sum().item(),
+        bool((log_probs.argmax(dim=-1) == targets).all()),
+    )
+
+
+class TestPTEEval(unittest.TestCase):
+    def setUp(self) -> None:
+        torch.manual_seed(0)
+        self.model_args = {
+            "dim": 32,
+            "n_layers": 2,
+            "n_heads": 2,
+            "vocab_size": 64,
+            "max_seq_len": 32,
+        }
+        self.reference = construct_transformer(
+            ModelArgs(**self.model_args, generate_full_logits=True)
+        ).eval()
+        self.requests = [
+            ([1, 5, 6, 7], [8, 9]),
+            ([1, 2, 3], [4]),
+            ([1, 5, 6, 7], [10]),
+            ([1, 2, 3], [4, 11, 12]),
+            ([1, 5, 6, 7], [8, 13]),
+        ]
+
+    def _program(self, **kwargs: Any) -> _FakeProgram:
+        args = ModelArgs(**self.model_args, **kwargs)
+        model = construct_transformer(args).eval()
+        model.load_state_dict(self.reference.state_dict(), strict=False)
+        return _FakeProgram(model, args)
+
+    def _check_scores(self, scores: List[Tuple[float, bool]]) -> None:
+        with torch.no_grad():
+            expected = [
+                _reference_score(self.reference, context, continuation)
+                for context, continuation in self.requests
+            ]
+        self.assertEqual(len(scores), len(expected))
+        for (log_prob, is_greedy), (ref_log_prob, ref_is_greedy) in zip(
+            scores, expected
+        ):
+            self.assertAlmostEqual(log_prob, ref_log_prob, places=4)
+            self.assertEqual(is_greedy, ref_is_greedy)
+
+    def test_kv_cache_prefix_reuse(self) -> None:
+        program = self._program(
+            use_kv_cache=True, enable_dynamic_shape=True, generate_full_logits=True
+        )
+        forward = PTEForward(program)
+        self.assertEqual(forward.max_context_len, 32)
+        scorer = PrefixCachingScorer(forward, max_length=31, use_kv_cache=True)
+        self._check_scores(scorer.score(iter(self.requests)))
+        # In sorted order, the tokens fed are [1, 2, 3], [3, 4, 11],
+        # [5, 6, 7, 8], [7, 8] and [7], from the first position whose logits are
+        # needed at most.
+        self.assertEqual(program.num_tokens, [3, 3, 4, 2, 1])
+        self.assertEqual(scorer.stats.num_requests, 5)
+        self.assertEqual(scorer.stats.num_tokens, 22)
+        self.assertEqual(scorer.stats.num_fed_tokens, 13)
+
+    def test_windows(self) -> None:
+        program = self._program(
+            use_kv_cache=True, enable_dynamic_shape=True, generate_full_logits=True
+        )
+        scorer = PrefixCachingScorer(
+            PTEForward(program), max_length=31, use_kv_cache=True, window_size=2
+        )
+        self._check_scores(scorer.score(prefetch(self.requests, max_pending=1)))
+        self.assertEqual(len(program.num_tokens), 5)
+
+    def test_last_token_logits(self) -> None:
+        # Only the logits of the last token, each token is fed on its own, after
+        # a first call on 3 tokens with dynamic shapes.
+        for enable_dynamic_shape, num_calls in ((False, 13), (True, 14)):
+            program = self._program(
+                use_kv_cache=True,
+                enable_dynamic_shape=enable_dynamic_shape,
+                generate_full_logits=False,
+            )
+            scorer = PrefixCachingScorer(
+                PTEForward(program), max_length=31, use_kv_cache=True
+            )
+            self._check_scores(scorer.score(self.requests))
+            self.assertEqual(len(program.num_tokens), num_calls)
+            self.assertEqual(set(program.num_tokens[-12:]), {1})
+
+    def test_no_kv_cache(self) -> None:
+        program = self._program(use_kv_cache=False, generate_full_logits=True)
+        forward = PTEForward(program)
+        scorer = PrefixCachingScorer(forward, max_length=31, use_kv_cache=False)
+        self._check_scores(scorer.score(self.requests))
+        self.assertEqual(len(program.num_tokens), 5)
+
+    def test_truncation(self) -> None:
+        program = self._program(
+            use_kv_cache=True, enable_dynamic_shape=True, generate_full_logits=True
+        )
+        scorer = PrefixCachingScorer(
+            PTEForward(program), max_length=4, use_kv_cache=True
+        )
+        ((log_prob, _),) = scorer.score([(list(range(1, 9)), [9, 10])])
+        self.assertEqual(program.num_tokens, [4])
+        with torch.no_grad():
+            ref_log_prob, _ = _reference_score(self.reference, [6, 7, 8], [9, 10])
+        self.assertAlmostEqual(log_prob, ref_log_prob, places=4)
+
+    def test_generate_greedy(self) -> None:
+        context = [1, 2, 3]
+        expected = []
+        with torch.no_grad():
+            for _ in range(5):
+                logits = self.reference(torch.tensor([context + expected]))
+                expected.append(int(torch.argmax(logits[0, -1]).item()))
+        for kwargs in (
+            {"use_kv_cache": True, "enable_dynamic_shape": True},
+            {"use_kv_cache": True, "enable_dynamic_shape": False},
+            {"use_kv_cache": False},
+        ):
+            program = self._program(generate_full_logits=False, **kwargs)
+            forward = PTEForward(program)
+            generated = generate_greedy(forward, forward.use_kv_cache, context, 5)
+            self.assertEqual(generated, expected)
+            self.assertEqual(
+                generate_greedy(
+                    forward,
+                    forward.use_kv_cache,
+                    context,
+                    5,
+                    stop=lambda tokens: len(tokens) == 2,
+                ),
+                expected[:2],
+            )
+            self.assertEqual(
+                generate_greedy(forward, forward.use_kv_cache, context, 0), []
+            )
+
+    def test_prefetch(self) -> None:
+        self.assertEqual(list(prefetch(range(100), max_pending=3)), list(range(100)))
+
+        def failing():
+            yield 1
+            raise RuntimeError("tokenizer failed")
+
+        items = prefetch(failing())
+        self.assertEqual(next(items), 1)
+        with self.assertRaisesRegex(RuntimeError, "tokenizer failed"):
+            next(items)
+
+        # Stopping early unblocks the worker.
+        items = prefetch(range(100), max_pending=1)
+        self.assertEqual(next(items), 0)
+        items.close()
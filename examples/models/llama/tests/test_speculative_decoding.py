@@ -0,0 +1,126 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+from typing import Optional
+from unittest import mock
+
+import torch
+from executorch.examples.models.llama.llama_transformer import construct_transformer
+from executorch.examples.models.llama.model_args import ModelArgs
+from executorch.examples.models.llama.runner.generation import LlamaRunner
+
+_VOCAB_SIZE = 32
+
+
+class _Tokenizer:
+    n_words = _VOCAB_SIZE
+    eos_id = -1
+
+    def decode_token(self, token: int) -> str:
+        return ""
+
+
+class _Runner(LlamaRunner):
+    def __init__(self, model: torch.nn.Module, use_kv_cache: bool = True) -> None:
+        with mock.patch(
+            "executorch.examples.models.llama.runner.generation.get_tokenizer",
+            return_value=_Tokenizer(),
+        ):
+            super().__init__(
+                tokenizer_path="tokenizer.model",
+                max_seq_len=48,
+                max_batch_size=1,
+                use_kv_cache=use_kv_cache,
+                vocab_size=_VOCAB_SIZE,
+            )
+        self.model = model
+
+    def forward(
+        self,
+        tokens: torch.Tensor,
+        input_pos: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        return self.model(tokens, {"input_pos": input_pos})
+
+
+def _model(seed: int, dim: int, generate_full_logits: bool = True) -> torch.nn.Module:
+    torch.manual_seed(seed)
+    args = ModelArgs(
+        dim=dim,
+        n_layers=2,
+        n_heads=2,
+        vocab_size=_VOCAB_SIZE,
+        max_seq_len=64,
+        use_kv_cache=True,
+        enable_dynamic_shape=True,
+        generate_full_logits=generate_full_logits,
+    )
+    return construct_transformer(args).eval()
+
+
+class TestSpeculativeDecoding(unittest.TestCase):
+    def setUp(self) -> None:
+        self.prompt = [1, 5, 9, 3]
+
+    def test_greedy_matches_generate(self) -> None:
+        runner = _Runner(_model(0, 32))
+        with torch.no_grad():
+            expected = runner.generate(self.prompt, max_seq_len=40, temperature=0)
+
+            draft = _model(1, 16)
+            runner.enable_speculative_decoding(
+                lambda tokens, input_pos: draft(tokens, {"input_pos": input_pos}),
+                num_draft_tokens=3,
+            )
+            generated = runner.generate(self.prompt, max_seq_len=40, temperature=0)
+        self.assertEqual(generated, expected)
+        stats = runner.stats
+        self.assertEqual(stats.num_decoded_tokens, 40 - len(self.prompt) - 1)
+        self.assertLessEqual(stats.num_accepted_tokens, stats.num_draft_tokens)
+
+    def test_same_draft_accepts_all(self) -> None:
+        runner = _Runner(_model(0, 32))
+        runner.enable_speculative_decoding(runner.forward, num_draft_tokens=4)
+        with torch.no_grad():
+            generated = runner.generate(self.prompt, max_seq_len=40, temperature=0.8)
+        self.assertEqual(len(generated), 40 - len(self.prompt))
+        stats = runner.stats
+        self.assertEqual(stats.accept_rate, 1.0)
+        # 4 draft tokens and 1 target token per forward.
+        self.assertEqual(stats.num_forwards, 7)
+        self.assertEqual(stats.num_draft_tokens, 28)
+
+    def test_verify_distribution(self) -> None:
+        runner = _Runner(_model(0, 32))
+        torch.manual_seed(0)
+        target_logits = torch.log(torch.tensor([[0.1, 0.2, 0.3, 0.4], [1.0] * 4]))
+        draft_probs = torch.tensor([0.4, 0.3, 0.2, 0.1])
+        counts = torch.zeros(4)
+        num_samples = 20000
+        for _ in range(num_samples):
+            proposal = int(torch.multinomial(draft_probs, 1).item())
+            token = runner._verify(
+                target_logits, [proposal], [draft_probs], temperature=1, top_p=1
+            )[0]
+            counts[token] += 1
+        # Whatever the draft, the tokens follow the target distribution.
+        torch.testing.assert_close(
+            counts / num_samples,
+            torch.tensor([0.1, 0.2, 0.3, 0.4]),
+            atol=0.015,
+            rtol=0,
+        )
+
+    def test_errors(self) -> None:
+        with self.assertRaises(ValueError):
+            _Runner(_model(0, 32), use_kv_cache=False).enable_speculative_decoding(
+                lambda tokens, input_pos: tokens
+            )
+
+        runner = _Runner(_model(0, 32, generate_full_logits=False))
+        runner.enable_speculative_decoding(runner.forward)
+        with self.assertRaises(ValueError), torch.no_grad():
+            runner.generate(self.prompt, max_seq_len=40, temperature=0)
@@ -0,0 +1,170 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Compares the planned memory of example models across memory planning algorithms.
+
+For each model, lowers it once per algorithm and prints the size of its
+planned memory buffers (the activation arena), followed by how many bytes each
+algorithm saves compared to `greedy`. The "peak live" column is the largest
+number of bytes of tensors that are live at the same time, which no
+algorithm can go below:
+
+    python -m examples.portable.scripts.compare_memory_planning \
+        -m ds_cnn resnet8 mobilenet_v1_025
+"""
+
+# pyre-unsafe
+
+import argparse
+import functools
+import logging
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import torch
+from executorch.exir.capture import ExecutorchBackendConfig
+from executorch.exir.memory_planning import (
+    _peak_live_bytes,
+    greedy,
+    MemoryAlgoResult,
+    MemoryPlanningAlgorithmSuite,
+    naive,
+    offsets_greedy_by_breadth,
+    offsets_greedy_by_size,
+    offsets_search,
+)
+from executorch.exir.passes import MemoryPlanningPass
+from executorch.exir.tensor import TensorSpec
+from executorch.extension.export_util.utils import export_to_edge
+
+from ...models import MODEL_NAME_TO_MODEL
+from ...models.model_factory import EagerModelFactory
+
+_DEFAULT_MODELS: List[str] = [
+    "mul",
+    "linear",
+    "add_mul",
+    "softmax",
+    "conv1d",
+    "deep_autoencoder",
+    "ds_cnn",
+    "mobilenet_v1_025",
+    "resnet8",
+    "lstm",
+    "edsr",
+    "mobilebert",
+    "deit_tiny",
+    "mv2",
+    "resnet18",
+    "w2l",
+]
+
+
+def _record_peak_live(
+    peaks: List[int],
+    alignment: int,
+    specs: Iterable[TensorSpec],
+    *args: Any,
+) -> MemoryAlgoResult:
+    """Plans like `naive`, and appends the peak live bytes of `specs` to `peaks`."""
+    specs = list(specs)
+    result = naive(alignment, specs, *args)
+    items_by_mem_id = defaultdict(list)
+    for spec in specs:
+        items_by_mem_id[spec.mem_id].append((spec.allocated_memory, *spec.lifetime))
+    peaks.append(sum(_peak_live_bytes(items) for items in items_by_mem_id.values()))
+    return result
+
+
+def _lower(
+    model: torch.nn.Module,
+    example_inputs: Tuple[Any, ...],
+    dynamic_shapes: Any,
+    algo: Callable[..., MemoryAlgoResult],
+) -> int:
+    edge_manager = export_to_edge(model, example_inputs, dynamic_shapes=dynamic_shapes)
+    program = edge_manager.to_executorch(
+        ExecutorchBackendConfig(
+            memory_planning_pass=MemoryPlanningPass(
+                MemoryPlanningAlgorithmSuite([algo])
+            )
+        )
+    ).executorch_program
+    return sum(sum(plan.non_const_buffer_sizes) for plan in program.execution_plan)
+
+
+def _planned_bytes(
+    model_name: str, algos: Dict[str, Callable[..., MemoryAlgoResult]]
+) -> Dict[str, int]:
+    model, example_inputs, _, dynamic_shapes = EagerModelFactory.create_model(
+        *MODEL_NAME_TO_MODEL[model_name]
+    )
+    peaks: List[int] = []
+    _lower(
+        model,
+        example_inputs,
+        dynamic_shapes,
+        functools.partial(_record_peak_live, peaks),
+    )
+    sizes = {"peak live": sum(peaks)}
+    for name, algo in algos.items():
+        sizes[name] = _lower(model, example_inputs, dynamic_shapes, algo)
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-m",
+        "--model_names",
+        nargs="+",
+        default=_DEFAULT_MODELS,
+        help=f"Models to compare. Valid ones: {list(MODEL_NAME_TO_MODEL.keys())}",
+    )
+    parser.add_argument(
+        "--search_iterations",
+        type=int,
+        default=1000,
+        help="max_iterations of offsets_search.",
+    )
+    args = parser.parse_args()
+
+    algos = {
+        "greedy": greedy,
+        "offsets_greedy_by_size": offsets_greedy_by_size,
+        "offsets_greedy_by_breadth": offsets_greedy_by_breadth,
+        "offsets_search": functools.partial(
+            offsets_search,
+            max_iterations=args.search_iterations,
+        ),
+    }
+    names = ["peak live", *algos]
+    print(f"{'model':<20}" + "".join(f"{name:>27}" for name in names))
+    total: Dict[str, int] = dict.fromkeys(names, 0)
+    for model_name in args.model_names:
+        try:
+            sizes = _planned_bytes(model_name, algos)
+        except Exception as e:
+            logging.warning(f"Skipping {model_name}: {type(e).__name__}: {e}")
+            continue
+        columns = []
+        for name, size in sizes.items():
+            total[name] += size
+            saved = sizes["greedy"] - size
+            percent = 100 * saved / sizes["greedy"] if sizes["greedy"] else 0.0
+            columns.append(f"{f'{size} ({saved:+} {percent:+.1f}%)':>27}")
+        print(f"{model_name:<20}" + "".join(columns))
+    print(
+        f"{'total':<20}"
+        + "".join(
+            f"{f'{size} ({total[greedy.__name__] - size:+})':>27}"
+            for size in total.values()
+        )
+    )
+
+
+if __name__ == "__main__":
+    with torch.no_grad():
+        main()  # pragma: no cover
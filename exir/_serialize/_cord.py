@@ -5,7 +5,48 @@
 # LICENSE file in the root directory of this source tree.
 
 import io
-from typing import List, Optional, Union
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Union
+
+# Size of the reads used to copy FileRange data.
+_FILE_RANGE_CHUNK_SIZE: int = 1 << 20
+
+
+@dataclass(frozen=True)
+class FileRange:
+    """A reference to `size` bytes at `offset` in the file at `path`.
+
+    The data is only read when a Cord holding the range is written out or
+    converted to bytes, so it never has to be fully resident in memory.
+    """
+
+    path: str
+    offset: int
+    size: int
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bytes__(self) -> bytes:
+        return b"".join(self.read_chunks())
+
+    def read_chunks(self, chunk_size: int = _FILE_RANGE_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yields the data of the range in chunks of at most `chunk_size` bytes."""
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            remaining = self.size
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise ValueError(
+                        f"{self.path} ends before offset {self.offset + self.size}"
+                    )
+                remaining -= len(chunk)
+                yield chunk
+
+
+# Blob types that a Cord can reference without copying them.
+DataBlob = Union[bytes, memoryview, FileRange]
 
 
 class Cord:
@@ -13,12 +54,14 @@ class Cord:
 
     Users can use a Cord to assemble large files and data blobs using references
     to and slices of other data, instead of copying and appending that data to a
-    `bytes` or `bytearray` object.
+    `bytes` or `bytearray` object. Objects that support the buffer protocol
+    (e.g. `memoryview`s of tensor storage) and `FileRange`s are referenced as
+    well, so their data is only copied when the Cord is written out.
     """
 
-    def __init__(self, data: Optional[Union[bytes, "Cord"]] = None) -> None:
+    def __init__(self, data: Optional[Union[DataBlob, "Cord"]] = None) -> None:
         """Initialize Cord data structure."""
-        self._buffers: List[bytes] = []
+        self._buffers: List[DataBlob] = []
         self._byte_size: int = 0
 
         if data is not None:
@@ -30,20 +73,34 @@ class Cord:
 
     def __bytes__(self) -> bytes:
         """Return the contents of the Cord as a single `bytes` object."""
-        return b"".join(self._buffers)
+        return b"".join(
+            bytes(item) if isinstance(item, FileRange) else item
+            for item in self._buffers
+        )
 
-    def append(self, data: Union[bytes, "Cord"]) -> None:
-        """Append a bytes or Cord to the current Cord."""
-        if isinstance(data, bytes):
-            self._buffers.append(data)
-            self._byte_size += len(data)
-        elif isinstance(data, Cord):
+    def append(self, data: Union[DataBlob, "Cord"]) -> None:
+        """Append a bytes, buffer, FileRange or Cord to the current Cord."""
+        if isinstance(data, Cord):
             self._buffers.extend(data._buffers)
             self._byte_size += len(data)
-        else:
-            raise TypeError(f"Can only append bytes or Cords, received {type(data)}")
+            return
+        if not isinstance(data, (bytes, FileRange)):
+            try:
+                view = memoryview(data)
+            except TypeError:
+                raise TypeError(
+                    "Can only append bytes, buffers, FileRanges or Cords, "
+                    f"received {type(data)}"
+                ) from None
+            data = view.cast("B")
+        self._buffers.append(data)
+        self._byte_size += len(data)
 
     def write_to_file(self, outfile: io.BufferedIOBase) -> None:
         """Write the Cord to a file."""
         for item in self._buffers:
-            outfile.write(item)
+            if isinstance(item, FileRange):
+                for chunk in item.read_chunks():
+                    outfile.write(chunk)
+            else:
+                outfile.write(item)
@@ -24,7 +24,7 @@ class _DataclassEncoder(json.JSONEncoder):
                     props[f"{field.name}_type"] = type(getattr(o, field.name)).__name__
             return props
 
-        if isinstance(o, bytes):
+        if isinstance(o, (bytes, memoryview)):
             return list(o)
 
         return super().default(o)
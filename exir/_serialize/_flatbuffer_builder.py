@@ -0,0 +1,823 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""Schema-driven, in-process flatbuffer serialization for dataclass trees.
+
+The delegate and devtools serializers historically dumped their dataclasses to
+JSON and ran `flatc --binary` on the result in a temporary directory. This
+module parses the `.fbs` schema once and writes the same dataclass tree
+directly with `flatbuffers.Builder`, which avoids the JSON round trip and the
+`flatc` subprocess entirely.
+
+The builder mirrors the order in which `flatc` constructs a buffer from JSON:
+child objects are created in dataclass field order (the order
+`_DataclassEncoder` emits JSON keys), and table slots are added largest scalar
+first, in reverse field-id order within each size class. Together with
+identical vtable deduplication and alignment rules, this produces the same
+bytes that `flatc` produces for the equivalent JSON.
+"""
+
+import enum
+import functools
+import importlib.resources
+import math
+import re
+import struct
+
+from dataclasses import dataclass, field, fields, is_dataclass
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import flatbuffers  # pyre-ignore[21]
+from executorch.exir._serialize._flatbuffer import _is_valid_alignment
+from flatbuffers import number_types  # pyre-ignore[21]
+
+
+def _create_aligned_byte_vector(builder: Any, data: bytes, alignment: int) -> int:
+    if not _is_valid_alignment(alignment):
+        raise ValueError(f"Bad alignment {alignment}")
+    builder.StartVector(1, len(data), alignment)
+    length = len(data)
+    builder.head = builder.Head() - length  # pyre-ignore[16]
+    builder.Bytes[builder.Head() : builder.Head() + length] = data  # pyre-ignore[16]
+    return builder.EndVector()
+
+
+def _coerce_bytes(data: Any) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, bytearray):
+        return bytes(data)
+    if isinstance(data, memoryview):
+        return data.tobytes()
+    tobytes = getattr(data, "tobytes", None)
+    if callable(tobytes):
+        return tobytes()
+    return bytes(data)
+
+
+@dataclass(frozen=True)
+class _ScalarInfo:
+    # Flags object from flatbuffers.number_types used by Builder.Prepend*.
+    flags: Any
+    # struct module format character.
+    fmt: str
+    # Size in bytes; also the inline alignment.
+    size: int
+    is_float: bool = False
+    is_bool: bool = False
+
+
+_SCALARS: Dict[str, _ScalarInfo] = {
+    "bool": _ScalarInfo(number_types.BoolFlags, "?", 1, is_bool=True),
+    "byte": _ScalarInfo(number_types.Int8Flags, "b", 1),
+    "ubyte": _ScalarInfo(number_types.Uint8Flags, "B", 1),
+    "short": _ScalarInfo(number_types.Int16Flags, "h", 2),
+    "ushort": _ScalarInfo(number_types.Uint16Flags, "H", 2),
+    "int": _ScalarInfo(number_types.Int32Flags, "i", 4),
+    "uint": _ScalarInfo(number_types.Uint32Flags, "I", 4),
+    "long": _ScalarInfo(number_types.Int64Flags, "q", 8),
+    "ulong": _ScalarInfo(number_types.Uint64Flags, "Q", 8),
+    "float": _ScalarInfo(number_types.Float32Flags, "f", 4, is_float=True),
+    "double": _ScalarInfo(number_types.Float64Flags, "d", 8, is_float=True),
+}
+
+_SCALAR_ALIASES: Dict[str, str] = {
+    "int8": "byte",
+    "uint8": "ubyte",
+    "int16": "short",
+    "uint16": "ushort",
+    "int32": "int",
+    "uint32": "uint",
+    "int64": "long",
+    "uint64": "ulong",
+    "float32": "float",
+    "float64": "double",
+}
+
+# Size used by flatc when ordering table fields: scalars use their own size,
+# every reference type (string, vector, table, struct, union value) uses the
+# size of an offset.
+_OFFSET_SIZE: int = 4
+
+
+@dataclass
+class _EnumDef:
+    name: str
+    scalar: str
+    values: Dict[str, int]
+
+
+@dataclass
+class _UnionDef:
+    name: str
+    # Maps member name (alias, or type name when no alias is given) to the
+    # referenced table name and its union type value.
+    members: Dict[str, Tuple[str, int]]
+    namespace: str
+    # Filled in after all files are parsed.
+    tables: Dict[str, "_TableDef"] = field(default_factory=dict)
+
+
+@dataclass
+class _Type:
+    # One of "scalar", "string", "vector", "enum", "table", "struct", "union".
+    kind: str
+    scalar: Optional[str] = None
+    element: Optional["_Type"] = None
+    enum_def: Optional[_EnumDef] = None
+    table_def: Optional["_TableDef"] = None
+    union_def: Optional[_UnionDef] = None
+
+
+@dataclass
+class _FieldDef:
+    name: str
+    type_name: str
+    is_vector: bool
+    default: Optional[str]
+    attributes: Dict[str, Optional[str]]
+    id: int = -1
+    # Filled in after all files are parsed.
+    type: Optional[_Type] = None
+    default_value: Any = None
+    # Struct layout: padding written after this field.
+    padding: int = 0
+
+    @property
+    def deprecated(self) -> bool:
+        return "deprecated" in self.attributes
+
+    @property
+    def force_align(self) -> int:
+        value = self.attributes.get("force_align")
+        return int(value) if value is not None else 1
+
+
+@dataclass
+class _TableDef:
+    name: str
+    is_struct: bool
+    fields: List[_FieldDef]
+    attributes: Dict[str, Optional[str]]
+    namespace: str
+    by_name: Dict[str, _FieldDef] = field(default_factory=dict)
+    num_slots: int = 0
+    # Struct layout.
+    minalign: int = 1
+    bytesize: int = 0
+
+
+@dataclass
+class _Schema:
+    root_table: _TableDef
+    file_identifier: Optional[bytes]
+    file_extension: Optional[str]
+    tables: Dict[str, _TableDef]
+    enums: Dict[str, _EnumDef]
+    unions: Dict[str, _UnionDef]
+
+
+_TOKEN_RE: re.Pattern[str] = re.compile(
+    r"""
+    (?P<skip>\s+|//[^\n]*|/\*.*?\*/)
+    |(?P<string>"(?:[^"\\]|\\.)*")
+    |(?P<number>[-+]?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?
+        |(?:inf|infinity|nan)\b))
+    |(?P<ident>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)*)
+    |(?P<punct>[{}\[\]():;,=])
+    """,
+    re.S | re.X,
+)
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if match is None:
+            raise ValueError(f"Unexpected schema input at {text[pos:pos + 20]!r}")
+        if match.lastgroup != "skip":
+            tokens.append(match.group())
+        pos = match.end()
+    return tokens
+
+
+class _SchemaParser:
+    """Parses the subset of the flatbuffer IDL used by ExecuTorch schemas."""
+
+    def __init__(self, files: Dict[str, bytes]) -> None:
+        self._files = files
+        self._parsed: set[str] = set()
+        self.tables: Dict[str, _TableDef] = {}
+        self.enums: Dict[str, _EnumDef] = {}
+        self.unions: Dict[str, _UnionDef] = {}
+        self.root_type: Optional[Tuple[str, str]] = None
+        self.file_identifier: Optional[bytes] = None
+        self.file_extension: Optional[str] = None
+
+    def parse_file(self, name: str, is_root: bool) -> None:
+        if name in self._parsed:
+            return
+        self._parsed.add(name)
+        if name not in self._files:
+            raise ValueError(f"Missing included schema file {name}")
+        self._tokens = _tokenize(self._files[name].decode("utf-8"))
+        self._pos = 0
+        namespace = ""
+        while self._pos < len(self._tokens):
+            keyword = self._next()
+            if keyword == "include":
+                include = self._string()
+                self._expect(";")
+                tokens, pos = self._tokens, self._pos
+                self.parse_file(include, is_root=False)
+                self._tokens, self._pos = tokens, pos
+            elif keyword == "namespace":
+                namespace = self._next()
+                self._expect(";")
+            elif keyword in ("attribute", "file_identifier", "file_extension"):
+                self._parse_file_attribute(keyword, is_root)
+            elif keyword == "root_type":
+                root = self._next()
+                self._expect(";")
+                if is_root:
+                    self.root_type = (namespace, root)
+            elif keyword == "enum":
+                self._parse_enum(namespace)
+            elif keyword == "union":
+                self._parse_union(namespace)
+            elif keyword in ("table", "struct"):
+                self._parse_table(namespace, is_struct=keyword == "struct")
+            else:
+                raise ValueError(f"Unsupported schema declaration {keyword!r}")
+
+    def _parse_file_attribute(self, keyword: str, is_root: bool) -> None:
+        value = self._next()
+        self._expect(";")
+        if not is_root or keyword == "attribute":
+            return
+        if not value.startswith('"'):
+            raise ValueError(f"Expected string after {keyword}, got {value!r}")
+        if keyword == "file_identifier":
+            self.file_identifier = value[1:-1].encode("ascii")
+        else:
+            self.file_extension = value[1:-1]
+
+    def _next(self) -> str:
+        if self._pos >= len(self._tokens):
+            raise ValueError("Unexpected end of schema")
+        token = self._tokens[self._pos]
+        self._pos += 1
+        return token
+
+    def _peek(self) -> Optional[str]:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _expect(self, token: str) -> None:
+        actual = self._next()
+        if actual != token:
+            raise ValueError(f"Expected {token!r} in schema, got {actual!r}")
+
+    def _string(self) -> str:
+        token = self._next()
+        if not token.startswith('"'):
+            raise ValueError(f"Expected string in schema, got {token!r}")
+        return token[1:-1]
+
+    def _attributes(self) -> Dict[str, Optional[str]]:
+        attributes: Dict[str, Optional[str]] = {}
+        if self._peek() != "(":
+            return attributes
+        self._expect("(")
+        while self._peek() != ")":
+            key = self._next()
+            value = None
+            if self._peek() == ":":
+                self._next()
+                value = self._next()
+                if value.startswith('"'):
+                    value = value[1:-1]
+            attributes[key] = value
+            if self._peek() == ",":
+                self._next()
+        self._expect(")")
+        return attributes
+
+    @staticmethod
+    def _qualify(namespace: str, name: str) -> str:
+        return f"{namespace}.{name}" if namespace else name
+
+    def _parse_enum(self, namespace: str) -> None:
+        name = self._next()
+        self._expect(":")
+        scalar = self._next()
+        scalar = _SCALAR_ALIASES.get(scalar, scalar)
+        if scalar not in _SCALARS:
+            raise ValueError(f"Enum {name} has non-scalar type {scalar}")
+        self._attributes()
+        self._expect("{")
+        values: Dict[str, int] = {}
+        next_value = 0
+        while self._peek() != "}":
+            value_name = self._next()
+            if self._peek() == "=":
+                self._next()
+                next_value = int(self._next(), 0)
+            values[value_name] = next_value
+            next_value += 1
+            if self._peek() == ",":
+                self._next()
+        self._expect("}")
+        self.enums[self._qualify(namespace, name)] = _EnumDef(name, scalar, values)
+
+    def _parse_union(self, namespace: str) -> None:
+        name = self._next()
+        self._attributes()
+        self._expect("{")
+        members: Dict[str, Tuple[str, int]] = {}
+        next_value = 1
+        while self._peek() != "}":
+            member_name = self._next()
+            type_name = member_name
+            if self._peek() == ":":
+                self._next()
+                type_name = self._next()
+            if self._peek() == "=":
+                self._next()
+                next_value = int(self._next(), 0)
+            members[member_name] = (type_name, next_value)
+            next_value += 1
+            if self._peek() == ",":
+                self._next()
+        self._expect("}")
+        self.unions[self._qualify(namespace, name)] = _UnionDef(
+            name, members, namespace
+        )
+
+    def _parse_table(self, namespace: str, is_struct: bool) -> None:
+        name = self._next()
+        attributes = self._attributes()
+        self._expect("{")
+        table_fields: List[_FieldDef] = []
+        while self._peek() != "}":
+            field_name = self._next()
+            self._expect(":")
+            is_vector = self._peek() == "["
+            if is_vector:
+                self._next()
+            type_name = self._next()
+            if is_vector:
+                if self._peek() == ":":
+                    raise ValueError(
+                        f"Fixed-size array field {name}.{field_name} is not supported"
+                    )
+                self._expect("]")
+            default = None
+            if self._peek() == "=":
+                self._next()
+                default = self._next()
+            field_attributes = self._attributes()
+            self._expect(";")
+            table_fields.append(
+                _FieldDef(
+                    field_name,
+                    _SCALAR_ALIASES.get(type_name, type_name),
+                    is_vector,
+                    default,
+                    field_attributes,
+                )
+            )
+        self._expect("}")
+        self.tables[self._qualify(namespace, name)] = _TableDef(
+            name, is_struct, table_fields, attributes, namespace
+        )
+
+    def _lookup(self, namespace: str, name: str, table: Dict[str, Any]) -> Any:
+        # Mirror flatc: try the current namespace and each enclosing namespace,
+        # then the fully-qualified name.
+        parts = namespace.split(".") if namespace else []
+        while True:
+            candidate = self._qualify(".".join(parts), name)
+            if candidate in table:
+                return table[candidate]
+            if not parts:
+                return None
+            parts.pop()
+
+    def _resolve_type(self, namespace: str, type_name: str) -> _Type:
+        if type_name in _SCALARS:
+            return _Type("scalar", scalar=type_name)
+        if type_name == "string":
+            return _Type("string")
+        enum_def = self._lookup(namespace, type_name, self.enums)
+        if enum_def is not None:
+            return _Type("enum", scalar=enum_def.scalar, enum_def=enum_def)
+        union_def = self._lookup(namespace, type_name, self.unions)
+        if union_def is not None:
+            return _Type("union", union_def=union_def)
+        table_def = self._lookup(namespace, type_name, self.tables)
+        if table_def is not None:
+            kind = "struct" if table_def.is_struct else "table"
+            return _Type(kind, table_def=table_def)
+        raise ValueError(f"Unknown type {type_name} in namespace {namespace!r}")
+
+    def resolve(self) -> _Schema:
+        if self.root_type is None:
+            raise ValueError("Missing root_type in schema files.")
+        for union_def in self.unions.values():
+            for member_name, (type_name, _) in union_def.members.items():
+                table_def = self._lookup(union_def.namespace, type_name, self.tables)
+                if table_def is None or table_def.is_struct:
+                    raise ValueError(
+                        f"Union {union_def.name} member {type_name} must be a table"
+                    )
+                union_def.tables[member_name] = table_def
+        for table_def in self.tables.values():
+            self._resolve_fields(table_def)
+        for table_def in self.tables.values():
+            if table_def.is_struct:
+                self._layout_struct(table_def)
+        root_table = self._lookup(self.root_type[0], self.root_type[1], self.tables)
+        if root_table is None:
+            raise ValueError(f"Unknown root_type {self.root_type[1]}")
+        return _Schema(
+            root_table=root_table,
+            file_identifier=self.file_identifier,
+            file_extension=self.file_extension,
+            tables=self.tables,
+            enums=self.enums,
+            unions=self.unions,
+        )
+
+    def _resolve_fields(self, table_def: _TableDef) -> None:
+        explicit_ids = [f.attributes.get("id") for f in table_def.fields]
+        use_explicit_ids = bool(explicit_ids) and all(
+            i is not None for i in explicit_ids
+        )
+        next_id = 0
+        for f in table_def.fields:
+            base = self._resolve_type(table_def.namespace, f.type_name)
+            f.type = _Type("vector", element=base) if f.is_vector else base
+            if f.type.kind == "union" and table_def.is_struct:
+                raise ValueError(f"Struct {table_def.name} cannot contain a union")
+            # Unions occupy two slots: the hidden `<name>_type` and the value.
+            width = 2 if f.type.kind == "union" else 1
+            if use_explicit_ids:
+                f.id = int(f.attributes["id"])  # pyre-ignore[6]
+            else:
+                f.id = next_id + width - 1
+                next_id += width
+            f.default_value = _parse_default(f)
+            table_def.by_name[f.name] = f
+        table_def.num_slots = max((f.id + 1 for f in table_def.fields), default=0)
+
+    def _layout_struct(self, table_def: _TableDef) -> None:
+        if table_def.bytesize or not table_def.fields:
+            return
+        force_align = table_def.attributes.get("force_align")
+        minalign = int(force_align) if force_align is not None else 1
+        offset = 0
+        previous: Optional[_FieldDef] = None
+        for f in table_def.fields:
+            field_type = f.type
+            assert field_type is not None
+            if field_type.kind in ("scalar", "enum"):
+                size = align = _SCALARS[field_type.scalar].size  # pyre-ignore[6]
+            elif field_type.kind == "struct":
+                nested = field_type.table_def
+                assert nested is not None
+                self._layout_struct(nested)
+                size, align = nested.bytesize, nested.minalign
+            else:
+                raise ValueError(
+                    f"Struct {table_def.name} field {f.name} must be a scalar or struct"
+                )
+            padding = (-offset) % align
+            if previous is not None:
+                previous.padding += padding
+            offset += padding + size
+            minalign = max(minalign, align)
+            previous = f
+        assert previous is not None
+        end_padding = (-offset) % minalign
+        previous.padding += end_padding
+        table_def.minalign = minalign
+        table_def.bytesize = offset + end_padding
+
+
+def _parse_number(token: str, is_float: bool) -> Union[int, float]:
+    if is_float:
+        return float(token)
+    if token in ("true", "false"):
+        return int(token == "true")
+    return int(token, 0)
+
+
+def _parse_default(f: _FieldDef) -> Any:
+    field_type = f.type
+    assert field_type is not None
+    if field_type.kind not in ("scalar", "enum"):
+        return None
+    scalar = _SCALARS[field_type.scalar]  # pyre-ignore[6]
+    if f.default is None:
+        return 0.0 if scalar.is_float else 0
+    if f.default == "null":
+        # Optional scalar: always serialized when present.
+        return None
+    if field_type.enum_def is not None and f.default in field_type.enum_def.values:
+        return field_type.enum_def.values[f.default]
+    value = _parse_number(f.default, scalar.is_float)
+    return bool(value) if scalar.is_bool else value
+
+
+def _parse_schema(files: Dict[str, bytes], root: str) -> _Schema:
+    """Parses `root` and the files it includes, all of which must be present in
+    `files` keyed by the name used in the include directives.
+    """
+    parser = _SchemaParser(files)
+    parser.parse_file(root, is_root=True)
+    return parser.resolve()
+
+
+@functools.lru_cache(maxsize=None)
+def _load_schema(
+    package: Union[str, ModuleType], schema_names: Tuple[str, ...]
+) -> _Schema:
+    """Loads and parses the schema resources `schema_names` from `package`. The
+    first name is the root schema; the rest are the files it includes.
+    """
+    resources = importlib.resources.files(package)
+    files = {name: resources.joinpath(name).read_bytes() for name in schema_names}
+    return _parse_schema(files, schema_names[0])
+
+
+@dataclass
+class _Entry:
+    """A value waiting to be added to the table currently being built."""
+
+    slot: int
+    # Size class flatc uses to order the slots of a table.
+    size: int
+    # One of "scalar", "struct" or "offset".
+    kind: str
+    value: Any
+    flags: Any = None
+    default: Any = None
+    struct_def: Optional[_TableDef] = None
+
+
+class _DataclassFlatbufferBuilder:
+    """Writes a dataclass tree to a flatbuffer following a parsed schema.
+
+    Dataclass field names must match the schema field names. The type of a
+    union field is inferred from the class name of its value, which must match
+    a union member name; this is the same contract `_DataclassEncoder` uses
+    when producing JSON for `flatc`.
+    """
+
+    def __init__(self, schema: _Schema) -> None:
+        self._schema = schema
+        self._builder: Any = flatbuffers.Builder(1024)
+
+    def build(self, obj: Any, size_prefixed: bool = False) -> bytes:
+        root = self._build_table(self._schema.root_table, obj)
+        if size_prefixed:
+            self._builder.FinishSizePrefixed(root, self._schema.file_identifier)
+        else:
+            self._builder.Finish(root, self._schema.file_identifier)
+        return bytes(self._builder.Output())
+
+    def _build_table(self, table_def: _TableDef, obj: Any) -> int:
+        if not is_dataclass(obj):
+            raise TypeError(
+                f"Expected a dataclass for table {table_def.name}, got {type(obj)}"
+            )
+        # Children are created in the order flatc parses them, i.e. dataclass
+        # field order.
+        entries: List[_Entry] = []
+        for dc_field in fields(obj):
+            f = table_def.by_name.get(dc_field.name)
+            if f is None:
+                raise ValueError(
+                    f"Field {dc_field.name} of {type(obj).__name__} is not in "
+                    f"table {table_def.name}"
+                )
+            value = getattr(obj, dc_field.name)
+            if value is not None and not f.deprecated:
+                entries.extend(self._table_entries(f, value))
+
+        builder = self._builder
+        entries.sort(key=lambda entry: entry.slot)
+        builder.StartObject(table_def.num_slots)
+        for size in (8, 4, 2, 1):
+            for entry in reversed(entries):
+                if entry.size == size:
+                    self._add_slot(entry)
+        return builder.EndObject()
+
+    def _table_entries(self, f: _FieldDef, value: Any) -> List["_Entry"]:
+        field_type = f.type
+        assert field_type is not None
+        kind = field_type.kind
+        if kind in ("scalar", "enum"):
+            scalar = _SCALARS[field_type.scalar]  # pyre-ignore[6]
+            return [
+                _Entry(
+                    f.id,
+                    scalar.size,
+                    "scalar",
+                    _to_scalar(value, field_type),
+                    scalar.flags,
+                    f.default_value,
+                )
+            ]
+        if kind == "struct":
+            struct_def = field_type.table_def
+            assert struct_def is not None
+            # flatc aligns the buffer when it parses a struct value, even
+            # though the struct itself is written inline later.
+            self._builder.Prep(struct_def.minalign, 0)
+            return [_Entry(f.id, _OFFSET_SIZE, "struct", value, struct_def=struct_def)]
+        if kind == "union":
+            union_def = field_type.union_def
+            assert union_def is not None
+            member = type(value).__name__
+            if member not in union_def.members:
+                raise ValueError(f"{member} is not a member of union {union_def.name}")
+            offset = self._build_table(union_def.tables[member], value)
+            return [
+                # The hidden `<name>_type` field.
+                _Entry(
+                    f.id - 1,
+                    1,
+                    "scalar",
+                    union_def.members[member][1],
+                    number_types.Uint8Flags,
+                    0,
+                ),
+                _Entry(f.id, _OFFSET_SIZE, "offset", offset),
+            ]
+        return [_Entry(f.id, _OFFSET_SIZE, "offset", self._build_value(f, value))]
+
+    def _add_slot(self, entry: "_Entry") -> None:
+        builder = self._builder
+        if entry.kind == "scalar":
+            if entry.default is None:
+                builder.Prepend(entry.flags, entry.value)
+                builder.Slot(entry.slot)
+            else:
+                builder.PrependSlot(entry.flags, entry.slot, entry.value, entry.default)
+        elif entry.kind == "struct":
+            self._write_struct(entry.struct_def, entry.value)  # pyre-ignore[6]
+            builder.Slot(entry.slot)
+        else:
+            builder.PrependUOffsetTRelativeSlot(entry.slot, entry.value, 0)
+
+    def _build_value(self, f: _FieldDef, value: Any) -> int:
+        field_type = f.type
+        assert field_type is not None
+        if field_type.kind == "string":
+            return self._builder.CreateString(value)
+        if field_type.kind == "table":
+            return self._build_table(field_type.table_def, value)  # pyre-ignore[6]
+        assert field_type.kind == "vector"
+        return self._build_vector(
+            field_type.element, value, f.force_align
+        )  # pyre-ignore[6]
+
+    def _start_vector(
+        self, elem_size: int, num_elems: int, alignment: int, force_align: int
+    ) -> None:
+        builder = self._builder
+        # flatc only applies force_align to non-empty vectors, before the
+        # regular length/element alignment.
+        if force_align > 1 and num_elems > 0:
+            builder.Prep(force_align, elem_size * num_elems)
+        builder.StartVector(elem_size, num_elems, alignment)
+
+    def _build_vector(self, element: _Type, values: Any, force_align: int) -> int:
+        builder = self._builder
+        if element.kind in ("scalar", "enum"):
+            scalar = _SCALARS[element.scalar]  # pyre-ignore[6]
+            if scalar.size == 1 and not scalar.is_bool and not isinstance(values, list):
+                # bytes-like payloads (constant data, delegate blobs) are copied
+                # in one go.
+                data = _coerce_bytes(values)
+                self._start_vector(1, len(data), 1, force_align)
+                builder.head = builder.Head() - len(data)
+                builder.Bytes[builder.Head() : builder.Head() + len(data)] = data
+                return builder.EndVector()
+            items = [_to_scalar(v, element) for v in values]
+            nbytes = scalar.size * len(items)
+            self._start_vector(scalar.size, len(items), scalar.size, force_align)
+            builder.head = builder.Head() - nbytes
+            struct.pack_into(
+                f"<{len(items)}{scalar.fmt}", builder.Bytes, builder.Head(), *items
+            )
+            return builder.EndVector()
+        if element.kind == "struct":
+            struct_def = element.table_def
+            assert struct_def is not None
+            if values:
+                # flatc aligns the buffer while parsing each struct element.
+                builder.Prep(struct_def.minalign, 0)
+            self._start_vector(
+                struct_def.bytesize, len(values), struct_def.minalign, force_align
+            )
+            for value in reversed(values):
+                self._write_struct(struct_def, value)
+            return builder.EndVector()
+        if element.kind == "string":
+            offsets = [builder.CreateString(v) for v in values]
+        elif element.kind == "table":
+            offsets = [
+                self._build_table(element.table_def, v) for v in values
+            ]  # pyre-ignore[6]
+        else:
+            raise ValueError(f"Unsupported vector element kind {element.kind}")
+        self._start_vector(_OFFSET_SIZE, len(offsets), _OFFSET_SIZE, force_align)
+        for offset in reversed(offsets):
+            builder.PrependUOffsetTRelative(offset)
+        return builder.EndVector()
+
+    def _write_struct(self, struct_def: _TableDef, obj: Any) -> None:
+        builder = self._builder
+        builder.Prep(struct_def.minalign, struct_def.bytesize)
+        for f in reversed(struct_def.fields):
+            builder.Pad(f.padding)
+            field_type = f.type
+            assert field_type is not None
+            value = getattr(obj, f.name)
+            if field_type.kind == "struct":
+                self._write_struct(field_type.table_def, value)  # pyre-ignore[6]
+            else:
+                builder.Prepend(
+                    _SCALARS[field_type.scalar].flags,  # pyre-ignore[6]
+                    _to_scalar(value, field_type),
+                )
+
+
+def _to_scalar(value: Any, scalar_type: _Type) -> Union[int, float, bool]:
+    scalar = _SCALARS[scalar_type.scalar]  # pyre-ignore[6]
+    if isinstance(value, enum.Enum):
+        value = value.value
+    if isinstance(value, str):
+        enum_def = scalar_type.enum_def
+        if enum_def is not None and value in enum_def.values:
+            value = enum_def.values[value]
+        else:
+            # e.g. "inf"/"-inf" stored as strings in Union[float, str] fields.
+            value = _parse_number(value, scalar.is_float)
+    if scalar.is_float:
+        value = float(value)
+        if scalar.size == 4 and math.isfinite(value):
+            # Compare against defaults the way flatc does, after narrowing.
+            value = struct.unpack("<f", struct.pack("<f", value))[0]
+        return value
+    if scalar.is_bool:
+        return bool(value)
+    value = int(value)
+    bits = 8 * scalar.size
+    if scalar.fmt.isupper():
+        # Unsigned; their struct format characters are upper case.
+        low, high = 0, 1 << bits
+    else:
+        low, high = -(1 << (bits - 1)), 1 << (bits - 1)
+    if not low <= value < high:
+        # Like flatc, which rejects e.g. -1 in a uint field.
+        raise ValueError(
+            f"Value {value} does not fit in a {bits}-bit {scalar_type.scalar} field"
+        )
+    return value
+
+
+def _dataclass_to_flatbuffer(
+    obj: Any, schema: _Schema, *, size_prefixed: bool = False
+) -> bytes:
+    """Serializes the dataclass tree `obj`, whose type corresponds to the root
+    table of `schema`, into binary flatbuffer data.
+
+    Produces the same bytes as `flatc --binary` over the JSON that
+    `_DataclassEncoder` would emit for `obj`, without JSON or a subprocess.
+    """
+    return _DataclassFlatbufferBuilder(schema).build(obj, size_prefixed=size_prefixed)
+
+
+def _serialize_with_schema(
+    obj: Any,
+    package: Union[str, ModuleType],
+    schema_names: Sequence[str],
+    *,
+    size_prefixed: bool = False,
+) -> bytes:
+    """Convenience wrapper: loads (and caches) the schema resources
+    `schema_names` from `package`, then serializes `obj` with them.
+    """
+    schema = _load_schema(package, tuple(schema_names))
+    return _dataclass_to_flatbuffer(obj, schema, size_prefixed=size_prefixed)
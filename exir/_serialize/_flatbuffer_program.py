@@ -18,10 +18,13 @@ from typing import Any, Dict, Optional
 import flatbuffers  # pyre-ignore[21]
 from executorch.exir._serialize._flatbuffer import (
     _FlatbufferResult,
-    _is_valid_alignment,
     _prepare_schema,
     _SchemaInfo,
 )
+from executorch.exir._serialize._flatbuffer_builder import (
+    _coerce_bytes,
+    _create_aligned_byte_vector,
+)
 from executorch.exir._serialize.generated.executorch_flatbuffer import (
     BackendDelegateInlineData as _BackendDelegateInlineData,
     Buffer as _Buffer,
@@ -64,29 +67,6 @@ def _dataclass_field_map(dataclass_type: type) -> tuple[tuple[str, str], ...]:
     return mapping
 
 
-def _create_aligned_byte_vector(builder: Any, data: bytes, alignment: int) -> int:
-    if not _is_valid_alignment(alignment):
-        raise ValueError(f"Bad alignment {alignment}")
-    builder.StartVector(1, len(data), alignment)
-    length = len(data)
-    builder.head = builder.Head() - length  # pyre-ignore[16]
-    builder.Bytes[builder.Head() : builder.Head() + length] = data  # pyre-ignore[16]
-    return builder.EndVector()
-
-
-def _coerce_bytes(data: Any) -> bytes:
-    if isinstance(data, bytes):
-        return data
-    if isinstance(data, bytearray):
-        return bytes(data)
-    if isinstance(data, memoryview):
-        return data.tobytes()
-    tobytes = getattr(data, "tobytes", None)
-    if callable(tobytes):
-        return tobytes()
-    return bytes(data)
-
-
 def _pack_buffer(self: Any, builder: Any) -> int:
     storage = 0
     if self.storage is not None:
@@ -0,0 +1,342 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""Schema-driven, lazy, read-only access to serialized flatbuffers.
+
+The views in this module wrap a buffer (typically an mmap of a file) and the
+parsed schema from `_flatbuffer_builder`, and only decode a field when it is
+accessed. Byte vectors are returned as `memoryview` slices of the underlying
+buffer, so reading e.g. a constant tensor never copies it.
+
+`_FlatbufferTable.to_dataclass()` converts a (sub)tree to the schema
+dataclasses; the intermediate dict has the same shape as the JSON that
+`flatc --json --defaults-json --strict-json` emits for the same buffer, so it
+can be fed to `_json_to_dataclass()`.
+"""
+
+import struct
+from functools import lru_cache
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
+
+from executorch.exir._serialize._dataclass import _json_to_dataclass
+from executorch.exir._serialize._flatbuffer_builder import (
+    _FieldDef,
+    _SCALARS,
+    _Schema,
+    _TableDef,
+    _Type,
+)
+
+_UOFFSET: struct.Struct = struct.Struct("<I")
+_SOFFSET: struct.Struct = struct.Struct("<i")
+_VOFFSET: struct.Struct = struct.Struct("<H")
+
+
+def _read_uoffset(buf: memoryview, pos: int) -> int:
+    return _UOFFSET.unpack_from(buf, pos)[0]
+
+
+@lru_cache(maxsize=None)
+def _scalar_struct(scalar: str) -> struct.Struct:
+    return struct.Struct("<" + _SCALARS[scalar].fmt)
+
+
+def _struct_field_offset(struct_def: _TableDef, name: str) -> int:
+    """Returns the offset of field `name` from the start of the struct."""
+    offset = 0
+    for f in struct_def.fields:
+        if f.name == name:
+            return offset
+        field_type = f.type
+        assert field_type is not None
+        if field_type.kind == "struct":
+            offset += field_type.table_def.bytesize  # pyre-ignore[16]
+        else:
+            offset += _SCALARS[field_type.scalar].size  # pyre-ignore[6]
+        offset += f.padding
+    raise KeyError(name)
+
+
+def _read_scalar(buf: memoryview, pos: int, field_type: _Type) -> Union[int, float]:
+    scalar = field_type.scalar
+    assert scalar is not None
+    return _scalar_struct(scalar).unpack_from(buf, pos)[0]
+
+
+def _enum_name(field_type: _Type, value: Any) -> Any:
+    """Returns the enum label for `value`, as emitted by flatc JSON output."""
+    enum_def = field_type.enum_def
+    if enum_def is None:
+        return value
+    for name, enum_value in enum_def.values.items():
+        if enum_value == value:
+            return name
+    return value
+
+
+def _read_string(buf: memoryview, pos: int) -> str:
+    pos += _read_uoffset(buf, pos)
+    length = _read_uoffset(buf, pos)
+    return bytes(buf[pos + 4 : pos + 4 + length]).decode("utf-8")
+
+
+def _to_json_value(value: Any, field_type: _Type) -> Any:
+    if isinstance(value, (_FlatbufferTable, _FlatbufferStruct)):
+        return value.to_dict()
+    if isinstance(value, _FlatbufferVector):
+        element = field_type.element
+        assert element is not None
+        return [_to_json_value(v, element) for v in value]
+    if isinstance(value, memoryview):
+        return bytes(value)
+    if field_type.kind == "enum":
+        return _enum_name(field_type, value)
+    return value
+
+
+class _FlatbufferStruct:
+    """Read-only view of a flatbuffer struct stored inline in a buffer."""
+
+    __slots__ = ("_buf", "_pos", "_struct_def")
+
+    def __init__(self, buf: memoryview, pos: int, struct_def: _TableDef) -> None:
+        self._buf = buf
+        self._pos = pos
+        self._struct_def = struct_def
+
+    @property
+    def type_name(self) -> str:
+        return self._struct_def.name
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        f = self._struct_def.by_name.get(name)
+        if f is None:
+            raise AttributeError(f"{self._struct_def.name} has no field {name!r}")
+        field_type = f.type
+        assert field_type is not None
+        pos = self._pos + _struct_field_offset(self._struct_def, name)
+        if field_type.kind == "struct":
+            return _FlatbufferStruct(
+                self._buf, pos, field_type.table_def  # pyre-ignore[6]
+            )
+        value = _read_scalar(self._buf, pos, field_type)
+        return bool(value) if _SCALARS[field_type.scalar].is_bool else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        for f in self._struct_def.fields:
+            assert f.type is not None
+            result[f.name] = _to_json_value(getattr(self, f.name), f.type)
+        return result
+
+    def __repr__(self) -> str:
+        return f"{self.type_name}({self.to_dict()})"
+
+
+class _FlatbufferVector(Sequence[Any]):
+    """Read-only view of a flatbuffer vector of strings, tables or structs.
+
+    Elements are decoded when they are indexed.
+    """
+
+    def __init__(self, buf: memoryview, pos: int, element: _Type) -> None:
+        self._buf = buf
+        self._length: int = _read_uoffset(buf, pos)
+        self._start: int = pos + 4
+        self._element = element
+        if element.kind == "struct":
+            self._stride: int = element.table_def.bytesize  # pyre-ignore[16]
+        else:
+            self._stride = 4
+
+    def __len__(self) -> int:
+        return self._length
+
+    def _get(self, index: int) -> Any:
+        pos = self._start + index * self._stride
+        kind = self._element.kind
+        if kind == "string":
+            return _read_string(self._buf, pos)
+        if kind == "struct":
+            return _FlatbufferStruct(
+                self._buf, pos, self._element.table_def  # pyre-ignore[6]
+            )
+        return _FlatbufferTable(
+            self._buf,
+            pos + _read_uoffset(self._buf, pos),
+            self._element.table_def,  # pyre-ignore[6]
+        )
+
+    # pyre-ignore[14]: Sequence.__getitem__ also accepts slices.
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(f"Index {index} out of range [0, {self._length})")
+        return self._get(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for i in range(self._length):
+            yield self._get(i)
+
+    def __repr__(self) -> str:
+        return f"[{self._element.kind} x {self._length}]"
+
+
+class _FlatbufferTable:
+    """Read-only view of a flatbuffer table.
+
+    Fields are read through attribute access using their schema names, and are
+    decoded from the buffer on every access:
+
+    - scalars and enums are returned as Python numbers (enums as their integer
+      value), with the schema default when the field is absent;
+    - strings are returned as `str`;
+    - `[ubyte]`/`[byte]` vectors are returned as `memoryview` slices of the
+      buffer, other scalar vectors as lists;
+    - tables, structs and vectors of them are returned as lazy views;
+    - unions are returned as a view of the member table; `union_type()`
+      returns the member name.
+
+    Absent non-scalar fields are returned as None.
+    """
+
+    __slots__ = ("_buf", "_pos", "_vtable", "_vtable_size", "_table_def")
+
+    def __init__(self, buf: memoryview, pos: int, table_def: _TableDef) -> None:
+        self._buf = buf
+        self._pos = pos
+        self._table_def = table_def
+        self._vtable: int = pos - _SOFFSET.unpack_from(buf, pos)[0]
+        self._vtable_size: int = _VOFFSET.unpack_from(buf, self._vtable)[0]
+
+    @property
+    def type_name(self) -> str:
+        return self._table_def.name
+
+    def _field_pos(self, field_id: int) -> int:
+        """Returns the absolute position of field `field_id`, or 0 if absent."""
+        entry = 4 + 2 * field_id
+        if entry >= self._vtable_size:
+            return 0
+        offset = _VOFFSET.unpack_from(self._buf, self._vtable + entry)[0]
+        return self._pos + offset if offset else 0
+
+    def has_field(self, name: str) -> bool:
+        """Returns True if the field is stored in the buffer."""
+        f = self._table_def.by_name[name]
+        return self._field_pos(f.id) != 0
+
+    def union_type(self, name: str) -> Optional[str]:
+        """Returns the member name stored in union field `name`, or None."""
+        f = self._table_def.by_name[name]
+        union_def = f.type.union_def  # pyre-ignore[16]
+        assert union_def is not None
+        pos = self._field_pos(f.id - 1)
+        type_value = self._buf[pos] if pos else 0
+        for member, (_, value) in union_def.members.items():
+            if value == type_value:
+                return member
+        return None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        f = self._table_def.by_name.get(name)
+        if f is None:
+            raise AttributeError(f"{self._table_def.name} has no field {name!r}")
+        return self._read_field(f)
+
+    def _read_field(self, f: _FieldDef) -> Any:  # noqa: C901
+        field_type = f.type
+        assert field_type is not None
+        kind = field_type.kind
+        if kind == "union":
+            member = self.union_type(f.name)
+            pos = self._field_pos(f.id)
+            if member is None or not pos:
+                return None
+            return _FlatbufferTable(
+                self._buf,
+                pos + _read_uoffset(self._buf, pos),
+                field_type.union_def.tables[member],  # pyre-ignore[16]
+            )
+        pos = self._field_pos(f.id)
+        if kind in ("scalar", "enum"):
+            if not pos:
+                return f.default_value
+            value = _read_scalar(self._buf, pos, field_type)
+            return bool(value) if _SCALARS[field_type.scalar].is_bool else value
+        if not pos:
+            return None
+        if kind == "struct":
+            return _FlatbufferStruct(
+                self._buf, pos, field_type.table_def  # pyre-ignore[6]
+            )
+        if kind == "string":
+            return _read_string(self._buf, pos)
+        pos += _read_uoffset(self._buf, pos)
+        if kind == "table":
+            return _FlatbufferTable(
+                self._buf, pos, field_type.table_def  # pyre-ignore[6]
+            )
+        element = field_type.element
+        assert element is not None
+        if element.kind not in ("scalar", "enum"):
+            return _FlatbufferVector(self._buf, pos, element)
+        length = _read_uoffset(self._buf, pos)
+        scalar = _SCALARS[element.scalar]  # pyre-ignore[6]
+        if scalar.size == 1 and not scalar.is_bool:
+            return self._buf[pos + 4 : pos + 4 + length]
+        return list(struct.unpack_from(f"<{length}{scalar.fmt}", self._buf, pos + 4))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the table as a dict with the layout of flatc's JSON output.
+
+        Byte vectors are copied to `bytes`.
+        """
+        result: Dict[str, Any] = {}
+        for f in self._table_def.fields:
+            if f.deprecated:
+                continue
+            field_type = f.type
+            assert field_type is not None
+            value = self._read_field(f)
+            if value is None:
+                continue
+            if field_type.kind == "union":
+                result[f"{f.name}_type"] = self.union_type(f.name)
+                result[f.name] = value.to_dict()
+            else:
+                result[f.name] = _to_json_value(value, field_type)
+        return result
+
+    def to_dataclass(self, cls: Any) -> Any:
+        """Decodes the whole table into an instance of dataclass `cls`."""
+        return _json_to_dataclass(self.to_dict(), cls)
+
+    def __repr__(self) -> str:
+        return f"<{self.type_name} table at {self._pos}>"
+
+
+def _root_table(
+    buf: Union[bytes, bytearray, memoryview], schema: _Schema
+) -> _FlatbufferTable:
+    """Returns a lazy view of the root table of flatbuffer `buf`."""
+    view = memoryview(buf).cast("B")
+    if schema.file_identifier is not None and bytes(view[4:8]) != (
+        schema.file_identifier
+    ):
+        raise ValueError(
+            f"Unexpected file identifier {bytes(view[4:8])!r}, expected "
+            f"{schema.file_identifier!r}"
+        )
+    return _FlatbufferTable(view, _read_uoffset(view, 0), schema.root_table)
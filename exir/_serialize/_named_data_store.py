@@ -6,31 +6,69 @@
 
 # pyre-strict
 
+import copy
 import hashlib
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import torch
+from executorch.exir._serialize._cord import DataBlob, FileRange
 from executorch.exir._serialize.data_serializer import DataEntry
 from executorch.exir.tensor_layout import TensorLayout
 
+# Number of leading bytes used in the dedup fingerprint of a blob.
+_FINGERPRINT_PREFIX_SIZE: int = 32
 
-def _tensor_to_bytes(tensor: torch.Tensor) -> bytes:
-    """Convert tensor to bytes using the fastest method available.
 
-    Uses numpy().tobytes() which is faster than bytes(untyped_storage())
-    for C-contiguous tensors. Falls back to untyped_storage() for
-    non-contiguous tensors (e.g., channels_last) to preserve memory layout.
+def _tensor_to_view(tensor: torch.Tensor) -> memoryview:
+    """Returns a read-only view of the data of a CPU tensor, without copying it.
+
+    For non-C-contiguous tensors (e.g., channels_last) the view covers the whole
+    untyped storage, to preserve the actual memory layout. The view keeps the
+    tensor data alive.
     """
+    tensor = tensor.detach()
     if not tensor.is_contiguous():
-        # For non-C-contiguous tensors (e.g., channels_last), use untyped_storage
-        # to preserve the actual memory layout
-        return bytes(tensor.untyped_storage())
-    if tensor.dtype == torch.bfloat16:
-        # BFloat16 is not supported by numpy, extract raw bytes via view
-        return tensor.view(torch.uint16).numpy().tobytes()
+        tensor = torch.empty(0, dtype=torch.uint8).set_(tensor.untyped_storage())
+    # Reinterpret as bytes, since numpy does not support e.g. bfloat16.
+    return memoryview(tensor.reshape(-1).view(torch.uint8).numpy()).toreadonly()
+
+
+def _to_data_blob(data: Any, reference_data: bool) -> DataBlob:
+    """Returns `data` as a blob that can be stored. Unless `reference_data` is
+    set, tensors, storages and other buffers are copied to bytes.
+    """
+    if isinstance(data, (bytes, FileRange)):
+        return data
+    if isinstance(data, torch.Tensor):
+        view = _tensor_to_view(data)
+    elif isinstance(data, torch.UntypedStorage):
+        view = _tensor_to_view(torch.empty(0, dtype=torch.uint8).set_(data))
     else:
-        return tensor.numpy().tobytes()
+        view = memoryview(data).cast("B")
+    return view if reference_data else view.tobytes()
+
+
+def _copy_blob(data: DataBlob) -> DataBlob:
+    """Returns a copy of `data` that does not reference tensor memory."""
+    if isinstance(data, (bytes, FileRange)):
+        return data
+    return memoryview(data).tobytes()
+
+
+def _blob_prefix(data: DataBlob, size: int) -> bytes:
+    if isinstance(data, FileRange):
+        return bytes(FileRange(data.path, data.offset, min(size, data.size)))
+    return bytes(data[:size])
+
+
+def _blob_sha256(data: DataBlob) -> bytes:
+    if isinstance(data, FileRange):
+        sha = hashlib.sha256()
+        for chunk in data.read_chunks():
+            sha.update(chunk)
+        return sha.digest()
+    return hashlib.sha256(data).digest()
 
 
 @dataclass
@@ -47,10 +85,24 @@ class NamedDataStoreOutput:
             from {filename: {key: DataEntry}}.
     """
 
-    buffers: List[bytes]
+    buffers: List[DataBlob]
     pte_data: Dict[str, DataEntry]
     external_data: Dict[str, Dict[str, DataEntry]]
 
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "NamedDataStoreOutput":
+        # Views of tensor data cannot be deep-copied, so copy their bytes.
+        return NamedDataStoreOutput(
+            [_copy_blob(buffer) for buffer in self.buffers],
+            copy.deepcopy(self.pte_data, memo),
+            copy.deepcopy(self.external_data, memo),
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Views of tensor data cannot be pickled, so pickle their bytes.
+        state = dict(self.__dict__)
+        state["buffers"] = [_copy_blob(buffer) for buffer in self.buffers]
+        return state
+
 
 class NamedDataStore:
     """
@@ -65,10 +117,14 @@ class NamedDataStore:
     - The same data can be added multiple times and all keys will point to one
         buffer. If a duplicate blob is added with a different alignment, the
         lcm of the current and new alignment is taken for that blob.
+    - Tensors, tensor storages and other buffers are copied to bytes, unless
+        the store is created with `reference_data=True`. Then they are
+        referenced rather than copied, so they must not be modified until the
+        data has been serialized. FileRanges are always referenced.
     """
 
     # List of unique blobs.
-    buffers: List[bytes]
+    buffers: List[DataBlob]
     # Named data stored inside the PTE file. Map of {key: DataEntry}.
     pte_data: Dict[str, DataEntry]
     # Named data stored outside of the PTE file.
@@ -76,16 +132,25 @@ class NamedDataStore:
     external_data: Dict[str, Dict[str, DataEntry]]
 
     # Fast fingerprint for dedup: (length, first 32 bytes) -> buffer indices.
+    # The prefix is copied, since views of tensor data are not hashable.
     fingerprint_to_buffer_idx: Dict[Tuple[int, bytes], List[int]]
     # SHA-256 digest per buffer index, computed lazily on first dedup check.
     buffer_sha256: Dict[int, bytes]
     # Cache of key to buffer idx to detect duplicate key registration.
     key_to_buffer_idx: Dict[str, int]
+    # Whether tensors and buffers are referenced instead of copied.
+    reference_data: bool
 
-    def __init__(self) -> None:
+    def __init__(self, reference_data: bool = False) -> None:
         """
         Initializes a new NamedDataStore.
+
+        Args:
+            reference_data (bool): reference tensors and buffers that are
+                added instead of copying them. The caller must keep them
+                unmodified until the data has been serialized.
         """
+        self.reference_data = reference_data
         self.buffers = []
         self.pte_data = {}
         self.external_data = {}
@@ -96,14 +161,14 @@ class NamedDataStore:
     def _get_buffer_sha256(self, buffer_idx: int) -> bytes:
         sha = self.buffer_sha256.get(buffer_idx)
         if sha is None:
-            sha = hashlib.sha256(self.buffers[buffer_idx]).digest()
+            sha = _blob_sha256(self.buffers[buffer_idx])
             self.buffer_sha256[buffer_idx] = sha
         return sha
 
     def _add_named_data_to_map(
         self,
         key: str,
-        data: bytes,
+        data: DataBlob,
         alignment: int,
         local_key_to_buffer_idx: Dict[str, DataEntry],
         tensor_layout: Optional[TensorLayout] = None,
@@ -117,7 +182,7 @@ class NamedDataStore:
 
         Args:
             key (str): key associated with the data.
-            data (bytes): Bytes being requested to be serialized.
+            data (DataBlob): Bytes being requested to be serialized.
             alignment (int): alignment for bytes to be serialized with.
             local_key_to_buffer_idx (Dict[str, int]): map to add the data to.
         Raises:
@@ -127,19 +192,22 @@ class NamedDataStore:
         # Check if the key exists.
         buffer_idx = self.key_to_buffer_idx.get(key, -1)
         if buffer_idx != -1:
-            if data != self.buffers[buffer_idx]:
+            existing = self.buffers[buffer_idx]
+            if len(data) != len(existing) or _blob_sha256(
+                data
+            ) != self._get_buffer_sha256(buffer_idx):
                 raise ValueError(
                     f"Duplicate key {key} with different data. "
-                    f"Existing data size: {len(self.buffers[buffer_idx])} bytes. "
+                    f"Existing data size: {len(existing)} bytes. "
                     f"New data size: {len(data)} bytes."
                 )
         else:
             # Two-level dedup: cheap fingerprint rejects non-matches fast,
             # SHA-256 confirms matches without full byte comparison.
-            fingerprint = (len(data), data[:32])
+            fingerprint = (len(data), _blob_prefix(data, _FINGERPRINT_PREFIX_SIZE))
             candidates = self.fingerprint_to_buffer_idx.get(fingerprint)
             if candidates is not None:
-                new_sha = hashlib.sha256(data).digest()
+                new_sha = _blob_sha256(data)
                 for candidate in candidates:
                     if new_sha == self._get_buffer_sha256(candidate):
                         buffer_idx = candidate
@@ -162,7 +230,7 @@ class NamedDataStore:
     def add_named_data(
         self,
         key: str,
-        data: Union[bytes, torch.Tensor],
+        data: Union[DataBlob, torch.Tensor, torch.UntypedStorage],
         alignment: Optional[int] = 1,
         external_tag: Optional[str] = None,
         tensor_layout: Optional[TensorLayout] = None,
@@ -171,7 +239,7 @@ class NamedDataStore:
         Adds a named blob to the NamedDataStore.
         Args:
             key (str): key associated with the data.
-            data (Union[bytes, torch.Tensor]): Union of bytes, or torch.Tensor to serialize. Note: if a tensor is passed, it must have contiguous memory layout. The tensor_layout will be inferred from the tensor and should not be passed in.
+            data (Union[DataBlob, torch.Tensor, torch.UntypedStorage]): The data to serialize: bytes, any object supporting the buffer protocol (e.g. a memoryview), a FileRange, a torch.Tensor or a torch.UntypedStorage. Unless the store references data, everything but bytes and FileRanges is copied. Note: if a tensor is passed, it must have contiguous memory layout. The tensor_layout will be inferred from the tensor and should not be passed in.
             alignment (int): alignment for bytes to be serialized with.
             external (Optional[str]): the external filename that this data is saved to.
             tensor_layout (Optional[TensorLayout]): layout of the tensor, if applicable.
@@ -193,9 +261,7 @@ class NamedDataStore:
                     f"Tensor {key} is a torch.Tensor, with tensor_layout {real_tensor_layout}. The provided tensor layout {tensor_layout} does not match."
                 )
             tensor_layout = real_tensor_layout
-            byte_data = _tensor_to_bytes(data)
-        else:
-            byte_data = data
+        byte_data = _to_data_blob(data, self.reference_data)
 
         if external_tag is None:
             self._add_named_data_to_map(
@@ -10,18 +10,18 @@
 import copy
 import json
 import math
+import mmap
 import re
 
 from dataclasses import dataclass
-from typing import ClassVar, Dict, List, Literal, Optional, Sequence, Tuple
+from typing import ClassVar, Dict, List, Literal, Optional, Sequence, Tuple, Union
 
 from executorch.exir._serialize._cord import Cord
 from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
-from executorch.exir._serialize._flatbuffer import (
-    _FlatbufferResult,
-    _program_flatbuffer_to_json,
-)
+from executorch.exir._serialize._flatbuffer import _FlatbufferResult
+from executorch.exir._serialize._flatbuffer_builder import _load_schema
 from executorch.exir._serialize._flatbuffer_program import _program_to_flatbuffer
+from executorch.exir._serialize._flatbuffer_reader import _FlatbufferTable, _root_table
 from executorch.exir._serialize._named_data_store import (
     NamedDataStore,
     NamedDataStoreOutput,
@@ -92,13 +92,13 @@ def _json_to_program(program_json: bytes) -> Program:
     return _json_to_dataclass(json.loads(program_json), cls=Program)
 
 
-def _insert_flatbuffer_header(
-    flatbuffer_data: bytes, magic_regex: str, header_data: bytes
-) -> bytes:
+def _insert_flatbuffer_header_cord(
+    flatbuffer_data: Union[bytes, memoryview], magic_regex: str, header_data: bytes
+) -> Cord:
     """Inserts a header just after the magic string of the provided flatbuffer data.
 
     Args:
-        flatbuffer_data: The input data to modify.
+        flatbuffer_data: The input data. Not modified.
         magic_regex: A regex pattern that must match the magic file_identifier
             characters of flatbuffer_data.
         header_data: The data to insert into flatbuffer_data. To ensure that
@@ -106,7 +106,8 @@ def _insert_flatbuffer_header(
             guaranteed that its length is a power of 2 >= the largest
             force_align value in the schema.
     Returns:
-        The modified flatbuffer_data with header_data inserted.
+        A Cord of flatbuffer_data with header_data inserted. The bulk of
+        flatbuffer_data is referenced, not copied.
     Raises:
         ValueError: If flatbuffer_data is too short to be valid.
         ValueError: If the magic bytes of flatbuffer_data does not match
@@ -119,30 +120,43 @@ def _insert_flatbuffer_header(
         raise ValueError(f"Flatbuffer data length {len(flatbuffer_data)} < 8")
 
     # Ensure that the magic matches.
-    actual_magic: str = flatbuffer_data[4:8].decode(errors="replace")
+    actual_magic: str = bytes(flatbuffer_data[4:8]).decode(errors="replace")
     if not re.match(magic_regex, actual_magic):
         raise ValueError(
             f"Flatbuffer data magic bytes {repr(actual_magic)} "
             + f"does not match pattern /{magic_regex}/"
         )
 
-    # Avoid a potentially big allocation/copy if there's nothing to do.
     if len(header_data) == 0:
-        return flatbuffer_data
+        return Cord(flatbuffer_data)
 
     # We will need to adjust the root object offset after inserting the header.
     root_offset = int.from_bytes(flatbuffer_data[0:4], byteorder=_HEADER_BYTEORDER)
 
-    return (
+    data = Cord(
         # New root offset.
         (root_offset + len(header_data)).to_bytes(4, byteorder=_HEADER_BYTEORDER)
         # Existing magic bytes.
-        + flatbuffer_data[4:8]
+        + bytes(flatbuffer_data[4:8])
         # Provided header + padding.
         + header_data
-        # Remainder of the file. Note that this can be O(10MB to 100MB), so it
-        # can trigger a large allocation + copy.
-        + flatbuffer_data[8:]
+    )
+    # Remainder of the file. Note that this can be O(10MB to 100MB), so it is
+    # referenced rather than copied.
+    data.append(memoryview(flatbuffer_data)[8:])
+    return data
+
+
+def _insert_flatbuffer_header(
+    flatbuffer_data: bytes, magic_regex: str, header_data: bytes
+) -> bytes:
+    """Like _insert_flatbuffer_header_cord(), but returns a contiguous copy."""
+    if len(header_data) == 0:
+        # Validate, and avoid a potentially big copy.
+        _insert_flatbuffer_header_cord(flatbuffer_data, magic_regex, header_data)
+        return flatbuffer_data
+    return bytes(
+        _insert_flatbuffer_header_cord(flatbuffer_data, magic_regex, header_data)
     )
 
 
@@ -419,6 +433,15 @@ def _extract_named_data(
     program.named_data = named_data
 
 
+def _data_blob_memo(program: Program) -> Dict[int, object]:
+    """Returns a copy.deepcopy() memo that makes the copy share the constant
+    buffer and inline delegate data blobs of `program`.
+    """
+    blobs = [buffer.storage for buffer in program.constant_buffer]
+    blobs.extend(inline.data for inline in program.backend_delegate_data)
+    return {id(blob): blob for blob in blobs}
+
+
 def serialize_pte_binary(
     pte_file: PTEFile,
     *,
@@ -452,10 +475,9 @@ def serialize_pte_binary(
     if constant_tensor_alignment is None:
         constant_tensor_alignment = ALIGNMENT
 
-    # Don't modify the original program.
-    # TODO(T144120904): Could avoid yet more huge copies with a more shallow
-    # copy, reusing the actual data blobs.
-    program = copy.deepcopy(pte_file.program)
+    # Don't modify the original program, but share its data blobs instead of
+    # copying them; they may be large, or memoryviews, which can't be copied.
+    program = copy.deepcopy(pte_file.program, _data_blob_memo(pte_file.program))
 
     # Store extracted segment data, with any buffer-specific alignment.
     # This may be constant data, delegate data or named data.
@@ -560,27 +582,22 @@ def serialize_pte_binary(
     header_data = pad_to(header_data, padded_header_length)
 
     # Insert the header into the flatbuffer data.
-    program_data: bytes = _insert_flatbuffer_header(
+    pte_data: Cord = _insert_flatbuffer_header_cord(
         flatbuffer_data=result.data,
         magic_regex=r"ET[0-9a-zA-Z][0-9a-zA-Z]",
         header_data=header_data,
     )
-    assert len(program_data) == program_size
-
-    # Potentially large. Try to free it as soon as we can.
-    del result.data
+    assert len(pte_data) == program_size
 
-    # Double-check that the extended header is in the right place and has the
-    # right contents.
-    eh = _get_extended_header(program_data)
-    assert eh is not None
+    # Double-check that the extended header has the right contents.
+    eh = _ExtendedHeader.from_bytes(header_data)
+    assert eh.is_valid()
     assert eh.program_size == program_size
     assert eh.segment_base_offset == segment_base_offset
 
     # Construct the final pte file containing:
     # - program data; written to offset 0.
     # - segments data (optional); aligned to segment_alignment.
-    pte_data = Cord(program_data)
     if len(segments_data) > 0:
         padding_length = padding_required(len(pte_data), segment_alignment)
         pte_data.append(b"\x00" * padding_length)
@@ -744,30 +761,136 @@ def _restore_segments(program: Program, segment_data: bytes) -> PTEFile:
     return PTEFile(program=program, mutable_data=mutable_data, named_data=named_data)
 
 
-def deserialize_pte_binary(program_data: bytes) -> PTEFile:
-    """Returns a PTEFile deserialized from the given runtime binary data."""
-    program_size = len(program_data)
-    segment_base_offset = 0
-
-    # Look for an extended header to see if segments follow the flatbuffer
-    # data.
-    eh: Optional[_ExtendedHeader] = _get_extended_header(program_data)
-    if eh and eh.is_valid():
-        program_size = eh.program_size
-        segment_base_offset = eh.segment_base_offset
-
-    # Parse the flatbuffer data.
-    program: Program = _json_to_program(
-        _program_flatbuffer_to_json(program_data[:program_size])
-    )
+class LazyPTEFile:
+    """Read-only view of a serialized PTE file that is decoded on demand.
+
+    Unlike deserialize_pte_binary(), nothing is decoded up front: `program` is
+    a lazy view of the Program flatbuffer table whose fields are read through
+    attribute access (see `_FlatbufferTable`), and segment, constant, mutable
+    and named data are returned as `memoryview` slices of the file data.
+
+    Use `LazyPTEFile.open()` to mmap a file; only the pages that are actually
+    read are loaded, so inspecting a single field of a multi-GB PTE file is
+    cheap. The mapping stays alive as long as this object or any view returned
+    by it is referenced.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        self._data: memoryview = memoryview(data).cast("B")
+        self.extended_header: Optional[_ExtendedHeader] = _get_extended_header(
+            bytes(self._data[: 8 + _ExtendedHeader.EXPECTED_LENGTH])
+        )
+        program_size = len(self._data)
+        self._segment_base_offset: int = 0
+        if self.extended_header is not None:
+            program_size = self.extended_header.program_size
+            self._segment_base_offset = self.extended_header.segment_base_offset
+        self.program: _FlatbufferTable = _root_table(
+            self._data[:program_size],
+            _load_schema(__package__, ("program.fbs", "scalar_type.fbs")),
+        )
+        self._named_data_index: Optional[Dict[str, int]] = None
 
-    if segment_base_offset != 0:
-        # Move segment data back into the Program.
-        return _restore_segments(
-            program=program, segment_data=program_data[segment_base_offset:]
+    @staticmethod
+    def open(path: str) -> "LazyPTEFile":
+        """Returns a LazyPTEFile backed by a read-only mmap of `path`."""
+        with open(path, "rb") as f:
+            return LazyPTEFile(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @property
+    def data(self) -> memoryview:
+        """The complete file data."""
+        return self._data
+
+    def segment(self, index: int) -> memoryview:
+        """Returns the data of segment `index`."""
+        segments = self.program.segments
+        if segments is None or index >= len(segments):
+            raise ValueError(f"Segment index {index} >= num segments")
+        segment = segments[index]
+        start = self._segment_base_offset + segment.offset
+        if self._segment_base_offset == 0 or start + segment.size > len(self._data):
+            raise ValueError(f"Segment {index} overflows data length {len(self._data)}")
+        return self._data[start : start + segment.size]
+
+    def _subsegment(self, offsets: SubsegmentOffsets, index: int) -> memoryview:
+        # Like _restore_constant_segment(), entries extend to the start of the
+        # next entry, including any padding.
+        segment = self.segment(offsets.segment_index)
+        start = offsets.offsets[index]
+        end = (
+            offsets.offsets[index + 1]
+            if index + 1 < len(offsets.offsets)
+            else len(segment)
         )
+        return segment[start:end]
 
-    return PTEFile(program=program, mutable_data=None, named_data=None)
+    def constant_data(self, buffer_index: int) -> Optional[memoryview]:
+        """Returns the data of constant buffer `buffer_index`, whether it is
+        stored in the constant segment or inline in the program, or None if
+        there is no such buffer.
+        """
+        constant_segment = self.program.constant_segment
+        if constant_segment is not None and len(constant_segment.offsets) > 0:
+            if buffer_index >= len(constant_segment.offsets):
+                return None
+            return self._subsegment(constant_segment, buffer_index)
+        constant_buffer = self.program.constant_buffer
+        if constant_buffer is None or buffer_index >= len(constant_buffer):
+            return None
+        return constant_buffer[buffer_index].storage
+
+    def mutable_data(self, buffer_index: int) -> Optional[memoryview]:
+        """Returns the initial data of mutable buffer `buffer_index`, or None if
+        there is no such buffer.
+        """
+        mutable_data_segments = self.program.mutable_data_segments
+        if not mutable_data_segments:
+            return None
+        if len(mutable_data_segments) > 1:
+            raise ValueError("Can't handle more than 1 mutable data segment.")
+        offsets = mutable_data_segments[0]
+        if buffer_index >= len(offsets.offsets):
+            return None
+        return self._subsegment(offsets, buffer_index)
+
+    def named_data(self, key: str) -> Optional[memoryview]:
+        """Returns the data stored under `key`, or None if there is none."""
+        if self._named_data_index is None:
+            named_data = self.program.named_data or []
+            self._named_data_index = {
+                entry.key: entry.segment_index for entry in named_data
+            }
+        segment_index = self._named_data_index.get(key)
+        if segment_index is None:
+            return None
+        return self.segment(segment_index)
+
+    def delegate_data(self, plan_index: int, delegate_index: int) -> memoryview:
+        """Returns the processed payload of a delegate, whether it is stored
+        inline or in a segment.
+        """
+        plan = self.program.execution_plan[plan_index]
+        processed = plan.delegates[delegate_index].processed
+        if processed.location == DataLocation.INLINE:
+            return self.program.backend_delegate_data[processed.index].data
+        return self.segment(processed.index)
+
+    def to_pte_file(self) -> PTEFile:
+        """Decodes the whole file, like deserialize_pte_binary()."""
+        program: Program = self.program.to_dataclass(Program)
+        if self._segment_base_offset != 0:
+            # Move segment data back into the Program.
+            return _restore_segments(
+                program=program,
+                segment_data=bytes(self._data[self._segment_base_offset :]),
+            )
+        return PTEFile(program=program, mutable_data=None, named_data=None)
+
+
+def deserialize_pte_binary(program_data: bytes) -> PTEFile:
+    """Returns a PTEFile deserialized from the given runtime binary data."""
+    return LazyPTEFile(program_data).to_pte_file()
 
 
 def _extract_delegate_payload(
@@ -789,24 +912,12 @@ def _extract_delegate_payload(
     Returns:
         Delegate payload bytes, or None if not found.
     """
-    # Parse the extended header
-    extended_header = _get_extended_header(pte_data)
-
-    # Determine program size from header or use full data
-    if extended_header is not None:
-        program_size = extended_header.program_size
-    else:
-        program_size = len(pte_data)
-
-    # Parse the program flatbuffer
-    program: Program = _json_to_program(
-        _program_flatbuffer_to_json(pte_data[:program_size])
-    )
+    pte_file = LazyPTEFile(pte_data)
 
     # Search for the matching delegate
     match_count = 0
-    for plan in program.execution_plan:
-        for delegate in plan.delegates:
+    for plan_index, plan in enumerate(pte_file.program.execution_plan):
+        for index, delegate in enumerate(plan.delegates):
             if backend_id.lower() not in delegate.id.lower():
                 continue
             if match_count != delegate_index:
@@ -817,20 +928,17 @@ def _extract_delegate_payload(
 
             # Inline data
             if processed.location == DataLocation.INLINE:
-                inline_data = program.backend_delegate_data[processed.index]
-                if inline_data.data:
-                    return bytes(inline_data.data)
-                return None
+                data = pte_file.delegate_data(plan_index, index)
+                return bytes(data) if data else None
 
             # Segment data
             if processed.location == DataLocation.SEGMENT:
+                extended_header = pte_file.extended_header
                 if extended_header is None:
                     return None
-
-                segment = program.segments[processed.index]
+                segment = pte_file.program.segments[processed.index]
                 offset = extended_header.segment_base_offset + segment.offset
-                size = segment.size
-                return pte_data[offset : offset + size]
+                return bytes(pte_data[offset : offset + segment.size])
 
             return None
 
@@ -99,7 +99,8 @@ def serialize_for_executorch(
 
     # Collect external weights from emitter output and merge them.
     fqn_to_tensor_layout = _extract_external_tensor_layouts(emitter_output.program)
-    updated_named_data_store = NamedDataStore()
+    # The store is serialized right away, so it can reference the data.
+    updated_named_data_store = NamedDataStore(reference_data=True)
     # Add tensor constants from the emitter to the NamedDataStore.
     for tag, fqn_to_index in emitter_output.external_constant_map.items():
         for fqn, index in fqn_to_index.items():
@@ -0,0 +1,368 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmarks the in-process flatbuffer builder against the JSON + flatc path.
+
+For each schema a synthetic payload is serialized with both paths; the script
+checks that the outputs are byte-identical and reports the time per call.
+
+    python -m executorch.exir._serialize.benchmark_flatbuffer_builder --scale 200
+"""
+
+import argparse
+import functools
+import importlib.resources
+import json
+import os
+import sys
+import tempfile
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+from executorch.exir._serialize._dataclass import _DataclassEncoder
+from executorch.exir._serialize._flatbuffer import _flatc_compile
+from executorch.exir._serialize._flatbuffer_builder import (
+    _load_schema,
+    _serialize_with_schema,
+)
+
+
+def _serialize_with_flatc(
+    obj: Any, package: Union[str, ModuleType], schema_names: Sequence[str]
+) -> bytes:
+    """Serializes `obj` the way it was done before the builder: dump it to
+    JSON and run `flatc --binary` over it.
+    """
+    resources = importlib.resources.files(package)
+    schema = _load_schema(package, tuple(schema_names))
+    with tempfile.TemporaryDirectory() as d:
+        for name in schema_names:
+            with open(os.path.join(d, name), "wb") as schema_file:
+                schema_file.write(resources.joinpath(name).read_bytes())
+        json_path = os.path.join(d, "data.json")
+        with open(json_path, "wb") as json_file:
+            json_file.write(json.dumps(obj, cls=_DataclassEncoder).encode("ascii"))
+        _flatc_compile(d, os.path.join(d, schema_names[0]), json_path)
+        output_path = os.path.join(d, f"data.{schema.file_extension or 'bin'}")
+        with open(output_path, "rb") as output_file:
+            return output_file.read()
+
+
+def _xnnpack_case(scale: int) -> Tuple[Any, str, List[str]]:
+    from executorch.backends.xnnpack.serialization import xnnpack_graph_schema as xs
+
+    xvalues = []
+    xnodes = []
+    for i in range(scale):
+        tensor = xs.XNNTensorValue(
+            datatype=xs.XNNDatatype.xnn_datatype_qint8,
+            num_dims=4,
+            dims=[1, 16, 32, 32],
+            constant_buffer_idx=i % 3,
+            external_id=0,
+            flags=0,
+            id_out=i,
+        )
+        xvalues.append(
+            xs.XValue(
+                xs.XNNQuantizedTensorValue(
+                    tensor_value=tensor,
+                    # The uint fields default to -1, which flatc rejects.
+                    quant_params=xs.PerChannelQuant(
+                        scale=[0.5] * 16,
+                        channel_dim=1,
+                        scale_buffer_idx=0,
+                        num_scales=16,
+                    ),
+                )
+            )
+        )
+        xnodes.append(
+            xs.XNode(
+                xs.XNNConv2d(
+                    padding_top=1,
+                    padding_right=1,
+                    padding_bottom=1,
+                    padding_left=1,
+                    kernel_height=3,
+                    kernel_width=3,
+                    subsampling_height=1,
+                    subsampling_width=1,
+                    dilation_height=1,
+                    dilation_width=1,
+                    group_input_channels=16,
+                    group_output_channels=16,
+                    groups=1,
+                    adjustment_height=0,
+                    adjustment_width=0,
+                    input1_id=i,
+                    filter_id=i,
+                    bias_id=i,
+                    output_id=i + 1,
+                    flags=0,
+                ),
+                debug_handle=i,
+                output_min_max=xs.OutputMinMax("-inf", 6.0),
+            )
+        )
+    graph = xs.XNNGraph(
+        version="0",
+        xnodes=xnodes,
+        xvalues=xvalues,
+        num_externs=2,
+        input_ids=[0],
+        output_ids=[scale],
+        constant_data=[
+            xs.ConstantDataOffset(offset=64 * i, size=64, named_key=f"w{i}")
+            for i in range(scale)
+        ],
+    )
+    return graph, "executorch.backends.xnnpack.serialization", ["schema.fbs"]
+
+
+def _vulkan_case(scale: int) -> Tuple[Any, str, List[str]]:
+    from executorch.backends.vulkan.serialization import vulkan_graph_schema as vs
+
+    values = [
+        vs.VkValue(
+            vs.VkTensor(
+                datatype=vs.VkDataType.FLOAT32,
+                dims=[1, 3, 224, 224],
+                constant_id=-1,
+                mem_obj_id=i,
+            )
+        )
+        for i in range(scale)
+    ]
+    graph = vs.VkGraph(
+        version="0",
+        chain=[
+            vs.OperatorCall(node_id=i, name="aten.conv2d.default", args=[i, i + 1])
+            for i in range(scale)
+        ],
+        values=values,
+        input_ids=[0],
+        output_ids=[scale - 1],
+        constants=[vs.VkBytes(offset=i * 64, length=64) for i in range(scale)],
+        shaders=[],
+    )
+    return graph, "executorch.backends.vulkan.serialization", ["schema.fbs"]
+
+
+def _mps_case(scale: int) -> Tuple[Any, str, List[str]]:
+    from executorch.backends.apple.mps.serialization import mps_graph_schema as ms
+
+    graph = ms.MPSGraph(
+        version="0",
+        mps_nodes=[
+            ms.MPSNode(ms.MPSAdd(input1_id=i, input2_id=i, output_id=i + 1))
+            for i in range(scale)
+        ],
+        mps_values=[
+            ms.MPSTensor(
+                datatype=ms.MPSDataType.mps_data_type_float32,
+                num_dims=4,
+                dims=[1, 16, 32, 32],
+                constant_buffer_size=0,
+                constant_buffer=ms.Buffer(storage=b""),
+                segment_offset=0,
+            )
+            for _ in range(scale + 1)
+        ],
+        input_ids=[0],
+        output_ids=[scale],
+        constant_ids=[],
+        graph_type=ms.OpType.mps_graph,
+        constant_segment=ms.DataSegment(offset=0, size=0),
+    )
+    return graph, "executorch.backends.apple.mps.serialization", ["schema.fbs"]
+
+
+def _qnn_case(scale: int) -> Tuple[Any, str, List[str]]:
+    from executorch.backends.qualcomm.serialization import qc_schema as qs
+
+    # The compiler spec has no repeated fields, so `scale` does not apply.
+    options = qs.QnnExecuTorchOptions(
+        soc_info=qs.SocInfo(qs.QcomChipset.SM8650, qs.HtpInfo(qs.HtpArch.V75, 8)),
+        backend_options=qs.QnnExecuTorchBackendOptions(
+            backend_type=qs.QnnExecuTorchBackendType.kHtpBackend,
+            htp_options=qs.QnnExecuTorchHtpBackendOptions(),
+        ),
+    )
+    return (
+        options,
+        "executorch.backends.qualcomm.serialization",
+        ["qc_compiler_spec.fbs"],
+    )
+
+
+def _samsung_case(scale: int) -> Tuple[Any, str, List[str]]:
+    from executorch.backends.samsung.serialization.compile_options import (
+        EnnExecuTorchOptions,
+        SamsungChipset,
+    )
+
+    # The compile options are a single enum, so `scale` does not apply.
+    return (
+        EnnExecuTorchOptions(SamsungChipset.E9955),
+        "executorch.backends.samsung.serialization",
+        ["compile_options_def.fbs"],
+    )
+
+
+def _flat_tensor_case(scale: int) -> Tuple[Any, str, List[str]]:
+    from executorch.exir.scalar_type import ScalarType
+    from executorch.extension.flat_tensor.serialize import flat_tensor_schema as fs
+
+    flat_tensor = fs.FlatTensor(
+        version=0,
+        segments=[fs.DataSegment(offset=i * 64, size=64) for i in range(scale)],
+        named_data=[
+            fs.NamedData(
+                key=f"layers.{i}.weight",
+                segment_index=i,
+                tensor_layout=fs.TensorLayout(
+                    scalar_type=ScalarType.FLOAT, sizes=[4, 4], dim_order=[0, 1]
+                ),
+            )
+            for i in range(scale)
+        ],
+    )
+    return (
+        flat_tensor,
+        "executorch.extension.flat_tensor.serialize",
+        ["flat_tensor.fbs", "scalar_type.fbs"],
+    )
+
+
+def _etdump_case(scale: int) -> Tuple[Any, str, List[str]]:
+    from executorch.devtools.etdump import schema_flatcc as es
+
+    events = [
+        es.Event(
+            profile_event=es.ProfileEvent(
+                name="native_call_add.out",
+                chain_index=0,
+                instruction_id=i,
+                delegate_debug_id_int=-1,
+                delegate_debug_id_str=None,
+                delegate_debug_metadata=None,
+                start_time=1000 * i,
+                end_time=1000 * i + 500,
+            ),
+            allocation_event=None,
+            debug_event=None,
+        )
+        for i in range(scale)
+    ]
+    etdump = es.ETDumpFlatCC(
+        version=0,
+        run_data=[
+            es.RunData(
+                name="forward",
+                bundled_input_index=-1,
+                allocators=[],
+                events=events,
+            )
+        ],
+    )
+    return (
+        etdump,
+        "executorch.devtools.etdump",
+        ["etdump_schema_flatcc.fbs", "scalar_type.fbs"],
+    )
+
+
+def _bundled_program_case(scale: int) -> Tuple[Any, str, List[str]]:
+    import executorch.devtools.bundled_program.schema as bp_schema
+    from executorch.exir.scalar_type import ScalarType
+
+    tensor = bp_schema.Tensor(
+        scalar_type=ScalarType.FLOAT,
+        sizes=[1, 16, 8, 8],
+        data=b"\x00" * 4096,
+        dim_order=[0, 1, 2, 3],
+    )
+    bundled_program = bp_schema.BundledProgram(
+        version=0,
+        method_test_suites=[
+            bp_schema.BundledMethodTestSuite(
+                method_name="forward",
+                test_cases=[
+                    bp_schema.BundledMethodTestCase(
+                        inputs=[bp_schema.Value(tensor)],
+                        expected_outputs=[bp_schema.Value(tensor)],
+                    )
+                    for _ in range(scale)
+                ],
+            )
+        ],
+        program=b"\x00" * 4096,
+    )
+    return (
+        bundled_program,
+        "executorch.devtools.bundled_program.serialize",
+        ["bundled_program_schema.fbs", "scalar_type.fbs"],
+    )
+
+
+_CASES: Dict[str, Callable[[int], Tuple[Any, str, List[str]]]] = {
+    "xnnpack": _xnnpack_case,
+    "vulkan": _vulkan_case,
+    "mps": _mps_case,
+    "qnn": _qnn_case,
+    "samsung": _samsung_case,
+    "flat_tensor": _flat_tensor_case,
+    "etdump": _etdump_case,
+    "bundled_program": _bundled_program_case,
+}
+
+
+def _time_per_call(fn: Callable[[], bytes], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--schemas",
+        nargs="+",
+        default=list(_CASES.keys()),
+        choices=list(_CASES.keys()),
+    )
+    parser.add_argument(
+        "--scale", type=int, default=100, help="Number of nodes/values per payload."
+    )
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'schema':<16} {'builder ms':>12} {'flatc ms':>12} {'speedup':>9} identical"
+    )
+    for name in args.schemas:
+        obj, package, schema_names = _CASES[name](args.scale)
+        builder_bytes = _serialize_with_schema(obj, package, schema_names)
+        flatc_bytes = _serialize_with_flatc(obj, package, schema_names)
+        builder_s = _time_per_call(
+            functools.partial(_serialize_with_schema, obj, package, schema_names),
+            args.iterations,
+        )
+        flatc_s = _time_per_call(
+            functools.partial(_serialize_with_flatc, obj, package, schema_names),
+            args.iterations,
+        )
+        print(
+            f"{name:<16} {builder_s * 1e3:>12.3f} {flatc_s * 1e3:>12.3f} "
+            f"{flatc_s / builder_s:>8.1f}x {builder_bytes == flatc_bytes}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Dict, Optional, Sequence
 
-from executorch.exir._serialize._cord import Cord
+from executorch.exir._serialize._cord import Cord, DataBlob
 from executorch.exir.tensor_layout import TensorLayout
 
 
@@ -32,11 +32,11 @@ class DataPayload:
     keys to the same entry.
 
     Attributes:
-        buffers: a sequence of byte buffers.
+        buffers: a sequence of byte buffers; see `Cord` for the supported types.
         key_to_data: a map from unique keys to serializable data.
     """
 
-    buffers: Sequence[bytes]
+    buffers: Sequence[DataBlob]
     named_data: Dict[str, DataEntry]
 
 
@@ -6,9 +6,11 @@
 
 
 import io
+import os
+import tempfile
 import unittest
 
-from executorch.exir._serialize._cord import Cord
+from executorch.exir._serialize._cord import Cord, FileRange
 
 
 class TestCord(unittest.TestCase):
@@ -37,6 +39,55 @@ class TestCord(unittest.TestCase):
         self.assertEqual(10, len(cord))
         self.assertEqual(b"HelloWorld", bytes(cord))
 
+    def test_cord_append_memoryview(self) -> None:
+        data = bytearray(b"World")
+        cord = Cord(b"Hello")
+        cord.append(memoryview(data).toreadonly())
+        self.assertEqual(10, len(cord))
+        self.assertEqual(b"HelloWorld", bytes(cord))
+
+        # Confirm no copies were made.
+        data[0:1] = b"w"
+        self.assertEqual(b"Helloworld", bytes(cord))
+
+    def test_cord_append_buffer(self) -> None:
+        data = bytearray(b"World")
+        cord = Cord(b"Hello")
+        cord.append(data)
+        self.assertEqual(10, len(cord))
+        self.assertEqual(b"HelloWorld", bytes(cord))
+
+        # Confirm no copies were made.
+        self.assertIs(cord._buffers[1].obj, data)
+
+        with self.assertRaises(TypeError):
+            cord.append("World")  # pyre-ignore[6]
+
+    def test_cord_append_file_range(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "data.bin")
+            with open(path, "wb") as f:
+                f.write(b"0123HelloWorld4567")
+
+            cord = Cord(b">")
+            cord.append(FileRange(path, offset=4, size=10))
+            self.assertEqual(11, len(cord))
+            self.assertEqual(b">HelloWorld", bytes(cord))
+
+            outfile = io.BytesIO()
+            cord.write_to_file(outfile)
+            self.assertEqual(b">HelloWorld", outfile.getvalue())
+
+            # Chunks never extend past the range.
+            file_range = FileRange(path, offset=4, size=10)
+            self.assertEqual(
+                [b"Hell", b"oWor", b"ld"], list(file_range.read_chunks(chunk_size=4))
+            )
+
+            # Ranges past the end of the file fail when read.
+            with self.assertRaises(ValueError):
+                bytes(FileRange(path, offset=10, size=10))
+
     def test_cord_append_cord(self) -> None:
         cord = Cord()
         cord.append(b"Hello")
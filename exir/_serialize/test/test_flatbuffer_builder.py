@@ -0,0 +1,290 @@
+#!/usr/bin/env fbpython
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import tempfile
+import unittest
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from executorch.exir._serialize._dataclass import _DataclassEncoder
+from executorch.exir._serialize._flatbuffer import (
+    _flatc_compile,
+    _program_json_to_flatbuffer,
+    _ResourceFiles,
+)
+from executorch.exir._serialize._flatbuffer_builder import (
+    _dataclass_to_flatbuffer,
+    _parse_schema,
+)
+from executorch.exir._serialize._program import _program_to_json
+from executorch.exir.schema import (
+    Buffer,
+    Chain,
+    ContainerMetadata,
+    Double,
+    EValue,
+    ExecutionPlan,
+    Instruction,
+    Int,
+    IntList,
+    KernelCall,
+    Operator,
+    Program,
+    String,
+    SubsegmentOffsets,
+)
+
+_TEST_SCHEMA: bytes = b"""
+namespace test_schema;
+
+file_identifier "TS00";
+file_extension "tsb";
+
+enum Color : ubyte { RED = 1, GREEN, BLUE = 8 }
+
+struct Vec3 {
+  x: float;
+  y: byte;
+  z: double;
+}
+
+table Leaf {
+  id: uint;
+  name: string;
+}
+
+table OtherLeaf {
+  value: double = 1.5;
+}
+
+union Payload {
+  Leaf,
+  AliasedLeaf: Leaf,
+  OtherLeaf,
+}
+
+table Root {
+  version: int = -1;
+  color: Color = GREEN;
+  position: Vec3;
+  points: [Vec3];
+  payload: Payload;
+  leaves: [Leaf];
+  tags: [string];
+  blob: [ubyte] (force_align: 16);
+  empty_blob: [ubyte] (force_align: 16);
+  removed: int (deprecated);
+  flags: [bool];
+  small: short;
+}
+
+root_type Root;
+"""
+
+
+@dataclass
+class Vec3:
+    x: float
+    y: int
+    z: float
+
+
+@dataclass
+class Leaf:
+    id: int
+    name: Optional[str]
+
+
+@dataclass
+class AliasedLeaf:
+    id: int
+    name: Optional[str]
+
+
+@dataclass
+class OtherLeaf:
+    value: float
+
+
+Payload = Union[Leaf, AliasedLeaf, OtherLeaf]
+
+
+@dataclass
+class Root:
+    version: int
+    color: int
+    position: Optional[Vec3]
+    points: List[Vec3]
+    payload: "Payload"
+    leaves: List[Leaf]
+    tags: List[str]
+    blob: bytes
+    empty_blob: bytes
+    flags: List[bool]
+    small: int
+
+
+class TestFlatbufferBuilder(unittest.TestCase):
+    def _make_root(self) -> Root:
+        return Root(
+            version=-1,
+            color=8,
+            position=Vec3(x=1.0, y=-2, z=3.5),
+            points=[Vec3(x=0.5, y=1, z=2.0), Vec3(x=-0.5, y=2, z=-2.0)],
+            payload=AliasedLeaf(id=7, name="aliased"),
+            leaves=[
+                Leaf(id=1, name="one"),
+                Leaf(id=2, name=None),
+                Leaf(0xFFFFFFFF, "max"),
+            ],
+            tags=["a", "bc", ""],
+            blob=b"\x01\x02\x03",
+            empty_blob=b"",
+            flags=[True, False, True],
+            small=3,
+        )
+
+    def _flatc_serialize(self, schema: bytes, obj: object) -> bytes:
+        with tempfile.TemporaryDirectory() as d:
+            schema_path = os.path.join(d, "schema.fbs")
+            with open(schema_path, "wb") as schema_file:
+                schema_file.write(schema)
+            json_path = os.path.join(d, "data.json")
+            with open(json_path, "wb") as json_file:
+                json_file.write(json.dumps(obj, cls=_DataclassEncoder).encode("ascii"))
+            _flatc_compile(d, schema_path, json_path)
+            with open(os.path.join(d, "data.tsb"), "rb") as output_file:
+                return output_file.read()
+
+    def test_parse_schema(self) -> None:
+        schema = _parse_schema({"schema.fbs": _TEST_SCHEMA}, "schema.fbs")
+        self.assertEqual(schema.file_identifier, b"TS00")
+        self.assertEqual(schema.file_extension, "tsb")
+        self.assertEqual(schema.root_table.name, "Root")
+
+        color = schema.enums["test_schema.Color"]
+        self.assertEqual(color.values, {"RED": 1, "GREEN": 2, "BLUE": 8})
+
+        payload = schema.unions["test_schema.Payload"]
+        self.assertEqual(
+            payload.members,
+            {
+                "Leaf": ("Leaf", 1),
+                "AliasedLeaf": ("Leaf", 2),
+                "OtherLeaf": ("OtherLeaf", 3),
+            },
+        )
+
+        vec3 = schema.tables["test_schema.Vec3"]
+        self.assertEqual(vec3.bytesize, 16)
+        self.assertEqual(vec3.minalign, 8)
+        self.assertEqual([f.padding for f in vec3.fields], [0, 3, 0])
+
+        root = schema.root_table
+        # The union occupies two slots: payload_type and payload.
+        self.assertEqual(root.by_name["payload"].id, 5)
+        self.assertEqual(root.by_name["leaves"].id, 6)
+        self.assertEqual(root.num_slots, 13)
+        self.assertEqual(root.by_name["version"].default_value, -1)
+        self.assertEqual(root.by_name["color"].default_value, 2)
+        self.assertTrue(root.by_name["removed"].deprecated)
+
+    def test_matches_flatc(self) -> None:
+        schema = _parse_schema({"schema.fbs": _TEST_SCHEMA}, "schema.fbs")
+        root = self._make_root()
+        self.assertEqual(
+            _dataclass_to_flatbuffer(root, schema),
+            self._flatc_serialize(_TEST_SCHEMA, root),
+        )
+
+    def test_program_matches_flatc(self) -> None:
+        program = Program(
+            version=0,
+            execution_plan=[
+                ExecutionPlan(
+                    name="forward",
+                    container_meta_type=ContainerMetadata("inp", "out"),
+                    values=[
+                        EValue(Int(1)),
+                        EValue(Double(float("-inf"))),
+                        EValue(String("hello")),
+                        EValue(IntList([1, 2, 3])),
+                    ],
+                    inputs=[0],
+                    outputs=[1],
+                    chains=[
+                        Chain(
+                            inputs=[0],
+                            outputs=[1],
+                            instructions=[
+                                Instruction(KernelCall(op_index=0, args=[0, 1]))
+                            ],
+                            stacktrace=None,
+                        )
+                    ],
+                    operators=[Operator(name="aten::add", overload="Tensor")],
+                    delegates=[],
+                    non_const_buffer_sizes=[0, 1024],
+                )
+            ],
+            constant_buffer=[Buffer(storage=b""), Buffer(storage=b"\x00" * 10)],
+            backend_delegate_data=[],
+            segments=[],
+            constant_segment=SubsegmentOffsets(segment_index=0, offsets=[]),
+        )
+        resources = _ResourceFiles(["program.fbs", "scalar_type.fbs"])
+        files = {
+            name: resources.get(name) for name in ["program.fbs", "scalar_type.fbs"]
+        }
+        schema = _parse_schema(files, "program.fbs")
+        self.assertEqual(
+            _dataclass_to_flatbuffer(program, schema),
+            _program_json_to_flatbuffer(_program_to_json(program)).data,
+        )
+
+    def test_size_prefixed(self) -> None:
+        schema = _parse_schema({"schema.fbs": _TEST_SCHEMA}, "schema.fbs")
+        root = self._make_root()
+        data = _dataclass_to_flatbuffer(root, schema)
+        prefixed = _dataclass_to_flatbuffer(root, schema, size_prefixed=True)
+        self.assertEqual(int.from_bytes(prefixed[:4], "little"), len(prefixed) - 4)
+        self.assertEqual(prefixed[8:12], b"TS00")
+        self.assertEqual(data[4:8], b"TS00")
+
+    def test_unknown_field_fails(self) -> None:
+        @dataclass
+        class BadLeaf:
+            id: int
+            not_in_schema: int
+
+        schema = _parse_schema({"schema.fbs": _TEST_SCHEMA}, "schema.fbs")
+        root = self._make_root()
+        root.leaves = [BadLeaf(id=1, not_in_schema=2)]  # pyre-ignore[8]
+        with self.assertRaises(ValueError):
+            _dataclass_to_flatbuffer(root, schema)
+
+    def test_bad_union_member_fails(self) -> None:
+        schema = _parse_schema({"schema.fbs": _TEST_SCHEMA}, "schema.fbs")
+        root = self._make_root()
+        root.payload = Vec3(x=0.0, y=0, z=0.0)
+        with self.assertRaises(ValueError):
+            _dataclass_to_flatbuffer(root, schema)
+
+    def test_out_of_range_scalar_fails(self) -> None:
+        schema = _parse_schema({"schema.fbs": _TEST_SCHEMA}, "schema.fbs")
+        for field, value in [
+            ("leaves", [Leaf(id=-1, name=None)]),
+            ("leaves", [Leaf(id=1 << 32, name=None)]),
+            ("small", 1 << 15),
+            ("points", [Vec3(x=0.0, y=128, z=0.0)]),
+        ]:
+            with self.subTest(field=field, value=value):
+                root = self._make_root()
+                setattr(root, field, value)
+                with self.assertRaises(ValueError):
+                    _dataclass_to_flatbuffer(root, schema)
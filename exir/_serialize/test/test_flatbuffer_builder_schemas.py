@@ -0,0 +1,262 @@
+#!/usr/bin/env fbpython
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Checks that the in-process flatbuffer builder produces the same bytes as
+`flatc --binary` for every schema that is serialized with it.
+"""
+
+import unittest
+from types import ModuleType
+from typing import Any, Sequence, Union
+
+from executorch.exir._serialize._flatbuffer_builder import _serialize_with_schema
+from executorch.exir._serialize.test.utils import flatc_serialize
+
+
+class TestFlatbufferBuilderSchemas(unittest.TestCase):
+    def _assert_matches_flatc(
+        self, obj: Any, package: Union[str, ModuleType], schema_names: Sequence[str]
+    ) -> None:
+        self.assertEqual(
+            _serialize_with_schema(obj, package, schema_names),
+            flatc_serialize(obj, package, schema_names),
+        )
+
+    def test_xnnpack(self) -> None:
+        from executorch.backends.xnnpack.serialization import xnnpack_graph_schema as xs
+
+        tensor = xs.XNNTensorValue(
+            datatype=xs.XNNDatatype.xnn_datatype_qint8,
+            num_dims=4,
+            dims=[1, 4, 8, 8],
+            constant_buffer_idx=1,
+            external_id=0,
+            flags=0,
+            id_out=1,
+        )
+        graph = xs.XNNGraph(
+            version="0",
+            xnodes=[
+                xs.XNode(
+                    xs.XNNFullyConnected(
+                        input1_id=0, filter_id=1, bias_id=2, output_id=3, flags=0
+                    ),
+                    debug_handle=7,
+                    output_min_max=xs.OutputMinMax("-inf", 6.0),
+                )
+            ],
+            xvalues=[
+                xs.XValue(
+                    xs.XNNQuantizedTensorValue(
+                        tensor_value=tensor,
+                        # The uint fields default to -1, which flatc rejects.
+                        quant_params=xs.PerChannelQuant(
+                            scale=[0.5] * 4,
+                            channel_dim=1,
+                            scale_buffer_idx=0,
+                            num_scales=4,
+                        ),
+                    )
+                ),
+                xs.XValue(
+                    xs.XNNTensorValue(
+                        datatype=xs.XNNDatatype.xnn_datatype_fp32,
+                        num_dims=2,
+                        dims=[4, 8],
+                        constant_buffer_idx=0,
+                        external_id=1,
+                        flags=1,
+                        id_out=0,
+                    )
+                ),
+            ],
+            num_externs=2,
+            input_ids=[0],
+            output_ids=[3],
+            constant_data=[
+                xs.ConstantDataOffset(offset=0, size=64, named_key="w0"),
+                xs.ConstantDataOffset(offset=64, size=16),
+            ],
+        )
+        self._assert_matches_flatc(
+            graph, "executorch.backends.xnnpack.serialization", ["schema.fbs"]
+        )
+
+    def test_vulkan(self) -> None:
+        from executorch.backends.vulkan.serialization import vulkan_graph_schema as vs
+
+        graph = vs.VkGraph(
+            version="0",
+            chain=[
+                vs.OperatorCall(node_id=0, name="aten.add.Tensor", args=[0, 1, 2]),
+            ],
+            values=[
+                vs.VkValue(
+                    vs.VkTensor(
+                        datatype=vs.VkDataType.FLOAT32,
+                        dims=[1, 3, 8, 8],
+                        constant_id=-1,
+                        mem_obj_id=0,
+                    )
+                ),
+                vs.VkValue(vs.Int(3)),
+                vs.VkValue(vs.Double(0.5)),
+                vs.VkValue(vs.String("add")),
+            ],
+            input_ids=[0],
+            output_ids=[2],
+            constants=[vs.VkBytes(offset=0, length=64)],
+            shaders=[],
+        )
+        self._assert_matches_flatc(
+            graph, "executorch.backends.vulkan.serialization", ["schema.fbs"]
+        )
+
+    def test_mps(self) -> None:
+        from executorch.backends.apple.mps.serialization import mps_graph_schema as ms
+
+        graph = ms.MPSGraph(
+            version="0",
+            mps_nodes=[
+                ms.MPSNode(
+                    ms.MPSAdd(input1_id=0, input2_id=1, output_id=2, alpha=2.0),
+                    min_max=ms.MPSMinMax(min_value=-1.0, max_value=1.0),
+                ),
+                ms.MPSNode(ms.MPSView(input1_id=2, output_id=3, num_dims=1, shape=[8])),
+            ],
+            mps_values=[
+                ms.MPSTensor(
+                    datatype=ms.MPSDataType.mps_data_type_float32,
+                    num_dims=2,
+                    dims=[2, 4],
+                    constant_buffer_size=32 if i == 1 else 0,
+                    constant_buffer=ms.Buffer(storage=b""),
+                    segment_offset=0,
+                )
+                for i in range(4)
+            ],
+            input_ids=[0],
+            output_ids=[3],
+            constant_ids=[1],
+            graph_type=ms.OpType.mps_graph,
+            constant_segment=ms.DataSegment(offset=0, size=32),
+        )
+        self._assert_matches_flatc(
+            graph, "executorch.backends.apple.mps.serialization", ["schema.fbs"]
+        )
+
+    def test_samsung(self) -> None:
+        from executorch.backends.samsung.serialization.compile_options import (
+            EnnExecuTorchOptions,
+            SamsungChipset,
+        )
+
+        self._assert_matches_flatc(
+            EnnExecuTorchOptions(SamsungChipset.E9955),
+            "executorch.backends.samsung.serialization",
+            ["compile_options_def.fbs"],
+        )
+
+    def test_flat_tensor(self) -> None:
+        from executorch.exir.scalar_type import ScalarType
+        from executorch.extension.flat_tensor.serialize import flat_tensor_schema as fs
+
+        flat_tensor = fs.FlatTensor(
+            version=0,
+            segments=[fs.DataSegment(offset=0, size=64), fs.DataSegment(64, 16)],
+            named_data=[
+                fs.NamedData(
+                    key="linear.weight",
+                    segment_index=0,
+                    tensor_layout=fs.TensorLayout(
+                        scalar_type=ScalarType.FLOAT, sizes=[4, 4], dim_order=[0, 1]
+                    ),
+                ),
+                fs.NamedData(key="blob", segment_index=1, tensor_layout=None),
+            ],
+        )
+        self._assert_matches_flatc(
+            flat_tensor,
+            "executorch.extension.flat_tensor.serialize",
+            ["flat_tensor.fbs", "scalar_type.fbs"],
+        )
+
+    def test_etdump(self) -> None:
+        from executorch.devtools.etdump import schema_flatcc as es
+
+        etdump = es.ETDumpFlatCC(
+            version=0,
+            run_data=[
+                es.RunData(
+                    name="forward",
+                    bundled_input_index=-1,
+                    allocators=[es.Allocator(name="method")],
+                    events=[
+                        es.Event(
+                            profile_event=es.ProfileEvent(
+                                name="native_call_add.out",
+                                chain_index=0,
+                                instruction_id=1,
+                                delegate_debug_id_int=-1,
+                                delegate_debug_id_str=None,
+                                delegate_debug_metadata=None,
+                                start_time=1000,
+                                end_time=1500,
+                            ),
+                            allocation_event=None,
+                            debug_event=None,
+                        ),
+                        es.Event(
+                            profile_event=None,
+                            allocation_event=es.AllocationEvent(
+                                allocator_id=0, allocation_size=64
+                            ),
+                            debug_event=None,
+                        ),
+                    ],
+                )
+            ],
+        )
+        self._assert_matches_flatc(
+            etdump,
+            "executorch.devtools.etdump",
+            ["etdump_schema_flatcc.fbs", "scalar_type.fbs"],
+        )
+
+    def test_bundled_program(self) -> None:
+        import executorch.devtools.bundled_program.schema as bp_schema
+        from executorch.exir.scalar_type import ScalarType
+
+        tensor = bp_schema.Tensor(
+            scalar_type=ScalarType.FLOAT,
+            sizes=[2, 2],
+            data=b"\x00" * 16,
+            dim_order=[0, 1],
+        )
+        bundled_program = bp_schema.BundledProgram(
+            version=0,
+            method_test_suites=[
+                bp_schema.BundledMethodTestSuite(
+                    method_name="forward",
+                    test_cases=[
+                        bp_schema.BundledMethodTestCase(
+                            inputs=[
+                                bp_schema.Value(tensor),
+                                bp_schema.Value(bp_schema.Int(3)),
+                                bp_schema.Value(bp_schema.Bool(True)),
+                            ],
+                            expected_outputs=[bp_schema.Value(bp_schema.Double(0.25))],
+                        )
+                    ],
+                )
+            ],
+            program=b"\x01\x02\x03\x04",
+        )
+        self._assert_matches_flatc(
+            bundled_program,
+            "executorch.devtools.bundled_program.serialize",
+            ["bundled_program_schema.fbs", "scalar_type.fbs"],
+        )
@@ -6,9 +6,14 @@
 
 # pyre-strict
 
+import copy
+import os
+import pickle
+import tempfile
 import unittest
 
 import torch
+from executorch.exir._serialize._cord import FileRange
 
 from executorch.exir._serialize._named_data_store import NamedDataStore
 from executorch.exir._serialize.data_serializer import DataEntry
@@ -64,6 +69,61 @@ class TestNamedDataStore(unittest.TestCase):
         )
         self.assertEqual(len(output.external_data), 0)
 
+    def test_add_torch_tensor_is_copied(self) -> None:
+        store = NamedDataStore()
+        t0 = torch.arange(8, dtype=torch.bfloat16)
+        t1 = torch.arange(4, dtype=torch.float)
+        expected = [bytes(t0.untyped_storage()), bytes(t1.untyped_storage())]
+
+        store.add_named_data("key0", t0, None, None)
+        store.add_named_data("key1", t1.untyped_storage(), None, None)
+
+        output = store.get_named_data_store_output()
+        # In-place edits after adding the data do not change the buffers.
+        t0.fill_(0)
+        t1.fill_(0)
+        self.assertEqual(output.buffers, expected)
+
+    def test_add_torch_tensor_is_referenced(self) -> None:
+        store = NamedDataStore(reference_data=True)
+        t0 = torch.arange(8, dtype=torch.bfloat16)
+        t1 = torch.arange(4, dtype=torch.float)
+
+        store.add_named_data("key0", t0, None, None)
+        store.add_named_data("key1", t1.untyped_storage(), None, None)
+
+        output = store.get_named_data_store_output()
+        self.assertEqual(output.buffers[0], bytes(t0.untyped_storage()))
+        self.assertEqual(output.buffers[1], bytes(t1.untyped_storage()))
+        # The buffers are views of the tensor data.
+        t0.fill_(0)
+        t1.fill_(0)
+        self.assertEqual(output.buffers[0], bytes(16))
+        self.assertEqual(output.buffers[1], bytes(16))
+
+    def test_add_file_range(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "data.bin")
+            with open(path, "wb") as f:
+                f.write(b"data1data2")
+
+            store = NamedDataStore()
+            data1 = FileRange(path, offset=0, size=5)
+            store.add_named_data("key1", data1, None, None)
+            # Identical data is deduplicated, regardless of the buffer type.
+            store.add_named_data("key2", b"data1", None, None)
+            store.add_named_data("key3", FileRange(path, offset=5, size=5), None, None)
+            # Re-adding a key compares the data.
+            store.add_named_data("key1", b"data1", None, None)
+            with self.assertRaises(ValueError):
+                store.add_named_data("key3", b"data1", None, None)
+
+            output = store.get_named_data_store_output()
+            self.assertEqual(len(output.buffers), 2)
+            self.assertIs(output.buffers[0], data1)
+            self.assertEqual(output.pte_data["key2"], DataEntry(0, 1, None))
+            self.assertEqual(output.pte_data["key3"], DataEntry(1, 1, None))
+
     def test_add_invalid_torch_tensor_layout(self) -> None:
         store = NamedDataStore()
         t0 = torch.tensor([[1, 2], [3, 4]], dtype=torch.int)
@@ -85,6 +145,32 @@ class TestNamedDataStore(unittest.TestCase):
         # Non-contiguous tensor is not supported.
         self.assertRaises(ValueError, store.add_named_data, "key", t0, 1, None)
 
+    def test_add_memoryview(self) -> None:
+        store = NamedDataStore(reference_data=True)
+        data = memoryview(torch.arange(16, dtype=torch.uint8).numpy()).toreadonly()
+        store.add_named_data("key1", data, None, None)
+        store.add_named_data("key2", bytes(data), None, None)
+
+        output = store.get_named_data_store_output()
+        # The identical data is deduplicated, and the view is not copied.
+        self.assertEqual(len(output.buffers), 1)
+        self.assertIs(output.buffers[0].obj, data.obj)
+        self.assertEqual(output.pte_data["key2"], DataEntry(0, 1, None))
+
+    def test_copy_and_pickle_output_with_views(self) -> None:
+        store = NamedDataStore(reference_data=True)
+        t0 = torch.arange(4, dtype=torch.float)
+        store.add_named_data("key0", t0, None, "file1")
+        output = store.get_named_data_store_output()
+
+        copied = copy.deepcopy(output)
+        pickled = pickle.loads(pickle.dumps(output))
+        t0.fill_(0)
+        for other in (copied, pickled):
+            self.assertEqual(other.buffers, [bytes(torch.arange(4).float().numpy())])
+            self.assertEqual(other.external_data, output.external_data)
+        self.assertEqual(output.buffers[0], bytes(16))
+
     def test_add_duplicate_name_and_data(self) -> None:
         store = NamedDataStore()
         store.add_named_data("key", b"data", None, None)
@@ -12,10 +12,13 @@ import dataclasses
 import difflib
 import json
 import math
+import os
+import tempfile
 import unittest
 
 from typing import Dict, List, Sequence
 
+from executorch.exir._serialize._cord import Cord
 from executorch.exir._serialize._flatbuffer import _program_flatbuffer_to_json
 from executorch.exir._serialize._named_data_store import NamedDataStoreOutput
 from executorch.exir._serialize._program import (
@@ -23,7 +26,9 @@ from executorch.exir._serialize._program import (
     _get_extended_header,
     _json_to_program,
     _program_to_json,
+    _restore_segments,
     deserialize_pte_binary,
+    LazyPTEFile,
     PTEFile,
     serialize_pte_binary,
 )
@@ -672,6 +677,25 @@ class TestProgram(unittest.TestCase):
         self.assertEqual(len(flatbuffer_program.constant_segment.offsets), 1)
         self.assertEqual(flatbuffer_program.constant_segment.offsets[0], 0)
 
+    def test_constants_as_memoryviews(self) -> None:
+        blobs = [b"", b"\x10" * 17, b"\x20" * 32]
+        program = get_test_program()
+        add_constant_data(program, blobs)
+        view_program = get_test_program()
+        add_constant_data(view_program, [memoryview(blob) for blob in blobs])
+
+        def serialize(program: Program) -> Cord:
+            return serialize_pte_binary(
+                PTEFile(program=program),
+                extract_delegate_segments=True,
+                segment_alignment=SEGMENT_ALIGNMENT,
+                constant_tensor_alignment=CONSTANT_TENSOR_ALIGNMENT,
+            )
+
+        # Constant data can reference memory that it doesn't own, and is
+        # serialized the same way as bytes.
+        self.assertEqual(bytes(serialize(view_program)), bytes(serialize(program)))
+
     def test_unused_inline_delegate_blobs_with_segments(self) -> None:
         # Create a program with some delegate data blobs.
         program = get_test_program()
@@ -1100,6 +1124,100 @@ EXAMPLE_HEADER_DATA_MIN: bytes = (
 )
 
 
+def _flatc_deserialize(pte_data: bytes) -> PTEFile:
+    """Deserializes `pte_data` through flatc, independently of LazyPTEFile."""
+    program_size = len(pte_data)
+    segment_base_offset = 0
+    eh = _get_extended_header(pte_data)
+    if eh is not None and eh.is_valid():
+        program_size = eh.program_size
+        segment_base_offset = eh.segment_base_offset
+    program = _json_to_program(_program_flatbuffer_to_json(pte_data[:program_size]))
+    if segment_base_offset != 0:
+        return _restore_segments(program, pte_data[segment_base_offset:])
+    return PTEFile(program=program)
+
+
+class TestLazyPTEFile(unittest.TestCase):
+    def serialize_with_segments(self) -> bytes:
+        program = get_test_program()
+        add_constant_data(program, [b"\x01" * 10, b"\x02" * 33])
+        add_delegate_data(
+            program, program.execution_plan[0], [b"\x03" * 7, b"\x04" * 300]
+        )
+        named_data = NamedDataStoreOutput(
+            buffers=[b"\x05" * 16],
+            pte_data={"weight": DataEntry(0, 16, None)},
+            external_data={},
+        )
+        return bytes(
+            serialize_pte_binary(
+                PTEFile(program=program, named_data=named_data),
+                extract_delegate_segments=True,
+                segment_alignment=SEGMENT_ALIGNMENT,
+                constant_tensor_alignment=CONSTANT_TENSOR_ALIGNMENT,
+            )
+        )
+
+    def test_matches_deserialize(self) -> None:
+        pte_data = self.serialize_with_segments()
+        pte_file = _flatc_deserialize(pte_data)
+        lazy = LazyPTEFile(pte_data)
+
+        self.assertIsNotNone(lazy.extended_header)
+        self.assertEqual(lazy.program.version, pte_file.program.version)
+        plan = lazy.program.execution_plan[0]
+        expected_plan = pte_file.program.execution_plan[0]
+        self.assertEqual(plan.name, expected_plan.name)
+        self.assertEqual(len(plan.values), len(expected_plan.values))
+        for value, expected_value in zip(plan.values, expected_plan.values):
+            self.assertEqual(value.union_type("val"), type(expected_value.val).__name__)
+
+        # Constants are stored in the constant segment and are returned
+        # without copying the file data.
+        for i, buffer in enumerate(pte_file.program.constant_buffer):
+            data = lazy.constant_data(i)
+            self.assertIsInstance(data, memoryview)
+            self.assertIs(data.obj, pte_data)
+            self.assertEqual(data, buffer.storage)
+        self.assertIsNone(lazy.constant_data(len(pte_file.program.constant_buffer)))
+
+        for i, delegate in enumerate(expected_plan.delegates):
+            self.assertEqual(
+                lazy.delegate_data(0, i),
+                pte_file.program.backend_delegate_data[delegate.processed.index].data,
+            )
+        self.assertEqual(lazy.named_data("weight"), b"\x05" * 16)
+        self.assertIsNone(lazy.named_data("missing"))
+
+        self.assertEqual(lazy.to_pte_file().program, pte_file.program)
+        self.assertEqual(deserialize_pte_binary(pte_data), pte_file)
+
+    def test_no_segments(self) -> None:
+        program = get_test_program()
+        pte_data = bytes(serialize_pte_binary(PTEFile(program=program)))
+        lazy = LazyPTEFile(pte_data)
+
+        self.assertEqual(lazy.program.to_dataclass(Program), program)
+        self.assertEqual(lazy.to_pte_file().program, program)
+        with self.assertRaises(ValueError):
+            lazy.segment(0)
+
+    def test_open(self) -> None:
+        pte_data = self.serialize_with_segments()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "model.pte")
+            with open(path, "wb") as f:
+                f.write(pte_data)
+            lazy = LazyPTEFile.open(path)
+            self.assertEqual(lazy.data, pte_data)
+            self.assertEqual(lazy.named_data("weight"), b"\x05" * 16)
+            self.assertEqual(
+                lazy.to_pte_file().program, _flatc_deserialize(pte_data).program
+            )
+            del lazy
+
+
 class TestExtendedHeader(unittest.TestCase):
     def test_to_bytes(self) -> None:
         eh = _ExtendedHeader(
@@ -0,0 +1,36 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+import importlib.resources
+import json
+import os
+import tempfile
+from types import ModuleType
+from typing import Any, Sequence, Union
+
+from executorch.exir._serialize._dataclass import _DataclassEncoder
+from executorch.exir._serialize._flatbuffer import _flatc_compile
+from executorch.exir._serialize._flatbuffer_builder import _load_schema
+
+
+def flatc_serialize(
+    obj: Any, package: Union[str, ModuleType], schema_names: Sequence[str]
+) -> bytes:
+    """Serializes `obj` by dumping it to JSON and running `flatc --binary` over
+    the schema resources `schema_names` of `package`.
+    """
+    resources = importlib.resources.files(package)
+    schema = _load_schema(package, tuple(schema_names))
+    with tempfile.TemporaryDirectory() as d:
+        for name in schema_names:
+            with open(os.path.join(d, name), "wb") as schema_file:
+                schema_file.write(resources.joinpath(name).read_bytes())
+        json_path = os.path.join(d, "data.json")
+        with open(json_path, "wb") as json_file:
+            json_file.write(json.dumps(obj, cls=_DataclassEncoder).encode("ascii"))
+        _flatc_compile(d, os.path.join(d, schema_names[0]), json_path)
+        output_path = os.path.join(d, f"data.{schema.file_extension or 'bin'}")
+        with open(output_path, "rb") as output_file:
+            return output_file.read()
@@ -0,0 +1,160 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmarks the greedy memory planner and its verifier on synthetic graphs.
+
+Each graph is a chain of operators where every operator produces one tensor
+that is consumed by one of the next few operators, with a fraction of tensors
+living much longer (e.g. skip connections and KV caches). The script times
+`greedy()` and the storage reuse check of `Verifier` on its plan. Up to
+`--reference-max-specs` it also times the previous placement, which scans
+every allocation of every shared object, and checks that both place all the
+specs at the same offsets. Up to `--pairwise-max-specs` it times the pairwise
+verifier, and checks that both count the same number of pairs of tensors
+that reuse storage.
+
+    python -m executorch.exir.benchmark_memory_planning --specs 1000 10000 200000
+"""
+
+import argparse
+import functools
+import gc
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Sequence, Set, Tuple
+
+import torch
+from executorch.exir.memory_planning import (
+    greedy,
+    pick_shared_obj,
+    SharedObject,
+    Verifier,
+)
+from executorch.exir.tensor import TensorSpec
+
+_SIZES: Tuple[int, ...] = (16, 64, 256, 1024, 4096, 16384)
+
+
+def _synthetic_specs(
+    num_specs: int, long_lived_fraction: float, seed: int
+) -> List[TensorSpec]:
+    rng = random.Random(seed)
+    specs = []
+    for step in range(num_specs):
+        spec = TensorSpec(dtype=torch.float32, shape=torch.Size([rng.choice(_SIZES)]))
+        if rng.random() < long_lived_fraction:
+            last_use = step + rng.randrange(num_specs // 10 + 1)
+        else:
+            last_use = step + rng.randrange(1, 8)
+        spec.lifetime = [step, min(last_use, num_specs - 1)]
+        specs.append(spec)
+    return specs
+
+
+def _reference_offsets(specs: Set[TensorSpec], alignment: int) -> Dict[int, int]:
+    """Places `specs` like greedy() without the lifetime index."""
+    shared_objects: Dict[int, List[SharedObject]] = defaultdict(list)
+    sorted_specs = sorted(specs, key=lambda x: x.allocated_memory)
+    sorted_specs.reverse()
+    for spec in sorted_specs:
+        spec.realign(alignment)
+        pick_shared_obj(shared_objects[1], spec)
+    offsets = {}
+    total_size = 0
+    for sobj in shared_objects[1]:
+        for alloc in sobj.allocations:
+            offsets[id(alloc.spec)] = total_size + alloc.offset
+        total_size += sobj.size
+    return offsets
+
+
+def _time(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    # Like timeit, exclude garbage collections, which are dominated by the size
+    # of the heap rather than by the planner.
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return time.perf_counter() - start, result
+    finally:
+        gc.enable()
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--specs",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000, 200000],
+        help="Number of tensor specs per synthetic graph.",
+    )
+    parser.add_argument("--long-lived-fraction", type=float, default=0.01)
+    parser.add_argument(
+        "--reference-max-specs",
+        type=int,
+        default=20000,
+        help="Largest graph to also run the previous placement on.",
+    )
+    parser.add_argument(
+        "--pairwise-max-specs",
+        type=int,
+        default=2000,
+        help="Largest graph to also run the pairwise verifier on.",
+    )
+    parser.add_argument("--alignment", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(
+        f"{'specs':>8} {'objects':>8} {'greedy s':>9} {'reference s':>12} "
+        f"{'same plan':>10} {'verify s':>9} {'pairwise s':>11} {'reuse pairs':>12} "
+        f"{'same pairs':>11}"
+    )
+    for num_specs in args.specs:
+        specs = set(_synthetic_specs(num_specs, args.long_lived_fraction, args.seed))
+        greedy_s, result = _time(
+            functools.partial(greedy, args.alignment, specs, None, None)
+        )
+        spec_dict = result.spec_dict
+        num_objects = len({alloc.mem_obj_id for alloc in spec_dict.values()})
+        for spec, alloc in spec_dict.items():
+            spec.mem_id = alloc.mem_id
+            spec.mem_obj_id = alloc.mem_obj_id
+            spec.mem_offset = alloc.mem_offset
+        spec_list = list(specs)
+        verify_s, num_reuse_pairs = _time(
+            functools.partial(Verifier._count_storage_reuse, spec_list, False)
+        )
+        reference_s = same_plan = pairwise_s = same_pairs = "-"
+        if num_specs <= args.reference_max_specs:
+            seconds, offsets = _time(
+                functools.partial(_reference_offsets, specs, args.alignment)
+            )
+            reference_s = f"{seconds:.3f}"
+            same_plan = str(
+                all(spec_dict[spec].mem_offset == offsets[id(spec)] for spec in specs)
+            )
+        if num_specs <= args.pairwise_max_specs:
+            seconds, pairwise_num_reuse_pairs = _time(
+                functools.partial(
+                    Verifier._verify_storage_reuse_pairwise, spec_list, False
+                )
+            )
+            pairwise_s = f"{seconds:.3f}"
+            same_pairs = str(pairwise_num_reuse_pairs == num_reuse_pairs)
+        print(
+            f"{num_specs:>8} {num_objects:>8} {greedy_s:>9.3f} {reference_s:>12} "
+            f"{same_plan:>10} {verify_s:>9.3f} {pairwise_s:>11} {num_reuse_pairs:>12} "
+            f"{same_pairs:>11}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -28,7 +28,6 @@ their instructions.
 # presence of aot autograd param lifting.
 
 # pyre-strict
-import ctypes
 import hashlib
 import operator
 import typing
@@ -127,13 +126,24 @@ class _ProgramState:
 
     # Constants are optionally stored in external files.
     # Aggregate unique external constants into one buffer.
-    external_constant_buffer: List[bytes] = field(default_factory=list)
+    external_constant_buffer: List[Union[bytes, memoryview]] = field(
+        default_factory=list
+    )
     external_constant_hash: Dict[str, int] = field(default_factory=dict)
     # Each constant_tag groups a set of constants together.
     # {constant_tag: {fqn: index into external_constant_buffer}}
     external_constant_map: Dict[str, Dict[str, int]] = field(default_factory=dict)
 
 
+def _storage_view(storage: torch.UntypedStorage) -> memoryview:
+    """Returns a read-only view of the bytes of a CPU `storage`, without
+    copying them. The view keeps the storage alive.
+    """
+    return memoryview(
+        torch.empty(0, dtype=torch.uint8).set_(storage).numpy()
+    ).toreadonly()
+
+
 @dataclass
 class _EmitterState:
     """State of a single emitter.
@@ -389,7 +399,7 @@ class _Emitter(torch.fx.Interpreter):
     def _save_new_const_tensor(
         self,
         spec: TensorSpec,
-        buffer_data: bytes,
+        buffer_data: Union[bytes, memoryview],
         hashed: str,
         allocation_info: Optional[AllocationDetails] = None,
         constant_tag: Optional[str] = None,
@@ -400,6 +410,7 @@ class _Emitter(torch.fx.Interpreter):
         # +1 because the first buffer location is reserved.
 
         # Update buffer_idx to point to the end of the list where we are adding the new buffer.
+        # pyre-ignore[6]: Buffer.storage may be a memoryview.
         buffer = Buffer(storage=buffer_data)
 
         # Tensor is stored outside of the PTE file.
@@ -452,17 +463,10 @@ class _Emitter(torch.fx.Interpreter):
         if spec.const:
             # Tensor with a blob we need to serialize. May not actually be constant at runtime
             # if it's a weight with an associated gradient.
-            spec_array_type = (
-                ctypes.c_char * typing.cast(torch.UntypedStorage, spec.storage).nbytes()
-            )
-
+            # Reference the tensor storage instead of copying it; the data is
+            # copied straight from the storage when the program is written.
             buffer_data = (
-                bytes(
-                    ctypes.cast(
-                        typing.cast(torch.UntypedStorage, spec.storage).data_ptr(),
-                        ctypes.POINTER(spec_array_type),
-                    ).contents
-                )
+                _storage_view(typing.cast(torch.UntypedStorage, spec.storage))
                 if spec.allocated_memory != 0
                 else b""
             )
@@ -6,6 +6,9 @@
 
 # pyre-unsafe
 
+import os
+import pickle
+import tempfile
 import typing
 import unittest
 from contextlib import contextmanager
@@ -1847,6 +1850,74 @@ class TestEmit(unittest.TestCase):
         self.assertEqual(len(program.constant_buffer), 2)
         self.assertEqual(len(program.constant_buffer[1].storage), 8)
 
+    def test_constant_data_is_referenced(self) -> None:
+        class ModWithWeight(nn.Module):
+            def __init__(self):
+                super(ModWithWeight, self).__init__()
+                self.W = torch.nn.Parameter(torch.arange(4, dtype=torch.float))
+
+            def forward(self, x):
+                return self.W + x
+
+        model = ModWithWeight()
+        program = to_edge(export(model, (torch.ones(4),), strict=True)).to_executorch()
+        emitted = program._emitter_output.program
+        storage = emitted.constant_buffer[1].storage
+        # The emitted constant is a view of the tensor data, not a copy.
+        self.assertIsInstance(storage, memoryview)
+        self.assertTrue(storage.readonly)
+        self.assertEqual(storage, model.W.detach().numpy().tobytes())
+
+        # The emitted program can still be copied and pickled.
+        copied = deepcopy(emitted)
+        self.assertIs(copied.constant_buffer[1].storage, storage)
+        self.assertEqual(copied, emitted)
+        self.assertEqual(pickle.loads(pickle.dumps(emitted)), emitted)
+
+    def test_save_streams_constant_data(self) -> None:
+        class ModWithWeights(nn.Module):
+            def __init__(self):
+                super(ModWithWeights, self).__init__()
+                self.W = torch.nn.Parameter(torch.arange(64, dtype=torch.float))
+                self.b = torch.nn.Parameter(torch.ones(64))
+
+            def forward(self, x):
+                return self.W * x + self.b
+
+        for external_constants in (False, True):
+            program = to_edge(
+                export(ModWithWeights(), (torch.ones(64),), strict=True)
+            ).to_executorch(
+                ExecutorchBackendConfig(external_constants=external_constants)
+            )
+            with tempfile.TemporaryDirectory() as d:
+                path = os.path.join(d, "model.pte")
+                program.save(path)
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), program.buffer)
+                program.write_tensor_data_to_file(d)
+                for tag, cord in program._tensor_data.items():
+                    with open(os.path.join(d, f"{tag}.ptd"), "rb") as f:
+                        self.assertEqual(f.read(), bytes(cord))
+
+            # The emitted constants are written out as they are, without
+            # another copy; the written views share their tensor storage.
+            blobs = [
+                buffer.storage
+                for buffer in program._emitter_output.program.constant_buffer
+                if len(buffer.storage) > 0
+            ]
+            blobs.extend(program._emitter_output.external_constant_buffer)
+            self.assertEqual(len(blobs), 2)
+            written = [
+                item.obj
+                for cord in [program._pte_data, *program._tensor_data.values()]
+                for item in cord._buffers
+                if isinstance(item, memoryview)
+            ]
+            for blob in blobs:
+                self.assertTrue(any(item is blob.obj for item in written))
+
     def test_emit_lifted_tensor_constant(self) -> None:
         class LiftedTensorConstants(nn.Module):
             def __init__(self):
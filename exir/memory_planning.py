@@ -6,10 +6,18 @@
 
 # pyre-strict
 
+import bisect
 import functools
+import heapq
 import itertools
 import logging
+import math
+import multiprocessing
+import multiprocessing.connection
 import operator
+import random
+import time
+import traceback
 from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import (
@@ -154,8 +162,6 @@ class Verifier:
         Returns:
             Number of pairs of tenors that have overlapping storage.
         """
-        num_reuse_pairs = 0
-
         # unique tensors specs
         all_specs = list(
             collect_specs_from_nodes(
@@ -171,6 +177,112 @@ class Verifier:
             )
         )
 
+        num_reuse_pairs = self._count_storage_reuse(
+            all_specs, allow_lifetime_and_storage_overlap
+        )
+        if num_reuse_pairs is not None:
+            return num_reuse_pairs
+        # Compare all pairs to raise the same error as before.
+        return self._verify_storage_reuse_pairwise(
+            all_specs, allow_lifetime_and_storage_overlap
+        )
+
+    @classmethod
+    def _count_storage_reuse(
+        cls, all_specs: List[TensorSpec], allow_lifetime_and_storage_overlap: bool
+    ) -> Optional[int]:
+        r"""
+        Return the number of pairs of specs with overlapping storage, or None if
+        _verify_storage_reuse_pairwise() would raise an error for some pair.
+
+        Instead of comparing all pairs, this sweeps over the storage of each
+        memory id to count overlapping pairs and check their mem_obj_id, and
+        over the lifetimes to check that live tensors don't share storage,
+        in O(n log n).
+        """
+        if len({spec.mem_obj_id is None for spec in all_specs}) > 1:
+            return None
+        specs_by_mem_id: Dict[Optional[int], List[TensorSpec]] = defaultdict(list)
+        for spec in all_specs:
+            if (
+                spec.allocated_memory < 0
+                or not isinstance(spec.mem_offset, int)
+                or spec.mem_offset < 0
+                or spec.lifetime[0] is None
+                or spec.lifetime[1] is None
+            ):
+                return None
+            if spec.allocated_memory > 0:
+                specs_by_mem_id[spec.mem_id].append(spec)
+
+        num_reuse_pairs = 0
+        for specs in specs_by_mem_id.values():
+            num_pairs = cls._count_storage_overlaps(specs)
+            if num_pairs is None:
+                return None
+            if not allow_lifetime_and_storage_overlap and cls._live_storage_overlaps(
+                specs
+            ):
+                return None
+            num_reuse_pairs += num_pairs
+        return num_reuse_pairs
+
+    @classmethod
+    def _count_storage_overlaps(cls, specs: List[TensorSpec]) -> Optional[int]:
+        r"""
+        Return the number of pairs of specs with overlapping storage, or None if
+        such a pair has different mem_obj_ids. The specs must share a mem_id.
+        """
+        # Sweep over storage: the tensors whose storage contains the start of
+        # the current one are those that it overlaps with.
+        specs = sorted(specs, key=lambda spec: spec.mem_offset)
+        active: List[Tuple[int, int]] = []  # heap of (last byte, index)
+        active_obj_ids: Dict[Optional[int], int] = defaultdict(int)
+        num_pairs = 0
+        for idx, spec in enumerate(specs):
+            start = spec.mem_offset
+            while active and active[0][0] < start:
+                _, ended = heapq.heappop(active)
+                active_obj_ids[specs[ended].mem_obj_id] -= 1
+            if len(active) > active_obj_ids[spec.mem_obj_id]:
+                return None
+            num_pairs += len(active)
+            heapq.heappush(active, (start + spec.allocated_memory - 1, idx))
+            active_obj_ids[spec.mem_obj_id] += 1
+        return num_pairs
+
+    @classmethod
+    def _live_storage_overlaps(cls, specs: List[TensorSpec]) -> bool:
+        r"""
+        Return whether two of the specs overlap in both lifetime and storage. The
+        specs must share a mem_id.
+        """
+        # Sweep over lifetimes. The storage of the live tensors doesn't overlap
+        # until the first error, so it can be kept sorted by offset.
+        live = [spec for spec in specs if spec.lifetime[0] <= spec.lifetime[1]]
+        live.sort(key=lambda spec: spec.lifetime[0])
+        ends: List[Tuple[int, int]] = []  # heap of (lifetime end, offset)
+        storage: List[Tuple[int, int]] = []  # sorted (offset, last byte)
+        for spec in live:
+            while ends and ends[0][0] < spec.lifetime[0]:
+                _, offset = heapq.heappop(ends)
+                del storage[bisect.bisect_left(storage, (offset,))]
+            first = spec.mem_offset
+            last = first + spec.allocated_memory - 1
+            pos = bisect.bisect_left(storage, (first,))
+            if pos > 0 and storage[pos - 1][1] >= first:
+                return True
+            if pos < len(storage) and storage[pos][0] <= last:
+                return True
+            storage.insert(pos, (first, last))
+            heapq.heappush(ends, (spec.lifetime[1], first))
+        return False
+
+    @classmethod
+    def _verify_storage_reuse_pairwise(
+        cls, all_specs: List[TensorSpec], allow_lifetime_and_storage_overlap: bool
+    ) -> int:
+        num_reuse_pairs = 0
         for lhs_spec_idx, lhs_spec in enumerate(all_specs):
             for rhs_spec in all_specs[lhs_spec_idx + 1 :]:
                 # Check that both specs are consistent about whether mem_obj_id is defined
@@ -183,7 +295,7 @@ class Verifier:
                 if not has_storage_overlap:
                     continue
 
-                if not allow_lifetime_and_storage_overlap and self.lifetime_overlap(
+                if not allow_lifetime_and_storage_overlap and cls.lifetime_overlap(
                     lhs_spec, rhs_spec
                 ):
                     raise InternalError(
@@ -659,14 +771,150 @@ def _find_max_overlapping_allocations_offset(
     return max_offset
 
 
+class _IntervalIndex:
+    r"""
+    Index over closed intervals of [0, size), each with a value, answering which
+    values were added for intervals overlapping a query interval.
+
+    `combine` must be associative, commutative and idempotent (e.g. max or
+    bitwise or), so that values can be folded into segment tree nodes without
+    ever pushing them down. Adding and querying an interval are O(log(size)).
+    """
+
+    def __init__(
+        self, size: int, combine: Callable[[int, int], int], identity: int
+    ) -> None:
+        self._size: int = 1 << max(size - 1, 0).bit_length()
+        self._combine = combine
+        self._identity = identity
+        # Values of intervals covering a node's whole range.
+        self._covering: Dict[int, int] = {}
+        # Values of intervals overlapping a node's range, including at least
+        # those of all the intervals covering any node in its subtree.
+        self._overlapping: Dict[int, int] = {}
+
+    def add(self, start: int, end: int, value: int) -> None:
+        combine = self._combine
+        identity = self._identity
+        covering = self._covering
+        overlapping = self._overlapping
+        # First the ancestors of the nodes that the interval covers: the parent
+        # of such a node (unless covered itself) contains the start or the end,
+        # so these are on the paths from those leaves to the root. Values of a
+        # node are also in all its ancestors, so each walk can stop at the
+        # first node that already has the value; hence covered nodes, which
+        # can be on the paths too, are only updated afterwards.
+        for leaf in (start + self._size, end + self._size):
+            node = leaf >> 1
+            while node:
+                current = overlapping.get(node, identity)
+                combined = combine(current, value)
+                if combined == current:
+                    break
+                overlapping[node] = combined
+                node >>= 1
+        lo = start + self._size
+        hi = end + self._size + 1
+        while lo < hi:
+            if lo & 1:
+                covering[lo] = combine(covering.get(lo, identity), value)
+                overlapping[lo] = combine(overlapping.get(lo, identity), value)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                covering[hi] = combine(covering.get(hi, identity), value)
+                overlapping[hi] = combine(overlapping.get(hi, identity), value)
+            lo >>= 1
+            hi >>= 1
+
+    def query(self, start: int, end: int) -> int:
+        combine = self._combine
+        identity = self._identity
+        covering = self._covering
+        overlapping = self._overlapping
+        result = identity
+        lo = start + self._size
+        hi = end + self._size + 1
+        while lo < hi:
+            if lo & 1:
+                result = combine(result, overlapping.get(lo, identity))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                result = combine(result, overlapping.get(hi, identity))
+            lo >>= 1
+            hi >>= 1
+        # Intervals covering an ancestor of the nodes above.
+        lo = start + self._size
+        hi = end + self._size
+        while lo != hi:
+            result = combine(result, covering.get(lo, identity))
+            result = combine(result, covering.get(hi, identity))
+            lo >>= 1
+            hi >>= 1
+        while lo:
+            result = combine(result, covering.get(lo, identity))
+            lo >>= 1
+        return result
+
+
+class _SharedObjectIndex:
+    r"""
+    Lifetime index over the allocations of a list of shared objects, used by
+    pick_shared_obj() instead of scanning every allocation of every object.
+
+    `num_steps` bounds the lifetimes of all the specs that are allocated.
+    """
+
+    def __init__(self, num_steps: int) -> None:
+        self._num_steps = num_steps
+        # Bit i is set for the intervals of allocations in shared object i.
+        self._objects = _IntervalIndex(num_steps, operator.or_, 0)
+        # Per shared object, the end (offset + size) of its allocations.
+        self._ends: List[_IntervalIndex] = []
+
+    def first_non_overlapping(
+        self, shared_objects: List[SharedObject], spec: TensorSpec
+    ) -> Optional[SharedObject]:
+        r"""
+        Return the first shared object none of whose allocations overlap with
+        the lifetime of the spec, same as scanning with _does_not_overlap().
+        """
+        overlapping = self._objects.query(spec.lifetime[0], spec.lifetime[1])
+        free = ~overlapping & ((1 << len(shared_objects)) - 1)
+        if free == 0:
+            return None
+        return shared_objects[(free & -free).bit_length() - 1]
+
+    def max_overlapping_allocations_offset(
+        self, sobj: SharedObject, spec: TensorSpec
+    ) -> int:
+        r"""
+        Same as _find_max_overlapping_allocations_offset().
+        """
+        return max(self._ends[sobj.idx].query(spec.lifetime[0], spec.lifetime[1]), 0)
+
+    def add(self, sobj: SharedObject, allocation: AllocationSpec) -> None:
+        while len(self._ends) <= sobj.idx:
+            self._ends.append(_IntervalIndex(self._num_steps, max, -1))
+        start, end = allocation.spec.lifetime
+        self._objects.add(start, end, 1 << sobj.idx)
+        self._ends[sobj.idx].add(
+            start, end, allocation.offset + allocation.spec.allocated_memory
+        )
+
+
 def pick_shared_obj(
     shared_objects: List[SharedObject],
     spec: TensorSpec,
     allow_overlapping_allocations: bool = True,
+    index: Optional[_SharedObjectIndex] = None,
 ) -> SharedObject:
     r"""
     Pick the available shared object to which to assign this spec,
     or create a new one
+    If `index` is given, it is used to find overlapping allocations, and must
+    have been passed for every allocation made in `shared_objects`.
     Algorithm details
     Previous: Look at every spec in chronological order. Find if previously allocated object
     allows it to fit in. If not, allocate a new object.
@@ -716,19 +964,30 @@ def pick_shared_obj(
         if their timelines do not overlap.
     """
     picked = None
-    for sobj in shared_objects:
-        if _does_not_overlap(sobj, spec):
-            assert sobj.size >= spec.allocated_memory, "Allocation specs are not sorted"
-            picked = sobj
-            sobj.first_used_index = min(sobj.first_used_index, spec.lifetime[0])
-            sobj.last_used_index = max(sobj.last_used_index, spec.lifetime[1])
-            allocation_spec = AllocationSpec(0, spec)
-            picked.allocations.append(allocation_spec)
-            break
+    if index is None:
+        candidates = (sobj for sobj in shared_objects if _does_not_overlap(sobj, spec))
+        first_non_overlapping = next(candidates, None)
+    else:
+        first_non_overlapping = index.first_non_overlapping(shared_objects, spec)
+    if first_non_overlapping is not None:
+        sobj = first_non_overlapping
+        assert sobj.size >= spec.allocated_memory, "Allocation specs are not sorted"
+        picked = sobj
+        sobj.first_used_index = min(sobj.first_used_index, spec.lifetime[0])
+        sobj.last_used_index = max(sobj.last_used_index, spec.lifetime[1])
+        allocation_spec = AllocationSpec(0, spec)
+        picked.allocations.append(allocation_spec)
 
     if picked is None and allow_overlapping_allocations:
+        allocated_memory = spec.allocated_memory
         for sobj in shared_objects:
-            max_offset = _find_max_overlapping_allocations_offset(sobj, spec)
+            if sobj.size <= allocated_memory:
+                # No room above any overlapping allocation.
+                continue
+            if index is None:
+                max_offset = _find_max_overlapping_allocations_offset(sobj, spec)
+            else:
+                max_offset = index.max_overlapping_allocations_offset(sobj, spec)
             if max_offset > 0:
                 if max_offset + spec.allocated_memory <= sobj.size:
                     picked = sobj
@@ -752,6 +1011,8 @@ def pick_shared_obj(
         picked.last_used_index = spec.lifetime[1]
         shared_objects.append(picked)
 
+    if index is not None:
+        index.add(picked, picked.allocations[-1])
     return picked
 
 
@@ -826,16 +1087,19 @@ def greedy(
     greedy_result = MemoryAlgoResult({}, [])
     spec2obj = {}
     shared_objects = defaultdict(list)
+    # specs may be a generator, see collect_specs_from_nodes().
+    spec_list = list(specs)
+    num_steps = max((spec.lifetime[1] + 1 for spec in spec_list), default=0)
+    indexes: Dict[int, _SharedObjectIndex] = defaultdict(
+        lambda: _SharedObjectIndex(num_steps)
+    )
 
     # For each tensor, pick the available shared object with closest size to
     # the tensor. If there are no available shared object left, create a new
     # one.
-    import bisect
-
-    sorted_specs = []
-    for spec in specs:
-        bisect.insort(sorted_specs, spec, key=lambda x: x.allocated_memory)
-
+    # Reverse a stable ascending sort rather than sorting in descending order,
+    # which would change the order in which specs of the same size are placed.
+    sorted_specs = sorted(spec_list, key=lambda x: x.allocated_memory)
     sorted_specs.reverse()
 
     for spec in sorted_specs:
@@ -852,6 +1116,7 @@ def greedy(
             shared_objects[spec_alloc_result.mem_id],
             spec,
             allow_overlapping_allocations,
+            indexes[spec_alloc_result.mem_id],
         )
 
     if len(shared_objects) == 0:
@@ -894,14 +1159,80 @@ def greedy(
     return greedy_result
 
 
+def _algo_name(algo: Callable[..., MemoryAlgoResult]) -> str:
+    if isinstance(algo, functools.partial):
+        return algo.func.__name__
+    return getattr(algo, "__name__", repr(algo))
+
+
+# A plan sent back by a worker process: the SpecAllocResult fields and the
+# alignment of each spec in order, the bufsizes, and the wall time in seconds.
+_WorkerPlan = Tuple[List[Optional[Tuple[int, int, int]]], List[int], List[int], float]
+
+
+def _plan_in_worker(
+    conn: multiprocessing.connection.Connection,
+    algo: Callable[..., MemoryAlgoResult],
+    alignment: int,
+    spec_list: List[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    graph_signature: ExportGraphSignature,
+    extra_padding: int,
+) -> None:
+    """Runs `algo` in a forked worker process and sends back a `_WorkerPlan`,
+    or the traceback if it raised."""
+    try:
+        start = time.perf_counter()
+        result = algo(
+            alignment, spec_list, graph_module, graph_signature, extra_padding
+        )
+        seconds = time.perf_counter() - start
+        allocs = []
+        for spec in spec_list:
+            alloc = result.spec_dict.get(spec)
+            allocs.append(
+                None
+                if alloc is None
+                else (alloc.mem_id, alloc.mem_obj_id, alloc.mem_offset)
+            )
+        conn.send(
+            (allocs, [spec.alignment for spec in spec_list], result.bufsizes, seconds)
+        )
+    except Exception:
+        conn.send(traceback.format_exc())
+    finally:
+        conn.close()
+
+
 class MemoryPlanningAlgorithmSuite:
     def __init__(
         self,
         algo_list: Optional[List[Callable[..., MemoryAlgoResult]]] = None,
+        *,
+        max_workers: int = 1,
+        timeout_s: Optional[float] = None,
+        algo_timeout_s: Optional[float] = None,
     ) -> None:
+        r"""
+        Args:
+            algo_list: Memory planning algorithms to run, greedy by default
+            max_workers: If greater than 1, run the algorithms concurrently in up
+                to that many forked worker processes.
+            timeout_s: Deadline for all the algorithms, in seconds from the
+                start of planning. Algorithms still running or not yet started
+                when it expires are skipped.
+            algo_timeout_s: Deadline for each algorithm, in seconds from its
+                start. Algorithms still running when it expires are skipped.
+
+        With a timeout, the algorithms run in worker processes, even if
+        max_workers is 1, so that they can be stopped.
+        """
         if algo_list is None:
             algo_list = [greedy]
         self.algo_list: List[Callable[..., MemoryAlgoResult]] = algo_list
+        self.max_workers = max_workers
+        self.timeout_s = timeout_s
+        self.algo_timeout_s = algo_timeout_s
 
     def __call__(
         self,
@@ -929,20 +1260,50 @@ class MemoryPlanningAlgorithmSuite:
         Returns:
             List of buffer sizes for each memory hierarchy
         """
+        # specs may be a generator, see collect_specs_from_nodes(), and each
+        # algorithm needs all of them.
+        spec_list = list(specs)
+        use_workers = (
+            self.max_workers > 1
+            or self.timeout_s is not None
+            or self.algo_timeout_s is not None
+        )
+        if use_workers and "fork" not in multiprocessing.get_all_start_methods():
+            logging.warning(
+                "Running memory planning algorithms sequentially and without "
+                "timeouts: worker processes require the 'fork' start method, "
+                "which is unavailable on this platform."
+            )
+            use_workers = False
 
-        mem_algo_results = {}
-        for algo in self.algo_list:
-            if isinstance(algo, functools.partial):
-                name = algo.func.__name__
-            else:
-                name = getattr(algo, "__name__", None)
-
-            mem_algo_results[name] = algo(
-                alignment,
-                specs,
-                graph_module,
-                graph_signature,
-                extra_padding,
+        # (name, result, alignment of each spec) of each algorithm that finished.
+        mem_algo_results: List[Tuple[str, MemoryAlgoResult, Optional[List[int]]]] = []
+        if use_workers:
+            mem_algo_results = self._run_in_workers(
+                alignment, spec_list, graph_module, graph_signature, extra_padding
+            )
+        else:
+            for algo in self.algo_list:
+                name = _algo_name(algo)
+                start = time.perf_counter()
+                mem_algo_result = algo(
+                    alignment,
+                    spec_list,
+                    graph_module,
+                    graph_signature,
+                    extra_padding,
+                )
+                logging.debug(
+                    f"Memory planning algo {name} took "
+                    f"{time.perf_counter() - start:.3f}s and returned bufsizes "
+                    f"{mem_algo_result.bufsizes}"
+                )
+                mem_algo_results.append((name, mem_algo_result, None))
+
+        if len(mem_algo_results) == 0:
+            raise RuntimeError(
+                "No memory planning algorithm finished before its deadline, "
+                f"tried {[_algo_name(algo) for algo in self.algo_list]}"
             )
 
         # All the algorithms should have the same number of buffers allocated.
@@ -950,29 +1311,158 @@ class MemoryPlanningAlgorithmSuite:
             len(
                 {
                     len(mem_algo_result.bufsizes)
-                    for mem_algo_result in mem_algo_results.values()
+                    for _, mem_algo_result, _ in mem_algo_results
                 }
             )
             == 1
         ), "Different memory planning algorithms should have the same number of buffers allocated."
 
         # Find the algorithm that minimizes the total memory usage.
-        best_algo = min(
-            mem_algo_results, key=lambda k: sum(mem_algo_results[k].bufsizes)
+        best_algo, best_result, alignments = min(
+            mem_algo_results, key=lambda result: sum(result[1].bufsizes)
         )
         logging.debug(f"Best memory planning algo for this model is {best_algo}")
-        bufsizes = mem_algo_results[best_algo].bufsizes
+        bufsizes = best_result.bufsizes
+
+        if alignments is not None:
+            # Algorithms realign the specs they plan, but the worker did so on
+            # its own copies.
+            for spec, spec_alignment in zip(spec_list, alignments):
+                spec.alignment = spec_alignment
 
         # Update the mem_id and mem_offset for each spec in the graph module based on the
         # values provided by the best memory planning algorithm.
-        for spec in mem_algo_results[best_algo].spec_dict:
-            spec_alloc_result = mem_algo_results[best_algo].spec_dict[spec]
+        for spec in best_result.spec_dict:
+            spec_alloc_result = best_result.spec_dict[spec]
             spec.mem_id = spec_alloc_result.mem_id
             spec.mem_offset = spec_alloc_result.mem_offset
             spec.mem_obj_id = spec_alloc_result.mem_obj_id
 
         return bufsizes
 
+    def _run_in_workers(  # noqa: C901
+        self,
+        alignment: int,
+        spec_list: List[TensorSpec],
+        graph_module: torch.fx.GraphModule,
+        graph_signature: ExportGraphSignature,
+        extra_padding: int,
+    ) -> List[Tuple[str, MemoryAlgoResult, Optional[List[int]]]]:
+        r"""
+        Runs the algorithms in forked worker processes, and returns the results
+        of those that finished before their deadline, in the order of
+        algo_list. The inputs are inherited by the workers rather than pickled.
+        """
+        context = multiprocessing.get_context("fork")
+        start = time.monotonic()
+        total_deadline = math.inf if self.timeout_s is None else start + self.timeout_s
+        pending = list(enumerate(self.algo_list))
+        # Connection to each running worker -> (index in algo_list, process,
+        # start time, deadline).
+        running: Dict[
+            multiprocessing.connection.Connection,
+            Tuple[int, multiprocessing.process.BaseProcess, float, float],
+        ] = {}
+        plans: Dict[int, _WorkerPlan] = {}
+        try:
+            while pending or running:
+                while (
+                    pending
+                    and len(running) < max(self.max_workers, 1)
+                    and time.monotonic() < total_deadline
+                ):
+                    index, algo = pending.pop(0)
+                    recv_conn, send_conn = context.Pipe(duplex=False)
+                    process = context.Process(
+                        target=_plan_in_worker,
+                        args=(
+                            send_conn,
+                            algo,
+                            alignment,
+                            spec_list,
+                            graph_module,
+                            graph_signature,
+                            extra_padding,
+                        ),
+                        daemon=True,
+                    )
+                    process.start()
+                    send_conn.close()
+                    algo_start = time.monotonic()
+                    deadline = total_deadline
+                    if self.algo_timeout_s is not None:
+                        deadline = min(deadline, algo_start + self.algo_timeout_s)
+                    running[recv_conn] = (index, process, algo_start, deadline)
+                if not running:
+                    break
+
+                wait_s = min(deadline for _, _, _, deadline in running.values())
+                wait_s = max(wait_s - time.monotonic(), 0)
+                for conn in multiprocessing.connection.wait(
+                    list(running), None if math.isinf(wait_s) else wait_s
+                ):
+                    index, process, _, _ = running.pop(conn)
+                    name = _algo_name(self.algo_list[index])
+                    try:
+                        message = conn.recv()
+                    except EOFError:
+                        process.join()
+                        message = f"Worker exited with code {process.exitcode}"
+                    conn.close()
+                    process.join()
+                    if isinstance(message, str):
+                        raise RuntimeError(
+                            f"Memory planning algo {name} failed:\n{message}"
+                        )
+                    plans[index] = message
+                    logging.debug(
+                        f"Memory planning algo {name} took {message[3]:.3f}s and "
+                        f"returned bufsizes {message[2]}"
+                    )
+
+                now = time.monotonic()
+                for conn, (index, process, algo_start, deadline) in list(
+                    running.items()
+                ):
+                    if now >= deadline:
+                        del running[conn]
+                        process.kill()
+                        process.join()
+                        conn.close()
+                        logging.warning(
+                            f"Stopped memory planning algo "
+                            f"{_algo_name(self.algo_list[index])} after "
+                            f"{now - algo_start:.3f}s"
+                        )
+                if now >= total_deadline and pending:
+                    logging.warning(
+                        "Skipped memory planning algos "
+                        f"{[_algo_name(algo) for _, algo in pending]}: the "
+                        f"suite ran out of time after {now - start:.3f}s"
+                    )
+                    pending.clear()
+        finally:
+            for conn, (_, process, _, _) in running.items():
+                process.kill()
+                process.join()
+                conn.close()
+
+        results = []
+        for index, (allocs, alignments, bufsizes, _) in sorted(plans.items()):
+            spec_dict = {
+                spec: SpecAllocResult(*alloc)
+                for spec, alloc in zip(spec_list, allocs)
+                if alloc is not None
+            }
+            results.append(
+                (
+                    _algo_name(self.algo_list[index]),
+                    MemoryAlgoResult(spec_dict, bufsizes),
+                    alignments,
+                )
+            )
+        return results
+
 
 def naive(
     alignment: int,
@@ -1032,6 +1522,345 @@ def naive(
     return naive_result
 
 
+# A tensor to place at an offset, as (size, first use, last use).
+_OffsetItem = Tuple[int, int, int]
+
+
+def _best_fit_offsets(
+    items: List[_OffsetItem], order: List[int]
+) -> Tuple[List[int], int]:
+    r"""
+    Places `items` one by one in `order`. Each item goes to the smallest gap
+    that fits it between the already placed items whose lifetime overlaps
+    with its own, or above all of them. This is the offset calculation of
+    TFLite's "greedy by size" planner.
+
+    Returns the offset of each item, and the size of the arena.
+    """
+    offsets = [0] * len(items)
+    # Placed items as (offset, end, first use, last use), sorted by offset.
+    placed: List[Tuple[int, int, int, int]] = []
+    arena_size = 0
+    for i in order:
+        size, first, last = items[i]
+        prev_end = 0
+        best_offset = -1
+        best_gap = 0
+        for offset, end, other_first, other_last in placed:
+            if other_last < first or other_first > last:
+                continue
+            gap = offset - prev_end
+            if gap >= size and (best_offset < 0 or gap < best_gap):
+                best_offset = prev_end
+                best_gap = gap
+            prev_end = max(prev_end, end)
+        if best_offset < 0:
+            best_offset = prev_end
+        offsets[i] = best_offset
+        bisect.insort(placed, (best_offset, best_offset + size, first, last))
+        arena_size = max(arena_size, best_offset + size)
+    return offsets, arena_size
+
+
+def _size_order(items: List[_OffsetItem]) -> List[int]:
+    """Largest first, and among items of the same size, first used first."""
+    return sorted(range(len(items)), key=lambda i: (-items[i][0], items[i][1:]))
+
+
+def _breadth_order(items: List[_OffsetItem]) -> List[int]:
+    r"""
+    Orders `items` like TFLite's "greedy by breadth" planner: it visits the
+    steps from the one with the most live bytes to the one with the least,
+    and at each step takes the items live at that step that weren't taken
+    yet, largest first.
+
+    An item is thus taken at the highest ranked step of its lifetime, which
+    is found with a range minimum query over the ranks of the steps.
+    """
+    if not items:
+        return []
+    num_steps = max(last for _, _, last in items) + 1
+    deltas = [0] * (num_steps + 1)
+    for size, first, last in items:
+        deltas[first] += size
+        deltas[last + 1] -= size
+    breadth = list(itertools.accumulate(deltas[:num_steps]))
+    rank = [0] * num_steps
+    for position, step in enumerate(
+        sorted(range(num_steps), key=lambda s: -breadth[s])
+    ):
+        rank[step] = position
+    # Sparse table: min_rank[j][s] is the minimum rank in [s, s + 2**j).
+    min_rank = [rank]
+    width = 1
+    while 2 * width <= num_steps:
+        prev = min_rank[-1]
+        min_rank.append(
+            [min(prev[s], prev[s + width]) for s in range(num_steps - 2 * width + 1)]
+        )
+        width *= 2
+
+    def first_rank(item: _OffsetItem) -> int:
+        _, first, last = item
+        level = (last - first + 1).bit_length() - 1
+        table = min_rank[level]
+        return min(table[first], table[last - (1 << level) + 1])
+
+    keys = [(first_rank(item), -item[0], item[1]) for item in items]
+    return sorted(range(len(items)), key=keys.__getitem__)
+
+
+def _peak_live_bytes(items: List[_OffsetItem]) -> int:
+    r"""
+    Returns the largest sum of the sizes of the items that are live at the
+    same step, which is a lower bound of the size of any arena for them.
+    """
+    events = []
+    for size, first, last in items:
+        events.append((first, size))
+        events.append((last + 1, -size))
+    # At the same step, release before allocating.
+    events.sort()
+    live = peak = 0
+    for _, delta in events:
+        live += delta
+        peak = max(peak, live)
+    return peak
+
+
+def _search_offsets(
+    items: List[_OffsetItem],
+    time_budget_s: Optional[float],
+    max_iterations: int,
+    rng: random.Random,
+) -> Tuple[List[int], int]:
+    r"""
+    Starts from the best of the "greedy by size" and "greedy by breadth"
+    placements, then repeatedly moves one item earlier in the placement order
+    and keeps the new order if the arena doesn't grow. The moved item is
+    often one that ends at the top of the arena. Stops when the arena reaches
+    the lower bound from `_peak_live_bytes()`, which proves it optimal, or
+    after `max_iterations`, or after `time_budget_s` seconds if given.
+    """
+    deadline = None if time_budget_s is None else time.monotonic() + time_budget_s
+    lower_bound = _peak_live_bytes(items)
+    candidates = []
+    for order in (_size_order(items), _breadth_order(items)):
+        offsets, arena_size = _best_fit_offsets(items, order)
+        candidates.append((arena_size, order, offsets))
+    arena_size, order, offsets = min(candidates, key=operator.itemgetter(0))
+    for _ in range(max_iterations):
+        if arena_size <= lower_bound or len(order) < 2:
+            break
+        if deadline is not None and time.monotonic() >= deadline:
+            break
+        top = [
+            position
+            for position, i in enumerate(order)
+            if position > 0 and offsets[i] + items[i][0] == arena_size
+        ]
+        if top and rng.random() < 0.5:
+            source = rng.choice(top)
+        else:
+            source = rng.randrange(1, len(order))
+        new_order = list(order)
+        new_order.insert(rng.randrange(source), new_order.pop(source))
+        new_offsets, new_arena_size = _best_fit_offsets(items, new_order)
+        if new_arena_size <= arena_size:
+            arena_size, order, offsets = new_arena_size, new_order, new_offsets
+    return offsets, arena_size
+
+
+def _storage_object_ids(items: List[_OffsetItem], offsets: List[int]) -> List[int]:
+    r"""
+    Numbers the groups of items whose storage overlaps, transitively, in order
+    of offset. Tensors that reuse storage must have the same mem_obj_id, see
+    Verifier.
+    """
+    mem_obj_ids = [0] * len(items)
+    mem_obj_id = -1
+    end = -1
+    for i in sorted(range(len(items)), key=offsets.__getitem__):
+        if offsets[i] >= end:
+            mem_obj_id += 1
+        mem_obj_ids[i] = mem_obj_id
+        end = max(end, offsets[i] + items[i][0])
+    return mem_obj_ids
+
+
+def _plan_offsets(
+    name: str,
+    alignment: int,
+    specs: Iterable[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    extra_padding: int,
+    place: Callable[[List[_OffsetItem], int], Tuple[List[int], int]],
+) -> MemoryAlgoResult:
+    r"""
+    Plans each memory buffer with `place`, which is passed the specs of the
+    buffer as `_OffsetItem`s and the number of buffers, and returns the offset
+    of each spec and the size of the buffer.
+    """
+    result = MemoryAlgoResult({}, [])
+    specs_by_mem_id: Dict[int, List[TensorSpec]] = defaultdict(list)
+    for spec in specs:
+        specs_by_mem_id[1 if spec.mem_id is None else spec.mem_id].append(spec)
+
+    if len(specs_by_mem_id) == 0:
+        # Be consistent with greedy.
+        result.bufsizes = [0, 0]
+        return result
+
+    input_bufsizes = getattr(graph_module, "input_mem_buffer_sizes", None) or []
+    bufsizes = [0] * (max(specs_by_mem_id.keys()) + 1)
+    for mem_id, mem_specs in specs_by_mem_id.items():
+        items = [
+            (spec.realign(alignment), spec.lifetime[0], spec.lifetime[1])
+            for spec in mem_specs
+        ]
+        offsets, arena_size = place(items, len(specs_by_mem_id))
+        input_total_size = 0
+        if len(input_bufsizes) > mem_id:
+            input_total_size = input_bufsizes[mem_id]
+        mem_obj_ids = _storage_object_ids(items, offsets)
+        for spec, offset, mem_obj_id in zip(mem_specs, offsets, mem_obj_ids):
+            result.spec_dict[spec] = SpecAllocResult(
+                mem_id, mem_obj_id, input_total_size + offset
+            )
+        bufsizes[mem_id] = input_total_size + arena_size + extra_padding
+
+    logging.debug(f"{name} algorithm returns bufsizes: {bufsizes}")
+    result.bufsizes = bufsizes
+    return result
+
+
+def offsets_greedy_by_size(
+    alignment: int,
+    specs: Set[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    graph_signature: ExportGraphSignature,
+    extra_padding: int = 0,
+) -> MemoryAlgoResult:
+    r"""
+    Allocates memory for tensors in the graph at individual offsets rather
+    than in shared objects, like TFLite's "greedy by size" planner.
+
+    Tensors are placed from the largest to the smallest, each in the
+    tightest gap between the already placed tensors whose lifetime overlaps
+    with its own. Unlike `greedy`, a tensor can reuse the storage of several
+    smaller tensors, which usually gives a smaller buffer. Runs in quadratic
+    time in the number of tensors.
+
+    Args:
+        alignment: Memory alignment requirement
+        specs: Set of TensorSpec objects with updated lifetimes
+        graph_module: Graph module
+        graph_signature: Graph signature
+        extra_padding: Additional padding to add to each memory buffer (in bytes)
+
+    Returns:
+        MemoryAlgoResult containing the allocation decisions
+    """
+    return _plan_offsets(
+        "offsets_greedy_by_size",
+        alignment,
+        specs,
+        graph_module,
+        extra_padding,
+        lambda items, _: _best_fit_offsets(items, _size_order(items)),
+    )
+
+
+def offsets_greedy_by_breadth(
+    alignment: int,
+    specs: Set[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    graph_signature: ExportGraphSignature,
+    extra_padding: int = 0,
+) -> MemoryAlgoResult:
+    r"""
+    Like `offsets_greedy_by_size`, but places tensors in the order of TFLite's
+    "greedy by breadth" planner: first the tensors live at the step with the
+    most live bytes, then those live at the next such step, and so on. This
+    does better than by size on graphs where a few steps dominate the peak.
+
+    Args:
+        alignment: Memory alignment requirement
+        specs: Set of TensorSpec objects with updated lifetimes
+        graph_module: Graph module
+        graph_signature: Graph signature
+        extra_padding: Additional padding to add to each memory buffer (in bytes)
+
+    Returns:
+        MemoryAlgoResult containing the allocation decisions
+    """
+    return _plan_offsets(
+        "offsets_greedy_by_breadth",
+        alignment,
+        specs,
+        graph_module,
+        extra_padding,
+        lambda items, _: _best_fit_offsets(items, _breadth_order(items)),
+    )
+
+
+def offsets_search(
+    alignment: int,
+    specs: Set[TensorSpec],
+    graph_module: torch.fx.GraphModule,
+    graph_signature: ExportGraphSignature,
+    extra_padding: int = 0,
+    *,
+    max_iterations: int = 1000,
+    seed: int = 0,
+    time_budget_s: Optional[float] = None,
+) -> MemoryAlgoResult:
+    r"""
+    Searches for offsets that need less memory than both
+    `offsets_greedy_by_size` and `offsets_greedy_by_breadth`, by improving the
+    order in which the tensors are placed. The search ends as soon as the
+    buffer is as small as the peak of live bytes, which is optimal.
+
+    The search is bounded by `max_iterations` and the moves are drawn from
+    `seed`, so the same inputs always give the same plan. `time_budget_s`
+    additionally stops the search after that many seconds, which makes the
+    plan depend on the speed of the machine. For example, to pick the best of
+    this and `greedy`:
+
+        MemoryPlanningAlgorithmSuite(
+            [greedy, functools.partial(offsets_search, max_iterations=5000)]
+        )
+
+    Args:
+        alignment: Memory alignment requirement
+        specs: Set of TensorSpec objects with updated lifetimes
+        graph_module: Graph module
+        graph_signature: Graph signature
+        extra_padding: Additional padding to add to each memory buffer (in bytes)
+        max_iterations: Number of placement orders to try per memory buffer
+        seed: Seed of the moves to try
+        time_budget_s: Optional time to search for, split between memory
+            buffers. Unbounded by default.
+
+    Returns:
+        MemoryAlgoResult containing the allocation decisions
+    """
+    rng = random.Random(seed)
+    return _plan_offsets(
+        "offsets_search",
+        alignment,
+        specs,
+        graph_module,
+        extra_padding,
+        lambda items, num_buffers: _search_offsets(
+            items,
+            None if time_budget_s is None else time_budget_s / num_buffers,
+            max_iterations,
+            rng,
+        ),
+    )
+
+
 def get_cond_nodes(graph_module: torch.fx.GraphModule) -> Iterable[Node]:
     for nd in graph_module.graph.nodes:
         if nd.target is torch.ops.higher_order.cond:
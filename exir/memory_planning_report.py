@@ -0,0 +1,265 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""
+Reports on the quality of a memory plan, independently of the algorithm and
+backend that produced it.
+
+For each memory id, the report compares the arena size that the plan needs
+with the peak number of bytes that are live at the same time. No plan can do
+better than that peak, so it is a lower bound of the arena size and the gap
+between the two is the fragmentation of the plan. The report also lists the
+largest tensors live at the peak, and the nodes where the most bytes are live.
+"""
+
+import json
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from executorch.exir.memory_planning import get_node_tensor_specs
+from executorch.exir.tensor import TensorSpec
+
+
+@dataclass
+class PlannedTensor:
+    """A tensor in a memory plan."""
+
+    # Name of the first node that has the tensor's spec.
+    node: str
+    mem_id: int
+    mem_offset: int
+    size: int
+    # First and last node index (inclusive) where the tensor is live, like
+    # TensorSpec.lifetime.
+    lifetime: List[int]
+
+
+@dataclass
+class NodeMemoryPressure:
+    """Bytes live in a memory when a node runs."""
+
+    node: str
+    node_index: int
+    live_bytes: int
+
+
+@dataclass
+class ArenaReport:
+    """Report on the plan of one memory id of a method."""
+
+    mem_id: int
+    # Size of the arena in the plan, in bytes.
+    arena_size: int
+    # Peak number of bytes live at the same time. No plan needs less.
+    lower_bound: int
+    # Fraction of the arena that is not needed at the peak:
+    # 1 - lower_bound / arena_size.
+    fragmentation: float
+    num_tensors: int
+    # Index and name of the first node where lower_bound bytes are live.
+    peak_node_index: Optional[int]
+    peak_node: Optional[str]
+    # Largest tensors live at the peak, by decreasing size.
+    peak_tensors: List[PlannedTensor] = field(default_factory=list)
+    # Nodes where the most bytes are live, by decreasing live bytes.
+    top_nodes: List[NodeMemoryPressure] = field(default_factory=list)
+
+
+@dataclass
+class MemoryPlanReport:
+    """Memory plan reports of the methods of a program, by method name."""
+
+    methods: Dict[str, List[ArenaReport]]
+
+    def arena_sizes(self) -> Dict[str, Dict[int, int]]:
+        """Arena size of each memory id, by method name."""
+        return {
+            method: {arena.mem_id: arena.arena_size for arena in arenas}
+            for method, arenas in self.methods.items()
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "methods": {
+                method: [asdict(arena) for arena in arenas]
+                for method, arenas in self.methods.items()
+            }
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def __str__(self) -> str:
+        lines = []
+        for method, arenas in self.methods.items():
+            for arena in arenas:
+                lines.append(
+                    f"{method} mem_id={arena.mem_id}: arena {arena.arena_size} bytes, "
+                    f"lower bound {arena.lower_bound} bytes, "
+                    f"fragmentation {arena.fragmentation:.1%}, "
+                    f"peak at {arena.peak_node} ({arena.num_tensors} tensors)"
+                )
+                for tensor in arena.peak_tensors:
+                    lines.append(
+                        f"    {tensor.node}: {tensor.size} bytes at offset "
+                        f"{tensor.mem_offset}, lifetime {tensor.lifetime}"
+                    )
+        return "\n".join(lines)
+
+
+def _planned_tensors(graph_module: torch.fx.GraphModule) -> List[PlannedTensor]:
+    """Collects the tensors with a memory plan and a lifetime in the graph."""
+    tensors = []
+    seen = set()
+    for node in graph_module.graph.nodes:
+        if node.op == "get_attr":
+            continue
+        for spec in get_node_tensor_specs(node):
+            if not isinstance(spec, TensorSpec) or id(spec) in seen:
+                continue
+            seen.add(id(spec))
+            start, end = spec.lifetime
+            if (
+                spec.const
+                or spec.mem_id is None
+                or spec.mem_offset is None
+                or start is None
+                or end is None
+                or start > end
+                or spec.allocated_memory <= 0
+            ):
+                continue
+            tensors.append(
+                PlannedTensor(
+                    node=node.name,
+                    mem_id=spec.mem_id,
+                    mem_offset=spec.mem_offset,
+                    size=spec.allocated_memory,
+                    lifetime=[start, end],
+                )
+            )
+    return tensors
+
+
+def _merge_aliases(tensors: List[PlannedTensor]) -> List[PlannedTensor]:
+    """
+    Merges the tensors at the same place in memory with overlapping lifetimes,
+    e.g. mutable buffers and the outputs that write them back, which would
+    otherwise be counted twice in the live bytes.
+    """
+    by_place: Dict[Tuple[int, int, int], List[PlannedTensor]] = defaultdict(list)
+    for tensor in tensors:
+        by_place[(tensor.mem_id, tensor.mem_offset, tensor.size)].append(tensor)
+    merged = []
+    for aliases in by_place.values():
+        aliases.sort(key=lambda t: t.lifetime)
+        current = aliases[0]
+        for tensor in aliases[1:]:
+            if tensor.lifetime[0] <= current.lifetime[1]:
+                end = max(current.lifetime[1], tensor.lifetime[1])
+                current = replace(current, lifetime=[current.lifetime[0], end])
+            else:
+                merged.append(current)
+                current = tensor
+        merged.append(current)
+    return merged
+
+
+def report_memory_plan(
+    graph_module: torch.fx.GraphModule, top_n: int = 10
+) -> List[ArenaReport]:
+    """
+    Reports on the memory plan of a graph module after memory planning, for
+    each memory id with planned tensors or a non-empty arena.
+
+    Arena sizes are taken from graph_module.meta["non_const_buffer_sizes"], or
+    from the end of the last tensor in each memory id if it is missing. Tensors
+    at the same offset with the same size and overlapping lifetimes count as
+    one. Only the tensors of the graph module itself are counted, not those of
+    control flow submodules.
+    """
+    nodes = list(graph_module.graph.nodes)
+    tensors_by_mem_id: Dict[int, List[PlannedTensor]] = defaultdict(list)
+    for tensor in _merge_aliases(_planned_tensors(graph_module)):
+        tensors_by_mem_id[tensor.mem_id].append(tensor)
+
+    bufsizes = graph_module.meta.get("non_const_buffer_sizes")
+    mem_ids = set(tensors_by_mem_id)
+    if bufsizes is not None:
+        # Memory id 0 is reserved for constants.
+        mem_ids.update(mem_id for mem_id in range(1, len(bufsizes)) if bufsizes[mem_id])
+
+    reports = []
+    for mem_id in sorted(mem_ids):
+        tensors = tensors_by_mem_id[mem_id]
+        if bufsizes is not None and mem_id < len(bufsizes):
+            arena_size = bufsizes[mem_id]
+        else:
+            arena_size = max((t.mem_offset + t.size for t in tensors), default=0)
+
+        # Bytes live at each node index.
+        num_steps = max((t.lifetime[1] + 1 for t in tensors), default=0)
+        deltas = [0] * (num_steps + 1)
+        for tensor in tensors:
+            start, end = tensor.lifetime
+            deltas[start] += tensor.size
+            deltas[end + 1] -= tensor.size
+        live_bytes = []
+        live = 0
+        for delta in deltas[:num_steps]:
+            live += delta
+            live_bytes.append(live)
+
+        lower_bound = max(live_bytes, default=0)
+        peak_node_index = live_bytes.index(lower_bound) if live_bytes else None
+        peak_tensors = []
+        if peak_node_index is not None:
+            peak_tensors = sorted(
+                (
+                    t
+                    for t in tensors
+                    if t.lifetime[0] <= peak_node_index <= t.lifetime[1]
+                ),
+                key=lambda t: t.size,
+                reverse=True,
+            )[:top_n]
+        top_steps = sorted(
+            range(len(live_bytes)), key=lambda step: live_bytes[step], reverse=True
+        )[:top_n]
+
+        def node_name(step: int) -> str:
+            return nodes[step].name if step < len(nodes) else f"#{step}"
+
+        reports.append(
+            ArenaReport(
+                mem_id=mem_id,
+                arena_size=arena_size,
+                lower_bound=lower_bound,
+                fragmentation=(
+                    max(1.0 - lower_bound / arena_size, 0.0) if arena_size else 0.0
+                ),
+                num_tensors=len(tensors),
+                peak_node_index=peak_node_index,
+                peak_node=(
+                    node_name(peak_node_index) if peak_node_index is not None else None
+                ),
+                peak_tensors=peak_tensors,
+                top_nodes=[
+                    NodeMemoryPressure(
+                        node=node_name(step),
+                        node_index=step,
+                        live_bytes=live_bytes[step],
+                    )
+                    for step in top_steps
+                    if live_bytes[step] > 0
+                ],
+            )
+        )
+    return reports
@@ -7,6 +7,8 @@
 # pyre-unsafe
 
 import logging
+import os
+import tempfile
 from collections import OrderedDict
 from typing import cast, Mapping, Optional
 
@@ -56,7 +58,7 @@ def get_default_skip_targets_no_quant() -> set[EdgeOpOverload]:
 def is_const(
     arg,
     exported_program: ExportedProgram,
-    const_node_to_tensor: Mapping[torch.fx.Node, torch.Tensor],
+    const_node_to_tensor: Mapping[torch.fx.Node, Optional[torch.Tensor]],
 ) -> bool:
     if isinstance(arg, (tuple, list)):
         return all(is_const(x, exported_program, const_node_to_tensor) for x in arg)
@@ -78,7 +80,7 @@ def is_const(
 def get_data(
     arg,
     exported_program: ExportedProgram,
-    const_node_to_tensor: Mapping[torch.fx.Node, torch.Tensor],
+    const_node_to_tensor: Mapping[torch.fx.Node, Optional[torch.Tensor]],
 ):
     if isinstance(arg, (tuple, list)):
         return type(arg)(
@@ -124,15 +126,100 @@ def get_constant_placeholder_dict(
     return const_node_to_tensor
 
 
+def _spill_to_file(tensor: torch.Tensor, spill_dir: Optional[str]) -> torch.Tensor:
+    """
+    Returns a copy of `tensor`, with the same strides, backed by a memory-mapped
+    file in `spill_dir`, so that its pages can be evicted from memory and read
+    back when needed.
+    """
+    # Spill the part of the storage that the tensor spans, and view it with the
+    # strides of the tensor.
+    span = 1 + sum(
+        (size - 1) * stride for size, stride in zip(tensor.shape, tensor.stride())
+    )
+    fd, path = tempfile.mkstemp(prefix="constant_prop_", dir=spill_dir)
+    with os.fdopen(fd, "wb") as f:
+        f.write(tensor.as_strided((span,), (1,)).view(torch.uint8).numpy())
+    spilled = torch.from_file(
+        path, shared=True, size=span, dtype=tensor.dtype
+    ).as_strided(tensor.shape, tensor.stride())
+    try:
+        # The mapping keeps the data of the file until the tensor is freed.
+        os.unlink(path)
+    except OSError:
+        # Mapped files can't be removed on Windows.
+        pass
+    return spilled
+
+
+def _is_spillable(tensor: object, spill_threshold_bytes: Optional[int]) -> bool:
+    return (
+        spill_threshold_bytes is not None
+        and isinstance(tensor, torch.Tensor)
+        and tensor.layout == torch.strided
+        and not tensor.is_quantized
+        and tensor.device.type == "cpu"
+        and tensor.numel() > 0
+        and tensor.nbytes >= spill_threshold_bytes
+    )
+
+
+def _release_constant_inputs(
+    node: torch.fx.Node,
+    folded: bool,
+    const_node_to_tensor: dict[torch.fx.Node, Optional[torch.Tensor]],
+    num_unvisited_users: dict[torch.fx.Node, int],
+    kept: set[torch.fx.Node],
+    spill_threshold_bytes: Optional[int],
+    spill_dir: Optional[str],
+) -> None:
+    """
+    Drops the tensors of the constant inputs of `node` that have no unvisited
+    users left, unless a user wasn't folded and the tensor will be kept as a
+    constant of the program.
+    """
+    for input_node in node.all_input_nodes:
+        if input_node not in num_unvisited_users:
+            continue
+        num_unvisited_users[input_node] -= 1
+        if not folded and input_node.op != "placeholder" and input_node not in kept:
+            kept.add(input_node)
+            tensor = const_node_to_tensor[input_node]
+            if _is_spillable(tensor, spill_threshold_bytes):
+                const_node_to_tensor[input_node] = _spill_to_file(tensor, spill_dir)
+        if num_unvisited_users[input_node] == 0 and input_node not in kept:
+            # Placeholders stay in the state dict until they are erased.
+            const_node_to_tensor[input_node] = None
+
+
 def get_propagated_const_tensor_dict(
     exported_program: ExportedProgram,
     custom_skip_targets: Optional[set[EdgeOpOverload]],
-) -> OrderedDict[torch.fx.Node, torch.Tensor]:
+    streaming: bool = False,
+    spill_threshold_bytes: Optional[int] = None,
+    spill_dir: Optional[str] = None,
+) -> OrderedDict[torch.fx.Node, Optional[torch.Tensor]]:
     """
     Propagates constants and returns a dictionary of node->constant tensors.
+
+    With `streaming`, the tensor of a constant is dropped, and replaced with
+    None, as soon as all its users are folded, instead of at the end of the
+    pass. Only the constants that the program keeps are returned with their
+    tensor, and those of at least `spill_threshold_bytes` bytes are moved to
+    memory-mapped files in `spill_dir` (a temporary directory by default).
     """
     # Initialize dict with all constant placeholders.
-    const_node_to_tensor = get_constant_placeholder_dict(exported_program)
+    const_node_to_tensor: OrderedDict[torch.fx.Node, Optional[torch.Tensor]] = (
+        OrderedDict(get_constant_placeholder_dict(exported_program))
+    )
+    # In streaming mode, the number of users of each constant that weren't
+    # visited yet.
+    num_unvisited_users: dict[torch.fx.Node, int] = {}
+    kept: set[torch.fx.Node] = set()
+    if streaming:
+        num_unvisited_users = {
+            node: len(node.users) for node in const_node_to_tensor.keys()
+        }
 
     if custom_skip_targets is not None:
         all_skip_targets = custom_skip_targets
@@ -141,42 +228,69 @@ def get_propagated_const_tensor_dict(
         all_skip_targets = _DEFAULT_SKIP_TARGETS
 
     for node in exported_program.graph.nodes:
-        if node.op != "call_function" or node.target in all_skip_targets:
+        folded = (
+            node.op == "call_function"
+            and node.target not in all_skip_targets
+            and is_const(
+                node.args,
+                exported_program,
+                const_node_to_tensor,
+            )
+            and is_const(
+                node.kwargs,
+                exported_program,
+                const_node_to_tensor,
+            )
+        )
+        if folded:
+            const_node_to_tensor[node] = _fold(
+                node, exported_program, const_node_to_tensor
+            )
+        if not streaming:
             continue
 
-        if not is_const(
-            node.args,
-            exported_program,
+        _release_constant_inputs(
+            node,
+            folded,
             const_node_to_tensor,
-        ) or not is_const(
-            node.kwargs,
-            exported_program,
-            const_node_to_tensor,
-        ):
-            continue
-
-        args_data, kwargs_data = pytree.tree_map(
-            lambda x: get_data(x, exported_program, const_node_to_tensor),
-            (node.args, node.kwargs),
+            num_unvisited_users,
+            kept,
+            spill_threshold_bytes,
+            spill_dir,
         )
-        # Disable grad for constant propagation, otherwise the generated tensor can't be copied
-        # because of the grad_fn.
-        with torch.no_grad():
-            # Execute the `node.target` and create a new propagated constant tensor.
-            prop_constant_tensor = node.target(*args_data, **kwargs_data)
-
-            # ExecuTorch doesn't support zero strides, so we need to ensure the tensor is contiguous
-            # if it has any zero strides from broadcasting/expansion operations
-            if (
-                isinstance(prop_constant_tensor, torch.Tensor)
-                and 0 in prop_constant_tensor.stride()
-            ):
-                prop_constant_tensor = prop_constant_tensor.contiguous()
-        const_node_to_tensor[node] = prop_constant_tensor
+        if folded:
+            num_unvisited_users[node] = len(node.users)
+            if not node.users:
+                const_node_to_tensor[node] = None
 
     return const_node_to_tensor
 
 
+def _fold(
+    node: torch.fx.Node,
+    exported_program: ExportedProgram,
+    const_node_to_tensor: Mapping[torch.fx.Node, Optional[torch.Tensor]],
+):
+    args_data, kwargs_data = pytree.tree_map(
+        lambda x: get_data(x, exported_program, const_node_to_tensor),
+        (node.args, node.kwargs),
+    )
+    # Disable grad for constant propagation, otherwise the generated tensor can't be copied
+    # because of the grad_fn.
+    with torch.no_grad():
+        # Execute the `node.target` and create a new propagated constant tensor.
+        prop_constant_tensor = node.target(*args_data, **kwargs_data)
+
+        # ExecuTorch doesn't support zero strides, so we need to ensure the tensor is contiguous
+        # if it has any zero strides from broadcasting/expansion operations
+        if (
+            isinstance(prop_constant_tensor, torch.Tensor)
+            and 0 in prop_constant_tensor.stride()
+        ):
+            prop_constant_tensor = prop_constant_tensor.contiguous()
+    return prop_constant_tensor
+
+
 def get_first_user_input(exported_program: ExportedProgram) -> torch.fx.Node:
     """Returns the first user input node in the graph."""
     first_user_input = None
@@ -268,7 +382,7 @@ def erase_constant_node(
 
 
 def create_constant_nodes_and_return_specs(
-    const_node_to_tensor: Mapping[torch.fx.Node, torch.Tensor],
+    const_node_to_tensor: Mapping[torch.fx.Node, Optional[torch.Tensor]],
     exported_program: ExportedProgram,
 ) -> dict[str, InputSpec]:
     """
@@ -289,6 +403,7 @@ def create_constant_nodes_and_return_specs(
         if node.op == "placeholder":
             continue
 
+        assert prop_constant_tensor is not None, f"No tensor for {node}"
         const_placeholder_node, prop_constant_tensor_fqn = replace_with_constant_node(
             node, prop_constant_tensor, first_user_input, fake_mode, exported_program
         )
@@ -346,6 +461,10 @@ def constant_prop_pass(
     exported_program: ExportedProgram,
     custom_skip_targets: Optional[set[EdgeOpOverload]] = None,
     _skip_dim_order: bool = True,
+    *,
+    streaming: bool = False,
+    spill_threshold_bytes: Optional[int] = None,
+    spill_dir: Optional[str] = None,
 ) -> ExportedProgram:
     """
     This pass is for constant propagation for Exported Program with lifted parameters,
@@ -354,10 +473,19 @@ def constant_prop_pass(
     Args:
         exported_program: The ExportedProgram to perform constant propagation on.
         custom_skip_targets: Optional set of EdgeOpOverload targets to skip during constant propagation.
+        streaming: Free each intermediate constant as soon as all its users are
+            folded, so that peak memory is bounded by the constants that are live
+            at the same time rather than by all of them. The result is the same.
+        spill_threshold_bytes: In streaming mode, move the new constants of the
+            program of at least this many bytes to memory-mapped files.
+        spill_dir: Directory of the memory-mapped files, a temporary directory by
+            default. The files are removed once mapped, except on Windows.
 
     Returns:
         The modified ExportedProgram with constant propagation applied.
     """
+    if spill_threshold_bytes is not None and not streaming:
+        raise ValueError("spill_threshold_bytes requires streaming=True")
     if (
         len([node for node in exported_program.graph.nodes if node.op == "placeholder"])
         == 0
@@ -375,7 +503,11 @@ def constant_prop_pass(
         )
 
     const_node_to_tensor = get_propagated_const_tensor_dict(
-        exported_program, custom_skip_targets
+        exported_program,
+        custom_skip_targets,
+        streaming=streaming,
+        spill_threshold_bytes=spill_threshold_bytes,
+        spill_dir=spill_dir,
     )
 
     # Get old input specs.
@@ -43,6 +43,31 @@ def _callable_name(any_callable: Callable[..., Any]) -> str:
         return str(any_callable)
 
 
+# Algorithms whose plans pass Verifier.verify_storage_reuse().
+_VERIFIED_ALGOS = (
+    "greedy",
+    "offsets_greedy_by_size",
+    "offsets_greedy_by_breadth",
+    "offsets_search",
+)
+
+
+def _is_verified(memory_planning_algo: Callable[..., Any]) -> bool:
+    """
+    Return whether the algorithm is greedy or one of the other algorithms in
+    _VERIFIED_ALGOS, or a suite of only such algorithms, such as the default
+    MemoryPlanningAlgorithmSuite.
+    """
+    if isinstance(memory_planning_algo, MemoryPlanningAlgorithmSuite):
+        return len(memory_planning_algo.algo_list) > 0 and all(
+            _is_verified(algo) for algo in memory_planning_algo.algo_list
+        )
+    return (
+        callable(memory_planning_algo)
+        and _callable_name(memory_planning_algo) in _VERIFIED_ALGOS
+    )
+
+
 def _is_buffer(
     node: Node, graph_signature: ExportGraphSignature
 ) -> Tuple[bool, Optional[str]]:
@@ -278,14 +303,13 @@ class MemoryPlanningPass(PassBase):
                 f"The {getattr(self.memory_planning_algo, '__name__', repr(self.memory_planning_algo))} algorithm reuses storage for {num_reuse_pairs} pair of tensors"
             )
         verifier.verify_graph_input_output()
-        if (
-            callable(self.memory_planning_algo)
-            and _callable_name(self.memory_planning_algo) == "greedy"
-        ):
-            # Only verify storage reuse for greedy algorithm
+        if _is_verified(self.memory_planning_algo):
+            # Only verify storage reuse for greedy and offset algorithms, which
+            # includes the default suite. The check sweeps over the specs in
+            # O(n log n), so it is cheap enough to always run.
             # At the moment cadence backends memory planning fails this
             # I dont know if that is a valid thing but if it is we should adjust verify_storage_reuse function
-            verifier.verify_storage_reuse()
+            verifier.verify_storage_reuse(self.allow_lifetime_and_storage_overlap)
         return PassResult(graph_module, True)
 
     def run_multimethod(self):
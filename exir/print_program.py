@@ -265,6 +265,15 @@ def pretty_print(obj: Any, indent: int = 0, out: Optional[TextIO] = None) -> Non
         print(obj, end="", file=out)
         return
 
+    if isinstance(obj, memoryview):
+        # Constant data may be a view of the tensor storage. Only the ends of
+        # it show in the truncated repr below, so only copy those.
+        obj = (
+            obj.tobytes()
+            if len(obj) <= 2048
+            else obj[:1024].tobytes() + obj[-1024:].tobytes()
+        )
+
     if isinstance(obj, bytes):
         r = reprlib.Repr()
         r.maxother = 1024
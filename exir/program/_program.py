@@ -35,6 +35,7 @@ from executorch.exir.emit import emit_program, EmitterOutput
 from executorch.exir.emit._emitter import _DelegateDebugIdentifierMap
 from executorch.exir.error import ExportError
 from executorch.exir.graph_module import get_control_flow_submodules
+from executorch.exir.memory_planning_report import MemoryPlanReport, report_memory_plan
 from executorch.exir.operator.convert import _pybind_schema_to_native_schema
 from executorch.exir.operator.util import _QUANT_PRIMITIVES
 from executorch.exir.pass_base import PassBase
@@ -1917,6 +1918,24 @@ class ExecutorchProgramManager:
         """
         return self._execution_programs[method_name]
 
+    def memory_plan_report(self, top_n: int = 10) -> MemoryPlanReport:
+        """
+        Returns a report on the memory plan of each method.
+
+        For each memory id, the report has the arena size, the peak number of
+        bytes live at the same time (a lower bound of the arena size), the
+        resulting fragmentation ratio, and the `top_n` largest tensors live at
+        the peak and nodes where the most bytes are live. Use
+        `MemoryPlanReport.to_json()` to save it, e.g. to check for arena size
+        regressions in CI.
+        """
+        return MemoryPlanReport(
+            methods={
+                name: report_memory_plan(program.graph_module, top_n)
+                for name, program in self._execution_programs.items()
+            }
+        )
+
     def dump_executorch_program(
         self, verbose: bool = False, out: Optional[TextIO] = None
     ) -> None:
@@ -8,7 +8,7 @@
 
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from executorch.exir.backend.compile_spec_schema import CompileSpec
 
@@ -172,8 +172,18 @@ class EValue:
 
 @dataclass
 class Buffer:
+    # May also be a read-only memoryview of the tensor storage, which is
+    # written out without copying it. Annotated as bytes, which is what the
+    # JSON form of the program is loaded as.
     storage: bytes
 
+    def __deepcopy__(self, memo: Dict[int, object]) -> "Buffer":
+        # Read-only views can't be copied, but are as immutable as bytes.
+        return Buffer(self.storage)
+
+    def __reduce__(self) -> Tuple[type, Tuple[bytes]]:
+        return (Buffer, (bytes(self.storage),))
+
 
 @dataclass
 class BackendDelegateInlineData:
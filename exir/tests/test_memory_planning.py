@@ -6,9 +6,15 @@
 
 # pyre-strict
 
+import functools
 import itertools
+import json
+import random
+import time
 import unittest
-from typing import Any, Callable, List, Optional, Tuple, Type
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from unittest.mock import patch
 
 import executorch.exir as exir
 
@@ -27,16 +33,26 @@ import torch
 from executorch.exir import ExecutorchBackendConfig, to_edge
 from executorch.exir.capture._capture import patch_forward
 from executorch.exir.dialects._ops import ops as exir_ops
+from executorch.exir.error import InternalError
 from executorch.exir.memory_planning import (
+    _breadth_order,
     _do_user_inputs_exist,
+    _IntervalIndex,
+    _peak_live_bytes,
     filter_nodes,
     get_node_tensor_specs,
     greedy,
     MemoryAlgoResult,
     MemoryPlanningAlgorithmSuite,
     naive,
+    offsets_greedy_by_breadth,
+    offsets_greedy_by_size,
+    offsets_search,
+    pick_shared_obj,
+    SharedObject,
     Verifier,
 )
+from executorch.exir.memory_planning_report import report_memory_plan
 from executorch.exir.pass_base import ExportPass, PassResult
 from executorch.exir.pass_manager import PassManager
 from executorch.exir.passes import (  # noqa
@@ -495,6 +511,15 @@ class TestMemoryPlanning(unittest.TestCase):
         extra_check=ModuleListArg.extra_check,
     )
 
+    test_offsets: Callable[..., None] = maketest(
+        ModelWithDifferentTensorSizes,
+        criteria=[
+            (offsets_greedy_by_size, True),
+            (offsets_greedy_by_breadth, True),
+            (functools.partial(offsets_search, max_iterations=100), True),
+        ],
+    )
+
     def test_graph_input_output(self) -> None:
         for (
             alloc_graph_input,
@@ -526,6 +551,281 @@ class TestVerifier(unittest.TestCase):
         # non overlap. first on the right side
         self.assertFalse(Verifier.has_overlap([5, 6], [1, 2]))
 
+    def test_storage_reuse_matches_pairwise(self) -> None:
+        rng = random.Random(0)
+        num_valid = 0
+        for num_specs in (2, 10, 50) * 20:
+            specs = []
+            for _ in range(num_specs):
+                spec = TensorSpec(
+                    dtype=torch.uint8, shape=torch.Size([rng.choice([0, 1, 4, 8])])
+                )
+                start = rng.randrange(num_specs)
+                spec.lifetime = [start, start + rng.randrange(-1, 4)]
+                spec.mem_id = rng.choice([1, 2])
+                spec.mem_obj_id = rng.randrange(3)
+                spec.mem_offset = rng.randrange(0, 4 * num_specs, 4)
+                specs.append(spec)
+            for allow_overlap in (True, False):
+                try:
+                    expected = Verifier._verify_storage_reuse_pairwise(
+                        specs, allow_overlap
+                    )
+                except InternalError:
+                    expected = None
+                self.assertEqual(
+                    Verifier._count_storage_reuse(specs, allow_overlap), expected
+                )
+                num_valid += expected is not None
+        # Both valid and invalid plans were checked.
+        self.assertGreater(num_valid, 10)
+        self.assertLess(num_valid, 110)
+
+    def test_default_to_executorch_verifies_storage_reuse(self) -> None:
+        model = ToyModelForMemPlanning()
+        edge = to_edge(export(model, model.get_random_inputs(), strict=True))
+        with patch.object(
+            Verifier, "_count_storage_reuse", wraps=Verifier._count_storage_reuse
+        ) as count_storage_reuse, patch.object(
+            Verifier, "_verify_storage_reuse_pairwise"
+        ) as verify_pairwise:
+            edge.to_executorch()
+        # The default plan is checked with the sweep line, not all pairs.
+        count_storage_reuse.assert_called_once()
+        verify_pairwise.assert_not_called()
+
+
+class TestGreedy(unittest.TestCase):
+    def _random_specs(self, rng: random.Random, num_specs: int) -> List[TensorSpec]:
+        specs = []
+        max_lifetime = rng.choice([1, 4, num_specs])
+        for _ in range(num_specs):
+            spec = TensorSpec(
+                dtype=torch.float32, shape=torch.Size([rng.choice([0, 1, 3, 8, 64])])
+            )
+            start = rng.randrange(num_specs)
+            spec.lifetime = [start, start + rng.randrange(max_lifetime)]
+            spec.mem_id = rng.choice([None, 2])
+            specs.append(spec)
+        return specs
+
+    def test_interval_index(self) -> None:
+        rng = random.Random(0)
+        for size in (1, 2, 7, 64):
+            index = _IntervalIndex(size, max, -1)
+            intervals = []
+            for value in range(50):
+                start = rng.randrange(size)
+                interval = (start, rng.randrange(start, size), value)
+                index.add(*interval)
+                intervals.append(interval)
+                start = rng.randrange(size)
+                end = rng.randrange(start, size)
+                expected = max(
+                    (v for (s, e, v) in intervals if s <= end and e >= start),
+                    default=-1,
+                )
+                self.assertEqual(index.query(start, end), expected)
+
+    def test_greedy_matches_unindexed_placement(self) -> None:
+        rng = random.Random(0)
+        for num_specs in (1, 10, 100, 300):
+            for allow_overlapping_allocations in (True, False):
+                specs = set(self._random_specs(rng, num_specs))
+                result = greedy(
+                    16,
+                    specs,
+                    None,  # pyre-ignore[6]
+                    None,  # pyre-ignore[6]
+                    allow_overlapping_allocations=allow_overlapping_allocations,
+                )
+
+                # Place the specs in the same order without the lifetime index.
+                shared_objects: Dict[int, List[SharedObject]] = defaultdict(list)
+                sorted_specs = sorted(specs, key=lambda x: x.allocated_memory)
+                sorted_specs.reverse()
+                for spec in sorted_specs:
+                    pick_shared_obj(
+                        shared_objects[spec.mem_id or 1],
+                        spec,
+                        allow_overlapping_allocations,
+                    )
+                for sobjs in shared_objects.values():
+                    for sobj in sobjs:
+                        for alloc in sobj.allocations:
+                            alloc_result = result.spec_dict[alloc.spec]
+                            self.assertEqual(alloc_result.mem_obj_id, sobj.idx)
+                            self.assertEqual(
+                                alloc_result.mem_offset - alloc.offset,
+                                sum(s.size for s in sobjs[: sobj.idx]),
+                            )
+
+
+class TestOffsets(unittest.TestCase):
+    def _plan(
+        self, algo: Callable[..., MemoryAlgoResult], specs: List[TensorSpec]
+    ) -> List[int]:
+        result = algo(16, set(specs), None, None)  # pyre-ignore[6]
+        for spec, alloc in result.spec_dict.items():
+            spec.mem_obj_id = alloc.mem_obj_id
+            spec.mem_offset = alloc.mem_offset
+        # Raises if tensors that are live at the same time share storage.
+        Verifier._verify_storage_reuse_pairwise(specs, False)
+        return result.bufsizes
+
+    def test_random_specs(self) -> None:
+        rng = random.Random(0)
+        for num_specs in (1, 10, 100):
+            specs = TestGreedy()._random_specs(rng, num_specs)
+            sizes = {
+                algo: self._plan(algo, specs)
+                for algo in (
+                    offsets_greedy_by_size,
+                    offsets_greedy_by_breadth,
+                    offsets_search,
+                )
+            }
+            for mem_id in (1, 2):
+                lower_bound = _peak_live_bytes(
+                    [
+                        (spec.allocated_memory, *spec.lifetime)
+                        for spec in specs
+                        if (spec.mem_id or 1) == mem_id
+                    ]
+                )
+                for bufsizes in sizes.values():
+                    self.assertGreaterEqual(bufsizes[mem_id], lower_bound)
+                self.assertLessEqual(
+                    sizes[offsets_search][mem_id],
+                    min(
+                        sizes[offsets_greedy_by_size][mem_id],
+                        sizes[offsets_greedy_by_breadth][mem_id],
+                    ),
+                )
+
+    def test_search_deterministic(self) -> None:
+        specs = TestGreedy()._random_specs(random.Random(0), 100)
+
+        def plan() -> List[Tuple[int, int]]:
+            result = offsets_search(16, set(specs), None, None)  # pyre-ignore[6]
+            return [
+                (result.spec_dict[spec].mem_obj_id, result.spec_dict[spec].mem_offset)
+                for spec in specs
+            ]
+
+        self.assertEqual(plan(), plan())
+
+    def test_smaller_than_greedy(self) -> None:
+        # a: 64 bytes live at [1, 1], b: 32 bytes at [2, 4], c: 48 bytes at
+        # [3, 5]. greedy puts c in the 64 byte object of a, and b in an object
+        # of its own. At offsets, b goes right above c, partly in the storage
+        # that a used.
+        specs = []
+        for numel, lifetime in ((16, [1, 1]), (8, [2, 4]), (12, [3, 5])):
+            spec = TensorSpec(dtype=torch.float32, shape=torch.Size([numel]))
+            spec.lifetime = lifetime
+            specs.append(spec)
+        self.assertEqual(
+            greedy(16, set(specs), None, None).bufsizes, [0, 96]  # pyre-ignore[6]
+        )
+        for algo in (offsets_greedy_by_size, offsets_greedy_by_breadth):
+            self.assertEqual(self._plan(algo, specs), [0, 80])
+
+    def test_breadth_order(self) -> None:
+        rng = random.Random(0)
+        for num_items in (1, 5, 50):
+            items = []
+            for _ in range(num_items):
+                first = rng.randrange(20)
+                items.append(
+                    (rng.choice([0, 16, 64]), first, first + rng.randrange(10))
+                )
+            # Visit the steps from the most to the least live bytes.
+            num_steps = max(last for _, _, last in items) + 1
+            breadth = [
+                sum(size for size, first, last in items if first <= step <= last)
+                for step in range(num_steps)
+            ]
+            expected = []
+            for step in sorted(range(num_steps), key=lambda s: -breadth[s]):
+                live = [
+                    i
+                    for i, (_, first, last) in enumerate(items)
+                    if first <= step <= last and i not in expected
+                ]
+                live.sort(key=lambda i: (-items[i][0], items[i][1]))
+                expected.extend(live)
+            self.assertEqual(_breadth_order(items), expected)
+
+
+def _sleeping_greedy(alignment: int, *args: Any) -> MemoryAlgoResult:
+    time.sleep(60)
+    return greedy(alignment, *args)
+
+
+def _failing_greedy(alignment: int, *args: Any) -> MemoryAlgoResult:
+    raise ValueError("Not today")
+
+
+class TestMemoryPlanningAlgorithmSuite(unittest.TestCase):
+    def _plan(
+        self, suite: MemoryPlanningAlgorithmSuite, num_specs: int
+    ) -> Tuple[List[int], List[Tuple[int, int, int, int]]]:
+        specs = TestGreedy()._random_specs(random.Random(0), num_specs)
+        # Pass a generator, like apply_algo() does.
+        bufsizes = suite(16, (spec for spec in specs), None, None, 0)  # pyre-ignore
+        return bufsizes, [
+            (spec.mem_id, spec.mem_obj_id, spec.mem_offset, spec.alignment)
+            for spec in specs
+        ]
+
+    def test_workers_match_sequential(self) -> None:
+        for algo_list in (
+            [naive, greedy],
+            [naive, offsets_greedy_by_size, greedy],
+            [naive],
+        ):
+            expected = self._plan(MemoryPlanningAlgorithmSuite(algo_list), 200)
+            self.assertEqual(
+                self._plan(MemoryPlanningAlgorithmSuite(algo_list, max_workers=2), 200),
+                expected,
+            )
+        # Every algorithm got all the specs: greedy beat naive.
+        self.assertLess(
+            sum(self._plan(MemoryPlanningAlgorithmSuite([naive, greedy]), 200)[0]),
+            sum(self._plan(MemoryPlanningAlgorithmSuite([naive]), 200)[0]),
+        )
+
+    def test_timeouts(self) -> None:
+        expected = self._plan(MemoryPlanningAlgorithmSuite([greedy]), 50)
+        for suite in (
+            MemoryPlanningAlgorithmSuite(
+                [_sleeping_greedy, greedy], max_workers=2, algo_timeout_s=1
+            ),
+            # Greedy runs first, and the sleeping algorithm is stopped at the
+            # deadline of the suite.
+            MemoryPlanningAlgorithmSuite([greedy, _sleeping_greedy], timeout_s=5),
+        ):
+            start = time.monotonic()
+            with self.assertLogs(level="WARNING") as logs:
+                self.assertEqual(self._plan(suite, 50), expected)
+            self.assertLess(time.monotonic() - start, 30)
+            self.assertIn(
+                "Stopped memory planning algo _sleeping_greedy", logs.output[0]
+            )
+
+        # The sleeping algorithm runs first and uses up the time of greedy.
+        suite = MemoryPlanningAlgorithmSuite([_sleeping_greedy, greedy], timeout_s=1)
+        with self.assertLogs(level="WARNING") as logs:
+            with self.assertRaisesRegex(RuntimeError, "No memory planning algorithm"):
+                self._plan(suite, 50)
+        self.assertIn("Skipped memory planning algos ['greedy']", logs.output[1])
+
+    def test_worker_failure(self) -> None:
+        suite = MemoryPlanningAlgorithmSuite([greedy, _failing_greedy], max_workers=2)
+        with self.assertRaisesRegex(RuntimeError, "ValueError: Not today"):
+            self._plan(suite, 10)
+
 
 class TestMisc(unittest.TestCase):
     def test_filter_nodes(self) -> None:
@@ -958,6 +1258,72 @@ def _get_specs(gm: torch.fx.GraphModule) -> set[TensorSpec]:
     )
 
 
+class TestMemoryPlanReport(unittest.TestCase):
+    def test_report_matches_plan(self) -> None:
+        model = ToyModelForMemPlanning()
+        et = to_edge(
+            export(model, model.get_random_inputs(), strict=True)
+        ).to_executorch()
+        report = et.memory_plan_report(top_n=3)
+
+        self.assertEqual(list(report.methods), ["forward"])
+        graph_module = et.exported_program().graph_module
+        bufsizes = graph_module.meta["non_const_buffer_sizes"]
+        (arena,) = report.methods["forward"]
+        self.assertEqual(arena.mem_id, 1)
+        self.assertEqual(arena.arena_size, bufsizes[1])
+        self.assertEqual(report.arena_sizes(), {"forward": {1: bufsizes[1]}})
+        self.assertGreater(arena.lower_bound, 0)
+        self.assertLessEqual(arena.lower_bound, arena.arena_size)
+        self.assertAlmostEqual(
+            arena.fragmentation, 1 - arena.lower_bound / arena.arena_size
+        )
+        self.assertLessEqual(len(arena.peak_tensors), 3)
+        self.assertEqual(
+            [t.size for t in arena.peak_tensors],
+            sorted((t.size for t in arena.peak_tensors), reverse=True),
+        )
+        for tensor in arena.peak_tensors:
+            self.assertLessEqual(tensor.lifetime[0], arena.peak_node_index)
+            self.assertGreaterEqual(tensor.lifetime[1], arena.peak_node_index)
+        self.assertEqual(arena.top_nodes[0].live_bytes, arena.lower_bound)
+        self.assertEqual(arena.top_nodes[0].node, arena.peak_node)
+
+        self.assertEqual(json.loads(report.to_json()), report.to_dict())
+        self.assertEqual(
+            json.loads(report.to_json())["methods"]["forward"][0]["arena_size"],
+            bufsizes[1],
+        )
+
+    def test_lower_bound_and_aliases(self) -> None:
+        graph = Graph()
+        nodes = [graph.placeholder(f"x{i}") for i in range(4)]
+        # (lifetime, offset, bytes): x3 aliases x0 at the same offset.
+        plans = [([0, 2], 0, 64), ([1, 3], 64, 32), ([3, 3], 96, 16), ([2, 3], 0, 64)]
+        for node, (lifetime, offset, size) in zip(nodes, plans):
+            spec = TensorSpec(dtype=torch.uint8, shape=torch.Size([size]))
+            spec.lifetime = lifetime
+            spec.mem_id = 1
+            spec.mem_offset = offset
+            node.meta["spec"] = spec
+        graph.output(tuple(nodes))
+        graph_module = GraphModule(torch.nn.Module(), graph)
+        graph_module.meta["non_const_buffer_sizes"] = [0, 128]
+
+        (arena,) = report_memory_plan(graph_module, top_n=2)
+        self.assertEqual(arena.arena_size, 128)
+        self.assertEqual(arena.num_tensors, 3)
+        self.assertEqual(arena.lower_bound, 64 + 32 + 16)
+        self.assertEqual(arena.peak_node, "x3")
+        self.assertAlmostEqual(arena.fragmentation, 1 - 112 / 128)
+        self.assertEqual([t.node for t in arena.peak_tensors], ["x0", "x1"])
+        self.assertEqual(arena.peak_tensors[0].lifetime, [0, 3])
+        self.assertEqual(
+            [(n.node, n.live_bytes) for n in arena.top_nodes],
+            [("x3", 112), ("x1", 96)],
+        )
+
+
 class MapModel(torch.nn.Module):
     def __init__(self) -> None:
         super().__init__()
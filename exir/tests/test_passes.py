@@ -52,7 +52,10 @@ from executorch.exir.passes import (
     ReplaceSymSizeOpPass,
     ToOutVarPass,
 )
-from executorch.exir.passes.constant_prop_pass import constant_prop_pass
+from executorch.exir.passes.constant_prop_pass import (
+    constant_prop_pass,
+    get_propagated_const_tensor_dict,
+)
 from executorch.exir.passes.cse_pass import CSEPass
 from executorch.exir.passes.debug_handle_generator_pass import (
     DebugHandleGeneratorPass,
@@ -89,7 +92,7 @@ from torch._prims_common import ELEMENTWISE_TYPE_PROMOTION_KIND
 
 # Import passes
 from torch._subclasses.fake_tensor import FakeTensorMode
-from torch.export import export
+from torch.export import export, ExportedProgram
 from torch.export.graph_signature import InputKind, InputSpec, TensorArgument
 from torch.fx import GraphModule, subgraph_rewriter
 from torch.fx.experimental.proxy_tensor import make_fx
@@ -1549,6 +1552,66 @@ class TestPasses(unittest.TestCase):
         new_ep = constant_prop_pass(aten)
         self.assertEqual(count_additions(new_ep.graph_module), 1)
 
+    def test_constant_prop_pass_streaming(self) -> None:
+        class M(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.a = torch.nn.Parameter(torch.ones(4, 8))
+                self.b = torch.nn.Parameter(torch.arange(32.0).reshape(8, 4))
+
+            def forward(self, x):
+                # Chains of constants, some used by non-constant nodes.
+                a = (self.a * 2).t() + 1
+                b = self.b.t()
+                c = b * 3
+                return x @ a + x @ (a * b.t()), c + x[:4]
+
+        def export_m() -> ExportedProgram:
+            return export(M(), (torch.ones(8, 8),), strict=True)
+
+        expected = constant_prop_pass(export_m())
+        with tempfile.TemporaryDirectory() as spill_dir:
+            for spill_threshold_bytes in (None, 0):
+                ep = constant_prop_pass(
+                    export_m(),
+                    streaming=True,
+                    spill_threshold_bytes=spill_threshold_bytes,
+                    spill_dir=spill_dir,
+                )
+                self.assertEqual(ep.graph_module.code, expected.graph_module.code)
+                self.assertEqual(ep.graph_signature, expected.graph_signature)
+                self.assertEqual(ep.state_dict.keys(), expected.state_dict.keys())
+                self.assertEqual(ep.constants.keys(), expected.constants.keys())
+                for name, tensor in ep.constants.items():
+                    self.assertTrue(torch.equal(tensor, expected.constants[name]))
+                    self.assertEqual(tensor.stride(), expected.constants[name].stride())
+                    filename = tensor.untyped_storage().filename
+                    self.assertEqual(filename is not None, spill_threshold_bytes == 0)
+                for node, expected_node in zip(
+                    ep.graph.nodes, expected.graph.nodes, strict=True
+                ):
+                    if node.op == "placeholder":
+                        self.assertEqual(
+                            node.meta["val"].stride(),
+                            expected_node.meta["val"].stride(),
+                        )
+                # The files are removed once mapped.
+                self.assertEqual(os.listdir(spill_dir), [])
+
+        # Only the constants that the program keeps have a tensor left.
+        ep = export_m()
+        const_node_to_tensor = get_propagated_const_tensor_dict(
+            ep, None, streaming=True
+        )
+        kept = {
+            node.name
+            for node, tensor in const_node_to_tensor.items()
+            if tensor is not None
+        }
+        self.assertEqual(kept, {"add", "mul_1", "mul_2"})
+        with self.assertRaisesRegex(ValueError, "requires streaming"):
+            constant_prop_pass(export_m(), spill_threshold_bytes=0)
+
     def test_constant_prop_pass_graph_signature(self) -> None:
         def count_additions(gm: torch.fx.GraphModule) -> int:
             return sum(
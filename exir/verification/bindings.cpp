@@ -27,11 +27,12 @@ class DataBuffer {
   void* buffer_ = nullptr;
 
  public:
-  DataBuffer(pybind11::bytes data, int64_t len) {
+  DataBuffer(pybind11::buffer data, int64_t len) {
     // allocate buffer
     buffer_ = malloc(len);
-    // convert data to std::string and copy to buffer
-    std::memcpy(buffer_, (std::string{data}).data(), len);
+    // copy straight from the bytes-like object, e.g. a memoryview of the
+    // constant's storage, without an intermediate std::string
+    std::memcpy(buffer_, data.request().ptr, len);
   }
   ~DataBuffer() {
     if (buffer_) {
@@ -49,7 +50,7 @@ class DataBuffer {
 
 PYBIND11_MODULE(bindings, m) {
   pybind11::class_<DataBuffer>(m, "DataBuffer")
-      .def(pybind11::init<pybind11::bytes, int64_t>());
+      .def(pybind11::init<pybind11::buffer, int64_t>());
   m.def(
       "convert_to_tensor",
       [&](DataBuffer& data_buffer,
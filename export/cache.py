@@ -0,0 +1,296 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+Persistent, content-addressed cache of export pipeline artifacts.
+
+An ExportSession with a cache directory looks up the output of each cacheable
+stage under a key made of the ExecuTorch and PyTorch versions, an optional
+user-provided salt, the models, the example inputs, the dynamic shapes and
+constant methods, and the configuration of every stage up to and including
+this one. When the longest cached prefix of the pipeline is found, the stages
+in it are skipped.
+
+Models are keyed by their parameters and buffers (including non-persistent
+ones), the public attributes of their modules, the code of graph modules and
+the source code of the classes of their modules, including base classes
+outside of torch. The
+key doesn't cover anything else the output may depend on, e.g.:
+
+- functions and classes of other modules called by the model code,
+- global variables read by the model code,
+- code without available source, such as custom operators implemented in
+  C++, and libraries other than torch and ExecuTorch,
+- local changes to torch or ExecuTorch that don't change their versions.
+
+Pass a salt that changes with them, e.g. a version of the model code, or
+clear the cache when they change.
+"""
+
+import dataclasses
+import enum
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import shutil
+import tempfile
+import types
+from typing import Any, Callable, Dict, Optional, Set
+
+import torch
+from torch import nn
+
+# Bump when the fingerprints or the on-disk layout change, to invalidate
+# entries written by older versions.
+_CACHE_FORMAT_VERSION: int = 3
+
+# Types hashed by their repr.
+_SCALAR_TYPES = (
+    bool,
+    int,
+    float,
+    complex,
+    str,
+    bytes,
+    enum.Enum,
+    torch.dtype,
+    torch.device,
+)
+
+
+def _executorch_version() -> str:
+    try:
+        from executorch import version  # type: ignore[attr-defined]
+    except ImportError:
+        return "unknown"
+    return f"{version.__version__}+{version.git_version}"
+
+
+def _update_tensor(sha: "hashlib._Hash", tensor: torch.Tensor) -> None:
+    tensor = tensor.detach().cpu().contiguous()
+    sha.update(repr((str(tensor.dtype), tuple(tensor.shape))).encode())
+    sha.update(tensor.flatten().view(torch.uint8).numpy())
+
+
+def _update_source(sha: "hashlib._Hash", obj: Any) -> None:
+    """Adds the source code of a class or function, or its name if unavailable."""
+    sha.update(f"{getattr(obj, '__module__', '')}.{obj.__qualname__}".encode())
+    try:
+        sha.update(inspect.getsource(obj).encode())
+    except (OSError, TypeError):
+        pass
+
+
+def _is_library_class(cls: type) -> bool:
+    """Whether `cls` is covered by the versions in the key, e.g. nn.Module."""
+    return cls.__module__.partition(".")[0] in ("builtins", "torch")
+
+
+def _update_class_source(sha: "hashlib._Hash", cls: type) -> None:
+    """
+    Adds the source code of `cls` and of its base classes, so that editing a
+    method inherited by `cls` changes the hash. Classes of torch are only
+    covered by its version.
+    """
+    for base in cls.__mro__:
+        if not _is_library_class(base):
+            _update_source(sha, base)
+
+
+class _Fingerprint:
+    """
+    Hashes arbitrary export inputs and configurations.
+
+    Tensors are hashed by value, modules by their code and state, functions by
+    their code and closure, and other objects by their type and attributes, so
+    that equal configurations built in different processes hash the same.
+    """
+
+    def __init__(self) -> None:
+        self._sha = hashlib.sha256()
+        # Objects being hashed, from the outermost one.
+        self._path: Set[int] = set()
+
+    def hexdigest(self) -> str:
+        return self._sha.hexdigest()
+
+    def update(self, obj: Any) -> None:
+        if obj is None or isinstance(obj, _SCALAR_TYPES):
+            self._sha.update(repr(obj).encode())
+            return
+
+        # Guard against reference cycles, e.g. between modules and their parents.
+        if id(obj) in self._path:
+            self._sha.update(b"<cycle>")
+            return
+        self._path.add(id(obj))
+        try:
+            self._update(obj)
+        finally:
+            self._path.discard(id(obj))
+
+    def _update(self, obj: Any) -> None:  # noqa: C901
+        sha = self._sha
+        sha.update(type(obj).__qualname__.encode())
+        if isinstance(obj, torch.Tensor):
+            _update_tensor(sha, obj)
+        elif isinstance(obj, nn.Module):
+            for module_cls in sorted(
+                {type(m) for m in obj.modules()},
+                key=lambda c: (c.__module__, c.__qualname__),
+            ):
+                _update_class_source(sha, module_cls)
+            self._update_state(obj)
+            for name, module in obj.named_modules():
+                self.update(name)
+                if isinstance(module, torch.fx.GraphModule):
+                    # The code covers the graph. The other attributes of graph
+                    # modules are bookkeeping, e.g. meta.
+                    sha.update(module.code.encode())
+                    continue
+                # Hyperparameters, e.g. the stride of a convolution
+                self.update(
+                    {
+                        attr: value
+                        for attr, value in vars(module).items()
+                        if not attr.startswith("_") and attr != "training"
+                    }
+                )
+        elif isinstance(obj, (list, tuple)):
+            sha.update(str(len(obj)).encode())
+            for item in obj:
+                self.update(item)
+        elif isinstance(obj, (set, frozenset)):
+            for item in sorted(obj, key=repr):
+                self.update(item)
+        elif isinstance(obj, dict):
+            for key in sorted(obj, key=repr):
+                self.update(key)
+                self.update(obj[key])
+        elif isinstance(obj, functools.partial):
+            self.update(obj.func)
+            self.update(obj.args)
+            self.update(obj.keywords)
+        elif isinstance(obj, types.MethodType):
+            self.update(obj.__self__)
+            self.update(obj.__func__)
+        elif isinstance(obj, types.FunctionType):
+            _update_source(sha, obj)
+            self.update(obj.__defaults__)
+            if obj.__closure__:
+                for cell in obj.__closure__:
+                    try:
+                        self.update(cell.cell_contents)
+                    except ValueError:
+                        # Empty cell
+                        pass
+        elif isinstance(obj, type) or (callable(obj) and not hasattr(obj, "__dict__")):
+            # Classes and builtins
+            module = getattr(obj, "__module__", "")
+            sha.update(f"{module}.{getattr(obj, '__qualname__', repr(obj))}".encode())
+        elif dataclasses.is_dataclass(obj):
+            for f in dataclasses.fields(obj):
+                self.update(f.name)
+                self.update(getattr(obj, f.name))
+        elif hasattr(obj, "__dict__"):
+            self.update(vars(obj))
+        else:
+            sha.update(repr(obj).encode())
+
+    def _update_state(self, module: nn.Module) -> None:
+        # Unlike state_dict(), this covers non-persistent buffers, e.g. RoPE
+        # frequencies computed in __init__.
+        for kind, named_tensors in (
+            ("parameter", module.named_parameters(remove_duplicate=False)),
+            ("buffer", module.named_buffers(remove_duplicate=False)),
+        ):
+            for name, tensor in named_tensors:
+                self._sha.update(f"{kind}:{name}".encode())
+                self.update(tensor)
+
+
+class ExportArtifactCache:
+    """
+    Content-addressed on-disk cache of the data of pipeline artifacts
+
+    Each entry is a directory named after its key, written by the stage that
+    produced the data (see Stage.save_artifact_data) and read back by the same
+    stage type. Entries are written to a temporary directory and renamed, so
+    that concurrent exports never observe a partially written entry.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def base_key(
+        context: Dict[str, Any], models: Any, salt: Optional[str] = None
+    ) -> str:
+        """
+        Returns the key of the pipeline inputs: the versions, `salt`, the
+        models, and the example inputs, dynamic shapes and constant methods in
+        `context`.
+        """
+        fingerprint = _Fingerprint()
+        fingerprint.update(
+            (_CACHE_FORMAT_VERSION, _executorch_version(), torch.__version__, salt)
+        )
+        fingerprint.update(models)
+        for name in ("example_inputs", "dynamic_shapes", "constant_methods"):
+            fingerprint.update(name)
+            fingerprint.update(context.get(name))
+        return fingerprint.hexdigest()
+
+    @staticmethod
+    def stage_key(previous_key: str, stage: Any) -> str:
+        """
+        Returns the key of the output of `stage`, given the key of its input.
+        """
+        fingerprint = _Fingerprint()
+        fingerprint.update(previous_key)
+        fingerprint.update(type(stage))
+        fingerprint.update(
+            {
+                name: value
+                for name, value in vars(stage).items()
+                if name not in stage.cache_ignored_attributes
+            }
+        )
+        return fingerprint.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get(self, key: str, load: Callable[[str], Any]) -> Optional[Any]:
+        """Returns the data of the entry `key` read with `load`, if cached."""
+        path = self._path(key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            return load(path)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable export cache entry {path}: {e}")
+            return None
+
+    def put(self, key: str, save: Callable[[str], None]) -> None:
+        """Adds the entry `key`, written by `save` to an empty directory."""
+        path = self._path(key)
+        if os.path.isdir(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            save(tmp_path)
+            os.rename(tmp_path, path)
+        except OSError:
+            # Another export added the same entry first.
+            if not os.path.isdir(path):
+                raise
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
@@ -20,6 +20,7 @@ from torch import nn
 from torch.export import ExportedProgram
 from torch.fx import GraphModule
 
+from .cache import ExportArtifactCache
 from .recipe import ExportRecipe, LoweringRecipe, QuantizationRecipe
 from .stages import (
     EdgeProgramManagerTransformStage,
@@ -61,6 +62,8 @@ def export(
     constant_methods: Optional[Union[Dict[str, Callable]]] = None,
     artifact_dir: Optional[str] = None,
     generate_etrecord: bool = False,
+    cache_dir: Optional[str] = None,
+    cache_salt: Optional[str] = None,
 ) -> "ExportSession":
     """
     Create and configure an ExportSession with the given parameters.
@@ -85,6 +88,10 @@ def export(
         constant_methods: Optional dictionary of constant methods
         artifact_dir: Optional directory to store artifacts
         generate_etrecord: Optional flag to generate an etrecord
+        cache_dir: Optional directory of a persistent cache of stage artifacts,
+                   to skip the stages whose inputs and configuration are unchanged
+        cache_salt: Optional string added to the cache keys, e.g. a version of
+                    code the models depend on that the keys don't cover
 
     Returns:
         A configured ExportSession instance with the export process completed if requested
@@ -98,6 +105,8 @@ def export(
         constant_methods=constant_methods,
         artifact_dir=artifact_dir,
         generate_etrecord=generate_etrecord,
+        cache_dir=cache_dir,
+        cache_salt=cache_salt,
     )
     session.export()
 
@@ -141,6 +150,8 @@ class ExportSession:
         constant_methods: Optional[Union[Dict[str, Callable]]] = None,
         artifact_dir: Optional[str] = None,
         generate_etrecord: Optional[bool] = False,
+        cache_dir: Optional[str] = None,
+        cache_salt: Optional[str] = None,
     ) -> None:
         """
         Initialize the ExportSession with model, inputs, and recipe.
@@ -162,6 +173,15 @@ class ExportSession:
             constant_methods: Optional dictionary of constant methods
             artifact_dir: Optional directory to store artifacts
             generate_etrecord: Optional flag to generate an etrecord
+            cache_dir: Optional directory of a persistent cache of stage artifacts.
+                       The artifacts of cacheable stages (e.g. TORCH_EXPORT) are
+                       keyed by the ExecuTorch and PyTorch versions, the models,
+                       the example inputs and the configuration of the stages up
+                       to them, and the longest cached prefix of the pipeline is
+                       skipped. See export/cache.py for what the keys don't cover.
+            cache_salt: Optional string added to the cache keys, e.g. a version
+                        of code the models depend on that the keys don't cover,
+                        like helper functions or custom operators.
         """
         # Load model from file if string path provided
         if isinstance(model, str):
@@ -234,6 +254,11 @@ class ExportSession:
 
         self._stage_to_artifacts: Dict[StageType, PipelineArtifact] = {}
 
+        self._cache: Optional[ExportArtifactCache] = (
+            ExportArtifactCache(cache_dir) if cache_dir is not None else None
+        )
+        self._cache_salt = cache_salt
+
     def _detect_model_type(
         self, model: Union[nn.Module, GraphModule, ExportedProgram, Dict]
     ) -> str:
@@ -439,8 +464,16 @@ class ExportSession:
 
         current_artifact = PipelineArtifact(data=self._model, context=self._run_context)
 
+        cache_keys = self._get_cache_keys()
+        first_stage_index = 0
+        if cache_keys is not None:
+            first_stage_index, current_artifact = self._load_cached_prefix(
+                cache_keys, current_artifact
+            )
+
         # Execute stages from registry in the order specified by pipeline_stages
-        for stage_type in self._pipeline_stages:
+        for stage_index in range(first_stage_index, len(self._pipeline_stages)):
+            stage_type = self._pipeline_stages[stage_index]
             stage = self._stage_registry.get(stage_type)
             if stage is None:
                 raise ValueError(f"Stage {stage_type} not found in registry")
@@ -457,6 +490,81 @@ class ExportSession:
 
             self._stage_to_artifacts[stage_type] = current_artifact
 
+            if cache_keys is not None and stage.cacheable:
+                self._save_to_cache(
+                    cache_keys[stage_index], stage, current_artifact.data
+                )
+
+    def _get_cache_keys(self) -> Optional[List[str]]:
+        """
+        Returns the export artifact cache key of the output of each stage, or
+        None if there is no cache or no cacheable stage in the pipeline.
+        """
+        if self._cache is None:
+            return None
+        stages = [self._stage_registry[s] for s in self._pipeline_stages]
+        # Only the stages up to the last cacheable one need a key.
+        num_keys = max(
+            (i + 1 for i, stage in enumerate(stages) if stage.cacheable), default=0
+        )
+        if num_keys == 0:
+            return None
+
+        try:
+            keys = []
+            key = ExportArtifactCache.base_key(
+                self._run_context, self._model, self._cache_salt
+            )
+            for stage in stages[:num_keys]:
+                key = ExportArtifactCache.stage_key(key, stage)
+                keys.append(key)
+        except Exception as e:
+            logging.warning(f"Not using the export artifact cache: {e}")
+            return None
+        return keys
+
+    def _load_cached_prefix(
+        self, cache_keys: List[str], artifact: PipelineArtifact
+    ) -> Tuple[int, PipelineArtifact]:
+        """
+        Loads the output of the last cached stage of the pipeline, and returns
+        the index of the first stage to run and its input artifact.
+
+        The artifacts of the stages before the cached one are not available.
+        """
+        cache = self._cache
+        assert cache is not None
+        for stage_index in reversed(range(len(self._pipeline_stages))):
+            stage_type = self._pipeline_stages[stage_index]
+            stage = self._stage_registry[stage_type]
+            if not stage.cacheable:
+                continue
+
+            start = time.perf_counter()
+            data = cache.get(cache_keys[stage_index], stage.load_artifact_data)
+            if data is None:
+                continue
+            elapsed = (time.perf_counter() - start) * 1000
+
+            logging.info(f"Loaded the artifact of stage {stage_type} from the cache")
+            artifact = artifact.copy_with_new_data(data)
+            artifact.add_context("duration_ms", int(elapsed))
+            artifact.add_context("cache_hit", True)
+            self._stage_to_artifacts[stage_type] = artifact
+            return stage_index + 1, artifact
+        return 0, artifact
+
+    def _save_to_cache(self, key: str, stage: Stage, data: Any) -> None:
+        cache = self._cache
+        assert cache is not None
+        try:
+            cache.put(key, lambda path: stage.save_artifact_data(data, path))
+        except Exception as e:
+            # The cache only saves time, never fail the export because of it.
+            logging.warning(
+                f"Failed to add the artifact of stage {stage.stage_type} to the cache: {e}"
+            )
+
     def export(self) -> None:
         """
         Execute the full export process.
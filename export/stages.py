@@ -6,7 +6,9 @@
 # LICENSE file in the root directory of this source tree.
 
 import copy
+import json
 import logging
+import os
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from typing import Any, Callable, Dict, List, Optional
@@ -101,6 +103,35 @@ class Stage(ABC):
             raise RuntimeError(f"Stage: {self.__class__.__name__} not executed")
         return self._artifact
 
+    # Attributes that don't affect the output of the stage, left out of the
+    # keys of the export artifact cache.
+    cache_ignored_attributes: frozenset = frozenset({"_artifact"})
+
+    @property
+    def cacheable(self) -> bool:
+        """
+        Returns whether the data of this stage's artifact can be saved to and
+        loaded from the export artifact cache.
+        """
+        return False
+
+    def save_artifact_data(self, data: Any, path: str) -> None:
+        """
+        Saves the data of this stage's artifact to the existing, empty
+        directory `path`.
+        """
+        raise NotImplementedError(
+            f"Stage: {self.__class__.__name__} does not support caching"
+        )
+
+    def load_artifact_data(self, path: str) -> Any:
+        """
+        Loads the data of an artifact saved by save_artifact_data.
+        """
+        raise NotImplementedError(
+            f"Stage: {self.__class__.__name__} does not support caching"
+        )
+
 
 class TorchExportStage(Stage):
     """
@@ -166,6 +197,26 @@ class TorchExportStage(Stage):
 
         self._artifact = artifact.copy_with_new_data(exported_programs)
 
+    @property
+    def cacheable(self) -> bool:
+        return True
+
+    def save_artifact_data(self, data: Any, path: str) -> None:
+        # Method names are not necessarily valid file names.
+        methods = list(data.keys())
+        for i, method_name in enumerate(methods):
+            torch.export.save(data[method_name], os.path.join(path, f"{i}.pt2"))
+        with open(os.path.join(path, "methods.json"), "w") as f:
+            json.dump(methods, f)
+
+    def load_artifact_data(self, path: str) -> Any:
+        with open(os.path.join(path, "methods.json")) as f:
+            methods = json.load(f)
+        return {
+            method_name: torch.export.load(os.path.join(path, f"{i}.pt2"))
+            for i, method_name in enumerate(methods)
+        }
+
 
 class EdgeTransformAndLowerStage(Stage):
     """
@@ -310,6 +361,10 @@ class SourceTransformStage(Stage):
     Optional stage: Source transform stage: Apply source transformations to the model.
     """
 
+    cache_ignored_attributes: frozenset = frozenset(
+        {"_artifact", "_transformed_models"}
+    )
+
     def __init__(self, quantization_recipe: Optional[QuantizationRecipe]) -> None:
         self._quantization_recipe = quantization_recipe
         self._transformed_models: Dict[str, nn.Module] = {}
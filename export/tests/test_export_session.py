@@ -6,12 +6,19 @@
 
 # pyre-strict
 
+import copy
+import importlib
+import os
+import sys
+import tempfile
+import textwrap
 import unittest
-from typing import List
-from unittest.mock import Mock
+from typing import List, Optional
+from unittest.mock import Mock, patch
 
 import torch
 from executorch.export import ExportRecipe, ExportSession
+from executorch.export.cache import ExportArtifactCache
 from executorch.export.recipe import (
     AOQuantizationConfig,
     LoweringRecipe,
@@ -971,3 +978,174 @@ class TestIntermediateStateGetters(unittest.TestCase):
         with self.assertRaises(RuntimeError) as cm:
             session.get_edge_program_manager()
         self.assertIn("Edge program manager is not available", str(cm.exception))
+
+
+class TestExportArtifactCache(unittest.TestCase):
+    """Test the persistent cache of stage artifacts."""
+
+    def setUp(self) -> None:
+        torch.manual_seed(0)
+        self.model = SimpleTestModel()
+        self.example_inputs = [(torch.randn(2, 10),)]
+        self.recipe = ExportRecipe(
+            name="test",
+            pipeline_stages=[
+                StageType.TORCH_EXPORT,
+                StageType.TO_EDGE_TRANSFORM_AND_LOWER,
+                StageType.TO_EXECUTORCH,
+            ],
+        )
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+
+    def _export(
+        self, model: torch.nn.Module, cache_salt: Optional[str] = None
+    ) -> ExportSession:
+        session = ExportSession(
+            model=model,
+            example_inputs=self.example_inputs,
+            export_recipe=self.recipe,
+            cache_dir=self.cache_dir.name,
+            cache_salt=cache_salt,
+        )
+        session.export()
+        return session
+
+    @staticmethod
+    def _cache_hit(session: ExportSession) -> bool:
+        torch_export = session.get_stage_artifacts()[StageType.TORCH_EXPORT]
+        return bool(torch_export.get_context("cache_hit"))
+
+    def test_cached_torch_export_is_skipped(self) -> None:
+        first = self._export(self.model)
+        torch_export = first.get_stage_artifacts()[StageType.TORCH_EXPORT]
+        self.assertIsNone(torch_export.get_context("cache_hit"))
+
+        with patch("torch.export.export", wraps=torch.export.export) as export:
+            second = self._export(copy.deepcopy(self.model))
+            export.assert_not_called()
+
+        torch_export = second.get_stage_artifacts()[StageType.TORCH_EXPORT]
+        self.assertTrue(torch_export.get_context("cache_hit"))
+        self.assertIsInstance(
+            second.get_exported_program(), torch.export.ExportedProgram
+        )
+        self.assertGreater(len(second.get_pte_buffer()), 0)
+
+    def test_changed_weights_are_not_cached(self) -> None:
+        self._export(self.model)
+
+        model = copy.deepcopy(self.model)
+        with torch.no_grad():
+            model.linear.weight.add_(1.0)
+        session = self._export(model)
+
+        torch_export = session.get_stage_artifacts()[StageType.TORCH_EXPORT]
+        self.assertIsNone(torch_export.get_context("cache_hit"))
+
+    def test_edited_base_class_is_not_cached(self) -> None:
+        module_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(module_dir.cleanup)
+        path = os.path.join(module_dir.name, "export_cache_test_model.py")
+        source = textwrap.dedent(
+            """
+            import torch
+
+            class Base(torch.nn.Module):
+                def __init__(self) -> None:
+                    super().__init__()
+                    self.linear = torch.nn.Linear(10, 5)
+
+                def project(self, x):
+                    return self.linear(x)
+
+            class Model(Base):
+                def forward(self, x):
+                    return self.project(x)
+            """
+        )
+        with open(path, "w") as f:
+            f.write(source)
+        sys.path.insert(0, module_dir.name)
+        self.addCleanup(sys.path.remove, module_dir.name)
+        self.addCleanup(sys.modules.pop, "export_cache_test_model", None)
+        module = importlib.import_module("export_cache_test_model")
+
+        def new_model() -> torch.nn.Module:
+            torch.manual_seed(0)
+            return module.Model()
+
+        self._export(new_model())
+        self.assertTrue(self._cache_hit(self._export(new_model())))
+
+        # Only the method of the base class changes.
+        with open(path, "w") as f:
+            f.write(source.replace("self.linear(x)", "self.linear(x) * 2"))
+        module = importlib.reload(module)
+        self.assertFalse(self._cache_hit(self._export(new_model())))
+
+    def test_non_persistent_buffer_is_keyed(self) -> None:
+        class Rope(torch.nn.Module):
+            def __init__(self, theta: float) -> None:
+                super().__init__()
+                freqs = 1.0 / theta ** (torch.arange(0, 8, 2).float() / 8)
+                self.register_buffer("freqs", freqs, persistent=False)
+
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                return x * self.freqs
+
+        context = {"example_inputs": {"forward": [(torch.randn(4),)]}}
+        self.assertEqual(
+            ExportArtifactCache.base_key(context, {"forward": Rope(10000.0)}),
+            ExportArtifactCache.base_key(context, {"forward": Rope(10000.0)}),
+        )
+        self.assertNotEqual(
+            ExportArtifactCache.base_key(context, {"forward": Rope(10000.0)}),
+            ExportArtifactCache.base_key(context, {"forward": Rope(500000.0)}),
+        )
+
+    def test_graph_module_submodules_are_keyed(self) -> None:
+        class Conv(torch.nn.Module):
+            def __init__(self, padding: int) -> None:
+                super().__init__()
+                torch.manual_seed(0)
+                self.conv = torch.nn.Conv2d(3, 3, 3, padding=padding)
+
+            def forward(self, x: torch.Tensor) -> torch.Tensor:
+                return self.conv(x)
+
+        context = {"example_inputs": {"forward": [(torch.randn(1, 3, 8, 8),)]}}
+
+        def key(padding: int) -> str:
+            traced = torch.fx.symbolic_trace(Conv(padding))
+            return ExportArtifactCache.base_key(context, {"forward": traced})
+
+        self.assertEqual(key(0), key(0))
+        self.assertNotEqual(key(0), key(1))
+
+    def test_cache_salt(self) -> None:
+        self._export(self.model, cache_salt="v1")
+        self.assertTrue(self._cache_hit(self._export(self.model, cache_salt="v1")))
+        self.assertFalse(self._cache_hit(self._export(self.model, cache_salt="v2")))
+        self.assertFalse(self._cache_hit(self._export(self.model)))
+
+    def test_base_key(self) -> None:
+        context = {"example_inputs": {"forward": self.example_inputs}}
+        key = ExportArtifactCache.base_key(context, {"forward": self.model})
+
+        self.assertEqual(
+            key,
+            ExportArtifactCache.base_key(
+                copy.deepcopy(context), {"forward": copy.deepcopy(self.model)}
+            ),
+        )
+        self.assertNotEqual(
+            key,
+            ExportArtifactCache.base_key(
+                {"example_inputs": {"forward": [(torch.randn(2, 10),)]}},
+                {"forward": self.model},
+            ),
+        )
+        self.assertNotEqual(
+            key, ExportArtifactCache.base_key(context, {"forward": SimpleTestModel()})
+        )
@@ -18,10 +18,11 @@ from typing import ClassVar, Dict, List, Literal, Optional
 import executorch.extension.flat_tensor.serialize as serialize_package
 
 from executorch.exir._serialize._cord import Cord
-from executorch.exir._serialize._dataclass import _DataclassEncoder, _json_to_dataclass
-from executorch.exir._serialize._flatbuffer import _flatc_compile, _flatc_decompile
+from executorch.exir._serialize._dataclass import _json_to_dataclass
+from executorch.exir._serialize._flatbuffer import _flatc_decompile
+from executorch.exir._serialize._flatbuffer_builder import _serialize_with_schema
 from executorch.exir._serialize._named_data_store import NamedDataStoreOutput
-from executorch.exir._serialize._program import _insert_flatbuffer_header
+from executorch.exir._serialize._program import _insert_flatbuffer_header_cord
 from executorch.exir._serialize.data_serializer import (
     DataEntry,
     DataPayload,
@@ -48,26 +49,11 @@ _FLAT_TENSOR_VERSION: int = 0
 
 def _serialize_to_flatbuffer(flat_tensor: FlatTensor) -> Cord:
     """Serializes a FlatTensor to a flatbuffer and returns the serialized data."""
-    flat_tensor_json = json.dumps(flat_tensor, cls=_DataclassEncoder)
-    with tempfile.TemporaryDirectory() as d:
-        schema_path = os.path.join(d, "flat_tensor.fbs")
-        with open(schema_path, "wb") as schema_file:
-            schema_file.write(
-                _resources.read_binary(serialize_package, "flat_tensor.fbs")
-            )
-        scalar_type_path = os.path.join(d, "scalar_type.fbs")
-        with open(scalar_type_path, "wb") as scalar_type_file:
-            scalar_type_file.write(
-                _resources.read_binary(serialize_package, "scalar_type.fbs")
-            )
-        json_path = os.path.join(d, "flat_tensor.json")
-        with open(json_path, "wb") as json_file:
-            json_file.write(flat_tensor_json.encode("ascii"))
-
-        _flatc_compile(d, schema_path, json_path)
-        output_path = os.path.join(d, "flat_tensor.ptd")
-        with open(output_path, "rb") as output_file:
-            return Cord(output_file.read())
+    return Cord(
+        _serialize_with_schema(
+            flat_tensor, serialize_package, ["flat_tensor.fbs", "scalar_type.fbs"]
+        )
+    )
 
 
 def _deserialize_to_flat_tensor(flatbuffer: bytes) -> FlatTensor:
@@ -357,15 +343,15 @@ class FlatTensorSerializer(DataSerializer):
 
         # Pad header and payload to segment alignment.
         header_data = pad_to(header_data, padded_header_length)
-        injected_flatbuffer_data: bytes = _insert_flatbuffer_header(
-            flatbuffer_data=flatbuffer_payload.__bytes__(),
+        payload: Cord = _insert_flatbuffer_header_cord(
+            flatbuffer_data=bytes(flatbuffer_payload),
             magic_regex=r"FT[0-9a-zA-Z][0-9a-zA-Z]",
             header_data=header_data,
         )
-        injected_flatbuffer_data = pad_to(injected_flatbuffer_data, segment_base_offset)
+        payload.append(b"\x00" * (segment_base_offset - len(payload)))
 
-        eh = _get_extended_header(injected_flatbuffer_data)
-        assert eh is not None
+        eh = FlatTensorHeader.from_bytes(header_data)
+        assert eh.is_valid()
         assert eh.flatbuffer_size == len(flatbuffer_payload)
         assert eh.segment_base_offset == segment_base_offset
         assert eh.flatbuffer_offset == padded_header_length
@@ -375,8 +361,6 @@ class FlatTensorSerializer(DataSerializer):
         del flatbuffer_payload
 
         # Place everything into one segment.
-        payload = Cord()
-        payload.append(injected_flatbuffer_data)
         payload.append(aggregated_segment_data)
 
         return payload
@@ -0,0 +1,166 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""Benchmarks prefill calibration against per-token calibration.
+
+Exports a small randomly initialized Llama with a KV cache and a dynamic
+sequence length, prepares it twice for static XNNPACK quantization, and
+calibrates one copy by feeding random samples one token at a time, like the
+decode calibration mode does for its prompt, and the other by prefilling each
+sample with calibrate_prefill(). The script reports both times, the largest
+difference between the min/max values of the observers of the two copies,
+relative to the observed range, and how many observers differ by more than
+rounding. The lm_eval pass that the decode mode runs
+after its prompt isn't included.
+
+The model returns the logits of all the tokens, as without them prefill only
+runs the final norm and output layer on the last token of each call, whose
+observers then see a narrower range. `--last-token-logits` shows the
+difference.
+
+    python -m executorch.extension.llm.export.benchmark_calibration --dim 256 --samples 8
+"""
+
+import argparse
+import copy
+import functools
+import gc
+import sys
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import torch
+from executorch.backends.xnnpack.quantizer.xnnpack_quantizer import (
+    get_symmetric_quantization_config,
+    XNNPACKQuantizer,
+)
+from executorch.examples.models.llama.llama_transformer import construct_transformer
+from executorch.examples.models.llama.model_args import ModelArgs
+from executorch.extension.llm.export.calibration import calibrate_prefill
+from torchao.quantization.pt2e.observer import ObserverBase
+from torchao.quantization.pt2e.quantize_pt2e import prepare_pt2e
+
+
+def _observer_ranges(module: torch.nn.Module) -> Dict[str, Tuple[float, float]]:
+    return {
+        name: (observer.min_val.min().item(), observer.max_val.max().item())
+        for name, observer in module.named_modules()
+        if isinstance(observer, ObserverBase) and hasattr(observer, "min_val")
+    }
+
+
+def _relative_differences(
+    reference: Dict[str, Tuple[float, float]], ranges: Dict[str, Tuple[float, float]]
+) -> List[float]:
+    differences = []
+    for name, (ref_min, ref_max) in reference.items():
+        scale = max(ref_max - ref_min, 1e-12)
+        min_val, max_val = ranges[name]
+        differences.append(
+            max(abs(min_val - ref_min) / scale, abs(max_val - ref_max) / scale)
+        )
+    return differences
+
+
+def _time(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    # Like timeit, exclude garbage collections, which are dominated by the size
+    # of the heap rather than by the calibration.
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn()
+        return time.perf_counter() - start, result
+    finally:
+        gc.enable()
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--layers", type=int, default=4)
+    parser.add_argument("--vocab-size", type=int, default=1024)
+    parser.add_argument("--max-seq-len", type=int, default=256)
+    parser.add_argument("--samples", type=int, default=8)
+    parser.add_argument(
+        "--seq-length",
+        type=int,
+        default=128,
+        help="Number of tokens per calibration sample.",
+    )
+    parser.add_argument(
+        "--last-token-logits",
+        action="store_true",
+        help="Export the model to only return the logits of the last token.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    torch.manual_seed(args.seed)
+    model_args = ModelArgs(
+        dim=args.dim,
+        n_layers=args.layers,
+        n_heads=max(args.dim // 64, 1),
+        vocab_size=args.vocab_size,
+        max_seq_len=args.max_seq_len,
+        max_context_len=args.max_seq_len,
+        use_kv_cache=True,
+        enable_dynamic_shape=True,
+        generate_full_logits=not args.last_token_logits,
+    )
+    model = construct_transformer(model_args).eval()
+    example_inputs = (torch.tensor([[2, 3, 4]]), {"input_pos": torch.tensor([0])})
+    dynamic_shapes = (
+        {1: torch.export.Dim("token_dim", max=args.max_seq_len - 1)},
+        {"input_pos": {0: 1}},
+    )
+    with torch.no_grad():
+        graph_module = (
+            torch.export.export(
+                model, example_inputs, dynamic_shapes=dynamic_shapes, strict=True
+            )
+            .run_decompositions({})
+            .module()
+        )
+    quantizer = XNNPACKQuantizer().set_global(
+        get_symmetric_quantization_config(is_dynamic=False)
+    )
+    per_token = prepare_pt2e(copy.deepcopy(graph_module), quantizer)
+    prefill = prepare_pt2e(copy.deepcopy(graph_module), quantizer)
+    samples = [
+        torch.randint(0, args.vocab_size, (args.seq_length,))
+        for _ in range(args.samples)
+    ]
+
+    calibrate = functools.partial(
+        calibrate_prefill,
+        samples=samples,
+        seq_length=args.seq_length,
+        use_kv_cache=True,
+    )
+    per_token_s, num_tokens = _time(
+        functools.partial(calibrate, per_token, chunk_size=1)
+    )
+    prefill_s, _ = _time(
+        functools.partial(calibrate, prefill, chunk_size=args.max_seq_len - 1)
+    )
+    reference = _observer_ranges(per_token)
+    differences = _relative_differences(reference, _observer_ranges(prefill))
+    # Tolerate the rounding differences of batched matmuls.
+    num_different = sum(difference > 1e-4 for difference in differences)
+
+    print(
+        f"{'tokens':>7} {'observers':>10} {'per-token s':>12} {'prefill s':>10} "
+        f"{'speedup':>8} {'max rel diff':>13} {'differing':>10}"
+    )
+    print(
+        f"{num_tokens:>7} {len(reference):>10} {per_token_s:>12.3f} {prefill_s:>10.3f} "
+        f"{per_token_s / prefill_s:>7.1f}x {max(differences):>13.2e} {num_different:>10}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv[1:]))
@@ -32,6 +32,11 @@ from executorch.exir.passes import MemoryPlanningPass
 from executorch.exir.passes.sym_shape_eval_pass import ConstraintBasedSymShapeEvalPass
 
 from executorch.extension.export_util.utils import export_to_edge, save_pte_program
+from executorch.extension.llm.export.calibration import (
+    calibrate_decode,
+    calibrate_prefill,
+    encode_calibration_data,
+)
 
 from executorch.extension.llm.export.export_passes import RemoveRedundantTransposes
 from pytorch_tokenizers import get_tokenizer
@@ -91,6 +96,9 @@ class LLMEdgeManager:
         calibration_limit: Optional[int] = None,
         calibration_seq_length: Optional[int] = None,
         calibration_data: Optional[str] = None,
+        calibration_mode: str = "decode",
+        calibration_max_tokens: Optional[int] = None,
+        calibration_cache_dir: Optional[str] = None,
         tokenizer_path: Optional[str] = None,
         verbose: bool = False,
         metadata: Optional[dict] = None,
@@ -113,6 +121,13 @@ class LLMEdgeManager:
         self.calibration_limit = calibration_limit
         self.calibration_seq_length = calibration_seq_length
         self.calibration_data = calibration_data
+        if calibration_mode not in ("decode", "prefill"):
+            raise ValueError(
+                f"Unsupported calibration mode {calibration_mode}, expected decode or prefill"
+            )
+        self.calibration_mode = calibration_mode
+        self.calibration_max_tokens = calibration_max_tokens
+        self.calibration_cache_dir = calibration_cache_dir
         self.tokenizer_path = tokenizer_path
         self.verbose = verbose
         self.metadata = metadata if metadata is not None else {}
@@ -266,6 +281,16 @@ class LLMEdgeManager:
         tokenizer_path,
     ):
         logging.info("Run calibration...")
+        if self.calibration_mode == "prefill":
+            self.pt2e_calibrate_prefill(
+                prepared_module,
+                calibration_seq_length,
+                calibration_data,
+                tokenizer_path,
+            )
+            logging.info("Calibration finish...")
+            return
+
         try:
             from executorch.examples.models.llama.eval_llama_lib import (
                 GraphModuleEvalWrapper,
@@ -278,33 +303,12 @@ class LLMEdgeManager:
 
         tokenizer = get_tokenizer(tokenizer_path)
 
-        def calibrate_template(
-            module: torch.fx.GraphModule, tokenizer, prompts: str, max_len: int
-        ):
-            # TODO: change criteria & support batch inputs if necessary
-            pos = torch.tensor(0, dtype=torch.int64)
-            token_list = tokenizer.encode(prompts, bos=True, eos=False)
-
-            with torch.no_grad():
-                while token_list[-1] != tokenizer.eos_id and pos < max_len:
-                    logits = module(
-                        torch.full((1, 1), token_list[pos]),
-                        {"input_pos": torch.tensor((pos,))},
-                    )
-                    pos += 1
-                    if pos >= len(token_list):
-                        if self.generate_full_logits:
-                            token_list.append(
-                                torch.argmax(logits[:, -1], dim=-1).item()
-                            )
-                        else:
-                            token_list.append(torch.argmax(logits[:], dim=-1).item())
-
-        calibrate_template(
+        calibrate_decode(
             module=prepared_module,
             tokenizer=tokenizer,
             prompts=calibration_data,
             max_len=calibration_seq_length,
+            generate_full_logits=self.generate_full_logits,
         )
 
         eval_wrapper = GraphModuleEvalWrapper(
@@ -328,6 +332,49 @@ class LLMEdgeManager:
             print(f"{task}: {res}")
         logging.info("Calibration finish...")
 
+    def pt2e_calibrate_prefill(
+        self,
+        prepared_module,
+        calibration_seq_length,
+        calibration_data,
+        tokenizer_path,
+    ):
+        """
+        Calibrates by prefilling each calibration sample, up to
+        `calibration_max_tokens` tokens in total, instead of decoding one token at a
+        time and running lm_eval. Graphs exported with a static sequence length and
+        a KV cache are fed one token per call.
+
+        Unless the model generates full logits, its layers after the selection of
+        the last token only observe the last token of each call.
+        """
+        if self.enable_dynamic_shape:
+            # The exported token dimension is at most max_seq_len - 1.
+            chunk_size = self.max_seq_len - 1
+        elif self.use_kv_cache:
+            chunk_size = 1
+        else:
+            raise ValueError(
+                "Prefill calibration of a model without KV cache needs enable_dynamic_shape"
+            )
+        samples = encode_calibration_data(
+            get_tokenizer(tokenizer_path),
+            calibration_data,
+            tokenizer_path=tokenizer_path,
+            cache_dir=self.calibration_cache_dir,
+        )
+        num_tokens = calibrate_prefill(
+            prepared_module,
+            samples,
+            seq_length=calibration_seq_length,
+            use_kv_cache=self.use_kv_cache,
+            chunk_size=chunk_size,
+            max_tokens=self.calibration_max_tokens,
+        )
+        logging.info(
+            f"Calibrated on {num_tokens} tokens of {len(samples)} samples, in chunks of up to {chunk_size} tokens"
+        )
+
     def pt2e_quantize(self, quantizers: Optional[List[Quantizer]]) -> "LLMEdgeManager":
         """
         Quantize the model via pt2e flow and retrieve LLMEdgeManager including the quantized model.
@@ -342,6 +389,20 @@ class LLMEdgeManager:
         # 1. torch.nn.attention.sdpa_kernel([SDPBackend.MATH]) is for bypassing the dynamo error when tracing
         # 2. torch.no_grad() is for getting rid of the dropout (not sure why training ops will show up)
         if quantizers:
+            if self.calibration_mode == "prefill":
+                missing = [
+                    name
+                    for name, value in (
+                        ("calibration_seq_length", self.calibration_seq_length),
+                        ("calibration_data", self.calibration_data),
+                        ("tokenizer_path", self.tokenizer_path),
+                    )
+                    if value is None
+                ]
+                if missing:
+                    raise ValueError(
+                        f"Prefill calibration requires {', '.join(missing)} to be set"
+                    )
             with torch.nn.attention.sdpa_kernel([SDPBackend.MATH]), torch.no_grad():
                 if self.verbose:
                     logging.info(f"Applied quantizers: {quantizers}")
@@ -359,7 +420,19 @@ class LLMEdgeManager:
                     f"Calibrating with tasks: {self.calibration_tasks}, limit: {self.calibration_limit}, calibration_data: {self.calibration_data}, tokenizer_path: {self.tokenizer_path}, seq_length: {self.calibration_seq_length}"
                 )
                 # Calibrate
-                if (
+                if self.calibration_mode == "prefill":
+                    logging.info(
+                        f"Calibrating by prefill with calibration_data: {self.calibration_data}, max_tokens: {self.calibration_max_tokens}, tokenizer_path: {self.tokenizer_path}, seq_length: {self.calibration_seq_length}"
+                    )
+                    self.pt2e_calibrate(
+                        prepared_module=m,
+                        calibration_tasks=self.calibration_tasks,
+                        calibration_limit=self.calibration_limit,
+                        calibration_seq_length=self.calibration_seq_length,
+                        calibration_data=self.calibration_data,
+                        tokenizer_path=self.tokenizer_path,
+                    )
+                elif (
                     self.calibration_tasks is not None
                     and self.calibration_limit is not None
                     and self.calibration_seq_length is not None
@@ -0,0 +1,166 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# Calibration loops for models prepared by prepare_pt2e, see
+# LLMEdgeManager.pt2e_calibrate().
+
+# pyre-unsafe
+
+import functools
+import hashlib
+import logging
+import os
+from typing import List, Optional
+
+import torch
+
+# Bumped when the format of cached calibration data changes.
+_CACHE_VERSION = 1
+
+
+def _read_samples(calibration_data: str) -> List[str]:
+    """
+    Returns the calibration samples: the documents of `calibration_data`,
+    separated by blank lines, if it is the path of a text file, or else the
+    prompt itself.
+    """
+    if not os.path.isfile(calibration_data):
+        return [calibration_data]
+    with open(calibration_data, encoding="utf-8") as f:
+        text = f.read()
+    return [doc.strip() for doc in text.split("\n\n") if doc.strip()]
+
+
+def _cache_path(cache_dir: str, tokenizer_path: str, calibration_data: str) -> str:
+    key = hashlib.sha256()
+    key.update(str(_CACHE_VERSION).encode())
+    for path in (tokenizer_path, calibration_data):
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                for block in iter(functools.partial(f.read, 1 << 20), b""):
+                    key.update(block)
+        else:
+            key.update(path.encode())
+        key.update(b"\0")
+    return os.path.join(cache_dir, f"calibration_{key.hexdigest()[:32]}.pt")
+
+
+def encode_calibration_data(
+    tokenizer,
+    calibration_data: str,
+    tokenizer_path: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+) -> List[torch.Tensor]:
+    """
+    Tokenizes the calibration samples of `calibration_data`, see _read_samples().
+
+    Args:
+        tokenizer: Tokenizer with an encode(text, bos, eos) method.
+        calibration_data: A prompt, or the path of a text file of documents
+            separated by blank lines.
+        tokenizer_path: Path of the tokenizer, identifying it in the cache.
+        cache_dir: If set, the tokens are saved to this directory and loaded from
+            it by later calls with the same tokenizer and calibration data.
+
+    Returns:
+        A 1D int64 tensor of tokens per sample, starting with BOS.
+    """
+    path = None
+    if cache_dir is not None and tokenizer_path is not None:
+        path = _cache_path(cache_dir, tokenizer_path, calibration_data)
+        if os.path.isfile(path):
+            logging.info(f"Loading calibration tokens from {path}")
+            return torch.load(path, weights_only=True)
+    samples = [
+        torch.tensor(tokenizer.encode(sample, bos=True, eos=False), dtype=torch.int64)
+        for sample in _read_samples(calibration_data)
+    ]
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temporary file first so concurrent exports never read a
+        # partially written cache.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        torch.save(samples, tmp_path)
+        os.replace(tmp_path, path)
+        logging.info(f"Saved calibration tokens to {path}")
+    return samples
+
+
+def calibrate_decode(
+    module: torch.nn.Module,
+    tokenizer,
+    prompts: str,
+    max_len: int,
+    generate_full_logits: bool = False,
+) -> None:
+    """
+    Feeds `prompts` to `module` one token at a time, then generates tokens
+    greedily until EOS or `max_len` tokens.
+    """
+    # TODO: change criteria & support batch inputs if necessary
+    pos = torch.tensor(0, dtype=torch.int64)
+    token_list = tokenizer.encode(prompts, bos=True, eos=False)
+
+    with torch.no_grad():
+        while token_list[-1] != tokenizer.eos_id and pos < max_len:
+            logits = module(
+                torch.full((1, 1), token_list[pos]),
+                {"input_pos": torch.tensor((pos,))},
+            )
+            pos += 1
+            if pos >= len(token_list):
+                if generate_full_logits:
+                    token_list.append(torch.argmax(logits[:, -1], dim=-1).item())
+                else:
+                    token_list.append(torch.argmax(logits[:], dim=-1).item())
+
+
+def calibrate_prefill(
+    module: torch.nn.Module,
+    samples: List[torch.Tensor],
+    seq_length: int,
+    use_kv_cache: bool,
+    chunk_size: int,
+    max_tokens: Optional[int] = None,
+) -> int:
+    """
+    Feeds the first `seq_length` tokens of each of `samples` to `module` in
+    chunks of up to `chunk_size` tokens. With a KV cache, the chunks of a sample
+    continue from the position where the previous one ended, and each sample
+    starts at position 0. Without one, each chunk is an independent sequence.
+
+    Since the chunks go through the model together, the observers see the same
+    activations as when feeding the tokens one at a time, in far fewer calls.
+
+    Args:
+        module: Model prepared by prepare_pt2e, taking tokens of shape
+            [1, num_tokens] and, with a KV cache, {"input_pos": [start]}.
+        samples: 1D tensors of tokens, see encode_calibration_data().
+        seq_length: Maximum number of tokens of a sample to feed.
+        use_kv_cache: Whether `module` takes an input position.
+        chunk_size: Maximum number of tokens the model accepts per call.
+        max_tokens: If set, stop after feeding this many tokens in total.
+
+    Returns:
+        The number of tokens fed to `module`.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    num_tokens = 0
+    with torch.no_grad():
+        for sample in samples:
+            tokens = sample[:seq_length]
+            if max_tokens is not None:
+                tokens = tokens[: max_tokens - num_tokens]
+            for start in range(0, len(tokens), chunk_size):
+                chunk = tokens[start : start + chunk_size].unsqueeze(0)
+                if use_kv_cache:
+                    module(chunk, {"input_pos": torch.tensor([start])})
+                else:
+                    module(chunk)
+            num_tokens += len(tokens)
+            if max_tokens is not None and num_tokens >= max_tokens:
+                break
+    return num_tokens
@@ -384,6 +384,21 @@ class SpinQuant(str, Enum):
     native = "native"
 
 
+class CalibrationMode(str, Enum):
+    """
+    How the calibration data is run through the model prepared for pt2e
+    quantization.
+
+    decode: Feeds the prompt one token at a time and continues it with
+        generated tokens, then runs lm_eval over the calibration tasks.
+    prefill: Feeds each calibration sample in as few calls as the exported
+        sequence length allows, without generating tokens or running lm_eval.
+    """
+
+    decode = "decode"
+    prefill = "prefill"
+
+
 @dataclass
 class QuantizationConfig:
     """
@@ -404,7 +419,15 @@ class QuantizationConfig:
         calibration_tasks: Tasks for GPTQ calibration from lm_eval.
         calibration_limit: Number of samples used for calibration from lm_eval.
         calibration_seq_length: Sequence length for GPTQ calibration from lm_eval.
-        calibration_data: Prompts use for calibration.
+        calibration_data: Prompts use for calibration. With the prefill
+            calibration mode, this can also be the path of a text file of
+            calibration samples separated by blank lines.
+        calibration_mode: Whether to calibrate by decoding one token at a time
+            and running lm_eval, or by prefilling whole samples.
+        calibration_max_tokens: Maximum number of tokens to prefill over all
+            the calibration samples. Only used by the prefill calibration mode.
+        calibration_cache_dir: Directory to cache the tokenized calibration
+            samples in. Only used by the prefill calibration mode.
     """
 
     # Constants.
@@ -429,6 +452,9 @@ class QuantizationConfig:
     calibration_limit: Optional[int] = None
     calibration_seq_length: Optional[int] = None
     calibration_data: str = "Once upon a time"
+    calibration_mode: CalibrationMode = CalibrationMode.decode
+    calibration_max_tokens: Optional[int] = None
+    calibration_cache_dir: Optional[str] = None
 
     def __post_init__(self):
         if self.qmode:
@@ -745,6 +771,14 @@ class LlmConfig:
             llm_config.quantization.calibration_seq_length = args.calibration_seq_length
         if hasattr(args, "calibration_data"):
             llm_config.quantization.calibration_data = args.calibration_data
+        if hasattr(args, "calibration_mode") and args.calibration_mode:
+            llm_config.quantization.calibration_mode = CalibrationMode(
+                args.calibration_mode
+            )
+        if hasattr(args, "calibration_max_tokens"):
+            llm_config.quantization.calibration_max_tokens = args.calibration_max_tokens
+        if hasattr(args, "calibration_cache_dir"):
+            llm_config.quantization.calibration_cache_dir = args.calibration_cache_dir
 
         # BackendConfig - XNNPack
         if hasattr(args, "xnnpack"):
@@ -116,3 +116,31 @@ class TestLLMEdgeManager(unittest.TestCase):
 
         # Verify the result is None
         self.assertIsNone(result)
+
+    def test_invalid_calibration_mode(self) -> None:
+        """Test that an unknown calibration mode is rejected."""
+        with self.assertRaises(ValueError):
+            LLMEdgeManager(
+                model=self.mock_model,
+                modelname=self.modelname,
+                max_seq_len=self.max_seq_len,
+                dtype=self.dtype,
+                use_kv_cache=True,
+                example_inputs=self.example_inputs,
+                calibration_mode="greedy",
+            )
+
+    def test_prefill_calibration_requires_data(self) -> None:
+        """Test that prefill calibration without data or tokenizer is rejected."""
+        manager = LLMEdgeManager(
+            model=self.mock_model,
+            modelname=self.modelname,
+            max_seq_len=self.max_seq_len,
+            dtype=self.dtype,
+            use_kv_cache=True,
+            example_inputs=self.example_inputs,
+            calibration_seq_length=32,
+            calibration_mode="prefill",
+        )
+        with self.assertRaisesRegex(ValueError, "calibration_data, tokenizer_path"):
+            manager.pt2e_quantize([MagicMock()])
@@ -0,0 +1,175 @@
+# Copyright 2026 Arm Limited and/or its affiliates.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+import copy
+import os
+import tempfile
+import unittest
+from typing import Dict, List, Optional, Tuple
+
+import torch
+from executorch.backends.xnnpack.quantizer.xnnpack_quantizer import (
+    get_symmetric_quantization_config,
+    XNNPACKQuantizer,
+)
+from executorch.extension.llm.export.calibration import (
+    calibrate_prefill,
+    encode_calibration_data,
+)
+from torchao.quantization.pt2e.observer import ObserverBase
+from torchao.quantization.pt2e.quantize_pt2e import prepare_pt2e
+
+
+class _CharTokenizer:
+    """Encodes each character as its code point, after BOS 1."""
+
+    eos_id = 2
+
+    def __init__(self) -> None:
+        self.num_calls = 0
+
+    def encode(self, text: str, bos: bool, eos: bool) -> List[int]:
+        self.num_calls += 1
+        return [1] * bos + [ord(c) for c in text] + [self.eos_id] * eos
+
+
+class _RecordingModule(torch.nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: List[Tuple[List[int], Optional[int]]] = []
+
+    def forward(
+        self, tokens: torch.Tensor, kwargs: Optional[Dict[str, torch.Tensor]] = None
+    ) -> torch.Tensor:
+        start = None if kwargs is None else kwargs["input_pos"].item()
+        self.calls.append((tokens[0].tolist(), start))
+        return tokens
+
+
+class _TokenMLP(torch.nn.Module):
+    def __init__(self) -> None:
+        super().__init__()
+        self.embedding = torch.nn.Embedding(128, 16)
+        self.linear = torch.nn.Linear(16, 16)
+
+    def forward(
+        self, tokens: torch.Tensor, kwargs: Dict[str, torch.Tensor]
+    ) -> torch.Tensor:
+        return torch.relu(self.linear(self.embedding(tokens)))
+
+
+class TestCalibration(unittest.TestCase):
+    def test_encode_calibration_data(self) -> None:
+        tokenizer = _CharTokenizer()
+        samples = encode_calibration_data(tokenizer, "ab")
+        self.assertEqual([s.tolist() for s in samples], [[1, 97, 98]])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_path = os.path.join(tmpdir, "data.txt")
+            with open(data_path, "w") as f:
+                f.write("ab\nc\n\n\nd\n\n")
+            tokenizer_path = os.path.join(tmpdir, "tokenizer.model")
+            with open(tokenizer_path, "w") as f:
+                f.write("tokenizer")
+            cache_dir = os.path.join(tmpdir, "cache")
+
+            tokenizer = _CharTokenizer()
+            for _ in range(2):
+                samples = encode_calibration_data(
+                    tokenizer, data_path, tokenizer_path, cache_dir
+                )
+                self.assertEqual(
+                    [s.tolist() for s in samples], [[1, 97, 98, 10, 99], [1, 100]]
+                )
+            # The second call loads the samples from the cache.
+            self.assertEqual(tokenizer.num_calls, 2)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            # Changing the data invalidates the cache.
+            with open(data_path, "w") as f:
+                f.write("e")
+            samples = encode_calibration_data(
+                tokenizer, data_path, tokenizer_path, cache_dir
+            )
+            self.assertEqual([s.tolist() for s in samples], [[1, 101]])
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_calibrate_prefill(self) -> None:
+        samples = [torch.arange(10), torch.arange(20, 25)]
+
+        module = _RecordingModule()
+        num_tokens = calibrate_prefill(
+            module, samples, seq_length=8, use_kv_cache=True, chunk_size=3
+        )
+        self.assertEqual(num_tokens, 13)
+        self.assertEqual(
+            module.calls,
+            [
+                ([0, 1, 2], 0),
+                ([3, 4, 5], 3),
+                ([6, 7], 6),
+                ([20, 21, 22], 0),
+                ([23, 24], 3),
+            ],
+        )
+
+        # The token budget stops in the middle of the second sample.
+        module = _RecordingModule()
+        num_tokens = calibrate_prefill(
+            module,
+            samples,
+            seq_length=8,
+            use_kv_cache=False,
+            chunk_size=8,
+            max_tokens=10,
+        )
+        self.assertEqual(num_tokens, 10)
+        self.assertEqual(module.calls, [(list(range(8)), None), ([20, 21], None)])
+
+        with self.assertRaises(ValueError):
+            calibrate_prefill(
+                module, samples, seq_length=8, use_kv_cache=True, chunk_size=0
+            )
+
+    def test_prefill_observer_parity(self) -> None:
+        example_inputs = (torch.tensor([[2, 3, 4]]), {"input_pos": torch.tensor([0])})
+        dynamic_shapes = (
+            {1: torch.export.Dim("token_dim", max=63)},
+            {"input_pos": {0: 1}},
+        )
+        graph_module = torch.export.export(
+            _TokenMLP().eval(), example_inputs, dynamic_shapes=dynamic_shapes
+        ).module()
+        quantizer = XNNPACKQuantizer().set_global(
+            get_symmetric_quantization_config(is_dynamic=False)
+        )
+        samples = [torch.randint(0, 128, (40,)) for _ in range(3)]
+
+        observer_ranges = []
+        for chunk_size in (1, 16, 63):
+            prepared = prepare_pt2e(copy.deepcopy(graph_module), quantizer)
+            calibrate_prefill(
+                prepared,
+                samples,
+                seq_length=32,
+                use_kv_cache=True,
+                chunk_size=chunk_size,
+            )
+            observer_ranges.append(
+                [
+                    (observer.min_val.item(), observer.max_val.item())
+                    for observer in prepared.modules()
+                    if isinstance(observer, ObserverBase)
+                    and hasattr(observer, "min_val")
+                ]
+            )
+        self.assertTrue(len(observer_ranges[0]) > 0)
+        for ranges in observer_ranges[1:]:
+            for (min_val, max_val), (ref_min, ref_max) in zip(
+                ranges, observer_ranges[0]
+            ):
+                self.assertAlmostEqual(min_val, ref_min, places=5)
+                self.assertAlmostEqual(max_val, ref_max, places=5)
@@ -20,10 +20,12 @@ try:
         Image,
         make_audio_input,
         make_image_input,
+        make_image_inputs,
         make_raw_audio_input,
         make_text_input,
         make_token_input,
         MultimodalInput,
+        MultimodalInputList,
         MultimodalRunner,
         Stats,
         TextLLMRunner,
@@ -171,7 +173,7 @@ def _hf_to_multimodal_inputs(  # noqa: C901
 
 def generate_hf(
     runner: MultimodalRunner,
-    inputs: Union[BatchFeature, List[MultimodalInput]],
+    inputs: Union[BatchFeature, MultimodalInputList, List[MultimodalInput]],
     config: GenerationConfig,
     image_token_id: Optional[int] = None,
     token_callback: Optional[Callable[[str], None]] = None,
@@ -183,13 +185,13 @@ def generate_hf(
             "Input is a BatchFeature, assuming it's coming from HF AutoProcessor.apply_chat_template(). Converting to multimodal inputs."
         )
         converted = _hf_to_multimodal_inputs(inputs, image_token_id=image_token_id)
-    elif isinstance(inputs, list) and all(
-        isinstance(i, MultimodalInput) for i in inputs
+    elif isinstance(inputs, MultimodalInputList) or (
+        isinstance(inputs, list) and all(isinstance(i, MultimodalInput) for i in inputs)
     ):
         converted = inputs
     else:
         raise RuntimeError(
-            "inputs must be either a BatchFeature (from HF AutoProcessor) or a list of MultimodalInput"
+            "inputs must be either a BatchFeature (from HF AutoProcessor), a MultimodalInputList or a list of MultimodalInput"
         )
 
     runner.generate(converted, config, token_callback, stats_callback)
@@ -197,7 +199,7 @@ def generate_hf(
 
 def generate_text_hf(
     runner: MultimodalRunner,
-    inputs: Union[BatchFeature, List[MultimodalInput]],
+    inputs: Union[BatchFeature, MultimodalInputList, List[MultimodalInput]],
     config: GenerationConfig,
     image_token_id: Optional[int] = None,
 ) -> str:
@@ -207,13 +209,13 @@ def generate_text_hf(
             "Input is a BatchFeature, assuming it's coming from HF AutoProcessor.apply_chat_template(). Converting to multimodal inputs."
         )
         converted = _hf_to_multimodal_inputs(inputs, image_token_id=image_token_id)
-    elif isinstance(inputs, list) and all(
-        isinstance(i, MultimodalInput) for i in inputs
+    elif isinstance(inputs, MultimodalInputList) or (
+        isinstance(inputs, list) and all(isinstance(i, MultimodalInput) for i in inputs)
     ):
         converted = inputs
     else:
         raise RuntimeError(
-            "inputs must be either a BatchFeature (from HF AutoProcessor) or a list of MultimodalInput"
+            "inputs must be either a BatchFeature (from HF AutoProcessor), a MultimodalInputList or a list of MultimodalInput"
         )
 
     return runner.generate_text(converted, config)
@@ -228,10 +230,12 @@ __all__ = [
     "Image",
     "make_audio_input",
     "make_image_input",
+    "make_image_inputs",
     "make_raw_audio_input",
     "make_text_input",
     "make_token_input",
     "MultimodalInput",
+    "MultimodalInputList",
     "MultimodalRunner",
     "TextLLMRunner",
     "Stats",
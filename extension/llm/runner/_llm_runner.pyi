@@ -4,10 +4,16 @@ Type stubs for _llm_runner module.
 This file provides type annotations for the ExecuTorch LLM Runner Python bindings.
 """
 
-from typing import Callable, List, Optional, overload
+from typing import Callable, Iterable, List, Optional, overload, Tuple, Union
 
+import numpy as np
 import torch
 
+# Objects supporting the buffer protocol, e.g. NumPy arrays, of uint8 or float32
+# data. It is copied without holding the GIL, with a single memcpy if the buffer
+# is C-contiguous. Buffers of other types are rejected.
+_Buffer = Union[np.ndarray, bytes, bytearray, memoryview]
+
 class GenerationConfig:
     """Configuration for text generation."""
 
@@ -130,13 +136,30 @@ class Stats:
     def __repr__(self) -> str: ...
 
 class Image:
-    """Container for image data."""
+    """
+    Container for image data, in CHW order.
+
+    Supports the buffer protocol: `numpy.asarray(image)` is a (C, H, W) view of
+    the image data, without copying it.
+    """
 
     @overload
     def __init__(self) -> None:
         """Initialize an empty Image."""
         ...
 
+    @overload
+    def __init__(self, data: _Buffer, width: int, height: int, channels: int) -> None:
+        """
+        Initialize an Image from a buffer, e.g. a NumPy array of shape
+        (C, H, W).
+
+        Raises:
+            RuntimeError: If the buffer doesn't have width * height * channels
+                elements, or isn't of uint8 or float32 data
+        """
+        ...
+
     @overload
     def __init__(self, data: List[int], width: int, height: int, channels: int) -> None:
         """Initialize an Image with uint8 data."""
@@ -185,7 +208,12 @@ class Image:
     def __repr__(self) -> str: ...
 
 class Audio:
-    """Container for preprocessed audio data."""
+    """
+    Container for preprocessed audio data.
+
+    Supports the buffer protocol: `numpy.asarray(audio)` is a
+    (batch_size, n_bins, n_frames) view of the audio data, without copying it.
+    """
 
     data: List[int]
     """Raw audio data as a list of uint8 values."""
@@ -204,6 +232,20 @@ class Audio:
         """Initialize an empty Audio."""
         ...
 
+    @overload
+    def __init__(
+        self, data: _Buffer, batch_size: int, n_bins: int, n_frames: int
+    ) -> None:
+        """
+        Initialize Audio from a buffer, e.g. a NumPy array of shape
+        (batch_size, n_bins, n_frames).
+
+        Raises:
+            RuntimeError: If the buffer doesn't have batch_size * n_bins *
+                n_frames elements, or isn't of uint8 or float32 data
+        """
+        ...
+
     @overload
     def __init__(
         self, data: List[int], batch_size: int, n_bins: int, n_frames: int
@@ -214,7 +256,13 @@ class Audio:
     def __repr__(self) -> str: ...
 
 class RawAudio:
-    """Container for raw audio data."""
+    """
+    Container for raw audio data.
+
+    Supports the buffer protocol: `numpy.asarray(raw_audio)` is a
+    (batch_size, n_channels, n_samples) view of the audio data, without copying
+    it, unlike `data`.
+    """
 
     data: List[int]
     """Raw audio data as a list of uint8 values."""
@@ -233,6 +281,20 @@ class RawAudio:
         """Initialize an empty RawAudio."""
         ...
 
+    @overload
+    def __init__(
+        self, data: _Buffer, batch_size: int, n_channels: int, n_samples: int
+    ) -> None:
+        """
+        Initialize RawAudio from a buffer of uint8 data, e.g. a NumPy array of
+        shape (batch_size, n_channels, n_samples).
+
+        Raises:
+            RuntimeError: If the buffer doesn't have batch_size * n_channels *
+                n_samples elements, or isn't of uint8 data
+        """
+        ...
+
     @overload
     def __init__(
         self, data: List[int], batch_size: int, n_channels: int, n_samples: int
@@ -315,7 +377,8 @@ class MultimodalInput:
         Get the image content if this is an image input.
 
         Returns:
-            The Image object if this is an image input, None otherwise
+            The Image object if this is an image input, None otherwise.
+            It is a copy of the data of this input.
         """
         ...
 
@@ -324,7 +387,8 @@ class MultimodalInput:
         Get the audio content if this is an audio input.
 
         Returns:
-            The Audio object if this is an audio input, None otherwise
+            The Audio object if this is an audio input, None otherwise.
+            It is a copy of the data of this input.
         """
         ...
 
@@ -333,12 +397,35 @@ class MultimodalInput:
         Get the raw audio content if this is a raw audio input.
 
         Returns:
-            The RawAudio object if this is a raw audio input, None otherwise
+            The RawAudio object if this is a raw audio input, None otherwise.
+            It is a copy of the data of this input.
         """
         ...
 
     def __repr__(self) -> str: ...
 
+class MultimodalInputList:
+    """
+    List of MultimodalInput, taken by MultimodalRunner without copying the
+    inputs. Python lists and tuples of MultimodalInput are converted to it,
+    copying each input, so reuse a MultimodalInputList to submit large inputs, e.g. the
+    frames of a camera, at a high rate.
+    """
+
+    @overload
+    def __init__(self) -> None: ...
+    @overload
+    def __init__(self, inputs: Iterable[MultimodalInput]) -> None: ...
+    def append(self, input: MultimodalInput) -> None: ...
+    def extend(self, inputs: Iterable[MultimodalInput]) -> None: ...
+    def clear(self) -> None: ...
+    def __getitem__(self, index: int) -> MultimodalInput: ...
+    def __len__(self) -> int: ...
+
+_MultimodalInputs = Union[
+    MultimodalInputList, List[MultimodalInput], Tuple[MultimodalInput, ...]
+]
+
 class TextLLMRunner:
     """Runner for text language models."""
 
@@ -430,7 +517,7 @@ class MultimodalRunner:
 
     def generate(
         self,
-        inputs: List[MultimodalInput],
+        inputs: _MultimodalInputs,
         config: GenerationConfig,
         token_callback: Optional[Callable[[str], None]] = None,
         stats_callback: Optional[Callable[[Stats], None]] = None,
@@ -476,7 +563,7 @@ class MultimodalRunner:
         """
         ...
 
-    def prefill(self, inputs: List[MultimodalInput]) -> None:
+    def prefill(self, inputs: _MultimodalInputs) -> None:
         """
         Prefill multimodal inputs (e.g., to rebuild KV cache from chat history)
         without generating tokens. After prefill, call generate() with a
@@ -490,9 +577,7 @@ class MultimodalRunner:
         """
         ...
 
-    def generate_text(
-        self, inputs: List[MultimodalInput], config: GenerationConfig
-    ) -> str:
+    def generate_text(self, inputs: _MultimodalInputs, config: GenerationConfig) -> str:
         """
         Generate text and return the complete result as a string.
 
@@ -564,6 +649,23 @@ def make_image_input(image_tensor: torch.Tensor) -> MultimodalInput:
     """
     ...
 
+def make_image_inputs(image_tensor: torch.Tensor) -> List[MultimodalInput]:
+    """
+    Create an image input per image of a batch, without holding the GIL.
+
+    Args:
+        image_tensor: Torch tensor with shape (N, C, H, W), in contiguous or
+            channels last memory format
+
+    Returns:
+        A list containing an image input per image
+
+    Raises:
+        RuntimeError: If the tensor has invalid dimensions, number of channels
+            or dtype
+    """
+    ...
+
 def make_audio_input(audio_tensor: torch.Tensor) -> MultimodalInput:
     """
     Create a preprocessed audio input from a torch tensor.
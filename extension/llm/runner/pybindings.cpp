@@ -10,6 +10,7 @@
 #include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <pybind11/stl_bind.h>
 #include <torch/python.h>
 
 #include <executorch/extension/llm/runner/audio.h>
@@ -23,11 +24,17 @@
 #include <executorch/runtime/platform/runtime.h>
 #include <pytorch/tokenizers/tokenizer.h>
 
+#include <cstring>
 #include <memory>
 #include <stdexcept>
 #include <string>
 #include <vector>
 
+// Bound as MultimodalInputList, so that lists of inputs built in Python are
+// passed to the runner without copying every input on each call.
+PYBIND11_MAKE_OPAQUE(
+    std::vector<executorch::extension::llm::MultimodalInput>);
+
 namespace py = pybind11;
 using namespace executorch::extension::llm;
 using namespace executorch::extension;
@@ -43,6 +50,203 @@ using namespace executorch::runtime;
     }                                                             \
   })
 
+namespace {
+
+std::vector<py::ssize_t> c_strides(
+    const std::vector<py::ssize_t>& shape,
+    py::ssize_t itemsize) {
+  std::vector<py::ssize_t> strides(shape.size());
+  py::ssize_t stride = itemsize;
+  for (size_t i = shape.size(); i-- > 0;) {
+    strides[i] = stride;
+    stride *= shape[i];
+  }
+  return strides;
+}
+
+bool is_c_contiguous(const py::buffer_info& info) {
+  py::ssize_t stride = info.itemsize;
+  for (py::ssize_t i = info.ndim; i-- > 0;) {
+    if (info.shape[i] != 1 && info.strides[i] != stride) {
+      return false;
+    }
+    stride *= info.shape[i];
+  }
+  return true;
+}
+
+void check_buffer_size(
+    const py::buffer_info& info,
+    int64_t expected_size,
+    const std::string& name) {
+  if (info.size != expected_size) {
+    throw std::runtime_error(
+        name + " data has " + std::to_string(info.size) +
+        " elements, expected " + std::to_string(expected_size));
+  }
+}
+
+// Returns whether a buffer holds elements of type T.
+template <typename T>
+bool is_buffer_of(const py::buffer_info& info) {
+  return info.itemsize == sizeof(T) &&
+      info.format == py::format_descriptor<T>::format();
+}
+
+// Copies a Python buffer of elements of type T (e.g. a NumPy array or bytes)
+// into a vector in row major order, without holding the GIL. C-contiguous
+// buffers are copied with a single memcpy.
+template <typename T>
+std::vector<T> buffer_to_vector(const py::buffer_info& info) {
+  const char* data = static_cast<const char*>(info.ptr);
+  std::vector<T> vec(info.size);
+  py::gil_scoped_release release;
+  if (is_c_contiguous(info)) {
+    std::memcpy(vec.data(), data, info.size * sizeof(T));
+    return vec;
+  }
+  std::vector<py::ssize_t> index(info.ndim, 0);
+  for (py::ssize_t i = 0; i < info.size; ++i) {
+    py::ssize_t offset = 0;
+    for (py::ssize_t d = 0; d < info.ndim; ++d) {
+      offset += index[d] * info.strides[d];
+    }
+    std::memcpy(&vec[i], data + offset, sizeof(T));
+    for (py::ssize_t d = info.ndim; d-- > 0;) {
+      if (++index[d] < info.shape[d]) {
+        break;
+      }
+      index[d] = 0;
+    }
+  }
+  return vec;
+}
+
+[[noreturn]] void throw_unsupported_format(
+    const py::buffer_info& info,
+    const std::string& name,
+    const std::string& expected) {
+  throw std::runtime_error(
+      name + " data must be a buffer of " + expected + ", got format '" +
+      info.format + "'");
+}
+
+// Copies a CPU tensor of any layout into a vector in its logical (row major)
+// order, with a single copy.
+template <typename T>
+std::vector<T> tensor_to_vector(const torch::Tensor& tensor) {
+  std::vector<T> vec(tensor.numel());
+  torch::from_blob(vec.data(), tensor.sizes(), tensor.options())
+      .copy_(tensor);
+  return vec;
+}
+
+template <typename T>
+py::buffer_info vector_buffer(
+    std::vector<T>& data,
+    const std::vector<py::ssize_t>& shape) {
+  return py::buffer_info(data.data(), shape, c_strides(shape, sizeof(T)));
+}
+
+// Creates an Image or Audio from a buffer of uint8 or float32 data, of any
+// strides. Buffers of other types are rejected.
+template <typename T>
+T from_buffer(
+    py::buffer data,
+    int32_t dim0,
+    int32_t dim1,
+    int32_t dim2,
+    const std::string& name) {
+  py::buffer_info info = data.request();
+  check_buffer_size(info, static_cast<int64_t>(dim0) * dim1 * dim2, name);
+  if (is_buffer_of<uint8_t>(info)) {
+    return T(buffer_to_vector<uint8_t>(info), dim0, dim1, dim2);
+  } else if (is_buffer_of<float>(info)) {
+    return T(buffer_to_vector<float>(info), dim0, dim1, dim2);
+  }
+  throw_unsupported_format(info, name, "uint8 or float32");
+}
+
+Image image_from_buffer(
+    py::buffer data,
+    int32_t width,
+    int32_t height,
+    int32_t channels) {
+  return from_buffer<Image>(data, width, height, channels, "Image");
+}
+
+Audio audio_from_buffer(
+    py::buffer data,
+    int32_t batch_size,
+    int32_t n_bins,
+    int32_t n_frames) {
+  return from_buffer<Audio>(data, batch_size, n_bins, n_frames, "Audio");
+}
+
+RawAudio raw_audio_from_buffer(
+    py::buffer data,
+    int32_t batch_size,
+    int32_t n_channels,
+    int32_t n_samples) {
+  py::buffer_info info = data.request();
+  check_buffer_size(
+      info,
+      static_cast<int64_t>(batch_size) * n_channels * n_samples,
+      "RawAudio");
+  if (!is_buffer_of<uint8_t>(info)) {
+    throw_unsupported_format(info, "RawAudio", "uint8");
+  }
+  return RawAudio{
+      buffer_to_vector<uint8_t>(info), batch_size, n_channels, n_samples};
+}
+
+// Creates an image input from a 3D tensor, (C, H, W) or channels last
+// (H, W, C).
+MultimodalInput image_input_from_tensor(torch::Tensor image_tensor) {
+  int64_t height, width, channels;
+  // Check for memory format and permute to CHW if necessary
+  if (image_tensor.is_contiguous(at::MemoryFormat::ChannelsLast)) {
+    // Input is HWC, permute to CHW
+    height = image_tensor.size(0);
+    width = image_tensor.size(1);
+    channels = image_tensor.size(2);
+    image_tensor = image_tensor.permute({2, 0, 1});
+  } else if (
+      image_tensor.is_contiguous(at::MemoryFormat::Contiguous) ||
+      image_tensor.permute({1, 2, 0}).is_contiguous()) {
+    // Input is CHW, e.g. an image of a batch in channels last memory format
+    channels = image_tensor.size(0);
+    height = image_tensor.size(1);
+    width = image_tensor.size(2);
+  } else {
+    throw std::runtime_error(
+        "Image tensor must be contiguous in either channels last (H, W, C) or contiguous (C, H, W) format.");
+  }
+
+  if (channels != 3 && channels != 4) {
+    throw std::runtime_error("Image must have 3 (RGB) or 4 (RGBA) channels");
+  }
+
+  if (image_tensor.scalar_type() == torch::kUInt8) {
+    return MultimodalInput(Image(
+        tensor_to_vector<uint8_t>(image_tensor),
+        static_cast<int32_t>(width),
+        static_cast<int32_t>(height),
+        static_cast<int32_t>(channels)));
+  } else if (image_tensor.scalar_type() == torch::kFloat) {
+    return MultimodalInput(Image(
+        tensor_to_vector<float>(image_tensor),
+        static_cast<int32_t>(width),
+        static_cast<int32_t>(height),
+        static_cast<int32_t>(channels)));
+  } else {
+    throw std::runtime_error(
+        "Unsupported image tensor dtype. Only uint8 and float32 are supported.");
+  }
+}
+
+} // namespace
+
 // Python wrapper class for TextLLMRunner
 class PyTextLLMRunner {
  public:
@@ -228,7 +432,7 @@ class PyMultimodalRunner {
     }
   }
 
-  void prefill(std::vector<MultimodalInput> inputs) {
+  void prefill(const std::vector<MultimodalInput>& inputs) {
     if (!runner_) {
       throw std::runtime_error("Runner not initialized");
     }
@@ -352,7 +556,15 @@ PYBIND11_MODULE(_llm_runner, m) {
       });
 
   // Bind Image class
-  py::class_<Image>(m, "Image")
+  py::class_<Image>(m, "Image", py::buffer_protocol())
+      .def(
+          py::init(&image_from_buffer),
+          py::arg("data"),
+          py::arg("width"),
+          py::arg("height"),
+          py::arg("channels"),
+          "Create an image from a buffer, e.g. a NumPy array, in CHW order. "
+          "C-contiguous uint8 and float32 data is copied without the GIL")
       .def(
           py::init<std::vector<uint8_t>&&, int32_t, int32_t, int32_t>(),
           py::arg("data"),
@@ -365,6 +577,14 @@ PYBIND11_MODULE(_llm_runner, m) {
           py::arg("width"),
           py::arg("height"),
           py::arg("channels"))
+      .def_buffer([](Image& img) {
+        std::vector<py::ssize_t> shape = {
+            img.channels(), img.height(), img.width()};
+        if (img.is_float()) {
+          return vector_buffer(img.get_float_data(), shape);
+        }
+        return vector_buffer(img.get_uint8_data(), shape);
+      })
       .def("is_uint8", &Image::is_uint8)
       .def("is_float", &Image::is_float)
       .def_property_readonly("width", &Image::width)
@@ -392,8 +612,16 @@ PYBIND11_MODULE(_llm_runner, m) {
       });
 
   // Bind Audio class
-  py::class_<Audio>(m, "Audio")
+  py::class_<Audio>(m, "Audio", py::buffer_protocol())
       .def(py::init<>())
+      .def(
+          py::init(&audio_from_buffer),
+          py::arg("data"),
+          py::arg("batch_size"),
+          py::arg("n_bins"),
+          py::arg("n_frames"),
+          "Create preprocessed audio data from a buffer, e.g. a NumPy array. "
+          "C-contiguous uint8 and float32 data is copied without the GIL")
       .def(
           py::init<std::vector<uint8_t>&&, int32_t, int32_t, int32_t>(),
           py::arg("data"),
@@ -408,6 +636,14 @@ PYBIND11_MODULE(_llm_runner, m) {
           py::arg("n_bins"),
           py::arg("n_frames"),
           "Create preprocessed audio data (float32)")
+      .def_buffer([](Audio& audio) {
+        std::vector<py::ssize_t> shape = {
+            audio.get_batch_size(), audio.get_n_bins(), audio.get_n_frames()};
+        if (audio.is_float()) {
+          return vector_buffer(audio.get_float_data(), shape);
+        }
+        return vector_buffer(audio.get_uint8_data(), shape);
+      })
       .def("is_uint8", &Audio::is_uint8)
       .def("is_float", &Audio::is_float)
       .def_property_readonly(
@@ -436,8 +672,16 @@ PYBIND11_MODULE(_llm_runner, m) {
       });
 
   // Bind RawAudio class
-  py::class_<RawAudio>(m, "RawAudio")
+  py::class_<RawAudio>(m, "RawAudio", py::buffer_protocol())
       .def(py::init<>())
+      .def(
+          py::init(&raw_audio_from_buffer),
+          py::arg("data"),
+          py::arg("batch_size"),
+          py::arg("n_channels"),
+          py::arg("n_samples"),
+          "Create raw audio data from a buffer, e.g. a NumPy array. "
+          "C-contiguous uint8 data is copied without the GIL")
       .def(
           py::init<std::vector<uint8_t>&&, int32_t, int32_t, int32_t>(),
           py::arg("data"),
@@ -445,6 +689,10 @@ PYBIND11_MODULE(_llm_runner, m) {
           py::arg("n_channels"),
           py::arg("n_samples"),
           "Create raw audio data")
+      .def_buffer([](RawAudio& audio) {
+        return vector_buffer(
+            audio.data, {audio.batch_size, audio.n_channels, audio.n_samples});
+      })
       .def_readwrite("data", &RawAudio::data)
       .def_readwrite("batch_size", &RawAudio::batch_size)
       .def_readwrite("n_channels", &RawAudio::n_channels)
@@ -504,6 +752,9 @@ PYBIND11_MODULE(_llm_runner, m) {
           })
       .def(
           "get_image",
+          // Returns a copy, like get_audio() and get_raw_audio(), since
+          // references into a MultimodalInputList would dangle once the
+          // list grows.
           [](const MultimodalInput& input) -> py::object {
             if (input.is_image()) {
               return py::cast(input.get_image());
@@ -543,6 +794,12 @@ PYBIND11_MODULE(_llm_runner, m) {
         return "<MultimodalInput type=unknown>";
       });
 
+  // Bind the list of inputs passed to MultimodalRunner, which Python lists and
+  // tuples of MultimodalInput are implicitly converted to.
+  py::bind_vector<std::vector<MultimodalInput>>(m, "MultimodalInputList");
+  py::implicitly_convertible<py::list, std::vector<MultimodalInput>>();
+  py::implicitly_convertible<py::tuple, std::vector<MultimodalInput>>();
+
   // Bind helper functions using lambdas
   m.def(
       "make_token_input",
@@ -582,52 +839,36 @@ PYBIND11_MODULE(_llm_runner, m) {
               "Image tensor must be 3-dimensional (H, W, C) or 4-dimensional (1, H, W, C)");
         }
 
-        int64_t height, width, channels;
-        // Check for memory format and permute to CHW if necessary
-        if (image_tensor.is_contiguous(at::MemoryFormat::ChannelsLast)) {
-          // Input is HWC, permute to CHW
-          height = image_tensor.size(0);
-          width = image_tensor.size(1);
-          channels = image_tensor.size(2);
-          image_tensor = image_tensor.permute({2, 0, 1});
-        } else if (image_tensor.is_contiguous(at::MemoryFormat::Contiguous)) {
-          // Input is CHW
-          channels = image_tensor.size(0);
-          height = image_tensor.size(1);
-          width = image_tensor.size(2);
-        } else {
-          throw std::runtime_error(
-              "Image tensor must be contiguous in either channels last (H, W, C) or contiguous (C, H, W) format.");
-        }
+        py::gil_scoped_release release;
+        return image_input_from_tensor(image_tensor);
+      },
+      "Create an image input from a torch tensor (H, W, C), (1, H, W, C), (C, H, W), or (1, C, H, W)",
+      py::arg("image_tensor"));
 
-        if (channels != 3 && channels != 4) {
+  m.def(
+      "make_image_inputs",
+      [](torch::Tensor image_tensor) -> py::list {
+        if (image_tensor.dim() != 4) {
           throw std::runtime_error(
-              "Image must have 3 (RGB) or 4 (RGBA) channels");
+              "Image batch tensor must be 4-dimensional (N, C, H, W)");
         }
-
-        image_tensor = image_tensor.contiguous();
-        if (image_tensor.scalar_type() == torch::kUInt8) {
-          uint8_t* data = image_tensor.data_ptr<uint8_t>();
-          std::vector<uint8_t> image_data(data, data + image_tensor.numel());
-          return MultimodalInput(Image(
-              std::move(image_data),
-              static_cast<int32_t>(width),
-              static_cast<int32_t>(height),
-              static_cast<int32_t>(channels)));
-        } else if (image_tensor.scalar_type() == torch::kFloat) {
-          float* data = image_tensor.data_ptr<float>();
-          std::vector<float> image_data(data, data + image_tensor.numel());
-          return MultimodalInput(Image(
-              std::move(image_data),
-              static_cast<int32_t>(width),
-              static_cast<int32_t>(height),
-              static_cast<int32_t>(channels)));
-        } else {
-          throw std::runtime_error(
-              "Unsupported image tensor dtype. Only uint8 and float32 are supported.");
+        std::vector<MultimodalInput> inputs;
+        inputs.reserve(image_tensor.size(0));
+        {
+          py::gil_scoped_release release;
+          for (int64_t i = 0; i < image_tensor.size(0); ++i) {
+            inputs.push_back(image_input_from_tensor(image_tensor[i]));
+          }
         }
+        // Return a Python list, like the other helpers, rather than the
+        // opaque MultimodalInputList.
+        py::list result;
+        for (auto& input : inputs) {
+          result.append(py::cast(std::move(input)));
+        }
+        return result;
       },
-      "Create an image input from a torch tensor (H, W, C), (1, H, W, C), (C, H, W), or (1, C, H, W)",
+      "Create an image input per image of a batch tensor (N, C, H, W), in contiguous or channels last memory format",
       py::arg("image_tensor"));
 
   m.def(
@@ -642,20 +883,15 @@ PYBIND11_MODULE(_llm_runner, m) {
         int64_t n_bins = audio_tensor.size(1);
         int64_t n_frames = audio_tensor.size(2);
 
-        audio_tensor = audio_tensor.contiguous();
         if (audio_tensor.scalar_type() == torch::kUInt8) {
-          uint8_t* data = audio_tensor.data_ptr<uint8_t>();
-          std::vector<uint8_t> audio_data(data, data + audio_tensor.numel());
           return MultimodalInput(Audio(
-              std::move(audio_data),
+              tensor_to_vector<uint8_t>(audio_tensor),
               static_cast<int32_t>(batch_size),
               static_cast<int32_t>(n_bins),
               static_cast<int32_t>(n_frames)));
         } else if (audio_tensor.scalar_type() == torch::kFloat) {
-          float* data = audio_tensor.data_ptr<float>();
-          std::vector<float> audio_data(data, data + audio_tensor.numel());
           return MultimodalInput(Audio(
-              std::move(audio_data),
+              tensor_to_vector<float>(audio_tensor),
               static_cast<int32_t>(batch_size),
               static_cast<int32_t>(n_bins),
               static_cast<int32_t>(n_frames)));
@@ -679,12 +915,9 @@ PYBIND11_MODULE(_llm_runner, m) {
         int64_t n_channels = audio_tensor.size(1);
         int64_t n_samples = audio_tensor.size(2);
 
-        audio_tensor = audio_tensor.contiguous();
         if (audio_tensor.scalar_type() == torch::kUInt8) {
-          uint8_t* data = audio_tensor.data_ptr<uint8_t>();
-          std::vector<uint8_t> audio_data(data, data + audio_tensor.numel());
           return MultimodalInput(RawAudio{
-              std::move(audio_data),
+              tensor_to_vector<uint8_t>(audio_tensor),
               static_cast<int32_t>(batch_size),
               static_cast<int32_t>(n_channels),
               static_cast<int32_t>(n_samples)});
@@ -16,15 +16,19 @@ import os
 import tempfile
 import unittest
 
+import numpy as np
 import torch
 from executorch.extension.llm.runner import (
     GenerationConfig,
     Image,
     make_image_input,
+    make_image_inputs,
     make_text_input,
     MultimodalInput,
+    MultimodalInputList,
     MultimodalRunner,
 )
+from executorch.extension.llm.runner._llm_runner import Audio, RawAudio
 
 
 class TestGenerationConfig(unittest.TestCase):
@@ -127,6 +131,44 @@ class TestImage(unittest.TestCase):
         self.assertEqual(image.height, 2)
         self.assertEqual(image.channels, 1)
 
+    def test_buffer(self):
+        """Test creating an Image from a NumPy array and viewing its data."""
+        data = np.arange(3 * 4 * 5, dtype=np.uint8).reshape(3, 4, 5)
+        image = Image(data, 5, 4, 3)
+        self.assertTrue(image.is_uint8())
+        view = np.asarray(image)
+        self.assertEqual(view.shape, (3, 4, 5))
+        np.testing.assert_array_equal(view, data)
+        # The views share the image data.
+        self.assertEqual(
+            np.asarray(image).__array_interface__["data"][0],
+            view.__array_interface__["data"][0],
+        )
+
+        float_data = np.random.rand(3, 2, 2).astype(np.float32)
+        image = Image(float_data, 2, 2, 3)
+        self.assertTrue(image.is_float())
+        np.testing.assert_array_equal(np.asarray(image), float_data)
+        self.assertEqual(Image(bytes(12), 2, 2, 3).uint8_data, [0] * 12)
+
+        with self.assertRaises(RuntimeError):
+            Image(data, 5, 4, 4)  # Wrong size
+
+        # Non-contiguous arrays are copied in row major order.
+        transposed = np.ascontiguousarray(data.transpose(1, 2, 0)).transpose(2, 0, 1)
+        image = Image(transposed, 5, 4, 3)
+        self.assertTrue(image.is_uint8())
+        np.testing.assert_array_equal(np.asarray(image), data)
+        image = Image(float_data[:, ::-1, :], 2, 2, 3)
+        self.assertTrue(image.is_float())
+        np.testing.assert_array_equal(np.asarray(image), float_data[:, ::-1, :])
+
+        # Other element types are rejected rather than converted.
+        for dtype in (np.int64, np.float64, np.int8):
+            with self.assertRaises(RuntimeError) as cm:
+                Image(data.astype(dtype), 5, 4, 3)
+            self.assertIn("uint8 or float32", str(cm.exception))
+
     def test_repr(self):
         """Test string representation."""
         image = Image([0] * (480 * 640 * 3), 640, 480, 3)
@@ -138,6 +180,29 @@ class TestImage(unittest.TestCase):
         self.assertIn("channels=3", repr_str)
 
 
+class TestAudio(unittest.TestCase):
+    """Test the Audio and RawAudio classes."""
+
+    def test_buffer(self):
+        """Test creating audio from NumPy arrays and viewing their data."""
+        data = np.random.rand(1, 4, 6).astype(np.float32)
+        audio = Audio(data, 1, 4, 6)
+        self.assertTrue(audio.is_float())
+        np.testing.assert_array_equal(np.asarray(audio), data)
+
+        raw_data = np.arange(2 * 8, dtype=np.uint8).reshape(1, 2, 8)
+        raw_audio = RawAudio(raw_data, 1, 2, 8)
+        np.testing.assert_array_equal(np.asarray(raw_audio), raw_data)
+        self.assertEqual(raw_audio.data, raw_data.reshape(-1).tolist())
+
+        with self.assertRaises(RuntimeError):
+            Audio(data, 1, 4, 5)
+        with self.assertRaises(RuntimeError):
+            RawAudio(raw_data, 1, 2, 4)
+        with self.assertRaises(RuntimeError):
+            RawAudio(raw_data.astype(np.float32), 1, 2, 8)
+
+
 class TestMultimodalInput(unittest.TestCase):
     """Test the MultimodalInput class."""
 
@@ -170,6 +235,37 @@ class TestMultimodalInput(unittest.TestCase):
         self.assertTrue(image_input2.is_image())
         self.assertFalse(image_input2.is_text())
 
+    def test_get_image_returns_copy(self):
+        """Test that get_image() outlives changes to the list of inputs."""
+        inputs = MultimodalInputList(
+            [MultimodalInput(Image(np.full((3, 2, 2), 5, np.uint8), 2, 2, 3))]
+        )
+        image = inputs[0].get_image()
+        # Growing the list reallocates its inputs.
+        inputs.extend([make_text_input(str(i)) for i in range(100)])
+        inputs.clear()
+        np.testing.assert_array_equal(np.asarray(image), np.full((3, 2, 2), 5))
+
+    def test_input_list(self):
+        """Test building a MultimodalInputList."""
+        inputs = MultimodalInputList([make_text_input("Describe:")])
+        inputs.extend(make_image_inputs(torch.zeros((2, 3, 4, 5), dtype=torch.uint8)))
+        self.assertEqual(len(inputs), 3)
+        self.assertTrue(inputs[0].is_text())
+        self.assertTrue(inputs[2].is_image())
+        inputs.clear()
+        self.assertEqual(len(inputs), 0)
+
+        # Tuples and other iterables of inputs are accepted like lists.
+        inputs = MultimodalInputList(
+            (make_text_input("Describe:"), make_text_input("Briefly."))
+        )
+        inputs.extend(make_text_input(str(i)) for i in range(2))
+        self.assertEqual(
+            [inputs[i].get_text() for i in range(len(inputs))],
+            ["Describe:", "Briefly.", "0", "1"],
+        )
+
     def test_invalid_image_array(self):
         """Test error handling for invalid image arrays."""
         # Wrong dimensions (expects 3D or 4D tensor)
@@ -256,3 +352,19 @@ class TestHelperFunctions(unittest.TestCase):
         img_tensor_rgba = torch.ones((4, 50, 50), dtype=torch.uint8) * 128
         image_input_rgba = make_image_input(img_tensor_rgba)
         self.assertTrue(image_input_rgba.is_image())
+
+    def test_make_image_inputs(self):
+        """Test make_image_inputs helper."""
+        images = torch.rand((3, 3, 8, 6))
+        for batch in (images, images.to(memory_format=torch.channels_last)):
+            inputs = make_image_inputs(batch)
+            self.assertIsInstance(inputs, list)
+            self.assertEqual(len(inputs), 3)
+            for i, image_input in enumerate(inputs):
+                image = image_input.get_image()
+                self.assertEqual((image.channels, image.height, image.width), (3, 8, 6))
+                np.testing.assert_array_equal(np.asarray(image), images[i].numpy())
+
+        with self.assertRaises(RuntimeError) as cm:
+            make_image_inputs(torch.zeros((3, 8, 6)))
+        self.assertIn("4-dimensional", str(cm.exception))
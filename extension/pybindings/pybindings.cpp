@@ -10,6 +10,7 @@
 #include <cstdio>
 #include <iostream>
 #include <memory>
+#include <mutex>
 #include <stdexcept>
 
 #include <pybind11/iostream.h>
@@ -727,7 +728,8 @@ struct PyModule final {
   py::list run_method(
       const std::string& method_name,
       const py::sequence& inputs,
-      bool clone_outputs = true) {
+      bool clone_outputs = true,
+      bool release_gil = false) {
     const auto inputs_size = py::len(inputs);
     std::vector<EValue> cpp_inputs;
     cpp_inputs.reserve(inputs_size);
@@ -814,9 +816,19 @@ struct PyModule final {
       }
     }
 
+    // Held until the outputs are retrieved.
+    auto lock = lock_module();
     // Set up output storage before execution.
     allocate_output_tensors(method_name);
-    auto outputs = module_->execute(method_name, cpp_inputs);
+    auto outputs = [&]() {
+      if (!release_gil) {
+        return module_->execute(method_name, cpp_inputs);
+      }
+      // Let other Python threads, e.g. one preparing the next inputs, run in
+      // the meantime.
+      py::gil_scoped_release release;
+      return module_->execute(method_name, cpp_inputs);
+    }();
     THROW_IF_ERROR(
         outputs.error(),
         "Failed to execute method %s, error: 0x%" PRIx32,
@@ -827,8 +839,11 @@ struct PyModule final {
     return get_outputs_as_py_list(outputs.get(), clone_outputs);
   }
 
-  py::list forward(const py::sequence& inputs, bool clone_outputs = true) {
-    return run_method("forward", inputs, clone_outputs);
+  py::list forward(
+      const py::sequence& inputs,
+      bool clone_outputs = true,
+      bool release_gil = false) {
+    return run_method("forward", inputs, clone_outputs, release_gil);
   }
 
   py::list forward_single_input(
@@ -840,17 +855,18 @@ struct PyModule final {
   }
 
   bool has_etdump() {
-    ETDumpGen* etdump = dynamic_cast<ETDumpGen*>(module_->event_tracer());
-    return etdump != nullptr;
+    auto lock = lock_module();
+    return etdump_gen() != nullptr;
   }
 
   void write_etdump_result_to_file(
       const std::string& path,
       const py::object& debug_buffer_path) {
-    if (!has_etdump()) {
+    auto lock = lock_module();
+    ETDumpGen* etdump = etdump_gen();
+    if (etdump == nullptr) {
       throw std::runtime_error("No etdump found");
     }
-    ETDumpGen* etdump = dynamic_cast<ETDumpGen*>(module_->event_tracer());
     etdump_result result = etdump->get_etdump_data();
     if (result.buf != nullptr && result.size > 0) {
       write_data_to_file(path, result.buf, result.size);
@@ -876,6 +892,7 @@ struct PyModule final {
   py::list plan_execute(
       const std::string method_name,
       bool clone_outputs = true) {
+    auto lock = lock_module();
     auto status = module_->load_method(method_name);
 
     THROW_IF_ERROR(
@@ -891,6 +908,7 @@ struct PyModule final {
   }
 
   std::unique_ptr<PyMethodMeta> method_meta(const std::string method_name) {
+    auto lock = lock_module();
     auto method_data = module_->method_meta(method_name);
     THROW_IF_ERROR(
         method_data.error(),
@@ -901,6 +919,7 @@ struct PyModule final {
   }
 
   std::vector<std::string> method_names() {
+    auto lock = lock_module();
     auto result = module_->method_names();
     THROW_IF_ERROR(
         result.error(),
@@ -919,6 +938,23 @@ struct PyModule final {
   // Need to keep-alive output tensors until they can be compared in case of
   // bundled programs.
   std::vector<std::optional<TensorPtr>> output_tensors_;
+  // Serializes the methods that use module_ or output_tensors_, since
+  // run_method() may execute without the GIL. Held by pointer to keep PyModule
+  // movable.
+  std::unique_ptr<std::mutex> execute_mutex_ = std::make_unique<std::mutex>();
+
+  // Locks execute_mutex_. The lock is always taken without the GIL, so that a
+  // thread holding it while executing without the GIL can re-acquire the GIL.
+  std::unique_lock<std::mutex> lock_module() {
+    std::unique_lock<std::mutex> lock(*execute_mutex_, std::defer_lock);
+    py::gil_scoped_release release;
+    lock.lock();
+    return lock;
+  }
+
+  ETDumpGen* etdump_gen() {
+    return dynamic_cast<ETDumpGen*>(module_->event_tracer());
+  }
 
   // Set debug buffer for potential event tracer.
   std::unique_ptr<torch::executor::ETDumpGen> setup_event_tracer(
@@ -1647,12 +1683,14 @@ PYBIND11_MODULE(EXECUTORCH_PYTHON_MODULE_NAME, m) {
           py::arg("method_name"),
           py::arg("inputs") = py::list(),
           py::arg("clone_outputs") = true,
+          py::arg("release_gil") = false,
           call_guard)
       .def(
           "forward",
           &PyModule::forward,
           py::arg("inputs") = py::list(),
           py::arg("clone_outputs") = true,
+          py::arg("release_gil") = false,
           call_guard)
       .def("has_etdump", &PyModule::has_etdump, call_guard)
       .def(
@@ -1666,6 +1704,7 @@ PYBIND11_MODULE(EXECUTORCH_PYTHON_MODULE_NAME, m) {
           &PyModule::forward,
           py::arg("inputs") = py::list(),
           py::arg("clone_outputs") = true,
+          py::arg("release_gil") = false,
           call_guard)
       .def(
           "__call__",
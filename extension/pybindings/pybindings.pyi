@@ -40,12 +40,14 @@ class ExecuTorchModule:
         method_name: str,
         inputs: Sequence[Any],  # pyre-ignore[2]: "Any" in parameter type annotations.
         clone_outputs: bool = True,
+        release_gil: bool = False,
     ) -> List[Any]: ...
     # pyre-ignore[2, 3]: "Any" in parameter and return type annotations.
     def forward(
         self,
         inputs: Sequence[Any],  # pyre-ignore[2]: "Any" in parameter type annotations.
         clone_outputs: bool = True,
+        release_gil: bool = False,
     ) -> List[Any]: ...
     # pyre-ignore[2, 3]: "Any" in parameter and return type annotations.
     def plan_execute(
@@ -8,6 +8,7 @@
 
 import sys
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 
 import torch
@@ -71,6 +72,32 @@ class PybindingsTest(unittest.TestCase):
         executorch_output2 = executorch_module.run_method("forward2", inputs)[0]
         self.assertTrue(torch.allclose(executorch_output2, torch.ones(2, 2) * 3))
 
+    def test_concurrent_calls(self):
+        program, inputs = create_program(ModuleMulti())
+        executorch_module = self.load_fn(program.buffer)
+
+        def call(i: int) -> bool:
+            # Mixes calls that execute without the GIL with ones that don't,
+            # and with the other methods of the module.
+            if i % 4 == 0:
+                output = executorch_module.forward(inputs, release_gil=True)[0]
+                return torch.allclose(output, torch.ones(2, 2) * 2)
+            if i % 4 == 1:
+                output = executorch_module.run_method(
+                    "forward2", inputs, release_gil=True
+                )[0]
+                return torch.allclose(output, torch.ones(2, 2) * 3)
+            if i % 4 == 2:
+                output = executorch_module.run_method("forward2", inputs)[0]
+                return torch.allclose(output, torch.ones(2, 2) * 3)
+            method_names = set(executorch_module.method_names())
+            num_inputs = executorch_module.method_meta("forward").num_inputs()
+            return {"forward", "forward2"} <= method_names and num_inputs == 2
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(call, range(200)))
+        self.assertTrue(all(results))
+
     def test_output_lifespan(self):
         def lower_function_call():
             program, inputs = create_program(ModuleMulti())